@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON编码方式基准测试
+比较标准库json（缩进/紧凑）、orjson和msgspec编码、解码比赛结果、马匹信息和赛程表的吞吐量
+
+使用方法:
+    python benchmarks/bench_codecs.py [文档数量]
+"""
+
+import sys
+import os
+import timeit
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+from hkjc_scrapers import HorseInfoScraper, RaceResultScraper, RaceScheduleScraper
+from hkjc_scrapers.serialization import available_codecs, decode, encode
+from pages import build_fixture_page, build_horse_page, build_result_page
+
+
+def build_documents(count: int):
+    """按各爬虫返回值的结构生成文档（包含raw_html）"""
+    result_scraper = RaceResultScraper()
+    horse_scraper = HorseInfoScraper()
+    schedule_scraper = RaceScheduleScraper()
+
+    race_results, horses, fixtures = [], [], []
+    for seed in range(count):
+        page = build_result_page(seed=seed)
+        soup = BeautifulSoup(page, 'html.parser')
+        race_results.append({
+            'race_date': '2026/01/18', 'racecourse': 'ST', 'race_no': str(seed % 11 + 1),
+            'race_info': result_scraper._extract_race_info(soup),
+            'horses': result_scraper._extract_horse_info(soup),
+            'race_result': result_scraper._extract_race_result(soup),
+            'incident_reports': result_scraper._extract_incident_reports(soup),
+            'pedigree': result_scraper._extract_pedigree(soup),
+            'raw_html': page,
+        })
+
+        page = build_horse_page(seed=seed)
+        soup = BeautifulSoup(page, 'html.parser')
+        horses.append({
+            'horse_id': f'HK_2022_H{seed:03d}', 'source_url': '', 'scraped_at': '2026-01-18T00:00:00',
+            'basic_info': horse_scraper._extract_basic_info(soup),
+            'race_records': horse_scraper._extract_race_records(soup),
+            'equipment_legend': horse_scraper._extract_equipment_legend(soup),
+            'raw_html': page,
+        })
+
+    page = build_fixture_page(seed=0)
+    fixture = schedule_scraper._extract_fixture(BeautifulSoup(page, 'html.parser'))
+    fixture.update({'source_url': '', 'scraped_at': '2026-01-18T00:00:00', 'raw_html': page})
+    fixtures = [fixture] * max(1, count // 10)
+
+    return {'race_result': race_results, 'horse_info': horses, 'fixture': fixtures}
+
+
+def bench(documents, codec, pretty=False, schema=None, number=5):
+    """返回(编码MB/s, 解码MB/s, 字节数)"""
+    encoded = [encode(doc, codec=codec, pretty=pretty) for doc in documents]
+    size = sum(len(raw) for raw in encoded)
+    encode_seconds = timeit.timeit(lambda: [encode(doc, codec=codec, pretty=pretty) for doc in documents],
+                                   number=number)
+    decode_seconds = timeit.timeit(lambda: [decode(raw, codec=codec, schema=schema) for raw in encoded],
+                                   number=number)
+    megabytes = size * number / 1024 / 1024
+    return megabytes / encode_seconds, megabytes / decode_seconds, size
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    documents = build_documents(count)
+
+    variants = [('json (indent=2)', 'json', True, None), ('json', 'json', False, None)]
+    for codec in available_codecs():
+        if codec != 'json':
+            variants.append((codec, codec, False, None))
+    if 'msgspec' in available_codecs():
+        variants.append(('msgspec (typed)', 'msgspec', False, 'schema'))
+
+    for kind, docs in documents.items():
+        print(f"{kind}: {len(docs)} 个文档")
+        for name, codec, pretty, schema in variants:
+            encode_rate, decode_rate, size = bench(docs, codec, pretty=pretty,
+                                                   schema=kind if schema else None)
+            print(f"  {name:<16} 编码 {encode_rate:8.1f} MB/s  解码 {decode_rate:8.1f} MB/s  大小 {size / 1024:.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+马匹往绩索引基准测试
+比较扫描race_records列表与FormIndex回答赛前分析常见查询的耗时
+
+使用方法:
+    python benchmarks/bench_form_index.py [马匹数量]
+"""
+
+import sys
+import os
+import random
+import time
+from datetime import date, timedelta
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers.form_index import FormIndex
+from hkjc_scrapers.utils import parse_finish_time, parse_race_date
+from pages import VENUES
+
+DISTANCES = [1000, 1200, 1400, 1600, 1650, 1800, 2000]
+GOINGS = ['好地', '好地至快', '黏地']
+EQUIPMENT = ['B', 'TT', 'B/TT', 'CP', 'V', '--']
+
+
+def build_horses(count: int, seed: int = 0):
+    """生成count匹马，每匹10-80条赛绩（由新到旧）"""
+    rnd = random.Random(seed)
+    horses = []
+    for i in range(count):
+        day = date(2025, 12, 28)
+        equipment = rnd.choice(EQUIPMENT)
+        records = []
+        for _ in range(rnd.randint(10, 80)):
+            if rnd.random() < 0.15:
+                equipment = rnd.choice(EQUIPMENT)
+            records.append({
+                'date': day.strftime('%d/%m/%y'), 'venue': rnd.choice(VENUES),
+                'distance': str(rnd.choice(DISTANCES)), 'track_condition': rnd.choice(GOINGS),
+                'position': str(rnd.randint(1, 14)), 'equipment': equipment,
+                'finish_time': f'1.{rnd.randint(8, 12):02d}.{rnd.randint(10, 99)}',
+            })
+            day -= timedelta(days=rnd.randint(14, 40))
+        horses.append({'horse_id': f'HK_2020_A{i:04d}', 'race_records': records})
+    return horses
+
+
+def scan_last_n(horses_by_id, horse_id, n, venue, distance):
+    """扫描：某场地某途程的最近N次赛绩"""
+    records = [r for r in horses_by_id[horse_id]['race_records']
+               if r['venue'] == venue and int(r['distance']) == distance]
+    records.sort(key=lambda r: parse_race_date(r['date']), reverse=True)
+    return records[:n]
+
+
+def scan_best_time(horses_by_id, horse_id, distance):
+    """扫描：某途程的最佳完成时间"""
+    times = [parse_finish_time(r['finish_time']) for r in horses_by_id[horse_id]['race_records']
+             if int(r['distance']) == distance]
+    times = [t for t in times if t is not None]
+    return min(times) if times else None
+
+
+def scan_equipment_runs(horses_by_id, horse_id):
+    """扫描：以当前配备连续出赛的次数"""
+    records = sorted(horses_by_id[horse_id]['race_records'], key=lambda r: parse_race_date(r['date']),
+                     reverse=True)
+    runs = 0
+    for record in records:
+        if record['equipment'] != records[0]['equipment']:
+            break
+        runs += 1
+    return runs
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    horses = build_horses(count)
+    horses_by_id = {horse['horse_id']: horse for horse in horses}
+    print(f"马匹: {len(horses)} 匹, 赛绩: {sum(len(h['race_records']) for h in horses)} 条")
+
+    index = FormIndex()
+    start = time.perf_counter()
+    index.add_horses(horses)
+    print(f"建立索引: {time.perf_counter() - start:.2f} 秒")
+
+    rnd = random.Random(1)
+    queries = [(rnd.choice(horses)['horse_id'], rnd.choice(VENUES), rnd.choice(DISTANCES)) for _ in range(5000)]
+    cases = [
+        ('某场地某途程最近5次',
+         lambda q: scan_last_n(horses_by_id, q[0], 5, q[1], q[2]),
+         lambda q: index.last_n(q[0], 5, venue=q[1], distance=q[2])),
+        ('某途程最佳时间',
+         lambda q: scan_best_time(horses_by_id, q[0], q[2]),
+         lambda q: index.best_time(q[0], q[2])),
+        ('更换配备后出赛次数',
+         lambda q: scan_equipment_runs(horses_by_id, q[0]),
+         lambda q: index.runs_since_equipment_change(q[0])),
+    ]
+    for name, scan, indexed in cases:
+        timings = []
+        for function in (scan, indexed):
+            start = time.perf_counter()
+            for query in queries:
+                function(query)
+            timings.append((time.perf_counter() - start) / len(queries) * 1e6)
+        print(f"{name}: 扫描 {timings[0]:.1f} 微秒, 索引 {timings[1]:.1f} 微秒")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+竞赛事件报告全文索引基准测试
+比较逐条扫描事件描述与IncidentIndex查询短语的耗时（约十个马季的赛果）
+
+使用方法:
+    python benchmarks/bench_incident_index.py [比赛数量]
+"""
+
+import sys
+import os
+import random
+import time
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers.incident_index import IncidentIndex
+from bench_sqlite_store import build_results
+from pages import INCIDENTS
+
+# 少见的事件
+RARE_INCIDENTS = ['賽後心律不正常', '於最後一百米左前蹄甩脫蹄鐵', '騎師報稱馬匹呼吸有雜音', '上馬房後發現左前腿不良於行']
+QUERIES = ['受阻', '流鼻血', '心律不正常', '蹄鐵', '呼吸有雜音']
+
+
+def add_descriptions(results, seed: int = 0):
+    """每条事件由两至三句组成，少见的事件约占2%"""
+    rnd = random.Random(seed)
+    for result in results:
+        for report in result['incident_reports']:
+            sentences = rnd.sample(INCIDENTS, rnd.randint(2, 3))
+            if rnd.random() < 0.02:
+                sentences.append(rnd.choice(RARE_INCIDENTS))
+            report['description'] = '；'.join(sentences) + '。'
+
+
+def scan(results, phrase, horse_id=None):
+    """逐条扫描事件描述"""
+    return [report for result in results for report in result['incident_reports']
+            if phrase in report['description'] and (horse_id is None or report['horse_id'] == horse_id)]
+
+
+def best_of(function, repeat: int = 3) -> float:
+    """多次运行取最短耗时"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    results = build_results(count)
+    add_descriptions(results)
+    horse_id = results[0]['incident_reports'][0]['horse_id']
+
+    start = time.perf_counter()
+    index = IncidentIndex()
+    index.add_race_results(results)
+    print(f"比赛: {len(results)} 场, 事件: {len(index)} 条, 建立索引: {time.perf_counter() - start:.2f} 秒")
+
+    for phrase in QUERIES:
+        found = index.search(phrase)
+        assert len(found) == len(scan(results, phrase))
+        scan_seconds = best_of(lambda: scan(results, phrase))
+        index_seconds = best_of(lambda: index.search(phrase))
+        print(f"'{phrase}' {len(found)} 条: 扫描 {scan_seconds * 1000:.1f} 毫秒, 索引 {index_seconds * 1000:.2f} 毫秒")
+
+    found = index.search('受阻', horse_id=horse_id)
+    assert len(found) == len(scan(results, '受阻', horse_id))
+    scan_seconds = best_of(lambda: scan(results, '受阻', horse_id))
+    index_seconds = best_of(lambda: index.search('受阻', horse_id=horse_id))
+    print(f"'受阻' {horse_id} {len(found)} 条: 扫描 {scan_seconds * 1000:.1f} 毫秒, 索引 {index_seconds * 1000:.2f} 毫秒")
+
+
+if __name__ == '__main__':
+    main()
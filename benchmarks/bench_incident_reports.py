@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+事件报告提取基准测试
+对比按标题定位的提取方法与旧版扫描所有表格的方法
+
+使用方法:
+    python benchmarks/bench_incident_reports.py [保存的赛果页面.html ...]
+"""
+
+import sys
+import os
+import timeit
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+from hkjc_scrapers import RaceResultScraper
+from pages import build_result_page, pages_or_default
+
+
+def main():
+    """主函数"""
+    pages = pages_or_default(sys.argv[1:], build_result_page)
+    soups = [BeautifulSoup(page, 'html.parser') for page in pages]
+    scraper = RaceResultScraper()
+
+    methods = {
+        '旧版（扫描所有表格）': scraper._extract_incident_reports_legacy,
+        '按标题定位': scraper._extract_incident_reports,
+    }
+
+    print(f"页面数量: {len(soups)}")
+    for name, method in methods.items():
+        rows = sum(len(method(soup)) for soup in soups)
+        number = 20
+        seconds = timeit.timeit(lambda: [method(soup) for soup in soups], number=number)
+        per_page = seconds / (number * len(soups)) * 1000
+        print(f"{name}: 每页 {per_page:.3f} ms, 共提取 {rows} 行")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字符串驻留基准测试
+分别在子进程中以普通模式和驻留模式解析大量马匹页面并保留全部赛绩，比较进程的峰值内存（RSS）
+
+使用方法:
+    python benchmarks/bench_interning.py [马匹页面数量]
+"""
+
+import sys
+import os
+import resource
+import subprocess
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(pages: int, intern_strings: bool):
+    """在当前进程中解析pages个马匹页面，输出峰值内存（KB）"""
+    from bs4 import BeautifulSoup
+    from hkjc_scrapers import HorseInfoScraper
+    from hkjc_scrapers.interning import pool_size
+    from pages import build_horse_page
+
+    scraper = HorseInfoScraper(intern_strings=intern_strings)
+    horses = []
+    for seed in range(pages):
+        soup = BeautifulSoup(build_horse_page(seed=seed), 'html.parser')
+        horses.append({
+            'basic_info': scraper._extract_basic_info(soup),
+            'race_records': scraper._extract_race_records(soup),
+        })
+
+    records = sum(len(horse['race_records']) for horse in horses)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f'{records} {peak_kb} {pool_size()}')
+
+
+def main():
+    """主函数"""
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        run(int(sys.argv[2]), sys.argv[3] == 'intern')
+        return
+
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    results = {}
+    for mode in ('plain', 'intern'):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', str(pages), mode],
+                                capture_output=True, text=True, check=True).stdout
+        records, peak_kb, pool = (int(value) for value in output.split())
+        results[mode] = peak_kb
+        print(f'{mode}: {pages} 个页面, {records} 条赛绩, 峰值内存 {peak_kb / 1024:.1f} MB, 驻留池 {pool} 个字符串')
+
+    print(f'驻留后峰值内存为普通模式的 {results["intern"] / results["plain"]:.0%}')
+
+
+if __name__ == '__main__':
+    main()
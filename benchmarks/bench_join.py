@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关联基准测试
+比较嵌套循环与哈希表关联参赛马匹、马匹资料和赛绩记录的耗时
+
+使用方法:
+    python benchmarks/bench_join.py [比赛数量]
+"""
+
+import sys
+import os
+import time
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers.join import join_runners
+from hkjc_scrapers.utils import parse_race_date, venue_code
+from bench_sqlite_store import build_horses, build_results
+
+
+def nested_loop(results, horses):
+    """嵌套循环：每匹参赛马匹扫描马匹列表和该马的赛绩"""
+    rows = []
+    for result in results:
+        race_date = parse_race_date(result['race_date'])
+        for runner in result['horses']:
+            row = dict(runner, basic_info=None, race_record=None)
+            for horse in horses:
+                if horse['horse_id'] == runner['horse_id']:
+                    row['basic_info'] = horse['basic_info']
+                    for record in horse['race_records']:
+                        if parse_race_date(record['date']) == race_date and \
+                                venue_code(record['venue']) == result['racecourse']:
+                            row['race_record'] = record
+                            break
+                    break
+            rows.append(row)
+    return rows
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    results = build_results(count)
+    horses = build_horses(results)
+    print(f"参赛马匹: {sum(len(r['horses']) for r in results)} 匹, 马匹: {len(horses)} 匹, "
+          f"赛绩: {sum(len(h['race_records']) for h in horses)} 条")
+
+    start = time.perf_counter()
+    expected = nested_loop(results, horses)
+    print(f"嵌套循环: {time.perf_counter() - start:.2f} 秒")
+
+    start = time.perf_counter()
+    rows, report = join_runners(results, horses)
+    print(f"哈希关联: {time.perf_counter() - start:.2f} 秒, 关联到赛绩 {report['matched_records']} 匹")
+    assert [row['race_record'] for row in rows] == [row['race_record'] for row in expected]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按需解析基准测试
+比较提取全部部分与只读取常用部分（比赛结果的horses、马匹信息的basic_info）的每页耗时
+
+使用方法:
+    python benchmarks/bench_lazy.py [页面数量]
+"""
+
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers import HorseInfoScraper, RaceResultScraper
+from pages import build_horse_page, build_result_page
+
+RESULT_URL = 'https://racing.hkjc.com/zh-hk/local/information/localresults?racedate=2026/01/18&Racecourse=ST&RaceNo=3'
+HORSE_URL = 'https://racing.hkjc.com/zh-hk/local/information/horse?horseid=HK_2023_J256'
+
+
+class LocalSession:
+    """依次返回本地生成页面的会话（代替requests.Session，不访问网络）"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.next = 0
+
+    def get(self, url, timeout=None):
+        text = self.pages[self.next % len(self.pages)]
+        self.next += 1
+        return SimpleNamespace(text=text, encoding=None, raise_for_status=lambda: None)
+
+
+def timed(scraper, scrape, pages, read) -> float:
+    """每页的平均耗时（毫秒）"""
+    scraper.session = LocalSession(pages)
+    start = time.perf_counter()
+    for _ in pages:
+        read(scrape())
+    return (time.perf_counter() - start) / len(pages) * 1000
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    result_pages = [build_result_page(seed=seed) for seed in range(count)]
+    horse_pages = [build_horse_page(seed=seed) for seed in range(count)]
+    print(f"页面数量: 比赛结果 {count} 个, 马匹信息 {count} 个")
+
+    scraper = RaceResultScraper()
+    cases = {
+        '全部提取': lambda: scraper.scrape_race_result(RESULT_URL),
+        'lazy=True，只读取horses': lambda: scraper.scrape_race_result(RESULT_URL, lazy=True),
+        "sections=['horses']": lambda: scraper.scrape_race_result(RESULT_URL, sections=['horses']),
+    }
+    for name, scrape in cases.items():
+        print(f"比赛结果 {name}: {timed(scraper, scrape, result_pages, lambda r: r['horses']):.2f} 毫秒/页")
+
+    scraper = HorseInfoScraper()
+    cases = {
+        '全部提取': lambda: scraper.scrape_horse_info(HORSE_URL),
+        'lazy=True，只读取basic_info': lambda: scraper.scrape_horse_info(HORSE_URL, lazy=True),
+        "sections=['basic_info']": lambda: scraper.scrape_horse_info(HORSE_URL, sections=['basic_info']),
+    }
+    for name, scrape in cases.items():
+        print(f"马匹信息 {name}: {timed(scraper, scrape, horse_pages, lambda r: r['basic_info']):.2f} 毫秒/页")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+类型转换基准测试
+比较逐行解析（utils.parse_*）与按列向量化转换（normalize）一批参赛马匹的耗时
+
+使用方法:
+    python benchmarks/bench_normalize.py [比赛数量]
+"""
+
+import sys
+import os
+import time
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers.normalize import normalize_runners
+from hkjc_scrapers.utils import _parse_finish_time_text, parse_float, parse_int
+from bench_sqlite_store import build_results
+
+
+def per_row(rows):
+    """逐行解析"""
+    columns = {name: [] for name in ('position', 'number', 'draw', 'weight', 'odds', 'finish_time')}
+    for row in rows:
+        columns['position'].append(parse_int(row.get('position')))
+        columns['number'].append(parse_int(row.get('number')))
+        columns['draw'].append(parse_int(row.get('draw')))
+        columns['weight'].append(parse_int(row.get('weight')))
+        columns['odds'].append(parse_float(row.get('odds')))
+        # 完成时间的结果缓存会掩盖逐行解析的成本，这里直接调用未缓存的实现
+        columns['finish_time'].append(_parse_finish_time_text.__wrapped__(row.get('完成時間') or ''))
+    return columns
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rows = [horse for result in build_results(count) for horse in result['horses']]
+    print(f"参赛马匹: {len(rows)} 行")
+
+    for name, function in (('逐行解析', per_row), ('向量化转换', normalize_runners)):
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            function(rows)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name}: {best:.3f} 秒, {len(rows) / best:,.0f} 行/秒")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parquet导出基准测试
+比较从JSON Lines和从Parquet数据集加载一个马季参赛马匹的耗时
+
+使用方法:
+    python benchmarks/bench_parquet.py [比赛数量]
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers.columnar import ColumnBuffer, ParquetExporter, read_dataset
+from hkjc_scrapers.jsonl import JsonLinesWriter, iter_json_lines
+from hkjc_scrapers.utils import season_of
+from bench_sqlite_store import build_results
+
+
+def timed(function):
+    """返回(结果, 秒数)"""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    results = build_results(count)
+    season = season_of(results[len(results) // 2]['race_date'])
+
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl_path = os.path.join(directory, 'results.jsonl')
+        root = os.path.join(directory, 'runners')
+
+        _, seconds = timed(lambda: _write_jsonl(jsonl_path, results))
+        print(f"写入JSON Lines: {count} 场, {seconds:.2f} 秒, {os.path.getsize(jsonl_path) / 1024 / 1024:.1f} MB")
+
+        def write_parquet():
+            with ParquetExporter(root, kind='runners') as exporter:
+                for result in results:
+                    exporter.add_race_result(result)
+            return exporter.rows_written
+
+        rows, seconds = timed(write_parquet)
+        size = sum(os.path.getsize(os.path.join(path, name))
+                   for path, _, names in os.walk(root) for name in names)
+        print(f"写入Parquet: {rows} 行, {seconds:.2f} 秒, {size / 1024 / 1024:.1f} MB")
+
+        def load_jsonl():
+            buffer = ColumnBuffer('runners')
+            for result in iter_json_lines(jsonl_path):
+                if season_of(result['race_date']) != season:
+                    continue
+                for horse in result['horses']:
+                    buffer.append(horse, race_date=result['race_date'], race_no=result['race_no'],
+                                  venue=result['racecourse'])
+            return buffer.to_table()
+
+        table, seconds = timed(load_jsonl)
+        print(f"从JSON Lines加载马季 {season}: {table.num_rows} 行, {seconds:.3f} 秒")
+
+        table, seconds = timed(lambda: read_dataset(root, season=season))
+        print(f"从Parquet加载马季 {season}（全部列）: {table.num_rows} 行, {seconds:.3f} 秒")
+
+        columns = ['race_date', 'horse_id', 'jockey', 'position', 'finish_time']
+        table, seconds = timed(lambda: read_dataset(root, columns=columns, season=season))
+        print(f"从Parquet加载马季 {season}（{len(columns)} 列）: {table.num_rows} 行, {seconds:.3f} 秒")
+
+
+def _write_jsonl(path, results):
+    """写入JSON Lines"""
+    with JsonLinesWriter(path) as writer:
+        writer.write_many(results)
+
+
+if __name__ == '__main__':
+    main()
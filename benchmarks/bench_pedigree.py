@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+血统关系图基准测试
+比较扫描马匹列表与PedigreeGraph回答血统查询的耗时
+
+使用方法:
+    python benchmarks/bench_pedigree.py [马匹数量]
+"""
+
+import sys
+import os
+import random
+import time
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers.form_index import FormIndex
+from hkjc_scrapers.pedigree import PedigreeGraph
+from bench_form_index import build_horses
+
+QUERIES = 200
+
+
+def add_pedigree(horses, seed: int = 0):
+    """为马匹加上血统（约150匹种公马，每匹母马约3匹后代）"""
+    rnd = random.Random(seed)
+    sires = [f'Sire {i}' for i in range(150)]
+    dams = [f'Dam {i}' for i in range(max(1, len(horses) // 3))]
+    dam_sires = {dam: rnd.choice(sires) for dam in dams}
+    for i, horse in enumerate(horses):
+        dam = rnd.choice(dams)
+        horse['basic_info'] = {'horse_name': f'馬{i}', 'sire': rnd.choice(sires), 'dam': dam,
+                               'maternal_grandsire': dam_sires[dam]}
+    return sires
+
+
+def scan_runs_by_sire(horses, sire, min_distance):
+    """扫描：某父系后代在某途程以上的赛绩"""
+    return [(h['horse_id'], r) for h in horses if h['basic_info']['sire'] == sire
+            for r in h['race_records'] if int(r['distance']) >= min_distance]
+
+
+def scan_siblings(horses, horse):
+    """扫描：同母的兄弟姊妹"""
+    dam = horse['basic_info']['dam']
+    return [h['horse_id'] for h in horses if h['basic_info']['dam'] == dam and h is not horse]
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    horses = build_horses(count)
+    sires = add_pedigree(horses)
+    rnd = random.Random(1)
+    sire_queries = [rnd.choice(sires) for _ in range(QUERIES)]
+    horse_queries = [rnd.choice(horses) for _ in range(QUERIES)]
+    print(f"马匹: {len(horses)} 匹, 查询: 各 {QUERIES} 次")
+
+    start = time.perf_counter()
+    graph = PedigreeGraph()
+    graph.add_horses(horses)
+    index = FormIndex()
+    index.add_horses(horses)
+    print(f"建立关系图和往绩索引: {time.perf_counter() - start:.2f} 秒")
+
+    start = time.perf_counter()
+    expected = [scan_runs_by_sire(horses, sire, 1800) for sire in sire_queries]
+    print(f"扫描 父系后代1800米以上赛绩: {time.perf_counter() - start:.3f} 秒")
+    start = time.perf_counter()
+    runs = [graph.runs_by_sire(sire, index, min_distance=1800) for sire in sire_queries]
+    print(f"关系图 父系后代1800米以上赛绩: {time.perf_counter() - start:.3f} 秒")
+    assert [len(r) for r in runs] == [len(r) for r in expected]
+
+    start = time.perf_counter()
+    expected = [scan_siblings(horses, horse) for horse in horse_queries]
+    print(f"扫描 同母兄弟姊妹: {time.perf_counter() - start:.3f} 秒")
+    start = time.perf_counter()
+    siblings = [graph.siblings(horse['horse_id']) for horse in horse_queries]
+    print(f"关系图 同母兄弟姊妹: {time.perf_counter() - start:.4f} 秒")
+    assert siblings == expected
+
+
+if __name__ == '__main__':
+    main()
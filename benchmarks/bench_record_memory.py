@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+记录内存占用基准测试
+对比普通字典与__slots__记录保存赛绩、参赛马匹和赛马日时的内存占用
+
+使用方法:
+    python benchmarks/bench_record_memory.py [保存的马匹页面.html ...]
+"""
+
+import sys
+import os
+import copy
+import tracemalloc
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+from hkjc_scrapers import HorseInfoScraper, RaceResultScraper, RaceScheduleScraper
+from hkjc_scrapers.records import Runner, RaceRecord, RaceDay
+from pages import build_horse_page, build_result_page, build_fixture_page, pages_or_default
+
+
+def measure(build):
+    """测量build()返回的对象占用的内存（字节）"""
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    data = build()
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, 'filename'))
+    return data, size
+
+
+def compare(name, rows, record_type, copies):
+    """复制rows直到copies条，分别以字典和记录保存，比较内存占用（两种方式都深拷贝，字符串共享）"""
+    def as_dicts():
+        return [copy.deepcopy(rows[i % len(rows)]) for i in range(copies)]
+
+    def as_records():
+        return [record_type.from_dict(copy.deepcopy(rows[i % len(rows)])) for i in range(copies)]
+
+    _, dict_size = measure(as_dicts)
+    _, record_size = measure(as_records)
+    print(f"{name}: {copies} 条")
+    print(f"  字典: {dict_size / copies:.0f} 字节/条")
+    print(f"  记录: {record_size / copies:.0f} 字节/条 ({record_size / dict_size:.0%})")
+
+
+def main():
+    """主函数"""
+    copies = 100000
+
+    horse_pages = pages_or_default(sys.argv[1:], build_horse_page)
+    horse_scraper = HorseInfoScraper()
+    race_records = []
+    for page in horse_pages:
+        race_records.extend(horse_scraper._extract_race_records(BeautifulSoup(page, 'html.parser')))
+
+    # 只比较成绩表中的参赛马匹行
+    result_table = BeautifulSoup(build_result_page(seed=0), 'html.parser').find('table', class_='performance')
+    runners = RaceResultScraper()._extract_horse_info(BeautifulSoup(str(result_table), 'html.parser'))
+    race_days = RaceScheduleScraper()._extract_race_days(BeautifulSoup(build_fixture_page(seed=0), 'html.parser'))
+
+    compare('赛绩记录 RaceRecord', race_records, RaceRecord, copies)
+    compare('参赛马匹 Runner', runners, Runner, copies)
+    compare('赛马日 RaceDay', race_days, RaceDay, copies // 10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+赛程表索引基准测试
+比较逐个扫描race_days与ScheduleIndex回答调度程序常见查询的耗时：
+某场地某日之后的下一个赛马日、日期范围内的一级赛、某途程的全天候跑道比赛
+
+使用方法:
+    python benchmarks/bench_schedule_index.py [马季数量]
+"""
+
+import sys
+import os
+import random
+import time
+from datetime import date, timedelta
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.race_schedule_scraper import RaceScheduleScraper
+from hkjc_scrapers.schedule_index import ScheduleIndex
+
+CHINESE_MONTHS = ['一月', '二月', '三月', '四月', '五月', '六月', '七月', '八月', '九月', '十月', '十一月', '十二月']
+CLASS_NAMES = ['第一班', '第二班', '第三班', '第四班', '第五班']
+
+
+def build_race_days(seasons: int, seed: int = 0):
+    """生成seasons个马季的赛马日（每季约88个，每天8-11场）"""
+    rnd = random.Random(seed)
+    race_days = []
+    day = date(2000, 9, 1)
+    while len(race_days) < seasons * 88:
+        day += timedelta(days=rnd.choice([3, 4]))
+        venue = rnd.choice(['沙田', '跑马地'])
+        races = [{
+            'race_number': number,
+            'class': rnd.choice(CLASS_NAMES),
+            'grade': '一级赛' if rnd.random() < 0.02 else None,
+            'track_type': '全天候跑道' if venue == '沙田' and rnd.random() < 0.2 else '草地',
+            'distance_meters': rnd.choice([1000, 1200, 1400, 1600, 1650, 1800, 2000]),
+        } for number in range(1, rnd.randint(8, 11) + 1)]
+        race_days.append({
+            'date': day.isoformat(), 'day': day.day, 'month': CHINESE_MONTHS[day.month - 1],
+            'year': str(day.year), 'venues': [venue], 'race_types': ['夜赛' if venue == '跑马地' else '日赛'],
+            'races': races,
+        })
+    return race_days
+
+
+def scan_next_race_day(race_days, after, venue):
+    """逐个扫描：下一个赛马日"""
+    candidates = [day for day in race_days if day['date'] > after and venue in day['venues']]
+    return min(candidates, key=lambda day: day['date']) if candidates else None
+
+
+def scan_races(race_days, date_from=None, date_to=None, grade=None, track_type=None, distance=None):
+    """逐个扫描：按条件查找比赛"""
+    return [(day, race) for day in race_days
+            if (date_from is None or day['date'] >= date_from) and (date_to is None or day['date'] <= date_to)
+            for race in day['races']
+            if (grade is None or race['grade'] == grade) and (track_type is None or race['track_type'] == track_type)
+            and (distance is None or race['distance_meters'] == distance)]
+
+
+def main():
+    """主函数"""
+    seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    race_days = build_race_days(seasons)
+    schedule = {'race_days': race_days}
+    print(f"赛马日: {len(race_days)} 个, 比赛: {sum(len(day['races']) for day in race_days)} 场")
+
+    rnd = random.Random(1)
+    queries = []
+    for _ in range(2000):
+        anchor = rnd.choice(race_days)['date']
+        end = (date.fromisoformat(anchor) + timedelta(days=120)).isoformat()
+        queries.append((anchor, end, rnd.choice(['沙田', '跑马地'])))
+
+    start = time.perf_counter()
+    index = ScheduleIndex(schedule)
+    print(f"建立索引: {(time.perf_counter() - start) * 1000:.1f} 毫秒")
+
+    scraper = RaceScheduleScraper()
+    cases = [
+        ('下一个赛马日（按场地）',
+         lambda q: scan_next_race_day(race_days, q[0], q[2]),
+         lambda q: index.next_race_day(q[0], venue=q[2])),
+        ('日期范围内的一级赛',
+         lambda q: scan_races(race_days, q[0], q[1], grade='一级赛'),
+         lambda q: index.races(q[0], q[1], grade='一级赛')),
+        ('1200米全天候跑道比赛',
+         lambda q: scan_races(race_days, track_type='全天候跑道', distance=1200),
+         lambda q: index.races(track_type='全天候跑道', distance=1200)),
+        ('按月份筛选赛马日',
+         lambda q: scraper.get_race_days_by_month(schedule, '一月'),
+         lambda q: scraper.get_race_days_by_month(index, '一月')),
+    ]
+    for name, scan, indexed in cases:
+        assert len(scan(queries[0]) or []) == len(indexed(queries[0]) or [])
+        timings = []
+        for function in (scan, indexed):
+            start = time.perf_counter()
+            for query in queries:
+                function(query)
+            timings.append((time.perf_counter() - start) / len(queries) * 1e6)
+        print(f"{name}: 扫描 {timings[0]:.1f} 微秒, 索引 {timings[1]:.1f} 微秒")
+
+
+if __name__ == '__main__':
+    main()
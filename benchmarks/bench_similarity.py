@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+马匹近况相似度基准测试
+比较逐匹马计算余弦相似度后排序与矩阵乘法加argpartition查询前k名的耗时
+
+使用方法:
+    python benchmarks/bench_similarity.py [马匹数量]
+"""
+
+import sys
+import os
+import math
+import random
+import time
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers.similarity import FormSimilarity
+from bench_form_index import build_horses
+
+K = 10
+QUERIES = 20
+
+
+def add_ratings_and_margins(horses, seed: int = 0):
+    """为赛绩加上评分和头马距离"""
+    rnd = random.Random(seed)
+    margins = ['---', '頸位', '短馬頭位', '1/2', '3/4', '1-1/4', '2', '3-1/2', '6', '10']
+    for horse in horses:
+        for record in horse['race_records']:
+            record['rating'] = str(rnd.randint(20, 120))
+            record['margin'] = rnd.choice(margins)
+
+
+def loop_top_k(index, vectors, horse_id, k):
+    """逐匹马计算余弦相似度后排序（vectors为各行的列表）"""
+    query = vectors[index.rows[horse_id]]
+    query_norm = math.sqrt(sum(x * x for x in query))
+    scores = []
+    for other, vector in zip(index.horse_ids, vectors):
+        if other == horse_id:
+            continue
+        norm = math.sqrt(sum(x * x for x in vector))
+        scores.append((sum(a * b for a, b in zip(query, vector)) / (query_norm * norm), other))
+    scores.sort(reverse=True)
+    return [other for _, other in scores[:k]]
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    horses = build_horses(count)
+    add_ratings_and_margins(horses)
+
+    start = time.perf_counter()
+    index = FormSimilarity()
+    index.add_horses(horses)
+    print(f"马匹: {len(index)} 匹, 向量长度: {index.dims}, 建立矩阵: {time.perf_counter() - start:.2f} 秒")
+
+    queries = [horse['horse_id'] for horse in random.Random(1).sample(horses, QUERIES)]
+
+    vectors = [row.tolist() for row in index.matrix]
+    start = time.perf_counter()
+    expected = [loop_top_k(index, vectors, horse_id, K) for horse_id in queries[:3]]
+    print(f"逐匹马循环: 每次查询 {(time.perf_counter() - start) / 3 * 1000:.1f} 毫秒")
+
+    start = time.perf_counter()
+    found = [index.similar(horse_id, k=K) for horse_id in queries]
+    print(f"矩阵查询: 每次查询 {(time.perf_counter() - start) / QUERIES * 1000:.2f} 毫秒")
+    # float32与float64的舍入可能使相似度相同的马匹次序不同，只比较前几名的集合
+    for ids, expected_ids in zip(found, expected):
+        assert len(set(horse_id for horse_id, _ in ids[:5]) & set(expected_ids)) >= 4
+
+    start = time.perf_counter()
+    index.similar_many(queries, k=K)
+    print(f"批量矩阵查询: 每次查询 {(time.perf_counter() - start) / QUERIES * 1000:.2f} 毫秒")
+
+    start = time.perf_counter()
+    for horse in horses[:QUERIES]:
+        index.add_horse(horse)
+    print(f"重新加入一匹马: {(time.perf_counter() - start) / QUERIES * 1000:.2f} 毫秒")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite存储基准测试
+测量比赛结果和马匹赛绩的写入速度（行/秒）以及常用查询的耗时
+
+使用方法:
+    python benchmarks/bench_sqlite_store.py [比赛数量]
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+import timeit
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers.sqlite_store import SQLiteStore
+from pages import CLASSES, INCIDENTS, JOCKEYS, TRAINERS, VENUES
+
+
+def build_results(count: int, seed: int = 0):
+    """生成count场比赛结果（每场14匹马）"""
+    rnd = random.Random(seed)
+    horse_ids = [f'HK_2022_H{i:03d}' for i in range(1500)]
+    results = []
+    for i in range(count):
+        day = i // 10
+        horses = []
+        for position, horse_id in enumerate(rnd.sample(horse_ids, 14), start=1):
+            horses.append({
+                'horse_id': horse_id, 'horse_name': f'模擬馬{horse_id[-3:]}', 'position': str(position),
+                'number': str(rnd.randint(1, 14)), 'jockey': rnd.choice(JOCKEYS), 'trainer': rnd.choice(TRAINERS),
+                'draw': str(rnd.randint(1, 14)), 'weight': str(rnd.randint(1000, 1250)),
+                'odds': str(rnd.randint(20, 990) / 10), '完成時間': f'1:{rnd.randint(8, 12):02d}.{rnd.randint(10, 99)}',
+            })
+        results.append({
+            'race_date': f'{2020 + day // 88}/{day % 88 // 8 + 1:02d}/{day % 8 * 3 + 1:02d}',
+            'racecourse': 'ST' if day % 2 else 'HV',
+            'race_no': str(i % 10 + 1),
+            'race_info': {'class': rnd.choice(CLASSES)},
+            'horses': horses,
+            'race_result': {},
+            'incident_reports': [{'position': h['position'], 'horse_id': h['horse_id'],
+                                  'description': rnd.choice(INCIDENTS)} for h in horses[:5]],
+            'pedigree': {},
+        })
+    return results
+
+
+def build_horses(results):
+    """从比赛结果生成马匹赛绩"""
+    horses = {}
+    for result in results:
+        day, month, year = result['race_date'][8:], result['race_date'][5:7], result['race_date'][2:4]
+        for horse in result['horses']:
+            record = horses.setdefault(horse['horse_id'], {'horse_id': horse['horse_id'], 'basic_info': {},
+                                                             'race_records': []})
+            record['race_records'].append({
+                'date': f'{day}/{month}/{year}', 'venue': VENUES[result['racecourse'] == 'HV'],
+                'position': horse['position'], 'jockey': horse['jockey'], 'trainer': horse['trainer'],
+                'class': result['race_info']['class'], 'finish_time': horse['完成時間'],
+            })
+    return list(horses.values())
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    results = build_results(count)
+    horses = build_horses(results)
+
+    with tempfile.TemporaryDirectory() as directory:
+        with SQLiteStore(os.path.join(directory, 'hkjc.db')) as store:
+            rows = sum(len(r['horses']) + len(r['incident_reports']) + 2 for r in results)
+            start = time.perf_counter()
+            store.add_race_results(results)
+            seconds = time.perf_counter() - start
+            print(f"比赛结果: {count} 场, {rows} 行, {seconds:.2f} 秒, {rows / seconds:,.0f} 行/秒")
+
+            rows = sum(len(h['race_records']) + 1 for h in horses)
+            start = time.perf_counter()
+            store.add_horses(horses)
+            seconds = time.perf_counter() - start
+            print(f"马匹赛绩: {len(horses)} 匹, {rows} 行, {seconds:.2f} 秒, {rows / seconds:,.0f} 行/秒")
+
+            queries = {
+                '按马匹查赛绩': lambda: store.runs_by_horse('HK_2022_H042'),
+                '按马匹查出赛': lambda: store.runners_by_horse('HK_2022_H042'),
+                '按骑师查一个月': lambda: store.runners_by_jockey('潘頓', '2021-03-01', '2021-03-31'),
+                '按练马师查一个月': lambda: store.runners_by_trainer('蔡約翰', '2021-03-01', '2021-03-31'),
+                '按日期查比赛': lambda: store.races_on('2021-03-04'),
+            }
+            for name, query in queries.items():
+                number = 50
+                per_query = timeit.timeit(query, number=number) / number * 1000
+                print(f"{name}: {per_query:.2f} ms ({len(query())} 行)")
+
+
+if __name__ == '__main__':
+    main()
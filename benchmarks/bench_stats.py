@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+骑师、练马师统计基准测试
+比较每次赛马日后从头重新统计全部赛果与增量加入一个赛马日（10场）的耗时，
+以及统计文件的保存、载入耗时
+
+使用方法:
+    python benchmarks/bench_stats.py [比赛数量]
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers.stats import RunningStats
+from bench_sqlite_store import build_results
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    results = build_results(count)
+    history, meeting = results[:-10], results[-10:]
+    print(f"比赛: {len(results)} 场, 参赛马匹: {sum(len(r['horses']) for r in results)} 匹")
+
+    start = time.perf_counter()
+    stats = RunningStats()
+    stats.add_race_results(results)
+    print(f"从头统计: {time.perf_counter() - start:.2f} 秒")
+
+    stats = RunningStats()
+    stats.add_race_results(history)
+    start = time.perf_counter()
+    stats.add_race_results(meeting)
+    print(f"增量加入一个赛马日: {(time.perf_counter() - start) * 1000:.2f} 毫秒")
+
+    start = time.perf_counter()
+    changed = stats.add_race_results(meeting)
+    print(f"重复加入同一赛马日: {(time.perf_counter() - start) * 1000:.2f} 毫秒, 变化 {changed} 场")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'stats.json')
+        start = time.perf_counter()
+        stats.save(filename)
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        RunningStats.load(filename)
+        loaded = time.perf_counter() - start
+        size = os.path.getsize(filename) / 1024 / 1024
+        print(f"保存: {saved:.2f} 秒, 载入: {loaded:.2f} 秒, 文件 {size:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式下载基准测试
+比较完整下载后解析与流式下载（读到所选部分即停止）的读取字节数和每页耗时。
+页面末尾加上约200KB的脚本和页脚（与真实赛果页面相近），下载按指定带宽模拟。
+
+使用方法:
+    python benchmarks/bench_streaming.py [页面数量] [带宽MB/s]
+"""
+
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hkjc_scrapers import RaceResultScraper
+from pages import build_result_page
+
+RESULT_URL = 'https://racing.hkjc.com/zh-hk/local/information/localresults?racedate=2026/01/18&Racecourse=ST&RaceNo=3'
+FOOTER = '<script>' + 'var tracking = {"id": 1, "name": "footer"};\n' * 4500 + '</script>'
+
+
+class SimulatedSession:
+    """按带宽模拟下载本地生成页面的会话（代替requests.Session，不访问网络）"""
+
+    def __init__(self, pages, bandwidth: float):
+        self.pages = [page.replace('</body>', FOOTER + '</body>').encode('utf-8') for page in pages]
+        self.bandwidth = bandwidth
+        self.next = 0
+        self.bytes_read = 0
+
+    def _download(self, size: int):
+        self.bytes_read += size
+        time.sleep(size / self.bandwidth)
+
+    def get(self, url, timeout=None, stream=False):
+        data = self.pages[self.next % len(self.pages)]
+        self.next += 1
+        if not stream:
+            self._download(len(data))
+            return SimpleNamespace(text=data.decode('utf-8'), encoding=None, raise_for_status=lambda: None)
+
+        def iter_content(chunk_size):
+            for start in range(0, len(data), chunk_size):
+                chunk = data[start:start + chunk_size]
+                self._download(len(chunk))
+                yield chunk
+
+        return SimpleNamespace(iter_content=iter_content, headers={'Content-Length': str(len(data))},
+                               raise_for_status=lambda: None, close=lambda: None)
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    bandwidth = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    pages = [build_result_page(seed=seed) for seed in range(count)]
+    print(f"页面数量: {count}, 模拟带宽: {bandwidth} MB/s")
+
+    cases = {
+        '完整下载': {},
+        "完整下载，sections=['horses']": {'sections': ['horses']},
+        '流式下载，全部部分': {'stream': True},
+        "流式下载，sections=['horses']": {'stream': True, 'sections': ['horses']},
+    }
+    expected = None
+    for name, options in cases.items():
+        scraper = RaceResultScraper()
+        session = scraper.session = SimulatedSession(pages, bandwidth * 1024 * 1024)
+        start = time.perf_counter()
+        horses = [scraper.scrape_race_result(RESULT_URL, **options)['horses'] for _ in pages]
+        seconds = time.perf_counter() - start
+        expected = expected or horses
+        assert horses == expected
+        print(f"{name}: {session.bytes_read / count / 1024:.0f} KB/页, {seconds / count * 1000:.1f} 毫秒/页")
+
+
+if __name__ == '__main__':
+    main()
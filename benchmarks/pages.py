@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试用页面
+读取抓取保存的HTML页面；没有保存页面时，生成结构接近真实页面的模拟HTML
+"""
+
+import os
+import random
+from typing import List, Optional
+
+
+JOCKEYS = ['潘頓', '莫雷拉', '布文', '田泰安', '何澤堯', '周俊樂', '巴度', '艾道拿', '霍宏聲', '鍾易禮']
+TRAINERS = ['蔡約翰', '方嘉柏', '姚本輝', '呂健威', '沈集成', '告東尼', '大衛希斯', '葉楚航']
+VENUES = ['沙田', '跑馬地']
+CLASSES = ['第一班', '第二班', '第三班', '第四班', '第五班']
+INCIDENTS = ['出閘時受阻', '起步慢', '轉彎時走勢受阻', '賽後獸醫檢驗，發現流鼻血', '沿途走外疊', '末段乏力', '衝過終點後跛行']
+
+
+def load_pages(paths: List[str]) -> List[str]:
+    """读取抓取保存的HTML页面"""
+    pages = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+def _layout_header() -> str:
+    """页面头部导航（包含"報告"字样的链接，真实页面中也有）"""
+    links = ''.join(f'<td><a href="/menu{i}">賽事報告 {i}</a></td>' for i in range(30))
+    return f'<table class="nav"><tr>{links}</tr></table>'
+
+
+def _layout_footer() -> str:
+    """页面底部链接表格"""
+    rows = ''.join(
+        f'<tr><td><a href="/f{i}">連結{i}</a></td><td>說明{i}</td><td>報告{i}</td></tr>'
+        for i in range(40)
+    )
+    return f'<table class="footer">{rows}</table><script>var x = 1;</script>'
+
+
+def build_result_page(runners: int = 14, seed: Optional[int] = None) -> str:
+    """生成比赛结果页面，整个页面包在布局表格中"""
+    rnd = random.Random(seed)
+    horses = [(f'HK_2023_H{rnd.randint(100, 999)}', f'馬匹{i}') for i in range(runners)]
+
+    race_info = (
+        '<table class="race_tab">'
+        '<tr><td>第三班 - 1200米 - (80-60)</td><td>場地狀況 :</td><td>好地</td></tr>'
+        '<tr><td>賽道</td><td>草地 - "A" 賽道</td><td>HK$ 1,170,000</td></tr>'
+        '</table>'
+    )
+
+    result_rows = ''.join(
+        '<tr>'
+        f'<td>{i + 1}</td><td>{i + 1}</td>'
+        f'<td><a href="/zh-hk/local/information/horse?horseid={hid}">{name}</a></td>'
+        f'<td>{rnd.choice(JOCKEYS)}</td><td>{rnd.choice(TRAINERS)}</td>'
+        f'<td>{rnd.randint(113, 135)}</td><td>{rnd.randint(1000, 1250)}</td><td>{rnd.randint(1, 14)}</td>'
+        f'<td>{i}-1/2</td><td>3 3 {i + 1}</td><td>1:09.{rnd.randint(10, 99)}</td><td>{rnd.randint(20, 990) / 10}</td>'
+        '</tr>'
+        for i, (hid, name) in enumerate(horses)
+    )
+    result_table = (
+        '<table class="performance">'
+        '<tr><th>名次</th><th>馬號</th><th>馬名</th><th>騎師</th><th>練馬師</th><th>實際負磅</th>'
+        '<th>排位體重</th><th>檔位</th><th>頭馬距離</th><th>沿途走位</th><th>完成時間</th><th>獨贏賠率</th></tr>'
+        f'{result_rows}</table>'
+    )
+
+    incident_rows = ''.join(
+        '<tr>'
+        f'<td>{i + 1}</td><td>{i + 1}</td>'
+        f'<td><a href="/zh-hk/local/information/horse?horseid={hid}">{name}</a></td>'
+        f'<td>{rnd.choice(INCIDENTS)}；{rnd.choice(INCIDENTS)}。</td>'
+        '</tr>'
+        for i, (hid, name) in enumerate(horses)
+    )
+    incident_block = (
+        '<div class="race_entry"><div class="title">競賽事件報告</div>'
+        '<table class="table_bd">'
+        '<tr><th>名次</th><th>馬號</th><th>馬名</th><th>競賽事件</th></tr>'
+        f'{incident_rows}</table></div>'
+    )
+
+    winner_id, winner_name = horses[0]
+    pedigree = (
+        '<table class="pedigree">'
+        '<tr><th>勝出馬匹血統</th></tr>'
+        f'<tr><td><a href="/horse?horseid={winner_id}">{winner_name}</a></td>'
+        '<td>父系: Starspangledbanner</td><td>母系: Red Pixie</td></tr>'
+        '</table>'
+    )
+
+    body = race_info + result_table + incident_block + pedigree
+    return (
+        '<html><head><title>賽果</title></head><body>'
+        f'<table class="layout"><tr><td>{_layout_header()}</td></tr>'
+        f'<tr><td><h2>沙田: 第三場</h2>{body}</td></tr>'
+        f'<tr><td>{_layout_footer()}</td></tr></table>'
+        '</body></html>'
+    )
+
+
+def build_horse_page(runs: int = 40, seed: Optional[int] = None) -> str:
+    """生成马匹资料页面（赛绩由新到旧排列）"""
+    rnd = random.Random(seed)
+    code = f'H{rnd.randint(100, 999)}'
+
+    info = (
+        f'<h1>模擬馬{code} ({code})</h1>'
+        '<table>'
+        '<tr><td>出生地 / 馬齡</td><td>:</td><td>澳洲 / 5</td></tr>'
+        '<tr><td>毛色 / 性別</td><td>:</td><td>棗 / 閹</td></tr>'
+        f'<tr><td>練馬師</td><td>:</td><td><a href="/trainer">{rnd.choice(TRAINERS)}</a></td></tr>'
+        '<tr><td>父系</td><td>:</td><td>Starspangledbanner</td></tr>'
+        '<tr><td>母系</td><td>:</td><td>Red Pixie</td></tr>'
+        '<tr><td>外祖父</td><td>:</td><td>Red Ransom</td></tr>'
+        '</table>'
+    )
+
+    rows = []
+    year, month, day = 2025, 12, 28
+    for i in range(runs):
+        jockey = rnd.choice(JOCKEYS)
+        trainer = rnd.choice(TRAINERS)
+        rows.append(
+            '<tr>'
+            f'<td>{rnd.randint(100, 800)}</td><td>{rnd.randint(1, 14)}</td>'
+            f'<td>{day:02d}/{month:02d}/{year % 100:02d}</td>'
+            f'<td>{rnd.choice(VENUES)}</td><td>{rnd.choice([1000, 1200, 1400, 1650, 1800, 2000])}</td>'
+            f'<td>{rnd.choice(["好地", "好地至快", "黏地"])}</td><td>{rnd.choice(CLASSES)}</td>'
+            f'<td>{rnd.randint(1, 14)}</td><td>{rnd.randint(40, 100)}</td>'
+            f'<td><a href="/trainer?trainerid=T{TRAINERS.index(trainer)}">{trainer}</a></td>'
+            f'<td><a href="/jockey?jockeyid=J{JOCKEYS.index(jockey)}">{jockey}</a></td>'
+            f'<td>{rnd.randint(0, 10)}-1/4</td><td>{rnd.randint(20, 990) / 10}</td>'
+            f'<td>{rnd.randint(113, 135)}</td><td>1.{rnd.randint(8, 12):02d}.{rnd.randint(10, 99)}</td>'
+            f'<td>{rnd.randint(1000, 1250)}</td><td>{rnd.choice(["B", "TT", "CP", "V", "--"])}</td>'
+            '</tr>'
+        )
+        day -= rnd.randint(10, 30)
+        while day < 1:
+            day += 28
+            month -= 1
+            if month < 1:
+                month = 12
+                year -= 1
+
+    records = (
+        '<table class="bigborder">'
+        '<tr><td>場次</td><td>名次</td><td>日期</td><td>場地</td><td>距離</td><td>場地狀況</td>'
+        '<td>班次</td><td>檔位</td><td>評分</td><td>練馬師</td><td>騎師</td><td>頭馬距離</td>'
+        '<td>賠率</td><td>實際負磅</td><td>完成時間</td><td>體重</td><td>裝備</td></tr>'
+        f'{"".join(rows)}</table>'
+    )
+
+    legend = (
+        '<table><tr>'
+        '<td>B :  戴眼罩</td><td>BO :  只戴單邊眼罩</td><td>CP :  羊毛面箍</td>'
+        '</tr><tr>'
+        '<td>H :  頭罩</td><td>TT :  綁繫舌帶</td><td>V :  開縫眼罩</td>'
+        '</tr></table>'
+    )
+
+    return f'<html><body>{_layout_header()}{info}{records}{legend}{_layout_footer()}</body></html>'
+
+
+def build_fixture_page(months: int = 11, seed: Optional[int] = None) -> str:
+    """生成整季赛程表页面（每月一个日历表格）"""
+    rnd = random.Random(seed)
+    chinese_months = ['一月', '二月', '三月', '四月', '五月', '六月', '七月', '八月', '九月', '十月', '十一月', '十二月']
+    icons = {
+        '沙田': '/images/st-ch.gif', '跑馬地': '/images/hv-ch.gif',
+        '日賽': '/images/day.gif', '夜賽': '/images/night.gif',
+        '草地': '/images/turf.gif', '全天候': '/images/awt.gif',
+    }
+
+    tables = []
+    for m in range(months):
+        month_index = (8 + m) % 12
+        year = 2025 if month_index >= 8 else 2026
+        rows = []
+        day = 1
+        for _week in range(5):
+            cells = []
+            for _weekday in range(7):
+                if day > 28:
+                    cells.append('<td class="color_H">1</td>')
+                    continue
+                if rnd.random() < 0.3:
+                    venue = rnd.choice(['沙田', '跑馬地'])
+                    session = '夜賽' if venue == '跑馬地' else '日賽'
+                    track = rnd.choice(['草地', '全天候'])
+                    races = ''.join(
+                        f'<p><img src="/images/class{rnd.randint(1, 5)}.gif" alt="第{"一二三四五"[rnd.randint(0, 4)]}班">'
+                        f'{rnd.choice([1000, 1200, 1400, 1650, 1800])}({r + 1}) {rnd.randint(80, 100)}-{rnd.randint(40, 79)}</p>'
+                        for r in range(rnd.randint(8, 11))
+                    )
+                    cells.append(
+                        '<td class="calendar">'
+                        f'<p><span class="f_fl f_fs14">{day}</span>'
+                        f'<img src="{icons[venue]}" alt="{venue}"><img src="{icons[session]}" alt="{session}">'
+                        f'<img src="{icons[track]}" alt="{track}"></p>'
+                        f'{races}</td>'
+                    )
+                else:
+                    cells.append(f'<td class="font_wb">{day}</td>')
+                day += 1
+            rows.append(f'<tr>{"".join(cells)}</tr>')
+        tables.append(
+            '<table class="cal">'
+            f'<thead><tr><th colspan="7">{year}年{chinese_months[month_index]}</th></tr>'
+            '<tr><th>日</th><th>一</th><th>二</th><th>三</th><th>四</th><th>五</th><th>六</th></tr></thead>'
+            f'<tbody>{"".join(rows)}</tbody></table>'
+        )
+
+    notices = '<div><p>原定於2025年9月24日（星期三）在跑馬地馬場舉行的賽事將予取消。</p></div>'
+    return f'<html><body>{_layout_header()}{"".join(tables)}{notices}{_layout_footer()}</body></html>'
+
+
+def pages_or_default(paths: List[str], builder, count: int = 5) -> List[str]:
+    """有保存的页面就使用保存的页面，否则生成模拟页面"""
+    paths = [p for p in paths if os.path.exists(p)]
+    if paths:
+        return load_pages(paths)
+    return [builder(seed=i) for i in range(count)]
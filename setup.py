@@ -36,6 +36,13 @@ setup(
     package_dir={'': 'src'},
     python_requires='>=3.10',
     install_requires=read_requirements(),
+    extras_require={
+        'fast-json': ['orjson>=3.9', 'msgspec>=0.18'],
+        'zstd': ['zstandard>=0.22'],
+        'parquet': ['pyarrow>=14'],
+        'numpy': ['numpy>=1.24'],
+        'all': ['orjson>=3.9', 'msgspec>=0.18', 'zstandard>=0.22', 'pyarrow>=14', 'numpy>=1.24'],
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
@@ -7,17 +7,41 @@ HKJC Scrapers Package
 包含多个爬虫模块：
 - race_result_scraper: 比赛结果爬虫
 - race_schedule_scraper: 赛程表爬虫
+- schedule_index: 赛程表索引
 - horse_info_scraper: 马匹信息爬虫
+- records: 紧凑的记录类型
+- interning: 字符串驻留
+- serialization: JSON编码方式（标准库、orjson、msgspec）
+- jsonl: JSON Lines读写
+- csv_appender: 可追加的CSV写入器
+- sqlite_store: SQLite存储
+- columnar: Parquet列式导出
+- arrow_stream: Arrow IPC流输出
+- normalize: 字符串列的向量化类型转换
+- features: 往绩滚动特征
+- form_index: 马匹往绩索引
+- stats: 骑师、练马师统计
+- join: 关联比赛结果与马匹资料
+- pedigree: 血统关系图
+- incident_index: 竞赛事件报告全文索引
+- similarity: 马匹近况相似度查询
+- lazy: 按需解析的爬取结果
+- streaming: 流式读取HTML
 """
 
 from .race_result_scraper import RaceResultScraper
 from .race_schedule_scraper import RaceScheduleScraper
 from .horse_info_scraper import HorseInfoScraper
+from .records import Runner, RaceRecord, RaceDay, ScheduledRace
 
 __all__ = [
     'RaceResultScraper',
     'RaceScheduleScraper',
     'HorseInfoScraper',
+    'Runner',
+    'RaceRecord',
+    'RaceDay',
+    'ScheduledRace',
 ]
 
 __version__ = '0.1.0'
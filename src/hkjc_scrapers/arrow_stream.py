@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arrow IPC流输出（需要安装pyarrow）
+把解析出的参赛马匹或马匹赛绩每batch_size行组成一个RecordBatch，以Arrow IPC流格式写到
+标准输出、文件描述符、文件或Unix socket，下游的pandas/polars进程直接读取，不需要JSON解析。
+
+列结构与Parquet导出相同（见columnar.dataset_schema）。
+输出到标准输出时，sys.stdout在输出期间指向标准错误，爬虫打印的进度和错误信息不会混入二进制流。
+
+消费端示例:
+    python scrape.py | python -c "import sys, pyarrow as pa; print(pa.ipc.open_stream(sys.stdin.buffer).read_all())"
+"""
+
+import os
+import socket
+import sys
+from typing import BinaryIO, Iterator, Union
+
+from .columnar import ColumnSink, dataset_schema
+
+try:
+    import pyarrow as pa
+except ImportError:  # 可选依赖
+    pa = None
+
+
+Target = Union[str, int, BinaryIO, socket.socket, None]
+
+
+class _StdoutToStderr:
+    """占用标准输出期间把sys.stdout指向标准错误，close时恢复"""
+
+    def __init__(self):
+        self.stdout = sys.stdout
+        self.stdout.flush()
+        sys.stdout = sys.stderr
+
+    def close(self):
+        sys.stdout = self.stdout
+
+
+def _open_target(target: Target):
+    """
+    打开输出目标
+
+    Returns:
+        (可写的二进制流, 关闭时需要释放的对象列表)
+    """
+    if target is None or target == '-':
+        stream = sys.stdout.buffer
+        return stream, [_StdoutToStderr()]
+    if isinstance(target, socket.socket):
+        stream = target.makefile('wb')
+        return stream, [stream]
+    if isinstance(target, int):
+        stream = os.fdopen(target, 'wb', closefd=False)
+        return stream, [stream]
+    if isinstance(target, str):
+        if target.startswith('unix:'):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(target[len('unix:'):])
+            stream = sock.makefile('wb')
+            return stream, [stream, sock]
+        stream = open(target, 'wb')
+        return stream, [stream]
+    return target, []
+
+
+class ArrowStreamSink(ColumnSink):
+    """
+    Arrow IPC流输出
+
+    用法:
+        with ArrowStreamSink('unix:/tmp/hkjc.sock', kind='runners', batch_size=1000) as sink:
+            for url in urls:
+                sink.add_race_result(scraper.scrape_race_result(url))
+    """
+
+    def __init__(self, target: Target = None, kind: str = 'runners', batch_size: int = 1000):
+        """
+        Args:
+            target: 输出目标：None或'-'为标准输出（输出期间sys.stdout指向标准错误）；整数为文件描述符；'unix:/路径'为Unix socket；
+                    其他字符串为文件名；也可以传入已连接的socket或可写的二进制流
+            kind: 'runners'（参赛马匹）或'race_records'（马匹赛绩）
+            batch_size: 每个RecordBatch的行数
+        """
+        super().__init__(kind, batch_size)
+        self.schema = dataset_schema(kind)
+        self.batches_written = 0
+        self._stream, self._resources = _open_target(target)
+        try:
+            self._writer = pa.ipc.new_stream(self._stream, self.schema)
+        except Exception:
+            self._release()
+            raise
+
+    def flush(self):
+        """把缓存的行作为一个RecordBatch写出"""
+        if not self.buffer.num_rows:
+            return
+        batch = self.buffer.to_record_batch()
+        self._writer.write_batch(batch)
+        self._stream.flush()
+        self.batches_written += 1
+        self.rows_written += batch.num_rows
+        self.buffer.clear()
+
+    def close(self):
+        """写出剩余的行，写入流结束标记并关闭输出"""
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        self._stream.flush()
+        self._writer = None
+        self._release()
+
+    def _release(self):
+        """关闭打开的输出，恢复标准输出"""
+        for resource in self._resources:
+            resource.close()
+        self._resources = []
+
+
+def iter_stream_batches(source) -> Iterator:
+    """
+    逐个读取Arrow IPC流中的RecordBatch
+
+    Args:
+        source: 文件名、可读的二进制流或pyarrow缓冲区
+
+    Yields:
+        pyarrow.RecordBatch
+    """
+    if pa is None:
+        raise ImportError("读取Arrow流需要安装pyarrow: pip install pyarrow")
+    if isinstance(source, str):
+        with pa.memory_map(source, 'r') as mapped:
+            yield from pa.ipc.open_stream(mapped)
+    else:
+        yield from pa.ipc.open_stream(source)
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parquet列式导出（需要安装pyarrow）
+参赛马匹（RaceResultScraper）和马匹赛绩（HorseInfoScraper）写入按马季和场地分区的Parquet数据集：
+
+    root/season=2025-26/venue=ST/part-xxxx.parquet
+
+骑师、练马师、班次等字符串列使用字典编码，日期、磅重、名次、赔率、完成时间等转换为类型化的列。
+导出器缓存行，每积累rows_per_file行写入新的分区文件，可以边抓取边追加；
+读取时按分区筛选，只读取需要的列。
+"""
+
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .utils import parse_finish_time, parse_float, parse_int, parse_race_date, season_of, venue_code
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # 可选依赖
+    pa = None
+
+
+PARTITION_COLUMNS = ('season', 'venue')
+
+# (列名, 来源字段, 类型)
+# 类型: category（字典编码字符串）、text（字符串）、date、int16、int32、float32、time（完成时间，秒）
+RUNNER_COLUMNS: Tuple[Tuple[str, Tuple[str, ...], str], ...] = (
+    ('race_date', ('race_date',), 'date'),
+    ('race_no', ('race_no',), 'int16'),
+    ('horse_id', ('horse_id',), 'category'),
+    ('horse_name', ('horse_name',), 'category'),
+    ('number', ('number', '馬號'), 'int16'),
+    ('position', ('position',), 'int16'),
+    ('position_text', ('position',), 'category'),
+    ('jockey', ('jockey',), 'category'),
+    ('trainer', ('trainer',), 'category'),
+    ('draw', ('draw',), 'int16'),
+    ('weight', ('weight', '排位體重'), 'int16'),
+    ('actual_weight', ('實際負磅',), 'int16'),
+    ('rating', ('rating',), 'int16'),
+    ('odds', ('odds', '獨贏賠率'), 'float32'),
+    ('margin', ('頭馬距離',), 'text'),
+    ('running_position', ('沿途走位',), 'text'),
+    ('finish_time', ('完成時間', 'finish_time'), 'time'),
+)
+
+RACE_RECORD_COLUMNS: Tuple[Tuple[str, Tuple[str, ...], str], ...] = (
+    ('horse_id', ('horse_id',), 'category'),
+    ('race_date', ('date',), 'date'),
+    ('race_index', ('場次',), 'int32'),
+    ('distance', ('distance', '途程'), 'int16'),
+    ('race_class', ('class',), 'category'),
+    ('position', ('position',), 'int16'),
+    ('position_text', ('position',), 'category'),
+    ('jockey', ('jockey',), 'category'),
+    ('jockey_id', ('jockey_id',), 'category'),
+    ('trainer', ('trainer',), 'category'),
+    ('trainer_id', ('trainer_id',), 'category'),
+    ('draw', ('draw',), 'int16'),
+    ('weight', ('weight', '排位體重'), 'int16'),
+    ('actual_weight', ('實際負磅',), 'int16'),
+    ('rating', ('rating',), 'int16'),
+    ('odds', ('odds',), 'float32'),
+    ('finish_time', ('finish_time', '完成時間'), 'time'),
+    ('margin', ('margin', '頭馬距離'), 'text'),
+    ('running_position', ('沿途走位',), 'text'),
+    ('track', ('track',), 'category'),
+    ('track_condition', ('track_condition',), 'category'),
+    ('equipment', ('equipment',), 'category'),
+)
+
+DATASETS = {
+    'runners': RUNNER_COLUMNS,
+    'race_records': RACE_RECORD_COLUMNS,
+}
+
+_CONVERTERS = {
+    'category': lambda value: None if value in (None, '') else str(value),
+    'text': lambda value: None if value in (None, '') else str(value),
+    'date': parse_race_date,
+    'int16': parse_int,
+    'int32': parse_int,
+    'float32': parse_float,
+    'time': parse_finish_time,
+}
+
+
+def _require_pyarrow():
+    """检查pyarrow是否可用"""
+    if pa is None:
+        raise ImportError("Parquet导出需要安装pyarrow: pip install pyarrow")
+
+
+def _arrow_type(kind: str):
+    """列类型对应的Arrow类型"""
+    return {
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'text': pa.string(),
+        'date': pa.date32(),
+        'int16': pa.int16(),
+        'int32': pa.int32(),
+        'float32': pa.float32(),
+        'time': pa.float32(),
+    }[kind]
+
+
+def dataset_schema(kind: str):
+    """
+    数据集的Arrow结构（包含分区列）
+
+    Args:
+        kind: 'runners'或'race_records'
+    """
+    _require_pyarrow()
+    fields = [pa.field(name, _arrow_type(column_kind)) for name, _, column_kind in DATASETS[kind]]
+    fields += [pa.field(name, pa.string()) for name in PARTITION_COLUMNS]
+    return pa.schema(fields)
+
+
+def _partitioning():
+    """hive风格的分区（season=2025-26/venue=ST）"""
+    return ds.partitioning(pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor='hive')
+
+
+class ColumnBuffer:
+    """
+    按列缓存转换后的行
+
+    字段按列定义中的来源字段依次查找，取第一个非空值并转换为列类型。
+    """
+
+    def __init__(self, kind: str):
+        """
+        Args:
+            kind: 'runners'或'race_records'
+        """
+        if kind not in DATASETS:
+            raise ValueError(f"未知的数据集: {kind}，可选: {', '.join(DATASETS)}")
+        self.kind = kind
+        self.columns = DATASETS[kind]
+        self._converters = [_CONVERTERS[column_kind] for _, _, column_kind in self.columns]
+        self.clear()
+
+    def clear(self):
+        """清空缓存"""
+        self.data: Dict[str, List] = {name: [] for name, _, _ in self.columns}
+        for name in PARTITION_COLUMNS:
+            self.data[name] = []
+        self.num_rows = 0
+
+    def append(self, row: Dict, **context):
+        """
+        追加一行
+
+        Args:
+            row: 参赛马匹或赛绩记录
+            **context: 优先于行中字段的值（如race_date、race_no、horse_id），以及分区列venue
+        """
+        for (name, keys, _), convert in zip(self.columns, self._converters):
+            value = None
+            for key in keys:
+                value = context[key] if key in context else row.get(key)
+                if value not in (None, ''):
+                    break
+            self.data[name].append(convert(value))
+
+        race_date = self.data['race_date'][-1]
+        self.data['season'].append(season_of(race_date) if race_date else None)
+        self.data['venue'].append(venue_code(context.get('venue') or row.get('venue')))
+        self.num_rows += 1
+
+    def _arrays(self):
+        """各列转换为Arrow数组"""
+        _require_pyarrow()
+        schema = dataset_schema(self.kind)
+        return [pa.array(self.data[field.name], type=field.type) for field in schema], schema
+
+    def to_table(self):
+        """转换为Arrow表"""
+        arrays, schema = self._arrays()
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def to_record_batch(self):
+        """转换为Arrow RecordBatch"""
+        arrays, schema = self._arrays()
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class ColumnSink(ABC):
+    """
+    按列缓存行并分批输出的基类
+
+    子类实现flush()，把缓存的行写出后调用self.buffer.clear()。
+    """
+
+    def __init__(self, kind: str, rows_per_flush: int):
+        """
+        Args:
+            kind: 'runners'（参赛马匹）或'race_records'（马匹赛绩）
+            rows_per_flush: 缓存多少行后输出一次
+        """
+        _require_pyarrow()
+        self.kind = kind
+        self.rows_per_flush = rows_per_flush
+        self.buffer = ColumnBuffer(kind)
+        self.rows_written = 0
+
+    def add_rows(self, rows: Iterable[Dict], **context) -> int:
+        """
+        追加多行
+
+        Args:
+            rows: 参赛马匹或赛绩记录
+            **context: 每行共用的值（如race_date、race_no、venue、horse_id）
+
+        Returns:
+            追加的行数
+        """
+        count = 0
+        for row in rows:
+            self.buffer.append(row, **context)
+            count += 1
+            if self.buffer.num_rows >= self.rows_per_flush:
+                self.flush()
+        return count
+
+    def add_race_result(self, result: Dict) -> int:
+        """追加一场比赛的参赛马匹（RaceResultScraper.scrape_race_result的返回值）"""
+        if not result:
+            return 0
+        return self.add_rows(result.get('horses') or [], race_date=result.get('race_date'),
+                             race_no=result.get('race_no'), venue=result.get('racecourse'))
+
+    def add_horse(self, horse: Dict) -> int:
+        """追加一匹马的赛绩（HorseInfoScraper.scrape_horse_info的返回值）"""
+        if not horse:
+            return 0
+        return self.add_rows(horse.get('race_records') or [], horse_id=horse.get('horse_id'))
+
+    @abstractmethod
+    def flush(self):
+        """输出缓存的行"""
+
+    def close(self):
+        """输出剩余的行"""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ParquetExporter(ColumnSink):
+    """
+    Parquet数据集导出器
+
+    用法:
+        with ParquetExporter('data/runners', kind='runners') as exporter:
+            for url in urls:
+                exporter.add_race_result(scraper.scrape_race_result(url))
+
+        with ParquetExporter('data/race_records', kind='race_records') as exporter:
+            exporter.add_horse(horse_scraper.scrape_horse_info(url))
+    """
+
+    def __init__(self, root: str, kind: str = 'runners', rows_per_file: int = 50000,
+                 compression: str = 'zstd'):
+        """
+        Args:
+            root: 数据集目录
+            kind: 'runners'（参赛马匹）或'race_records'（马匹赛绩）
+            rows_per_file: 缓存多少行后写入一次（每个分区一个文件）
+            compression: Parquet压缩方式
+        """
+        super().__init__(kind, rows_per_file)
+        self.root = root
+        self.compression = compression
+        self._token = uuid.uuid4().hex[:12]
+        self._flushes = 0
+
+    def flush(self):
+        """把缓存的行写入新的分区文件"""
+        if not self.buffer.num_rows:
+            return
+        table = self.buffer.to_table()
+        pq.write_to_dataset(
+            table,
+            root_path=self.root,
+            partitioning=_partitioning(),
+            basename_template=f'part-{self._token}-{self._flushes:05d}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            compression=self.compression,
+        )
+        self._flushes += 1
+        self.rows_written += table.num_rows
+        self.buffer.clear()
+
+
+def read_dataset(root: str, columns: Optional[Sequence[str]] = None,
+                 season: Union[str, Sequence[str], None] = None,
+                 venue: Union[str, Sequence[str], None] = None):
+    """
+    读取Parquet数据集
+
+    Args:
+        root: 数据集目录
+        columns: 只读取这些列（包括分区列season、venue），None读取全部
+        season: 马季（如'2025-26'）或马季列表
+        venue: 场地代码（如'ST'）或列表
+
+    Returns:
+        pyarrow.Table，可用to_pandas()转换为DataFrame
+    """
+    _require_pyarrow()
+    dataset = ds.dataset(root, format='parquet', partitioning=_partitioning())
+
+    expression = None
+    for name, value in (('season', season), ('venue', venue)):
+        if value is None:
+            continue
+        values = [value] if isinstance(value, str) else list(value)
+        condition = ds.field(name).isin(values)
+        expression = condition if expression is None else expression & condition
+
+    return dataset.to_table(columns=list(columns) if columns else None, filter=expression)
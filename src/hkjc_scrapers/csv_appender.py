@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可追加的CSV写入器
+多场比赛、多匹马的数据写入同一个CSV文件：列登记表在多次调用之间保留，
+行逐条写入；出现新的列时追加到列尾，只重写表头，已写入的行不变。
+"""
+
+import csv
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+
+class CsvAppender:
+    """
+    CSV追加写入器
+
+    列的顺序：已有文件的表头，其次是声明的fieldnames，最后是写入时新出现的列（按出现顺序）。
+    表头变化时通过临时文件重写表头并替换原文件；旧的行缺少新列，
+    csv.DictReader读取时这些列为restval（默认None）。
+
+    用法:
+        with CsvAppender('runners.csv', fieldnames=['race_date', 'race_no']) as appender:
+            for result in results:
+                appender.write_rows(result['horses'], race_date=result['race_date'], race_no=result['race_no'])
+    """
+
+    def __init__(self, filename: str, fieldnames: Optional[Iterable[str]] = None,
+                 grow: bool = True, append: bool = True, encoding: str = 'utf-8-sig'):
+        """
+        Args:
+            filename: 文件名，已存在时从表头读取列
+            fieldnames: 声明的列
+            grow: 为True时新出现的列追加到表头；为False时忽略未声明的列
+            append: 为False时清空已有文件重新写入
+            encoding: 文件编码，默认带BOM的UTF-8（Excel可直接打开）
+        """
+        self.filename = filename
+        self.grow = grow
+        self.encoding = encoding
+        self.fieldnames: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self._header_written: List[str] = []
+        self._file = None
+        self._writer = None
+
+        if not append and os.path.exists(filename):
+            open(filename, 'w').close()
+        for name in self._read_header():
+            self._register(name)
+        self._header_written = list(self.fieldnames)
+        for name in fieldnames or ():
+            self._register(name)
+
+    def _read_header(self) -> List[str]:
+        """读取已有文件的表头"""
+        if not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0:
+            return []
+        with open(self.filename, 'r', newline='', encoding=self.encoding) as f:
+            return next(csv.reader(f), [])
+
+    def _register(self, name: str) -> bool:
+        """登记列，返回是否为新列"""
+        if name in self._columns:
+            return False
+        self._columns[name] = len(self.fieldnames)
+        self.fieldnames.append(name)
+        return True
+
+    def _open(self):
+        """以追加模式打开文件"""
+        if self._file is None:
+            self._file = open(self.filename, 'a', newline='', encoding=self.encoding)
+            self._writer = csv.writer(self._file)
+
+    def _close_file(self):
+        """关闭文件句柄（可再次打开）"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def _sync_header(self):
+        """表头与列登记表不一致时写入或重写表头"""
+        if self._header_written == self.fieldnames:
+            return
+
+        if not self._header_written:
+            self._open()
+            self._writer.writerow(self.fieldnames)
+        else:
+            self._rewrite_header()
+        self._header_written = list(self.fieldnames)
+
+    def _rewrite_header(self):
+        """写入新表头并复制原文件的数据行到临时文件，再替换原文件"""
+        self._close_file()
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, temp_path = tempfile.mkstemp(suffix='.csv', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', newline='', encoding=self.encoding) as temp:
+                csv.writer(temp).writerow(self.fieldnames)
+                temp.flush()
+                with open(self.filename, 'rb') as source:
+                    source.readline()  # 跳过原表头
+                    shutil.copyfileobj(source, temp.buffer)
+            shutil.copymode(self.filename, temp_path)
+            os.replace(temp_path, self.filename)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def write_rows(self, rows: Iterable[Mapping[str, Any]], **context) -> int:
+        """
+        追加多行
+
+        Args:
+            rows: 字典或记录
+            **context: 每行附加的列（如race_date、race_no），优先于行中的同名字段
+
+        Returns:
+            写入的行数
+        """
+        rows = [dict(row, **context) if context else row for row in rows]
+        if not rows:
+            return 0
+
+        if self.grow:
+            for row in rows:
+                for key in row:
+                    self._register(key)
+        self._sync_header()
+        self._open()
+
+        fieldnames = self.fieldnames
+        self._writer.writerows([row.get(name, '') for name in fieldnames] for row in rows)
+        return len(rows)
+
+    def write_row(self, row: Mapping[str, Any], **context) -> int:
+        """追加一行"""
+        return self.write_rows([row], **context)
+
+    def flush(self):
+        """刷新缓冲区"""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        """关闭文件"""
+        self._close_file()
+
+    def __enter__(self) -> 'CsvAppender':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+往绩滚动特征（需要安装numpy）
+一次为多匹马的全部赛绩计算模型使用的滚动特征：
+
+- 之前3/5/10场的平均名次
+- 距上一场的日数
+- 评分、排位体重与上一场的差
+
+赛绩按(马匹, 日期)用numpy.lexsort排序后，同一匹马的赛绩连续排列；
+窗口内的合计用前缀和相减得到，窗口起点不早于该马的第一场，整个计算没有按马匹或按行的Python循环。
+每一行的特征只使用该马在这一场之前的赛绩，可以直接作为预测这一场的输入。
+"""
+
+from typing import Dict, Iterable, Mapping, Sequence
+
+from .normalize import normalize_race_records
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+
+DEFAULT_WINDOWS = (3, 5, 10)
+
+
+def _require_numpy():
+    """检查numpy是否可用"""
+    if np is None:
+        raise ImportError("滚动特征需要安装numpy: pip install numpy")
+
+
+def _values_and_valid(column):
+    """遮罩数组（或普通数组）拆分为float64数值和有效标记"""
+    values = np.ma.getdata(column).astype(np.float64)
+    return values, ~np.ma.getmaskarray(column) & ~np.isnan(values)
+
+
+def _previous_delta(values: 'np.ndarray', valid: 'np.ndarray', first: 'np.ndarray') -> 'np.ndarray':
+    """与同一匹马上一场的差，缺失或没有上一场时为nan"""
+    delta = np.full(values.shape, np.nan)
+    if values.size > 1:
+        ok = valid[1:] & valid[:-1] & ~first[1:]
+        delta[1:][ok] = values[1:][ok] - values[:-1][ok]
+    return delta
+
+
+def rolling_features(horse_ids: Sequence, dates, positions, ratings=None, weights=None,
+                     windows: Iterable[int] = DEFAULT_WINDOWS) -> Dict[str, 'np.ndarray']:
+    """
+    计算滚动特征
+
+    Args:
+        horse_ids: 每行的马匹ID
+        dates: 比赛日期（datetime64[D]数组或遮罩数组，如normalize.date_column的结果）
+        positions: 名次（遮罩数组，特殊名次被遮罩，不计入平均）
+        ratings: 评分，None时不计算rating_delta
+        weights: 排位体重，None时不计算weight_delta
+        windows: 平均名次的窗口（之前的场数）
+
+    Returns:
+        与输入行顺序相同的float64数组（缺失为nan）：
+        runs_before（之前的场数）、position_mean_N、days_since_last_run、rating_delta、weight_delta
+    """
+    _require_numpy()
+    horse_ids = np.asarray(horse_ids)
+    n = horse_ids.shape[0]
+
+    _, horse_codes = np.unique(horse_ids, return_inverse=True)
+    date_values = np.ma.getdata(dates).astype('datetime64[D]')
+    date_valid = ~np.ma.getmaskarray(dates) & ~np.isnat(date_values)
+    days = date_values.astype(np.int64)
+
+    # 按(马匹, 日期)排序，同一匹马的赛绩连续排列
+    order = np.lexsort((days, horse_codes.reshape(-1)))
+    codes = horse_codes.reshape(-1)[order]
+    rows = np.arange(n)
+    first = np.ones(n, dtype=bool)
+    first[1:] = codes[1:] != codes[:-1]
+    group_start = np.maximum.accumulate(np.where(first, rows, 0))
+
+    features = {'runs_before': (rows - group_start).astype(np.float64)}
+
+    # 窗口合计：前缀和（不含本行）相减
+    position_values, position_valid = _values_and_valid(positions)
+    position_values = np.where(position_valid, position_values, 0.0)[order]
+    position_valid = position_valid[order]
+    sums = np.concatenate(([0.0], np.cumsum(position_values)))
+    counts = np.concatenate(([0], np.cumsum(position_valid)))
+    for window in windows:
+        start = np.maximum(rows - window, group_start)
+        total = sums[rows] - sums[start]
+        count = counts[rows] - counts[start]
+        mean = np.full(n, np.nan)
+        np.divide(total, count, out=mean, where=count > 0)
+        features[f'position_mean_{window}'] = mean
+
+    sorted_days = days[order].astype(np.float64)
+    features['days_since_last_run'] = _previous_delta(sorted_days, date_valid[order], first)
+
+    for name, column in (('rating_delta', ratings), ('weight_delta', weights)):
+        if column is not None:
+            values, valid = _values_and_valid(column)
+            features[name] = _previous_delta(values[order], valid[order], first)
+
+    # 恢复输入的行顺序
+    inverse = np.empty(n, dtype=np.int64)
+    inverse[order] = rows
+    return {name: values[inverse] for name, values in features.items()}
+
+
+def race_record_features(horses: Iterable[Mapping],
+                         windows: Iterable[int] = DEFAULT_WINDOWS) -> Dict[str, 'np.ndarray']:
+    """
+    为多匹马的赛绩计算滚动特征
+
+    Args:
+        horses: HorseInfoScraper.scrape_horse_info的返回值
+        windows: 平均名次的窗口
+
+    Returns:
+        normalize_race_records的各列加上horse_id列和rolling_features的各特征，
+        行顺序为各马匹race_records的原顺序依次相接
+    """
+    _require_numpy()
+    horse_ids, records = [], []
+    for horse in horses:
+        if not horse or not horse.get('horse_id'):
+            continue
+        for record in horse.get('race_records') or []:
+            horse_ids.append(horse['horse_id'])
+            records.append(record)
+
+    columns = normalize_race_records(records)
+    columns['horse_id'] = np.array(horse_ids, dtype=str)
+    columns.update(rolling_features(columns['horse_id'], columns['race_date'], columns['position'],
+                                    ratings=columns['rating'], weights=columns['weight'], windows=windows))
+    return columns
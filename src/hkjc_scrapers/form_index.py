@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+马匹往绩索引
+把HorseInfoScraper的赛绩按马匹转换为按日期排序的类型化列（array模块的连续数组），
+并按场地、途程、场地状况建立每匹马的二级索引，用于赛前分析的常见查询：
+
+- 某匹马在某途程/场地/场地状况的最近N次赛绩
+- 某途程的最佳完成时间
+- 上次更换配备后出赛的次数
+
+场地、场地状况、配备等字符串在整个索引中共用一个编码表，列中只保存编码。
+每匹马的赛绩只有几十条，查询只在该马的列和索引上进行，不扫描其他马匹。
+"""
+
+import math
+from array import array
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .utils import parse_finish_time, parse_int, parse_race_date, venue_code
+
+
+MISSING = -1  # 整数列中的缺失值（名次为WV、PU等特殊名次时也记为缺失）
+
+# 途程、名次、体重、评分列（array('h')）的取值范围
+SHORT_MIN = -32768
+SHORT_MAX = 32767
+
+
+def _int_or_missing(value) -> int:
+    """解析整数，无法解析或超出array('h')的范围时为MISSING"""
+    number = parse_int(value)
+    if number is None or not SHORT_MIN <= number <= SHORT_MAX:
+        return MISSING
+    return number
+
+
+class HorseForm:
+    """一匹马按日期（由旧到新）排序的赛绩列"""
+
+    __slots__ = ('horse_id', 'records', 'dates', 'distances', 'positions', 'finish_times',
+                 'weights', 'ratings', 'venues', 'track_conditions', 'equipment',
+                 'equipment_runs', 'indexes')
+
+    def __init__(self, horse_id: str):
+        self.horse_id = horse_id
+        self.records: List[Mapping] = []
+        self.dates = array('i')              # date.toordinal()，无法解析为0
+        self.distances = array('h')          # 米
+        self.positions = array('h')          # 名次
+        self.finish_times = array('d')       # 秒，缺失为nan
+        self.weights = array('h')            # 排位体重
+        self.ratings = array('h')            # 评分
+        self.venues = array('i')             # 编码（FormIndex.categories）
+        self.track_conditions = array('i')
+        self.equipment = array('i')
+        self.equipment_runs = array('i')     # 以当前配备连续出赛的次数（含本场）
+        # (列名, 取值) -> 行号数组（由旧到新）
+        self.indexes: Dict[Tuple[str, object], array] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class FormIndex:
+    """
+    马匹往绩索引
+
+    用法:
+        index = FormIndex()
+        for horse in horses:
+            index.add_horse(horse)          # HorseInfoScraper.scrape_horse_info的返回值
+
+        index.last_n('HK_2023_J256', 5, distance=1650, venue='ST')
+        index.best_time('HK_2023_J256', 1650)
+        index.runs_since_equipment_change('HK_2023_J256')
+    """
+
+    # 建立二级索引的列
+    INDEXED = ('venue', 'distance', 'track_condition')
+
+    def __init__(self):
+        self.horses: Dict[str, HorseForm] = {}
+        self.categories: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.horses)
+
+    def __contains__(self, horse_id: str) -> bool:
+        return horse_id in self.horses
+
+    def _code(self, value: Optional[str]) -> int:
+        """字符串编码，空值为MISSING"""
+        if not value:
+            return MISSING
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    def _lookup_code(self, value: Optional[str]) -> Optional[int]:
+        """查询时使用的编码，没有出现过的字符串返回None"""
+        return self._codes.get(value) if value else None
+
+    def add_horse(self, horse: Mapping) -> int:
+        """
+        加入（或替换）一匹马的全部赛绩
+
+        Args:
+            horse: HorseInfoScraper.scrape_horse_info的返回值（需要horse_id和race_records）
+
+        Returns:
+            加入的赛绩条数
+        """
+        horse_id = horse.get('horse_id') if horse else None
+        if not horse_id:
+            return 0
+
+        rows = []
+        for record in horse.get('race_records') or []:
+            race_date = parse_race_date(record.get('date'))
+            rows.append((race_date.toordinal() if race_date else 0, record))
+        rows.sort(key=lambda row: row[0])
+
+        form = HorseForm(horse_id)
+        previous_equipment = None
+        for ordinal, record in rows:
+            # 先解析一整行，全部取值有效后再追加到各列，保持各列行数一致
+            distance = _int_or_missing(record.get('distance'))
+            position = _int_or_missing(record.get('position'))
+            finish_time = parse_finish_time(record.get('finish_time') or record.get('完成時間'))
+            weight = _int_or_missing(record.get('weight'))
+            rating = _int_or_missing(record.get('rating'))
+            venue = self._code(venue_code(record.get('venue')))
+            track_condition = self._code((record.get('track_condition') or '').strip())
+            equipment = self._code((record.get('equipment') or '').strip())
+
+            form.records.append(record)
+            form.dates.append(ordinal)
+            form.distances.append(distance)
+            form.positions.append(position)
+            form.finish_times.append(math.nan if finish_time is None else finish_time)
+            form.weights.append(weight)
+            form.ratings.append(rating)
+            form.venues.append(venue)
+            form.track_conditions.append(track_condition)
+            form.equipment.append(equipment)
+            runs = form.equipment_runs[-1] + 1 if form.equipment_runs and equipment == previous_equipment else 1
+            form.equipment_runs.append(runs)
+            previous_equipment = equipment
+
+        for row, key in enumerate(zip(form.venues, form.distances, form.track_conditions)):
+            for name, value in zip(self.INDEXED, key):
+                if value != MISSING:
+                    form.indexes.setdefault((name, value), array('I')).append(row)
+
+        self.horses[horse_id] = form
+        return len(form)
+
+    def add_horses(self, horses: Iterable[Mapping]) -> int:
+        """加入多匹马，返回赛绩总条数"""
+        return sum(self.add_horse(horse) for horse in horses)
+
+    def _rows(self, form: HorseForm, venue: Optional[str] = None, distance: Optional[int] = None,
+              track_condition: Optional[str] = None):
+        """
+        符合条件的行号（由旧到新）
+
+        先取命中最少的二级索引，其余条件直接比较列值。
+        """
+        conditions = []
+        if venue is not None:
+            conditions.append(('venue', self._lookup_code(venue_code(venue)), form.venues))
+        if distance is not None:
+            conditions.append(('distance', int(distance), form.distances))
+        if track_condition is not None:
+            conditions.append(('track_condition', self._lookup_code(track_condition), form.track_conditions))
+        if not conditions:
+            return range(len(form))
+
+        postings = []
+        for name, value, column in conditions:
+            rows = form.indexes.get((name, value)) if value is not None else None
+            if not rows:
+                return ()
+            postings.append((len(rows), rows, name))
+        postings.sort(key=lambda posting: posting[0])
+        _, rows, first = postings[0]
+        for name, value, column in conditions:
+            if name != first:
+                rows = [row for row in rows if column[row] == value]
+        return rows
+
+    def horse(self, horse_id: str) -> Optional[HorseForm]:
+        """某匹马的赛绩列，不存在时返回None"""
+        return self.horses.get(horse_id)
+
+    def last_n(self, horse_id: str, n: int = 6, venue: Optional[str] = None,
+               distance: Optional[int] = None, track_condition: Optional[str] = None) -> List[Mapping]:
+        """
+        最近N次赛绩
+
+        Args:
+            horse_id: 马匹ID
+            n: 条数
+            venue: 场地（"沙田"、"跑馬地"或代码"ST"、"HV"）
+            distance: 途程（米）
+            track_condition: 场地状况（如"好地"）
+
+        Returns:
+            赛绩记录列表（由新到旧）
+        """
+        form = self.horses.get(horse_id)
+        if form is None or n <= 0:
+            return []
+        rows = self._rows(form, venue, distance, track_condition)
+        return [form.records[row] for row in reversed(rows[-n:])]
+
+    def best_time(self, horse_id: str, distance: int, venue: Optional[str] = None,
+                  track_condition: Optional[str] = None) -> Optional[Tuple[float, Mapping]]:
+        """
+        某途程的最佳完成时间
+
+        Returns:
+            (秒数, 赛绩记录)，没有完成时间时返回None
+        """
+        form = self.horses.get(horse_id)
+        if form is None:
+            return None
+        best_row = None
+        finish_times = form.finish_times
+        for row in self._rows(form, venue, distance, track_condition):
+            seconds = finish_times[row]
+            if seconds == seconds and (best_row is None or seconds < finish_times[best_row]):
+                best_row = row
+        if best_row is None:
+            return None
+        return finish_times[best_row], form.records[best_row]
+
+    def runs_since_equipment_change(self, horse_id: str, equipment: Optional[str] = None) -> Optional[int]:
+        """
+        上次更换配备后出赛的次数
+
+        Args:
+            horse_id: 马匹ID
+            equipment: 下一场申报的配备；与最近一场不同时返回0
+
+        Returns:
+            以最近一场的配备连续出赛的次数（含最近一场），没有赛绩时返回None
+        """
+        form = self.horses.get(horse_id)
+        if not form:
+            return None
+        if equipment is not None:
+            equipment = equipment.strip()
+            if (self._lookup_code(equipment) if equipment else MISSING) != form.equipment[-1]:
+                return 0
+        return form.equipment_runs[-1]
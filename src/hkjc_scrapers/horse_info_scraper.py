@@ -7,17 +7,50 @@
 
 import requests
 from bs4 import BeautifulSoup
-import json
 import re
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Union
 from urllib.parse import urlparse, parse_qs
-from datetime import datetime
+from datetime import date, datetime
+
+from .csv_appender import CsvAppender
+from .interning import intern_fields, intern_text
+from .lazy import Deferred, LazyResult, select_sections
+from .records import RaceRecord
+from .serialization import dump_json
+from .sqlite_store import SQLiteStore
+from .utils import parse_race_date
+
+
+# 结果中由页面提取的部分（按结果中的顺序）
+HORSE_SECTIONS = ('basic_info', 'race_records', 'equipment_legend')
+
+# 开启字符串驻留时需要驻留的字段（取值种类少、重复多；日期等取值不断增加的字段不驻留）
+INTERNED_BASIC_INFO_FIELDS = ('sex', 'age', 'colour', 'sire', 'dam', 'maternal_grandsire', 'trainer',
+                              'owner', 'import_source', 'birthplace')
+INTERNED_RACE_RECORD_FIELDS = ('venue', 'distance', 'class', 'position', 'jockey', 'jockey_id',
+                               'trainer', 'trainer_id', 'draw', 'weight', 'rating', 'track',
+                               'track_condition', 'equipment')
 
 
 class HorseInfoScraper:
     """香港赛马会马匹信息爬虫类"""
     
-    def __init__(self):
+    # 装备图例全站相同，在进程内只解析一次，所有结果共享同一个字典
+    _equipment_legend_cache: Optional[Dict] = None
+    _equipment_legend_fingerprint: Optional[str] = None
+    
+    def __init__(self, detect_legend_change: bool = False, use_records: bool = False,
+                 intern_strings: bool = False):
+        """
+        Args:
+            detect_legend_change: 为True时每页比对装备图例表格文本，变化时重新解析；
+                                  为False时图例解析一次后不再处理
+            use_records: 为True时赛绩使用紧凑的RaceRecord记录（__slots__）代替字典
+            intern_strings: 为True时驻留表头和骑师、练马师、场地等重复取值，进程内只保留一个实例
+        """
+        self.detect_legend_change = detect_legend_change
+        self.use_records = use_records
+        self.intern_strings = intern_strings
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -25,16 +58,25 @@ class HorseInfoScraper:
             'Accept-Language': 'zh-HK,zh;q=0.9,en;q=0.8',
         })
     
-    def scrape_horse_info(self, url: str) -> Dict:
+    def scrape_horse_info(self, url: str, since: Optional[Union[str, date]] = None,
+                          known_records: Optional[List[Dict]] = None, lazy: bool = False,
+                          sections: Optional[Iterable[str]] = None) -> Union[Dict, LazyResult]:
         """
         爬取马匹信息页面
         
         Args:
             url: 马匹信息页面URL
+            since: 已知的最后比赛日期，赛绩解析到该日期（含）即停止，只返回更新的赛绩
+            known_records: 已保存的赛绩记录，新解析的赛绩会与其合并；
+                           未指定since时，取其中最新的日期作为since
+            lazy: 为True时返回LazyResult，各部分在第一次读取时才提取（提取出错时在读取时抛出异常）
+            sections: 只提取这些部分（HORSE_SECTIONS中的名称），None为全部；
+                      未选择的部分不出现在结果中
             
         Returns:
-            包含所有提取信息的字典
+            包含所有提取信息的字典（合并后新赛绩排在前面）
         """
+        selected = select_sections(HORSE_SECTIONS, sections)
         try:
             response = self.session.get(url, timeout=30)
             response.encoding = 'utf-8'
@@ -47,17 +89,25 @@ class HorseInfoScraper:
             params = parse_qs(parsed_url.query)
             horse_id = params.get('horseid', [''])[0]
             
+            if since is None and known_records:
+                since = self._latest_record_date(known_records)
+            
             result = {
                 'horse_id': horse_id,
                 'source_url': url,
                 'scraped_at': datetime.now().isoformat(),
-                'basic_info': self._extract_basic_info(soup),
-                'race_records': self._extract_race_records(soup),
-                'equipment_legend': self._extract_equipment_legend(soup),
-                'raw_html': response.text  # 保存原始HTML以备后续分析
             }
+            extractors = {
+                'basic_info': (self._extract_basic_info, soup),
+                'race_records': (self._extract_and_merge_race_records, soup, since, known_records),
+                'equipment_legend': (self._get_equipment_legend, soup),
+            }
+            for name in selected:
+                function, *args = extractors[name]
+                result[name] = Deferred(function, *args) if lazy else function(*args)
+            result['raw_html'] = response.text  # 保存原始HTML以备后续分析
             
-            return result
+            return LazyResult(result) if lazy else result
             
         except requests.RequestException as e:
             print(f"请求错误: {e}")
@@ -230,6 +280,9 @@ class HorseInfoScraper:
                             # 单个键值对
                             self._extract_field_from_pair(basic_info, key, value)
         
+        if self.intern_strings:
+            intern_fields(basic_info, INTERNED_BASIC_INFO_FIELDS)
+        
         return basic_info
     
     def _extract_field_from_pair(self, basic_info: Dict, key: str, value: str):
@@ -284,14 +337,25 @@ class HorseInfoScraper:
             if 'season_start_rating' not in basic_info or not basic_info.get('season_start_rating') or basic_info.get('season_start_rating') == ':':
                 basic_info['season_start_rating'] = value
     
-    def _extract_race_records(self, soup: BeautifulSoup) -> List[Dict]:
-        """提取马匹赛绩记录"""
+    def _extract_race_records(self, soup: BeautifulSoup, since: Optional[Union[str, date]] = None) -> List[Dict]:
+        """
+        提取马匹赛绩记录
+        
+        Args:
+            soup: 页面文档
+            since: 已知的最后比赛日期。赛绩由新到旧排列，遇到不晚于该日期的行即停止解析
+        """
         race_records = []
+        since_date = parse_race_date(since)
+        reached_known = False
         
         # 查找包含赛绩记录的表格
         tables = soup.find_all('table')
         
         for table in tables:
+            if reached_known:
+                break
+            
             rows = table.find_all('tr')
             headers = []
             header_row = None
@@ -310,14 +374,27 @@ class HorseInfoScraper:
             if not headers:
                 continue
             
+            if self.intern_strings:
+                headers = [intern_text(header) for header in headers]
+            
             # 提取数据行
             data_rows = rows[rows.index(header_row) + 1:] if header_row else rows
             
+            # 日期列的位置，用于增量解析时提前停止
+            date_index = next((i for i, header in enumerate(headers) if '日期' in header or 'Date' in header), None)
+            
             for row in data_rows:
                 cells = row.find_all(['td', 'th'])
                 if len(cells) < 3:  # 跳过数据不足的行
                     continue
                 
+                # 遇到已知的赛绩即停止，之后的行都更早
+                if since_date and date_index is not None and date_index < len(cells):
+                    row_date = parse_race_date(cells[date_index].get_text(strip=True))
+                    if row_date and row_date <= since_date:
+                        reached_known = True
+                        break
+                
                 # 跳过表头行
                 row_text = row.get_text()
                 if any(keyword in row_text for keyword in ['日期', '場地', '距離', 'Date', 'Venue', 'Distance']):
@@ -347,11 +424,17 @@ class HorseInfoScraper:
                                     race_record['jockey_id'] = jockey_id_match.group(1)
                         
                         # 根据表头名称提取相应信息
+                        # "場地狀況"包含"場地"、"頭馬距離"包含"距離"、"Track Condition"包含"Track"，
+                        # 较长的表头要先于较短的表头比较
                         if '日期' in header or 'Date' in header:
                             race_record['date'] = value
+                        elif '場地狀況' in header or 'Going' in header or 'Track Condition' in header:
+                            race_record['track_condition'] = value
+                        elif '頭馬距離' in header or 'LBW' in header:
+                            race_record['margin'] = value
                         elif '場地' in header or 'Venue' in header:
                             race_record['venue'] = value
-                        elif '距離' in header or 'Distance' in header:
+                        elif '距離' in header or '途程' in header or 'Distance' in header:
                             race_record['distance'] = value
                         elif '班次' in header or 'Class' in header:
                             race_record['class'] = value
@@ -373,8 +456,6 @@ class HorseInfoScraper:
                             race_record['finish_time'] = value
                         elif '跑道' in header or 'Track' in header or 'Course' in header:
                             race_record['track'] = value
-                        elif '場地狀況' in header or 'Going' in header or 'Track Condition' in header:
-                            race_record['track_condition'] = value
                         elif '裝備' in header or 'Equipment' in header:
                             race_record['equipment'] = value
                         else:
@@ -384,62 +465,160 @@ class HorseInfoScraper:
                 
                 # 只添加有足够数据的记录
                 if race_record and ('date' in race_record or 'venue' in race_record):
-                    race_records.append(race_record)
+                    if self.intern_strings:
+                        intern_fields(race_record, INTERNED_RACE_RECORD_FIELDS)
+                    race_records.append(RaceRecord(race_record) if self.use_records else race_record)
         
         return race_records
     
-    def _extract_equipment_legend(self, soup: BeautifulSoup) -> Dict:
-        """提取装备图例说明"""
-        equipment_legend = {}
+    def _extract_and_merge_race_records(self, soup: BeautifulSoup, since: Optional[Union[str, date]] = None,
+                                        known_records: Optional[List[Dict]] = None) -> List[Dict]:
+        """提取赛绩并与已保存的赛绩合并"""
+        race_records = self._extract_race_records(soup, since=since)
+        if known_records:
+            race_records = self._merge_race_records(race_records, known_records)
+        return race_records
+    
+    def _latest_record_date(self, records: List[Dict]) -> Optional[date]:
+        """取赛绩记录中最新的比赛日期"""
+        dates = [parse_race_date(record.get('date')) for record in records]
+        dates = [d for d in dates if d]
+        return max(dates) if dates else None
+    
+    def _merge_race_records(self, new_records: List[Dict], known_records: List[Dict]) -> List[Dict]:
+        """合并新解析的赛绩与已保存的赛绩（按日期和场地去重，新赛绩在前）"""
+        seen = {(record.get('date'), record.get('venue')) for record in new_records}
+        merged = list(new_records)
+        for record in known_records:
+            if (record.get('date'), record.get('venue')) not in seen:
+                merged.append(record)
+        return merged
+    
+    def _get_equipment_legend(self, soup: BeautifulSoup) -> Dict:
+        """
+        获取装备图例（进程内缓存）
         
-        # 查找包含装备图例的表格或文本
-        tables = soup.find_all('table')
+        图例解析一次后缓存在类属性中，之后的页面直接返回同一个字典，不再处理图例表格。
+        开启detect_legend_change时，只比对图例表格文本，文本变化才重新解析。
+        返回的字典由所有结果共享，不得修改（需要修改时请先复制：dict(result['equipment_legend'])）。
+        """
+        cls = HorseInfoScraper
+        if cls._equipment_legend_cache and not self.detect_legend_change:
+            return cls._equipment_legend_cache
         
-        for table in tables:
+        for table in self._find_equipment_legend_tables(soup):
+            fingerprint = table.get_text()
+            if cls._equipment_legend_cache and fingerprint == cls._equipment_legend_fingerprint:
+                return cls._equipment_legend_cache
+            
+            equipment_legend = self._parse_equipment_legend_table(table)
+            if equipment_legend:
+                cls._equipment_legend_cache = equipment_legend
+                cls._equipment_legend_fingerprint = fingerprint
+                return equipment_legend
+        
+        # 当前页面没有图例时沿用已缓存的图例
+        return cls._equipment_legend_cache or {}
+    
+    @classmethod
+    def clear_equipment_legend_cache(cls):
+        """清除进程内缓存的装备图例"""
+        cls._equipment_legend_cache = None
+        cls._equipment_legend_fingerprint = None
+    
+    def _extract_equipment_legend(self, soup: BeautifulSoup) -> Dict:
+        """提取装备图例说明（不使用缓存）"""
+        for table in self._find_equipment_legend_tables(soup):
+            equipment_legend = self._parse_equipment_legend_table(table)
+            # 如果找到了装备图例，跳出循环
+            if equipment_legend:
+                return equipment_legend
+        
+        return {}
+    
+    def _find_equipment_legend_tables(self, soup: BeautifulSoup):
+        """查找可能包含装备图例的表格"""
+        for table in soup.find_all('table'):
             table_text = table.get_text()
             # 查找包含装备说明的部分
             if '眼罩' in table_text or 'Equipment' in table_text or 'B :' in table_text or 'BO :' in table_text:
-                rows = table.find_all('tr')
-                
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    text = row.get_text()
-                    
-                    # 提取装备代码和说明
-                    # 格式如: "B :  戴眼罩" 或 "BO :  只戴單邊眼罩"
-                    equipment_patterns = [
-                        r'([A-Z]+(?:\s+[A-Z]+)?)\s*:\s*([^\n]+)',
-                        r'([A-Z]+(?:\s+[A-Z]+)?)\s*：\s*([^\n]+)',
-                    ]
-                    
-                    for pattern in equipment_patterns:
-                        matches = re.findall(pattern, text)
-                        for code, description in matches:
-                            code = code.strip()
-                            description = description.strip()
-                            if code and description:
-                                equipment_legend[code] = description
-                
-                # 如果找到了装备图例，跳出循环
-                if equipment_legend:
-                    break
+                yield table
+    
+    def _parse_equipment_legend_table(self, table) -> Dict:
+        """解析装备图例表格"""
+        equipment_legend = {}
+        
+        # 提取装备代码和说明
+        # 格式如: "B :  戴眼罩" 或 "BO :  只戴單邊眼罩"
+        equipment_patterns = [
+            r'([A-Z]+(?:\s+[A-Z]+)?)\s*:\s*([^\n]+)',
+            r'([A-Z]+(?:\s+[A-Z]+)?)\s*：\s*([^\n]+)',
+        ]
+        
+        for row in table.find_all('tr'):
+            text = row.get_text()
+            
+            for pattern in equipment_patterns:
+                matches = re.findall(pattern, text)
+                for code, description in matches:
+                    code = code.strip()
+                    description = description.strip()
+                    if code and description:
+                        equipment_legend[code] = description
         
         return equipment_legend
     
-    def save_to_json(self, data: Dict, filename: str):
-        """保存数据到JSON文件"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def save_to_json(self, data: Dict, filename: str, codec: str = 'json', pretty: bool = False):
+        """
+        保存数据到JSON文件
+        
+        Args:
+            data: 要保存的数据
+            filename: 文件名
+            codec: 编码方式，'json'（标准库）、'orjson'或'msgspec'，后两者需要安装对应的包
+            pretty: 为True时缩进2格输出，默认紧凑输出
+        """
+        dump_json(data, filename, codec=codec, pretty=pretty)
         print(f"数据已保存到: {filename}")
     
-    def save_to_csv(self, data: Dict, filename: str):
-        """保存赛绩记录到CSV文件"""
+    def save_to_sqlite(self, data: Dict, filename: str):
+        """
+        保存马匹信息和赛绩到SQLite数据库（表结构见sqlite_store），重复保存时更新
+        
+        Args:
+            data: 爬取结果
+            filename: 数据库文件名
+        """
+        if not data:
+            print("没有马匹信息可保存")
+            return
+        
+        with SQLiteStore(filename) as store:
+            store.add_horse(data)
+        print(f"数据已保存到数据库: {filename}")
+    
+    def save_to_csv(self, data: Dict, filename: str, append: bool = False):
+        """
+        保存赛绩记录到CSV文件
+        
+        Args:
+            data: scrape_horse_info的返回值
+            filename: 文件名
+            append: 为True时追加到已有文件（多匹马写入同一文件），
+                    每行附加horse_id列，新出现的列追加到表头，不需要预先扫描所有记录
+        """
         import csv
         
         if 'race_records' not in data or not data['race_records']:
             print("没有赛绩记录可保存")
             return
         
+        if append:
+            with CsvAppender(filename, fieldnames=['horse_id']) as appender:
+                appender.write_rows(data['race_records'], horse_id=data.get('horse_id') or '')
+            print(f"赛绩记录已追加到: {filename}")
+            return
+        
         with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
             if data['race_records']:
                 # 收集所有记录中的所有唯一字段名
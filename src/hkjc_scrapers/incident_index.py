@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+竞赛事件报告全文索引
+事件报告是没有分词的中文，按字建立倒排索引：每个字（一元）和每两个相邻的字（二元）各有一个倒排表，
+记录出现该字词的事件编号。事件编号按加入顺序递增，倒排表保存相邻编号的差（array('I')），
+占用的内存与事件数量成正比，加入新的赛果时只在各倒排表末尾追加。
+
+查询短语时取短语中各二元组倒排表的交集（从最短的一个开始，对递增列表倍增查找），
+再在候选事件的描述中确认短语确实连续出现，不需要扫描全部事件。
+"""
+
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+from .utils import race_key
+
+
+# 不建立索引的字符（空白和常见标点）
+SKIP_CHARS = frozenset(' \t\r\n，。、；：！？「」『』（）()[],.;:!?-—…"\'')
+
+
+def _normalize(text) -> str:
+    """统一大小写并去除不建立索引的字符"""
+    if not isinstance(text, str):
+        return ''
+    return ''.join(char for char in text.lower() if char not in SKIP_CHARS)
+
+
+def _intersect(doc_ids: List[int], others: List[int]) -> List[int]:
+    """
+    两个递增列表的交集（倍增查找，不为倒排表建立集合）
+
+    两边交替用二分查找跳到对方的下一个编号；编号相同时，按倍增的长度整段比较后续的编号，
+    常见短语的各二元组倒排表大段相同，整段比较在C中完成。
+    """
+    result = []
+    i = j = 0
+    size, other_size = len(doc_ids), len(others)
+    while i < size:
+        j = bisect_left(others, doc_ids[i], j)
+        if j == other_size:
+            break
+        if others[j] != doc_ids[i]:
+            i = bisect_left(doc_ids, others[j], i + 1)
+            continue
+        run, step = 1, 1
+        while step:
+            end = min(run + step, size - i, other_size - j)
+            if end > run and doc_ids[i + run:i + end] == others[j + run:j + end]:
+                run = end
+                step *= 2
+            else:
+                step //= 2
+        result.extend(doc_ids[i:i + run])
+        i += run
+        j += run
+    return result
+
+
+def _grams(text: str) -> Set[str]:
+    """一元和二元字符组"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class _Postings:
+    """差值编码的倒排表"""
+
+    __slots__ = ('deltas', 'last')
+
+    def __init__(self):
+        self.deltas = array('I')
+        self.last = 0
+
+    def append(self, doc_id: int):
+        self.deltas.append(doc_id - self.last)
+        self.last = doc_id
+
+    def __len__(self) -> int:
+        return len(self.deltas)
+
+    def decode(self) -> List[int]:
+        """还原为事件编号列表（递增）"""
+        return list(accumulate(self.deltas))
+
+
+class IncidentIndex:
+    """
+    竞赛事件报告全文索引
+
+    用法:
+        index = IncidentIndex()
+        for url in meeting_urls:
+            index.add_race_result(scraper.scrape_race_result(url))
+
+        index.search('受阻')
+        index.search('流鼻血', horse_id='HK_2023_J256')
+    """
+
+    def __init__(self):
+        # 事件编号 -> 事件（事件报告字段加上race_date、racecourse、race_no）
+        self.incidents: List[Optional[Dict]] = []
+        # 事件编号 -> 统一后的描述（用于确认短语）
+        self._texts: List[str] = []
+        self._postings: Dict[str, _Postings] = {}
+        self._horse_postings: Dict[str, _Postings] = {}
+        # 比赛键 -> 该场比赛的事件编号
+        self.races: Dict[str, List[int]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        """有效事件数量"""
+        return self._count
+
+    def __contains__(self, race_key: str) -> bool:
+        return race_key in self.races
+
+    def add_race_result(self, result: Mapping) -> int:
+        """
+        加入一场比赛的事件报告
+
+        同一场比赛再次加入时，原来的事件标记为已删除（倒排表中的编号在查询时跳过）。
+
+        Args:
+            result: RaceResultScraper.scrape_race_result的返回值
+
+        Returns:
+            加入的事件数量
+        """
+        if not result:
+            return 0
+        key = race_key(result)
+        if key is not None:
+            self.remove_race(key)
+
+        doc_ids = []
+        for report in result.get('incident_reports') or []:
+            doc_id = len(self.incidents)
+            incident = dict(report)
+            incident.update(race_date=result.get('race_date'), racecourse=result.get('racecourse'),
+                            race_no=result.get('race_no'))
+            text = _normalize(report.get('description'))
+            self.incidents.append(incident)
+            self._texts.append(text)
+            for gram in _grams(text):
+                postings = self._postings.get(gram)
+                if postings is None:
+                    postings = self._postings[gram] = _Postings()
+                postings.append(doc_id)
+            horse_id = report.get('horse_id')
+            if horse_id:
+                postings = self._horse_postings.get(horse_id)
+                if postings is None:
+                    postings = self._horse_postings[horse_id] = _Postings()
+                postings.append(doc_id)
+            doc_ids.append(doc_id)
+
+        if key is not None:
+            self.races[key] = doc_ids
+        self._count += len(doc_ids)
+        return len(doc_ids)
+
+    def add_race_results(self, results: Iterable[Mapping]) -> int:
+        """加入多场比赛，返回事件总数"""
+        return sum(self.add_race_result(result) for result in results)
+
+    def remove_race(self, race_key: str) -> bool:
+        """
+        删除一场比赛的事件
+
+        Args:
+            race_key: 比赛键（"2026-01-18|ST|3"）
+        """
+        doc_ids = self.races.pop(race_key, None)
+        if doc_ids is None:
+            return False
+        for doc_id in doc_ids:
+            self.incidents[doc_id] = None
+            self._texts[doc_id] = ''
+        self._count -= len(doc_ids)
+        return True
+
+    def _candidates(self, text: str) -> Optional[List[int]]:
+        """短语的候选事件编号（递增），None表示不限"""
+        if not text:
+            return None
+        grams = [text] if len(text) == 1 else {text[i:i + 2] for i in range(len(text) - 1)}
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        doc_ids = postings[0].decode()
+        for posting in postings[1:]:
+            doc_ids = _intersect(doc_ids, posting.decode())
+            if not doc_ids:
+                break
+        return doc_ids
+
+    def search(self, phrase: Optional[str] = None, horse_id: Optional[str] = None,
+               limit: Optional[int] = None) -> List[Dict]:
+        """
+        查询事件
+
+        Args:
+            phrase: 短语（如"受阻"、"流鼻血"），忽略空白和标点；None时不按短语筛选
+            horse_id: 只返回该马的事件
+            limit: 最多返回的事件数量（最新加入的优先）
+
+        Returns:
+            事件列表，按加入顺序由新到旧
+        """
+        text = _normalize(phrase)
+        if horse_id is not None:
+            # 一匹马的事件很少，直接在描述中确认短语
+            posting = self._horse_postings.get(horse_id)
+            doc_ids = posting.decode() if posting is not None else []
+            verify = bool(text)
+        else:
+            doc_ids = self._candidates(text)
+            if doc_ids is None:
+                doc_ids = range(len(self.incidents))
+            # 二元组都出现不代表短语连续出现
+            verify = len(text) > 2
+
+        results = []
+        for doc_id in reversed(doc_ids):
+            incident = self.incidents[doc_id]
+            if incident is None or (verify and text not in self._texts[doc_id]):
+                continue
+            results.append(incident)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
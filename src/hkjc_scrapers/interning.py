@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字符串驻留
+骑师、练马师、场地、班次、表头等取值种类很少，但在多季数据中重复出现数百万次。
+每次get_text()都会生成新的字符串，驻留后同样的取值在进程内只保留一个实例。
+只应驻留取值种类少的字段；驻留池有上限，达到上限后新的取值原样返回，不再加入驻留池。
+"""
+
+from typing import Any, Dict, Iterable
+
+# 驻留池的上限（字符串数量）
+MAX_POOL_SIZE = 100000
+
+# 进程内的驻留池：取值 -> 共享实例
+_pool: Dict[str, str] = {}
+
+
+def _shared(value: str) -> str:
+    """驻留池中的共享实例；驻留池已满时原样返回"""
+    shared = _pool.get(value)
+    if shared is None:
+        if len(_pool) >= MAX_POOL_SIZE:
+            return value
+        shared = _pool[value] = value
+    return shared
+
+
+def intern_text(value: Any) -> Any:
+    """
+    返回字符串的共享实例
+
+    Args:
+        value: 字符串；其他类型原样返回
+
+    Returns:
+        与value相等的共享字符串（驻留池已满且value不在池中时为value本身）
+    """
+    if value.__class__ is not str:
+        return value
+    return _shared(value)
+
+
+def intern_fields(record: Dict, fields: Iterable[str]) -> Dict:
+    """
+    驻留记录中指定字段的取值
+
+    Args:
+        record: 字典或记录
+        fields: 需要驻留的字段名
+
+    Returns:
+        原记录（原地修改）
+    """
+    for key in fields:
+        value = record.get(key)
+        if value.__class__ is str:
+            record[key] = _shared(value)
+    return record
+
+
+def pool_size() -> int:
+    """驻留池中的字符串数量"""
+    return len(_pool)
+
+
+def clear_pool():
+    """清空驻留池（已驻留的字符串仍由使用它们的记录引用）"""
+    _pool.clear()
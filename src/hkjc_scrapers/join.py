@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+比赛结果与马匹资料的关联
+为每匹参赛马匹附上该马的基本资料（basic_info）和同一场比赛的赛绩记录（race_records中日期、场地相同的一条）。
+
+马匹资料只建立一次哈希表：horse_id -> 马匹，(horse_id, 日期, 场地) -> 赛绩记录，
+之后每匹参赛马匹只查表，总耗时与参赛马匹数加赛绩数成正比，不再是两者的乘积。
+日期统一为ISO格式，场地统一为代码（见utils.venue_code），不同页面的写法可以直接比较。
+关联不上的键记录在报告中，用于检查数据质量。
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .utils import parse_race_date, venue_code
+
+
+RecordKey = Tuple[str, Optional[str], Optional[str]]
+
+
+def _record_key(horse_id: str, race_date, venue) -> RecordKey:
+    """(horse_id, ISO日期, 场地代码)"""
+    parsed = parse_race_date(race_date)
+    return horse_id, parsed.isoformat() if parsed else None, venue_code(venue) or None
+
+
+class HorseLookup:
+    """
+    马匹资料的哈希表
+
+    用法:
+        lookup = HorseLookup(horses)     # HorseInfoScraper.scrape_horse_info的返回值列表
+        lookup.horse('HK_2023_J256')
+        lookup.race_record('HK_2023_J256', '2026/01/18', 'ST')
+    """
+
+    def __init__(self, horses: Iterable[Mapping] = ()):
+        self.horses: Dict[str, Mapping] = {}
+        self.records: Dict[RecordKey, Mapping] = {}
+        # 场地缺失时按(horse_id, 日期)查找；一匹马同一天只会出赛一次
+        self._records_by_date: Dict[Tuple[str, Optional[str]], Mapping] = {}
+        # horse_id -> 该马的赛绩键（替换该马时用于删除原有的赛绩）
+        self._keys: Dict[str, List[RecordKey]] = {}
+        self.add_horses(horses)
+
+    def __len__(self) -> int:
+        return len(self.horses)
+
+    def add_horse(self, horse: Mapping):
+        """加入（或替换）一匹马；替换时原有的赛绩一并删除"""
+        horse_id = horse.get('horse_id') if horse else None
+        if not horse_id:
+            return
+        for key in self._keys.pop(horse_id, ()):
+            self.records.pop(key, None)
+            self._records_by_date.pop(key[:2], None)
+        self.horses[horse_id] = horse
+        keys = self._keys[horse_id] = []
+        for record in horse.get('race_records') or []:
+            key = _record_key(horse_id, record.get('date'), record.get('venue'))
+            if key[1] is None:
+                continue
+            keys.append(key)
+            # 重复的键保留先出现的一条
+            self.records.setdefault(key, record)
+            self._records_by_date.setdefault(key[:2], record)
+
+    def add_horses(self, horses: Iterable[Mapping]):
+        """加入多匹马"""
+        for horse in horses:
+            self.add_horse(horse)
+
+    def horse(self, horse_id: str) -> Optional[Mapping]:
+        """马匹资料，不存在时返回None"""
+        return self.horses.get(horse_id)
+
+    def race_record(self, horse_id: str, race_date, venue=None) -> Optional[Mapping]:
+        """
+        某匹马某日在某场地的赛绩记录
+
+        Args:
+            horse_id: 马匹ID
+            race_date: 比赛日期（格式见parse_race_date）
+            venue: 场地名称或代码；为None时只按日期查找
+        """
+        key = _record_key(horse_id, race_date, venue)
+        if key[2] is None:
+            return self._records_by_date.get(key[:2])
+        return self.records.get(key)
+
+
+def join_runners(results: Iterable[Mapping], horses, include_horse: bool = True) -> Tuple[List[Dict], Dict]:
+    """
+    为比赛结果中的每匹参赛马匹附上马匹资料和对应的赛绩记录
+
+    Args:
+        results: RaceResultScraper.scrape_race_result的返回值
+        horses: HorseInfoScraper.scrape_horse_info的返回值列表，或已建立的HorseLookup
+        include_horse: 为True时附上马匹的basic_info
+
+    Returns:
+        (参赛马匹列表, 报告)
+
+        每匹参赛马匹为原字段加上race_date、racecourse、race_no，以及：
+            basic_info: 马匹基本资料（没有该马资料时为None）
+            race_record: 同日同场地的赛绩记录（没有时为None）
+
+        报告:
+            runners: 参赛马匹数
+            matched_horses: 关联到马匹资料的参赛马匹数
+            matched_records: 关联到赛绩记录的参赛马匹数
+            missing_horse_id: 没有horse_id的参赛马匹数
+            unmatched_horse_ids: 没有马匹资料的horse_id
+            unmatched_records: 有马匹资料但没有对应赛绩的(horse_id, 日期, 场地)
+            unused_horse_ids: 没有出现在比赛结果中的马匹资料
+    """
+    lookup = horses if isinstance(horses, HorseLookup) else HorseLookup(horses)
+
+    rows = []
+    matched_horses = matched_records = missing_horse_id = 0
+    unmatched_horse_ids = set()
+    unmatched_records = []
+    seen_horse_ids = set()
+
+    for result in results:
+        if not result:
+            continue
+        race_date, racecourse, race_no = result.get('race_date'), result.get('racecourse'), result.get('race_no')
+        # 同一场比赛的日期和场地只转换一次
+        _, date_key, venue_key = _record_key('', race_date, racecourse)
+        records = lookup.records if venue_key else lookup._records_by_date
+        for runner in result.get('horses') or []:
+            row = dict(runner)
+            row.update(race_date=race_date, racecourse=racecourse, race_no=race_no)
+            row['basic_info'] = None
+            row['race_record'] = None
+            rows.append(row)
+
+            horse_id = runner.get('horse_id')
+            if not horse_id:
+                missing_horse_id += 1
+                continue
+            seen_horse_ids.add(horse_id)
+            horse = lookup.horses.get(horse_id)
+            if horse is None:
+                unmatched_horse_ids.add(horse_id)
+                continue
+            matched_horses += 1
+            if include_horse:
+                row['basic_info'] = horse.get('basic_info')
+
+            key = (horse_id, date_key, venue_key)
+            record = records.get(key if venue_key else key[:2])
+            if record is None:
+                unmatched_records.append(key)
+                continue
+            matched_records += 1
+            row['race_record'] = record
+
+    report = {
+        'runners': len(rows),
+        'matched_horses': matched_horses,
+        'matched_records': matched_records,
+        'missing_horse_id': missing_horse_id,
+        'unmatched_horse_ids': sorted(unmatched_horse_ids),
+        'unmatched_records': unmatched_records,
+        'unused_horse_ids': sorted(set(lookup.horses) - seen_horse_ids),
+    }
+    return rows, report
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON Lines读写
+批量抓取时每个页面追加一行记录，不需要把整季数据放在内存中；
+读取时逐行解码，下游处理只占用常量内存。
+
+支持gzip压缩（标准库）和zstd压缩（需要安装zstandard），
+文件名以.gz或.zst结尾时自动选择对应的压缩方式。
+"""
+
+import gzip
+import io
+import os
+from typing import Any, Iterable, Iterator, Optional
+
+from .serialization import decode, encode
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖
+    zstandard = None
+
+
+COMPRESSIONS = (None, 'gzip', 'zstd')
+
+
+def detect_compression(filename: str) -> Optional[str]:
+    """根据文件扩展名判断压缩方式"""
+    if filename.endswith('.gz'):
+        return 'gzip'
+    if filename.endswith('.zst'):
+        return 'zstd'
+    return None
+
+
+def _check_compression(compression: Optional[str]):
+    """检查压缩方式是否可用"""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"未知的压缩方式: {compression}，可选: gzip, zstd")
+    if compression == 'zstd' and zstandard is None:
+        raise ImportError("使用zstd压缩需要安装zstandard: pip install zstandard")
+
+
+class JsonLinesWriter:
+    """
+    JSON Lines写入器
+
+    每条记录编码为一行追加到文件末尾，每写入flush_every条刷新一次缓冲区，
+    fsync=True时刷新后同步到磁盘。压缩文件以追加的方式写入新的gzip成员/zstd帧，
+    已有内容不受影响。
+
+    用法:
+        with JsonLinesWriter('results.jsonl.gz') as writer:
+            for url in urls:
+                writer.write(scraper.scrape_race_result(url))
+    """
+
+    def __init__(self, filename: str, compression: Optional[str] = 'auto', codec: str = 'json',
+                 flush_every: int = 100, fsync: bool = False):
+        """
+        Args:
+            filename: 文件名
+            compression: None、'gzip'或'zstd'；'auto'时根据扩展名判断
+            codec: JSON编码方式，见serialization.encode
+            flush_every: 每写入多少条记录刷新一次，0表示只在关闭时刷新
+            fsync: 为True时每次刷新后调用os.fsync
+        """
+        if compression == 'auto':
+            compression = detect_compression(filename)
+        _check_compression(compression)
+
+        self.filename = filename
+        self.compression = compression
+        self.codec = codec
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.count = 0
+
+        self._file = open(filename, 'ab')
+        if compression == 'gzip':
+            self._stream = gzip.GzipFile(fileobj=self._file, mode='ab')
+        elif compression == 'zstd':
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._file, closefd=False)
+        else:
+            self._stream = self._file
+
+    def write(self, record: Any):
+        """写入一条记录"""
+        self._stream.write(encode(record, codec=self.codec) + b'\n')
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self.flush()
+
+    def write_many(self, records: Iterable[Any]):
+        """写入多条记录"""
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """刷新缓冲区（压缩流刷新到完整的块，已写入的记录可被读取）"""
+        if self.compression == 'zstd':
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        elif self.compression == 'gzip':
+            self._stream.flush()
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """结束压缩流并关闭文件"""
+        if self._file.closed:
+            return
+        if self._stream is not self._file:
+            if self.compression == 'zstd':
+                self._stream.flush(zstandard.FLUSH_FRAME)
+            self._stream.close()
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+    def __enter__(self) -> 'JsonLinesWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def iter_json_lines(filename: str, compression: Optional[str] = 'auto', codec: str = 'json') -> Iterator[Any]:
+    """
+    逐行读取JSON Lines文件
+
+    Args:
+        filename: 文件名
+        compression: None、'gzip'或'zstd'；'auto'时根据扩展名判断
+        codec: JSON编码方式，见serialization.decode
+
+    Yields:
+        每行解码后的记录（跳过空行）
+    """
+    if compression == 'auto':
+        compression = detect_compression(filename)
+    _check_compression(compression)
+
+    with open(filename, 'rb') as f:
+        if compression == 'gzip':
+            stream = gzip.GzipFile(fileobj=f, mode='rb')
+        elif compression == 'zstd':
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True, closefd=False)
+            stream = io.BufferedReader(reader)
+        else:
+            stream = f
+
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield decode(line, codec=codec)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按需解析的爬取结果
+多数调用只读取结果中的一两个部分（如比赛结果的horses、马匹信息的basic_info），
+但各部分的提取函数都要遍历整个文档。LazyResult保留已解析的文档，
+每个部分在第一次读取时才提取，之后直接返回缓存的值。
+
+LazyResult可以像字典一样读取、修改和遍历；dict(result)或to_dict()会提取全部部分。
+全部部分提取完成后不再引用文档，文档随之释放。
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+
+class Deferred:
+    """尚未提取的部分：第一次读取时调用function(*args)"""
+
+    __slots__ = ('function', 'args')
+
+    def __init__(self, function: Callable, *args):
+        self.function = function
+        self.args = args
+
+    def __call__(self):
+        return self.function(*self.args)
+
+
+class LazyResult(MutableMapping):
+    """
+    按需解析的爬取结果
+
+    用法:
+        result = scraper.scrape_race_result(url, lazy=True)
+        result['horses']                # 只提取参赛马匹
+        result.loaded                   # ['race_date', ..., 'horses', 'raw_html']
+        result.to_dict()                # 提取全部部分，返回普通字典
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            data: 字段 -> 取值；取值为Deferred时在第一次读取时提取
+        """
+        self._data: Dict[str, Any] = dict(data or {})
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._data[key]
+        if value.__class__ is Deferred:
+            value = value()
+            self._data[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self._data[key] = value
+
+    def __delitem__(self, key: str):
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        pending = [key for key in self._data if not self.is_loaded(key)]
+        return f'LazyResult(loaded={self.loaded!r}, pending={pending!r})'
+
+    def is_loaded(self, key: str) -> bool:
+        """该部分是否已经提取"""
+        return key in self._data and self._data[key].__class__ is not Deferred
+
+    @property
+    def loaded(self) -> List[str]:
+        """已经提取的字段"""
+        return [key for key in self._data if self._data[key].__class__ is not Deferred]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """提取全部部分，返回普通字典"""
+        return {key: self[key] for key in self._data}
+
+
+def select_sections(available: Sequence[str], sections: Optional[Iterable[str]]) -> List[str]:
+    """
+    检查并按页面顺序排列需要提取的部分
+
+    Args:
+        available: 可提取的部分（按结果中的顺序）
+        sections: 需要的部分，None表示全部
+
+    Returns:
+        需要提取的部分（按available的顺序）
+    """
+    if sections is None:
+        return list(available)
+    if isinstance(sections, str):
+        sections = [sections]
+    wanted = set(sections)
+    unknown = wanted - set(available)
+    if unknown:
+        raise ValueError(f"未知的部分: {', '.join(sorted(unknown))}，可选: {', '.join(available)}")
+    return [name for name in available if name in wanted]
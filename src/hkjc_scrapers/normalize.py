@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字符串列的向量化类型转换（需要安装numpy）
+爬虫输出的字段都是字符串。这里按列一次性转换一批参赛马匹或赛绩记录：
+
+- 完成时间（"1:09.45"、"1.09.45"）转换为秒（float64）
+- 磅重、档位、评分、途程等转换为整数
+- 赔率转换为小数
+- 名次拆分为数字名次和特殊名次代码（WV、PU等），并标记平头马（DH）
+- 日期转换为datetime64[D]
+
+数值列返回numpy.ma.MaskedArray，缺失、无法解析或超出结果类型范围的值被遮罩。
+一批记录中每列的不同取值很少（档位只有1-14，磅重、赔率、日期大量重复），每列先用numpy.unique去重，
+只对不同的取值逐个校验格式（只接受ASCII数字），再用numpy.char的向量化字符串操作解析，
+通过反向索引展开到整列。
+"""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from .utils import parse_race_date
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+
+# 特殊名次代码：position_code为在此元组中的下标，0表示正常完成，-1表示缺失或无法识别
+PLACING_CODES = ('', 'WV', 'WV-A', 'WX', 'WX-A', 'WXNR', 'PU', 'UR', 'FE', 'DNF', 'TNP', 'DISQ', 'VOID')
+_PLACING_INDEX = {code: index for index, code in enumerate(PLACING_CODES) if code}
+
+# 整数字符串（只接受ASCII数字：str.isdigit也接受"²"等字符，int()无法转换）
+INT_TEXT_PATTERN = re.compile(r'-?[0-9]+')
+UNSIGNED_INT_TEXT_PATTERN = re.compile(r'[0-9]+')
+# 整数或小数（最多一个小数点）
+NUMBER_TEXT_PATTERN = re.compile(r'[0-9]+\.?[0-9]*|\.[0-9]+')
+
+# (列名, 来源字段（按顺序取第一个非空值）, 类型)
+RUNNER_FIELDS: Tuple[Tuple[str, Tuple[str, ...], str], ...] = (
+    ('position', ('position',), 'position'),
+    ('number', ('number', '馬號'), 'int'),
+    ('draw', ('draw', '檔位'), 'int'),
+    ('weight', ('weight', '排位體重'), 'int'),
+    ('actual_weight', ('實際負磅',), 'int'),
+    ('rating', ('rating', '評分'), 'int'),
+    ('odds', ('odds', '獨贏賠率'), 'float'),
+    ('finish_time', ('完成時間', 'finish_time'), 'time'),
+)
+
+RACE_RECORD_FIELDS: Tuple[Tuple[str, Tuple[str, ...], str], ...] = (
+    ('race_date', ('date',), 'date'),
+    ('position', ('position',), 'position'),
+    ('distance', ('distance', '途程'), 'int'),
+    ('draw', ('draw',), 'int'),
+    ('weight', ('weight', '排位體重'), 'int'),
+    ('actual_weight', ('實際負磅',), 'int'),
+    ('rating', ('rating',), 'int'),
+    ('odds', ('odds',), 'float'),
+    ('finish_time', ('finish_time', '完成時間'), 'time'),
+)
+
+
+def _require_numpy():
+    """检查numpy是否可用"""
+    if np is None:
+        raise ImportError("向量化转换需要安装numpy: pip install numpy")
+
+
+def _strings(values: Iterable) -> 'np.ndarray':
+    """转换为定长字符串数组（None为空字符串）"""
+    _require_numpy()
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'U':
+        return values
+    return np.array(['' if value is None else str(value) for value in values], dtype=str)
+
+
+def _unique(values: Iterable) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    去重
+
+    Returns:
+        (去除首尾空白的不同取值, 每行对应的取值下标)
+    """
+    unique, inverse = np.unique(_strings(values), return_inverse=True)
+    return np.char.strip(unique), inverse.reshape(-1)
+
+
+def _expand(table: 'np.ndarray', valid: 'np.ndarray', inverse: 'np.ndarray') -> 'np.ma.MaskedArray':
+    """把按不同取值解析的结果展开到整列"""
+    return np.ma.MaskedArray(table[inverse], mask=~valid[inverse])
+
+
+def _empty(dtype) -> 'np.ma.MaskedArray':
+    """空列"""
+    return np.ma.MaskedArray(np.zeros(0, dtype=dtype), mask=np.zeros(0, dtype=bool))
+
+
+def _is_number(array: 'np.ndarray') -> 'np.ndarray':
+    """是否为整数或小数（最多一个小数点，只接受ASCII数字）"""
+    return np.array([NUMBER_TEXT_PATTERN.fullmatch(value) is not None for value in array.tolist()], dtype=bool)
+
+
+def _is_int(array: 'np.ndarray', signed: bool = True) -> 'np.ndarray':
+    """是否为整数字符串（按不同取值逐个匹配，取值很少）"""
+    pattern = INT_TEXT_PATTERN if signed else UNSIGNED_INT_TEXT_PATTERN
+    return np.array([pattern.fullmatch(value) is not None for value in array.tolist()], dtype=bool)
+
+
+def _parse_ints(array: 'np.ndarray', valid: 'np.ndarray', dtype) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    把valid中的整数字符串转换为dtype
+
+    先按int64解析再检查dtype的范围（np.iinfo），直接转换会在超出范围时回绕或抛出异常。
+
+    Returns:
+        (取值表, 有效标记)，超出范围的值标记为无效
+    """
+    table = np.zeros(array.shape, dtype=dtype)
+    # 超过18位的数字可能超出int64
+    valid = valid & (np.char.str_len(np.char.lstrip(array, '-')) <= 18)
+    if valid.any():
+        indices = np.flatnonzero(valid)
+        values = array[indices].astype(np.int64)
+        info = np.iinfo(dtype)
+        in_range = (values >= info.min) & (values <= info.max)
+        valid[indices[~in_range]] = False
+        table[indices[in_range]] = values[in_range]
+    return table, valid
+
+
+def int_column(values: Iterable, dtype=None) -> 'np.ma.MaskedArray':
+    """
+    整数列（如"1185"、"1,185"）
+
+    Args:
+        values: 字符串序列
+        dtype: 结果类型，默认int32
+
+    Returns:
+        遮罩数组，非数字或超出dtype范围的值被遮罩
+    """
+    unique, inverse = _unique(values)
+    if not inverse.size:
+        return _empty(dtype or np.int32)
+    unique = np.char.replace(unique, ',', '')
+    table, valid = _parse_ints(unique, _is_int(unique), dtype or np.int32)
+    return _expand(table, valid, inverse)
+
+
+def float_column(values: Iterable) -> 'np.ma.MaskedArray':
+    """
+    小数列（如赔率"4.7"）
+
+    Returns:
+        float64遮罩数组，非数字的值被遮罩
+    """
+    unique, inverse = _unique(values)
+    if not inverse.size:
+        return _empty(np.float64)
+    unique = np.char.replace(unique, ',', '')
+    valid = _is_number(unique)
+    table = np.full(unique.shape, np.nan)
+    if valid.any():
+        table[valid] = unique[valid].astype(np.float64)
+    return _expand(table, valid, inverse)
+
+
+def finish_time_column(values: Iterable) -> 'np.ma.MaskedArray':
+    """
+    完成时间列，转换为秒
+
+    支持"1:09.45"、"1.09.45"和"58.12"。
+
+    Returns:
+        float64遮罩数组，无法解析的值被遮罩
+    """
+    unique, inverse = _unique(values)
+    if not inverse.size:
+        return _empty(np.float64)
+    array = np.char.replace(unique, ':', '.')
+    dots = np.char.count(array, '.')
+    result = np.full(array.shape, np.nan)
+
+    # 分.秒.小数
+    with_minutes = dots == 2
+    if with_minutes.any():
+        parts = np.char.partition(array[with_minutes], '.')
+        minutes, rest = parts[:, 0], parts[:, 2]
+        valid = _is_int(minutes, signed=False) & _is_number(rest)
+        seconds = np.full(minutes.shape, np.nan)
+        seconds[valid] = minutes[valid].astype(np.float64) * 60 + rest[valid].astype(np.float64)
+        result[with_minutes] = seconds
+
+    # 秒.小数
+    seconds_only = (dots == 1) & _is_number(array)
+    if seconds_only.any():
+        result[seconds_only] = array[seconds_only].astype(np.float64)
+
+    return _expand(result, ~np.isnan(result), inverse)
+
+
+def position_column(values: Iterable) -> Dict[str, 'np.ndarray']:
+    """
+    名次列
+
+    Returns:
+        {
+            'position': 数字名次（int16遮罩数组，特殊名次和超出int16范围的值被遮罩）,
+            'position_code': 特殊名次代码（int8，见PLACING_CODES；0为正常完成，-1为缺失或无法识别）,
+            'dead_heat': 是否平头（bool）,
+        }
+    """
+    unique, inverse = _unique(values)
+    if not inverse.size:
+        return {'position': _empty(np.int16), 'position_code': np.zeros(0, dtype=np.int8),
+                'dead_heat': np.zeros(0, dtype=bool)}
+    unique = np.char.upper(unique)
+    dead_heat = np.char.endswith(unique, 'DH')
+    base = np.char.strip(np.where(dead_heat, np.char.replace(unique, 'DH', ''), unique))
+
+    numeric = _is_int(base, signed=False)
+    position, valid = _parse_ints(base, numeric, np.int16)
+
+    codes = np.array([_PLACING_INDEX.get(value, -1) for value in base], dtype=np.int8)
+    codes[numeric] = 0
+
+    return {
+        'position': _expand(position, valid, inverse),
+        'position_code': codes[inverse],
+        'dead_heat': dead_heat[inverse],
+    }
+
+
+def date_column(values: Iterable) -> 'np.ma.MaskedArray':
+    """
+    日期列（格式见parse_race_date）
+
+    Returns:
+        datetime64[D]遮罩数组，无法解析的值被遮罩
+    """
+    unique, inverse = _unique(values)
+    if not inverse.size:
+        return _empty('datetime64[D]')
+    table = np.array([parse_race_date(value) or 'NaT' for value in unique], dtype='datetime64[D]')
+    return _expand(table, ~np.isnat(table), inverse)
+
+
+_COLUMN_FUNCTIONS = {
+    'int': int_column,
+    'float': float_column,
+    'time': finish_time_column,
+    'date': date_column,
+}
+
+
+def column_values(rows: Sequence[Mapping], keys: Sequence[str]) -> List:
+    """取出一列的值：按keys顺序取每行第一个非空的字段"""
+    if len(keys) == 1:
+        key = keys[0]
+        return [row.get(key) for row in rows]
+    values = []
+    for row in rows:
+        value = None
+        for key in keys:
+            value = row.get(key)
+            if value not in (None, ''):
+                break
+        values.append(value)
+    return values
+
+
+def normalize_rows(rows: Sequence[Mapping],
+                   fields: Sequence[Tuple[str, Tuple[str, ...], str]]) -> Dict[str, 'np.ndarray']:
+    """
+    按字段定义转换一批记录
+
+    Args:
+        rows: 字典或记录
+        fields: (列名, 来源字段, 类型)，类型为int、float、time、date或position
+
+    Returns:
+        列名 -> 数组；position类型展开为position、position_code、dead_heat三列
+    """
+    _require_numpy()
+    rows = list(rows)
+    columns = {}
+    for name, keys, kind in fields:
+        values = column_values(rows, keys)
+        if kind == 'position':
+            columns.update(position_column(values))
+        else:
+            columns[name] = _COLUMN_FUNCTIONS[kind](values)
+    return columns
+
+
+def normalize_runners(rows: Sequence[Mapping]) -> Dict[str, 'np.ndarray']:
+    """转换一批参赛马匹（RaceResultScraper的horses）"""
+    return normalize_rows(rows, RUNNER_FIELDS)
+
+
+def normalize_race_records(rows: Sequence[Mapping]) -> Dict[str, 'np.ndarray']:
+    """转换一批赛绩记录（HorseInfoScraper的race_records）"""
+    return normalize_rows(rows, RACE_RECORD_FIELDS)
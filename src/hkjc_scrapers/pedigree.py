@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+血统关系图
+由马匹资料（父系、母系、外祖父）和比赛结果中头马的血统逐步建立，回答：
+
+- 某父系/母系/外祖父的所有后代马匹
+- 某匹马的全同胞、同母或同父的兄弟姊妹
+- 某匹马的祖先、某匹马或种马的后代（逐代展开）
+- 某父系的后代在某途程范围内的所有赛绩（配合FormIndex）
+
+名称在同一个驻留池中保存（见interning），邻接表以名称为键，
+每条边的增加、删除和查找都是常数时间。
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .interning import intern_text
+
+
+# 血统关系：马匹资料中的字段
+PARENT_ROLES = ('sire', 'dam')
+
+
+def _name(value) -> Optional[str]:
+    """统一名称（去除空白，空值和":"为None）并驻留"""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if not value or value == ':':
+        return None
+    return intern_text(value)
+
+
+def _add(adjacency: Dict, key, value):
+    """邻接表中加入一条边（按加入顺序保存，删除为常数时间）"""
+    if key is not None:
+        adjacency.setdefault(key, {})[value] = None
+
+
+def _remove(adjacency: Dict, key, value):
+    """邻接表中删除一条边"""
+    edges = adjacency.get(key)
+    if edges is not None:
+        edges.pop(value, None)
+        if not edges:
+            del adjacency[key]
+
+
+class PedigreeGraph:
+    """
+    血统关系图
+
+    用法:
+        graph = PedigreeGraph()
+        for horse in horses:
+            graph.add_horse(horse)          # HorseInfoScraper.scrape_horse_info的返回值
+
+        graph.offspring('Starspangledbanner')
+        graph.siblings('HK_2023_J256')
+        graph.ancestors('HK_2023_J256', generations=2)
+        graph.runs_by_sire('Starspangledbanner', form_index, min_distance=1800)
+    """
+
+    def __init__(self):
+        # horse_id -> {'name', 'sire', 'dam', 'maternal_grandsire'}
+        self.horses: Dict[str, Dict[str, Optional[str]]] = {}
+        # 名称 -> {'sire': 父, 'dam': 母}
+        self.parents: Dict[str, Dict[str, str]] = {}
+        # 名称 -> 子女名称
+        self.children: Dict[str, Dict[str, None]] = {}
+        # 父系/母系/外祖父名称 -> horse_id
+        self._by_role: Dict[str, Dict[str, Dict[str, None]]] = {
+            'sire': {}, 'dam': {}, 'maternal_grandsire': {}}
+        # (父系, 母系) -> horse_id
+        self._by_parents: Dict[Tuple[str, str], Dict[str, None]] = {}
+        # 名称 -> horse_id
+        self._ids_by_name: Dict[str, Dict[str, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self.horses)
+
+    def __contains__(self, horse_id: str) -> bool:
+        return horse_id in self.horses
+
+    def add(self, horse_id: str, name: Optional[str] = None, sire: Optional[str] = None,
+            dam: Optional[str] = None, maternal_grandsire: Optional[str] = None):
+        """
+        加入（或更新）一匹马的血统
+
+        已有的取值不会被空值覆盖（比赛结果中的血统没有外祖父）。
+        """
+        if not horse_id:
+            return
+        previous = self.horses.get(horse_id)
+        entry = {
+            'name': _name(name),
+            'sire': _name(sire),
+            'dam': _name(dam),
+            'maternal_grandsire': _name(maternal_grandsire),
+        }
+        if previous is not None:
+            for key, value in previous.items():
+                if entry[key] is None:
+                    entry[key] = value
+            if entry == previous:
+                return
+            self._unlink(horse_id, previous)
+        self.horses[horse_id] = entry
+        self._link(horse_id, entry)
+
+    def _link(self, horse_id: str, entry: Dict):
+        """加入一匹马的边"""
+        name = entry['name'] or horse_id
+        _add(self._ids_by_name, entry['name'], horse_id)
+        for role in self._by_role:
+            _add(self._by_role[role], entry[role], horse_id)
+        if entry['sire'] and entry['dam']:
+            _add(self._by_parents, (entry['sire'], entry['dam']), horse_id)
+
+        for role in PARENT_ROLES:
+            if entry[role]:
+                self._set_parent(name, role, entry[role])
+        # 外祖父是母系的父系
+        if entry['dam'] and entry['maternal_grandsire']:
+            self._set_parent(entry['dam'], 'sire', entry['maternal_grandsire'])
+
+    def _set_parent(self, name: str, role: str, parent: str):
+        """设置父系或母系（取代原有的取值时一并删除原来的子女边）"""
+        parents = self.parents.setdefault(name, {})
+        previous = parents.get(role)
+        if previous is not None and previous != parent:
+            _remove(self.children, previous, name)
+        parents[role] = parent
+        _add(self.children, parent, name)
+
+    def _unlink(self, horse_id: str, entry: Dict):
+        """
+        删除一匹马的边
+
+        只删除该马自己的父系、母系；母系与外祖父的关系由其他同母马匹共用，保留。
+        该马是其他马匹的母系时，由那些马匹的外祖父恢复该马的父系。
+        """
+        name = entry['name'] or horse_id
+        _remove(self._ids_by_name, entry['name'], horse_id)
+        for role in self._by_role:
+            _remove(self._by_role[role], entry[role], horse_id)
+        if entry['sire'] and entry['dam']:
+            _remove(self._by_parents, (entry['sire'], entry['dam']), horse_id)
+        parents = self.parents.get(name, {})
+        for role in PARENT_ROLES:
+            parent = entry[role]
+            if parent and parents.get(role) == parent:
+                del parents[role]
+                _remove(self.children, parent, name)
+        if not parents:
+            self.parents.pop(name, None)
+        for foal in self._by_role['dam'].get(name, ()):
+            grandsire = self.horses[foal]['maternal_grandsire']
+            if grandsire:
+                self._set_parent(name, 'sire', grandsire)
+                break
+
+    def add_horse(self, horse: Mapping):
+        """加入HorseInfoScraper.scrape_horse_info的返回值"""
+        if not horse:
+            return
+        info = horse.get('basic_info') or {}
+        self.add(horse.get('horse_id'), info.get('horse_name'), info.get('sire'), info.get('dam'),
+                 info.get('maternal_grandsire'))
+
+    def add_horses(self, horses: Iterable[Mapping]):
+        """加入多匹马"""
+        for horse in horses:
+            self.add_horse(horse)
+
+    def add_race_result(self, result: Mapping):
+        """加入比赛结果中头马的血统（RaceResultScraper.scrape_race_result的返回值）"""
+        pedigree = (result or {}).get('pedigree') or {}
+        self.add(pedigree.get('horse_id'), pedigree.get('horse_name'), pedigree.get('sire'), pedigree.get('dam'))
+
+    def offspring(self, name: str, role: str = 'sire') -> List[str]:
+        """
+        某父系（或母系、外祖父）的后代马匹
+
+        Args:
+            name: 名称
+            role: 'sire'、'dam'或'maternal_grandsire'
+
+        Returns:
+            horse_id列表（按加入顺序）
+        """
+        return list(self._by_role[role].get(_name(name), ()))
+
+    def siblings(self, horse_id: str, relation: str = 'dam') -> List[str]:
+        """
+        某匹马的兄弟姊妹（不含该马）
+
+        Args:
+            horse_id: 马匹ID
+            relation: 'full'（同父同母）、'dam'（同母，包括全同胞）或'sire'（同父）
+
+        Returns:
+            horse_id列表
+        """
+        entry = self.horses.get(horse_id)
+        if entry is None:
+            return []
+        if relation == 'full':
+            if not (entry['sire'] and entry['dam']):
+                return []
+            candidates = self._by_parents.get((entry['sire'], entry['dam']), ())
+        elif relation in PARENT_ROLES:
+            candidates = self._by_role[relation].get(entry[relation], ())
+        else:
+            raise ValueError(f"未知的关系: {relation}，可选: full、dam、sire")
+        return [other for other in candidates if other != horse_id]
+
+    def _start(self, horse_id_or_name: str) -> Optional[str]:
+        """horse_id或名称对应的图中名称"""
+        entry = self.horses.get(horse_id_or_name)
+        if entry is not None:
+            return entry['name'] or horse_id_or_name
+        return _name(horse_id_or_name)
+
+    def ancestors(self, horse_id_or_name: str, generations: int = 3) -> List[Tuple[int, str, str]]:
+        """
+        祖先（逐代展开）
+
+        Args:
+            horse_id_or_name: 马匹ID或名称
+            generations: 展开的代数
+
+        Returns:
+            [(代数, 关系路径, 名称), ...]，关系路径如"sire"、"dam.sire"（外祖父）
+        """
+        start = self._start(horse_id_or_name)
+        result = []
+        queue = deque([(start, 0, '')])
+        while queue:
+            name, generation, path = queue.popleft()
+            if generation >= generations:
+                continue
+            for role, parent in self.parents.get(name, {}).items():
+                parent_path = f'{path}.{role}' if path else role
+                result.append((generation + 1, parent_path, parent))
+                queue.append((parent, generation + 1, parent_path))
+        return result
+
+    def descendants(self, horse_id_or_name: str, generations: int = 2) -> List[Tuple[int, str]]:
+        """
+        后代（逐代展开）
+
+        Returns:
+            [(代数, 名称), ...]
+        """
+        start = self._start(horse_id_or_name)
+        result = []
+        seen = {start}
+        queue = deque([(start, 0)])
+        while queue:
+            name, generation = queue.popleft()
+            if generation >= generations:
+                continue
+            for child in self.children.get(name, ()):
+                if child not in seen:
+                    seen.add(child)
+                    result.append((generation + 1, child))
+                    queue.append((child, generation + 1))
+        return result
+
+    def horse_ids(self, name: str) -> List[str]:
+        """名称对应的horse_id（同名马匹可能有多个）"""
+        return list(self._ids_by_name.get(_name(name), ()))
+
+    def runs_by_sire(self, sire: str, form_index, min_distance: Optional[int] = None,
+                     max_distance: Optional[int] = None, role: str = 'sire') -> List[Tuple[str, Mapping]]:
+        """
+        某父系后代的赛绩
+
+        Args:
+            sire: 父系名称
+            form_index: 已加入这些马匹赛绩的FormIndex
+            min_distance: 最短途程（米，含）
+            max_distance: 最长途程（米，含）
+            role: 'sire'、'dam'或'maternal_grandsire'
+
+        Returns:
+            [(horse_id, 赛绩记录), ...]，每匹马的赛绩由旧到新
+        """
+        low = 0 if min_distance is None else int(min_distance)
+        high = float('inf') if max_distance is None else int(max_distance)
+        runs = []
+        for horse_id in self.offspring(sire, role):
+            form = form_index.horse(horse_id)
+            if form is None:
+                continue
+            # 途程缺失为MISSING（负数），不会落在范围内
+            runs.extend((horse_id, record) for distance, record in zip(form.distances, form.records)
+                        if low <= distance <= high)
+        return runs
@@ -7,16 +7,97 @@
 
 import requests
 from bs4 import BeautifulSoup
-import json
 import re
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Union
 from urllib.parse import urlparse, parse_qs
 
+from .csv_appender import CsvAppender
+from .interning import intern_fields, intern_text
+from .lazy import Deferred, LazyResult, select_sections
+from .records import Runner
+from .serialization import dump_json
+from .sqlite_store import SQLiteStore
+from .streaming import DEFAULT_MAX_BYTES, read_html
+
+
+# 事件报告区块的标题
+INCIDENT_HEADING_PATTERN = re.compile(r'競賽事件報告|競賽事件|Racing Incident|Incident Report', re.IGNORECASE)
+
+# 事件报告表头：同时包含马名列和事件列
+INCIDENT_HEADER_KEYWORDS = (('馬名', 'Horse'), ('事件', '報告', 'Incident'))
+
+# 追加保存CSV时每行附加的比赛字段
+RACE_CONTEXT_FIELDS = ('race_date', 'racecourse', 'race_no')
+
+# 结果中由页面提取的部分（按结果中的顺序）
+RESULT_SECTIONS = ('race_info', 'horses', 'race_result', 'incident_reports', 'pedigree')
+
+# 开启字符串驻留时需要驻留的字段（取值种类少、重复多）
+INTERNED_RUNNER_FIELDS = ('number', 'jockey', 'trainer', 'draw', 'weight', 'rating', 'position')
+
+# 流式读取时各部分完整读取的标志：赛事资料在名次表之前，名次表读完即可
+RESULT_TABLE_SECTIONS = frozenset({'race_info', 'horses', 'race_result'})
+
+
+def _is_incident_header(texts: Iterable[str]) -> bool:
+    """一行单元格的文本是否为事件报告表头"""
+    text = ''.join(texts)
+    return all(any(keyword in text for keyword in keywords) for keywords in INCIDENT_HEADER_KEYWORDS)
+
+
+class _ResultSectionTracker:
+    """
+    流式读取比赛结果页面时，判断所需部分的表格是否都已完整读取
+
+    以lxml元素调用（每个元素结束时一次），所需部分都已读取时返回True。
+    表格的判断与各提取函数相同：名次表为表头超过5列且包含"馬名"的表格，
+    事件报告为"競賽事件報告"等标题之后第一个表头包含马名和事件列的最内层表格，
+    血统为包含"血統"/"父系"的表格。
+    页面没有事件报告标题时，提取函数改按表头查找，需要整个页面，因此读取到页面结束。
+    """
+
+    def __init__(self, sections: Iterable[str]):
+        self.pending = set(sections)
+        self.incident_heading = False
+
+    def __call__(self, element) -> bool:
+        if element.tag != 'table':
+            if not self.incident_heading and isinstance(element.text, str) and \
+                    INCIDENT_HEADING_PATTERN.search(element.text):
+                self.incident_heading = True
+            return False
+        # 外层布局表格在页面末尾才结束，不作判断
+        if element.find('.//table') is not None:
+            return False
+
+        rows = [[cell for cell in row if cell.tag in ('td', 'th')] for row in element.iter('tr')]
+        header = next((row for row in rows if len(row) > 5), None)
+        if header is not None:
+            header_text = ''.join(text for cell in header for text in cell.itertext())
+            if '馬名' in header_text or 'Horse' in header_text:
+                self.pending -= RESULT_TABLE_SECTIONS
+        if 'incident_reports' in self.pending and self.incident_heading and any(
+                len(row) >= 3 and _is_incident_header(text for cell in row for text in cell.itertext())
+                for row in rows):
+            self.pending.discard('incident_reports')
+        if 'pedigree' in self.pending:
+            text = ''.join(element.itertext())
+            if '血統' in text or 'Pedigree' in text or '父系' in text:
+                self.pending.discard('pedigree')
+        return not self.pending
+
 
 class RaceResultScraper:
     """香港赛马会爬虫类"""
     
-    def __init__(self):
+    def __init__(self, use_records: bool = False, intern_strings: bool = False):
+        """
+        Args:
+            use_records: 为True时参赛马匹使用紧凑的Runner记录（__slots__）代替字典
+            intern_strings: 为True时驻留表头和骑师、练马师等重复取值，进程内只保留一个实例
+        """
+        self.use_records = use_records
+        self.intern_strings = intern_strings
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -24,22 +105,37 @@ class RaceResultScraper:
             'Accept-Language': 'zh-HK,zh;q=0.9,en;q=0.8',
         })
     
-    def scrape_race_result(self, url: str) -> Dict:
+    def scrape_race_result(self, url: str, lazy: bool = False,
+                           sections: Optional[Iterable[str]] = None, stream: bool = False,
+                           max_bytes: Optional[int] = DEFAULT_MAX_BYTES) -> Union[Dict, LazyResult]:
         """
         爬取比赛结果页面
         
         Args:
             url: 比赛结果页面URL
+            lazy: 为True时返回LazyResult，各部分在第一次读取时才提取（提取出错时在读取时抛出异常）
+            sections: 只提取这些部分（RESULT_SECTIONS中的名称），None为全部；
+                      未选择的部分不出现在结果中
+            stream: 为True时分块下载，所选部分的表格都已读取后立即停止，
+                    raw_html只包含已读取的部分
+            max_bytes: 流式下载的响应大小上限（字节），超过时按请求错误处理；None为不限
             
         Returns:
             包含所有提取信息的字典
         """
+        selected = select_sections(RESULT_SECTIONS, sections)
         try:
-            response = self.session.get(url, timeout=30)
-            response.encoding = 'utf-8'
-            response.raise_for_status()
+            if stream:
+                response = self.session.get(url, timeout=30, stream=True)
+                response.raise_for_status()
+                html, _ = read_html(response, _ResultSectionTracker(selected), max_bytes=max_bytes)
+            else:
+                response = self.session.get(url, timeout=30)
+                response.encoding = 'utf-8'
+                response.raise_for_status()
+                html = response.text
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             
             # 解析URL参数
             parsed_url = urlparse(url)
@@ -49,15 +145,19 @@ class RaceResultScraper:
                 'race_date': params.get('racedate', [''])[0],
                 'racecourse': params.get('Racecourse', [''])[0],
                 'race_no': params.get('RaceNo', [''])[0],
-                'race_info': self._extract_race_info(soup),
-                'horses': self._extract_horse_info(soup),
-                'race_result': self._extract_race_result(soup),
-                'incident_reports': self._extract_incident_reports(soup),
-                'pedigree': self._extract_pedigree(soup),
-                'raw_html': response.text  # 保存原始HTML以备后续分析
             }
+            extractors = {
+                'race_info': self._extract_race_info,
+                'horses': self._extract_horse_info,
+                'race_result': self._extract_race_result,
+                'incident_reports': self._extract_incident_reports,
+                'pedigree': self._extract_pedigree,
+            }
+            for name in selected:
+                result[name] = Deferred(extractors[name], soup) if lazy else extractors[name](soup)
+            result['raw_html'] = html  # 保存原始HTML以备后续分析
             
-            return result
+            return LazyResult(result) if lazy else result
             
         except requests.RequestException as e:
             print(f"请求错误: {e}")
@@ -140,6 +240,9 @@ class RaceResultScraper:
             if not headers:
                 continue
             
+            if self.intern_strings:
+                headers = [intern_text(header) for header in headers]
+            
             # 提取数据行
             data_rows = rows[rows.index(header_row) + 1:] if header_row else rows
             
@@ -193,7 +296,9 @@ class RaceResultScraper:
                                 horse_data[header] = value
                 
                 if horse_data:
-                    horses.append(horse_data)
+                    if self.intern_strings:
+                        intern_fields(horse_data, INTERNED_RUNNER_FIELDS)
+                    horses.append(Runner(horse_data) if self.use_records else horse_data)
         
         return horses
     
@@ -243,7 +348,114 @@ class RaceResultScraper:
         return result
     
     def _extract_incident_reports(self, soup: BeautifulSoup) -> List[Dict]:
-        """提取比赛事件报告"""
+        """提取比赛事件报告（先按标题和结构定位事件报告区块，只解析该表格的行）"""
+        incidents = []
+        
+        table = self._find_incident_report_table(soup)
+        if table is None:
+            return incidents
+        
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) < 3:
+                continue
+            
+            # 跳过表头行（全部由<th>组成，或文本为事件报告表头的行）；没有表头的表格从第一行开始都是数据
+            if self._is_header_row(cells):
+                continue
+            
+            # 每个单元格只取一次文本
+            first_text = cells[0].get_text(strip=True)
+            second_text = cells[1].get_text(strip=True)
+            
+            incident = {}
+            
+            # 提取位置/名次
+            if first_text.isdigit():
+                incident['position'] = first_text
+            
+            # 提取马匹编号
+            if second_text.isdigit():
+                incident['horse_number'] = second_text
+            
+            # 提取马匹名称和链接
+            for link in row.find_all('a', href=True):
+                horse_id_match = re.search(r'horseid=([^&]+)', link.get('href', ''))
+                if horse_id_match:
+                    incident['horse_id'] = horse_id_match.group(1)
+                    incident['horse_name'] = link.get_text(strip=True)
+            
+            # 提取事件描述（通常在最后一列）
+            incident['description'] = cells[-1].get_text(strip=True)
+            
+            incidents.append(incident)
+        
+        return incidents
+    
+    def _find_incident_report_table(self, soup: BeautifulSoup):
+        """
+        定位事件报告表格
+        
+        先查找"競賽事件報告"等标题，取标题所在或其后的第一个最内层表格；
+        如果页面没有标题，再按结构查找表头包含"報告"的最内层表格。
+        外层布局表格（内部嵌套其他表格）不会被选中。
+        
+        Returns:
+            事件报告表格，找不到时返回None
+        """
+        # 按标题定位
+        for heading in soup.find_all(string=INCIDENT_HEADING_PATTERN):
+            container = heading.find_parent('table')
+            if container is not None and self._is_incident_table(container):
+                return container
+            
+            next_table = heading.find_next('table')
+            while next_table is not None and next_table.find('table') is not None:
+                # 标题后面是布局表格，继续向内查找
+                next_table = next_table.find('table')
+            if next_table is not None and self._is_incident_table(next_table):
+                return next_table
+        
+        # 按结构定位：表头包含"報告"/"Incident"的最内层表格
+        for table in soup.find_all('table'):
+            if table.find('table') is not None:
+                continue
+            header_row = table.find('tr')
+            if header_row is None:
+                continue
+            header_text = header_row.get_text()
+            if ('報告' in header_text or 'Incident' in header_text) and self._is_incident_table(table):
+                return table
+        
+        return None
+    
+    def _is_header_row(self, cells) -> bool:
+        """是否为事件报告表格的表头行"""
+        return all(cell.name == 'th' for cell in cells) or \
+            _is_incident_header(cell.get_text(strip=True) for cell in cells)
+    
+    def _is_incident_table(self, table) -> bool:
+        """
+        判断表格是否为事件报告表格
+        
+        必须是最内层表格，且第一个三列以上的行为包含马名和事件列的表头；
+        没有表头的表格，每个三列以上的行都由<td>组成并有马匹链接。
+        导航链接或标题之后无关的表格（如名次表）不会被选中。
+        """
+        if table.find('table') is not None:
+            return False
+        rows = [row for row in table.find_all('tr') if len(row.find_all(['td', 'th'])) >= 3]
+        if not rows:
+            return False
+        first_cells = rows[0].find_all(['td', 'th'])
+        if _is_incident_header(cell.get_text(strip=True) for cell in first_cells):
+            return True
+        if any(cell.name == 'th' for cell in first_cells):
+            return False
+        return all(row.find('a', href=re.compile('horseid=')) is not None for row in rows)
+    
+    def _extract_incident_reports_legacy(self, soup: BeautifulSoup) -> List[Dict]:
+        """旧版事件报告提取方法：扫描所有包含"報告"的表格（保留用于基准对比）"""
         incidents = []
         
         # 查找包含"競賽事件報告"或"Incident"的部分
@@ -348,20 +560,58 @@ class RaceResultScraper:
         
         return pedigree
     
-    def save_to_json(self, data: Dict, filename: str):
-        """保存数据到JSON文件"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def save_to_json(self, data: Dict, filename: str, codec: str = 'json', pretty: bool = False):
+        """
+        保存数据到JSON文件
+        
+        Args:
+            data: 要保存的数据
+            filename: 文件名
+            codec: 编码方式，'json'（标准库）、'orjson'或'msgspec'，后两者需要安装对应的包
+            pretty: 为True时缩进2格输出，默认紧凑输出
+        """
+        dump_json(data, filename, codec=codec, pretty=pretty)
         print(f"数据已保存到: {filename}")
     
-    def save_to_csv(self, data: Dict, filename: str):
-        """保存马匹数据到CSV文件"""
+    def save_to_sqlite(self, data: Dict, filename: str):
+        """
+        保存比赛结果到SQLite数据库（表结构见sqlite_store），重复保存时更新
+        
+        Args:
+            data: 爬取结果
+            filename: 数据库文件名
+        """
+        if not data.get('horses'):
+            print("没有马匹数据可保存")
+            return
+        
+        with SQLiteStore(filename) as store:
+            store.add_race_result(data)
+        print(f"数据已保存到数据库: {filename}")
+    
+    def save_to_csv(self, data: Dict, filename: str, append: bool = False):
+        """
+        保存马匹数据到CSV文件
+        
+        Args:
+            data: scrape_race_result的返回值
+            filename: 文件名
+            append: 为True时追加到已有文件（多场比赛写入同一文件），
+                    每行附加race_date、racecourse、race_no列，新出现的列追加到表头
+        """
         import csv
         
         if 'horses' not in data or not data['horses']:
             print("没有马匹数据可保存")
             return
         
+        if append:
+            context = {key: data.get(key, '') for key in RACE_CONTEXT_FIELDS}
+            with CsvAppender(filename, fieldnames=RACE_CONTEXT_FIELDS) as appender:
+                appender.write_rows(data['horses'], **context)
+            print(f"马匹数据已追加到: {filename}")
+            return
+        
         with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
             if data['horses']:
                 fieldnames = list(data['horses'][0].keys())
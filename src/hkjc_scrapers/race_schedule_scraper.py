@@ -7,16 +7,216 @@
 
 import requests
 from bs4 import BeautifulSoup
-import json
 import re
-from typing import Dict, List, Optional
-from datetime import datetime
+import calendar
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Union
+from datetime import date, datetime
+
+from .csv_appender import CsvAppender
+from .interning import intern_fields
+from .records import RaceDay
+from .schedule_index import ScheduleIndex
+from .serialization import dump_json
+from .sqlite_store import SQLiteStore
+from .utils import parse_race_date
+
+
+# 班次数字对应的中文班次
+CHINESE_CLASS_NAMES = {
+    1: '第一班',
+    2: '第二班',
+    3: '第三班',
+    4: '第四班',
+    5: '第五班'
+}
+
+# 月份名称
+MONTH_PATTERN = r'[一二三四五六七八九十]+月|九月|十月|十一月|十二月|一月|二月|三月|四月|五月|六月|七月'
+MONTH_RE = re.compile(MONTH_PATTERN)
+MONTH_HEADER_RE = re.compile(r'([一二三四五六七八九十]+年)?(' + MONTH_PATTERN + ')')
+
+# 图例关键词：(图例分类, 名称, 正则)
+LEGEND_KEYWORDS = [
+    ('venues', '跑马地', r'跑馬地|跑马地'),
+    ('venues', '沙田', r'沙田'),
+    ('race_types', '日赛', r'日賽|日赛'),
+    ('race_types', '黄昏赛', r'黄昏賽|黄昏赛'),
+    ('race_types', '夜赛', r'夜賽|夜赛'),
+    ('track_types', '草地', r'草地'),
+    ('track_types', '混合赛道', r'混合賽道|混合赛道'),
+    ('race_classes', '一级赛', r'一級賽|一级赛'),
+    ('race_classes', '二级赛', r'二級賽|二级赛'),
+    ('race_classes', '三级赛', r'三級賽|三级赛'),
+    ('race_classes', '四岁', r'四歲|四岁'),
+]
+
+# 特殊标记说明
+SPECIAL_MARKS = {
+    'C': '盃賽',
+    'P': '獲得優先出賽權',
+    'S': '特別參賽條件'
+}
+
+# 通知：包含"取消"、"延期"等关键词的句子（通知按正则的次序排列）
+NOTICE_PATTERNS = [r'原定於.*?取消', r'原定于.*?取消', r'延期', r'改期', r'注意.*?事項', r'注意.*?事项']
+NOTICE_PATTERN = '|'.join(NOTICE_PATTERNS)
+
+# 页面文本只匹配一次的组合正则：通知用零宽前瞻匹配，不会吞掉其中的图例关键词；
+# 每个通知正则各自一个可选的前瞻分组，同一位置上每个通知正则都会尝试，
+# 匹配时跳过与同一正则上一个匹配重叠的位置（与逐个正则findall相同）
+FIXTURE_TEXT_RE = re.compile(
+    '(?=' + NOTICE_PATTERN + ')' +
+    ''.join(f'(?:(?=(?P<notice{i}>{pattern}))|)' for i, pattern in enumerate(NOTICE_PATTERNS)) + '|' +
+    '|'.join(f'(?P<legend{i}>{pattern})' for i, (_, _, pattern) in enumerate(LEGEND_KEYWORDS)),
+    re.IGNORECASE
+)
+
+# 各解析位置使用的跑道类型名称
+DAY_TRACK_TYPE_NAMES = {'mixed': '混合賽路', 'turf': '草地', 'awt': '全天候'}
+RACE_TRACK_TYPE_NAMES = {'mixed': '混合赛道', 'turf': '草地', 'awt': '全天候跑道'}
+
+# 赛程CSV的列（支持新的races结构）
+SCHEDULE_CSV_FIELDS = ['date', 'day', 'month', 'year', 'venues', 'race_types', 'track_types',
+                       'race_number', 'class', 'grade', 'track_type',
+                       'distance', 'distance_meters', 'distance_race_number', 'has_cup_mark',
+                       'score_range', 'score_min', 'score_max', 'race_text']
+
+
+class IconInfo(NamedTuple):
+    """赛程表图标的含义"""
+    venue: Optional[str] = None  # 沙田、跑马地
+    race_type: Optional[str] = None  # 日赛、黄昏赛、夜赛
+    track: Optional[str] = None  # mixed、turf、awt
+    race_class: Optional[str] = None  # 第一班、第二班等
+    grade: Optional[str] = None  # 一级赛、二级赛等
+
+
+# 图标规则：含义 -> ((取值, 图片地址的正则, alt的正则), ...)，按优先次序排列，取第一个符合的
+ICON_RULES = {
+    'venue': (
+        ('跑马地', r'hv\.gif|hv-ch', r'跑馬地|跑马地'),
+        ('沙田', r'st\.gif|st-ch', r'沙田'),
+    ),
+    'race_type': (
+        ('日赛', r'day', r'日賽|日赛'),
+        ('黄昏赛', r'dusk', r'黄昏賽|黄昏赛'),
+        ('夜赛', r'night', r'夜賽|夜赛'),
+    ),
+    'track': (
+        ('awt', r'awt', r'全天候'),
+        ('turf', r'turf', r'草地'),
+        ('mixed', r'mixed', r'混合'),
+    ),
+    'grade': (
+        ('一级赛', r'g1', r'一級賽|一级赛'),
+        ('二级赛', r'g2', r'二級賽|二级赛'),
+        ('三级赛', r'g3', r'三級賽|三级赛'),
+        ('四岁', r'4yo', r'四歲|四岁'),
+    ),
+}
+
+# 各解析位置与ICON_RULES不同的规则（保持各位置原来的判断）：
+# day为赛马日第一个<p>，race为比赛<p>，legacy为旧版单元格解析（图片地址不转换为小写）
+ICON_SITE_RULES = {
+    'day': {
+        'track': (
+            ('mixed', r'(?=.*mixed).*gif', r'混合'),
+            ('turf', r'(?=.*turf).*gif', r'草地'),
+            ('awt', r'(?=.*awt).*gif', r'全天候'),
+        ),
+    },
+    'race': {},
+    'legacy': {
+        'venue': (
+            ('跑马地', r'hv-ch', r'跑馬地|跑马地'),
+            ('沙田', r'st-ch', r'沙田'),
+        ),
+        'track': (
+            ('turf', r'turf', r'草地'),
+            ('mixed', r'mixed', r'混合'),
+            ('awt', r'awt', r'全天候'),
+        ),
+        'grade': (
+            ('一级赛', r'class_g1', r'一級賽|一级赛'),
+            ('二级赛', r'class_g2', r'二級賽|二级赛'),
+            ('三级赛', r'class_g3', r'三級賽|三级赛'),
+            ('四岁', r'class_4YO', r'四歲|四岁'),
+        ),
+    },
+}
+
+_COMPILED_ICON_RULES = {
+    site: {
+        field: tuple((value, re.compile(src_pattern), re.compile(alt_pattern))
+                     for value, src_pattern, alt_pattern in overrides.get(field, rules))
+        for field, rules in ICON_RULES.items()
+    }
+    for site, overrides in ICON_SITE_RULES.items()
+}
+
+
+def _match_icon_rule(rules, src: str, alt: str) -> Optional[str]:
+    """按优先次序取第一个符合的规则"""
+    for value, src_re, alt_re in rules:
+        if src_re.search(src) or alt_re.search(alt):
+            return value
+    return None
+
+
+@lru_cache(maxsize=1024)
+def classify_icon(src: str, alt: str = '', title: str = '', site: str = 'race') -> IconInfo:
+    """
+    识别赛程表图标的含义
+    
+    整季赛程表中同样的二三十个图标会出现数千次，每个不同的(src, alt, title, site)只识别一次，
+    之后直接从缓存返回。各解析位置的规则见ICON_SITE_RULES。
+    
+    Args:
+        src: 图片地址
+        alt: 图片alt属性
+        title: 图片title属性
+        site: 解析位置，'day'、'race'或'legacy'
+        
+    Returns:
+        IconInfo，无法识别的部分为None
+    """
+    rules = _COMPILED_ICON_RULES[site]
+    if site != 'legacy':
+        src = src.lower()
+    
+    # 班次图标：优先从alt/title中提取，其次从文件名（如class1.gif, class_1.gif）中提取
+    race_class = None
+    for name in CHINESE_CLASS_NAMES.values():
+        if name in alt or name in title:
+            race_class = name
+            break
+    else:
+        class_match = re.search(r'class[_-]?(\d+)', src)
+        if class_match:
+            class_num = int(class_match.group(1))
+            race_class = CHINESE_CLASS_NAMES.get(class_num, f'第{class_num}班')
+    
+    return IconInfo(
+        venue=_match_icon_rule(rules['venue'], src, alt),
+        race_type=_match_icon_rule(rules['race_type'], src, alt),
+        track=_match_icon_rule(rules['track'], src, alt),
+        race_class=race_class,
+        grade=_match_icon_rule(rules['grade'], src, alt),
+    )
 
 
 class RaceScheduleScraper:
     """香港赛马会赛程表爬虫类"""
     
-    def __init__(self):
+    def __init__(self, use_records: bool = False, intern_strings: bool = False):
+        """
+        Args:
+            use_records: 为True时赛马日和比赛使用紧凑的RaceDay/ScheduledRace记录（__slots__）代替字典
+            intern_strings: 为True时驻留月份、年份和图标地址等重复取值，进程内只保留一个实例
+        """
+        self.use_records = use_records
+        self.intern_strings = intern_strings
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -24,12 +224,23 @@ class RaceScheduleScraper:
             'Accept-Language': 'zh-HK,zh;q=0.9,en;q=0.8',
         })
     
-    def scrape_schedule(self, url: Optional[str] = None) -> Dict:
+    def scrape_schedule(self, url: Optional[str] = None,
+                        months: Optional[Iterable[Union[str, int]]] = None,
+                        date_from: Optional[Union[str, date]] = None,
+                        date_to: Optional[Union[str, date]] = None,
+                        venue: Optional[str] = None) -> Dict:
         """
         爬取赛程表页面
         
+        筛选条件在解析时生效：不符合条件的月份表格在处理单元格之前跳过，
+        日期或场地不符合的单元格不会解析比赛信息。
+        
         Args:
             url: 赛程表页面URL，如果为None则使用默认URL
+            months: 只解析这些月份（如"一月"或1）
+            date_from: 只保留该日期（含）之后的赛马日
+            date_to: 只保留该日期（含）之前的赛马日
+            venue: 只保留该场地的赛马日（"沙田"或"跑马地"）
             
         Returns:
             包含所有提取信息的字典
@@ -44,13 +255,16 @@ class RaceScheduleScraper:
             
             soup = BeautifulSoup(response.text, 'html.parser')
             
+            fixture = self._extract_fixture(soup, months=months, date_from=date_from,
+                                            date_to=date_to, venue=venue)
+            
             result = {
                 'source_url': url,
                 'scraped_at': datetime.now().isoformat(),
-                'months': self._extract_months(soup),
-                'race_days': self._extract_race_days(soup),
-                'legend': self._extract_legend(soup),
-                'notices': self._extract_notices(soup),
+                'months': fixture['months'],
+                'race_days': fixture['race_days'],
+                'legend': fixture['legend'],
+                'notices': fixture['notices'],
                 'raw_html': response.text  # 保存原始HTML以备后续分析
             }
             
@@ -63,13 +277,74 @@ class RaceScheduleScraper:
             print(f"解析错误: {e}")
             return {}
     
-    def _extract_months(self, soup: BeautifulSoup) -> List[str]:
-        """提取页面中显示的月份列表"""
-        months = []
+    def _extract_fixture(self, soup: BeautifulSoup,
+                         months: Optional[Iterable[Union[str, int]]] = None,
+                         date_from: Optional[Union[str, date]] = None,
+                         date_to: Optional[Union[str, date]] = None,
+                         venue: Optional[str] = None) -> Dict:
+        """
+        一次遍历页面，同时提取月份、赛马日、图例和通知
+        
+        遍历文档时收集月份元素、表头单元格、日历表格和页面文本片段（与get_text相同的字符串类型），
+        再用一个组合正则同时匹配图例关键词和通知。赛马日从收集到的日历表格中逐个解析
+        （解析时只查找该表格内的元素）。
         
+        Args:
+            soup: 页面文档
+            months、date_from、date_to、venue: 筛选条件，见scrape_schedule
+            
+        Returns:
+            包含months、race_days、legend、notices的字典
+        """
+        month_elements = []
+        header_cells = []
+        tables = []
+        texts = []
+        text_types = soup.interesting_string_types
+        
+        for node in soup.descendants:
+            name = node.name
+            if name is None:
+                if type(node) in text_types:
+                    texts.append(node)
+            elif name == 'table':
+                tables.append(node)
+            elif name in ('th', 'td', 'caption'):
+                header_cells.append(node)
+            elif name in ('option', 'a', 'span', 'div'):
+                string = node.string
+                if string and MONTH_RE.search(string):
+                    month_elements.append(node)
+        
+        legend, notices = self._match_fixture_text(''.join(texts))
+        
+        return {
+            'months': self._collect_months(month_elements, header_cells, months=months),
+            'race_days': self._extract_race_days_from_tables(tables, months=months, date_from=date_from,
+                                                             date_to=date_to, venue=venue),
+            'legend': legend,
+            'notices': notices,
+        }
+    
+    def _extract_months(self, soup: BeautifulSoup,
+                        months: Optional[Iterable[Union[str, int]]] = None) -> List[str]:
+        """
+        提取页面中显示的月份列表
+        
+        Args:
+            soup: 页面文档
+            months: 只返回这些月份
+        """
         # 查找月份选择器或月份标题
-        month_elements = soup.find_all(['option', 'a', 'span', 'div'], 
-                                      string=re.compile(r'[一二三四五六七八九十]+月|九月|十月|十一月|十二月|一月|二月|三月|四月|五月|六月|七月'))
+        month_elements = soup.find_all(['option', 'a', 'span', 'div'], string=MONTH_RE)
+        header_cells = soup.find_all(['th', 'td', 'caption']) if not month_elements else []
+        return self._collect_months(month_elements, header_cells, months=months)
+    
+    def _collect_months(self, month_elements: List, header_cells: List,
+                        months: Optional[Iterable[Union[str, int]]] = None) -> List[str]:
+        """从月份元素中整理月份列表，没有月份元素时从表格标题中提取"""
+        month_filter = self._normalize_month_filter(months)
+        months = []
         
         for element in month_elements:
             month_text = element.get_text(strip=True)
@@ -78,19 +353,39 @@ class RaceScheduleScraper:
         
         # 如果没找到，尝试从表格标题中提取
         if not months:
-            table_headers = soup.find_all(['th', 'td', 'caption'])
-            for header in table_headers:
+            for header in header_cells:
                 text = header.get_text(strip=True)
-                month_match = re.search(r'([一二三四五六七八九十]+年)?([一二三四五六七八九十]+月|九月|十月|十一月|十二月|一月|二月|三月|四月|五月|六月|七月)', text)
+                month_match = MONTH_HEADER_RE.search(text)
                 if month_match:
                     month_text = month_match.group(2)
                     if month_text and month_text not in months:
                         months.append(month_text)
         
+        if month_filter is not None:
+            months = [month for month in months if self._convert_chinese_month(month) in month_filter]
+        
         return months
     
     def _extract_legend(self, soup: BeautifulSoup) -> Dict:
         """提取图例说明"""
+        legend, _ = self._match_fixture_text(soup.get_text())
+        return legend
+    
+    def _extract_notices(self, soup: BeautifulSoup) -> List[str]:
+        """提取页面中的通知信息"""
+        _, notices = self._match_fixture_text(soup.get_text())
+        return notices
+    
+    def _match_fixture_text(self, page_text: str):
+        """
+        用组合正则匹配一次页面文本，同时提取图例和通知
+        
+        同一个通知正则的匹配互不重叠；通知先按正则的次序、再按在页面中的位置排列，
+        图例按LEGEND_KEYWORDS的次序排列。
+        
+        Returns:
+            (图例字典, 通知列表)
+        """
         legend = {
             'venues': {},
             'race_types': {},
@@ -98,94 +393,75 @@ class RaceScheduleScraper:
             'race_classes': {},
             'special_marks': {}
         }
+        found_legend = set()
+        found_notices = [[] for _ in NOTICE_PATTERNS]
+        notice_ends = [0] * len(NOTICE_PATTERNS)
         
-        # 查找图例部分
-        page_text = soup.get_text()
+        for match in FIXTURE_TEXT_RE.finditer(page_text):
+            group = match.lastgroup
+            if group and group.startswith('legend'):
+                found_legend.add(int(group[len('legend'):]))
+                continue
+            for index in range(len(NOTICE_PATTERNS)):
+                notice = match.group(f'notice{index}')
+                # 跳过与同一正则上一个匹配重叠的位置
+                if notice is not None and match.start() >= notice_ends[index]:
+                    found_notices[index].append(notice)
+                    notice_ends[index] = match.end(f'notice{index}')
         
-        # 提取场地图例
-        venue_patterns = {
-            '跑马地': r'跑馬地|跑马地',
-            '沙田': r'沙田'
-        }
-        for key, pattern in venue_patterns.items():
-            if re.search(pattern, page_text):
-                legend['venues'][key] = True
-        
-        # 提取赛马类型图例
-        race_type_patterns = {
-            '日赛': r'日賽|日赛',
-            '黄昏赛': r'黄昏賽|黄昏赛',
-            '夜赛': r'夜賽|夜赛'
-        }
-        for key, pattern in race_type_patterns.items():
-            if re.search(pattern, page_text):
-                legend['race_types'][key] = True
-        
-        # 提取赛道类型图例
-        track_patterns = {
-            '草地': r'草地',
-            '混合赛道': r'混合賽道|混合赛道'
-        }
-        for key, pattern in track_patterns.items():
-            if re.search(pattern, page_text):
-                legend['track_types'][key] = True
-        
-        # 提取赛事级别图例
-        class_patterns = {
-            '一级赛': r'一級賽|一级赛',
-            '二级赛': r'二級賽|二级赛',
-            '三级赛': r'三級賽|三级赛',
-            '四岁': r'四歲|四岁'
-        }
-        for key, pattern in class_patterns.items():
-            if re.search(pattern, page_text):
-                legend['race_classes'][key] = True
+        for index, (category, key, _) in enumerate(LEGEND_KEYWORDS):
+            if index in found_legend:
+                legend[category][key] = True
+        
+        notices = []
+        for matches in found_notices:
+            for notice in matches:
+                if notice and notice not in notices:
+                    notices.append(notice.strip())
         
         # 提取特殊标记说明
-        special_marks = {
-            'C': '盃賽',
-            'P': '獲得優先出賽權',
-            'S': '特別參賽條件'
-        }
-        for mark, desc in special_marks.items():
+        for mark, desc in SPECIAL_MARKS.items():
             if mark in page_text or desc in page_text:
                 legend['special_marks'][mark] = desc
         
-        return legend
+        return legend, notices
     
-    def _extract_notices(self, soup: BeautifulSoup) -> List[str]:
-        """提取页面中的通知信息"""
-        notices = []
-        
-        # 查找通知文本（通常在页面底部或特定区域）
-        page_text = soup.get_text()
-        
-        # 查找包含"取消"、"延期"等关键词的通知
-        notice_patterns = [
-            r'原定於.*?取消',
-            r'原定于.*?取消',
-            r'延期',
-            r'改期',
-            r'注意.*?事項',
-            r'注意.*?事项'
-        ]
-        
-        for pattern in notice_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
-            for match in matches:
-                if match and match not in notices:
-                    notices.append(match.strip())
+    def _extract_race_days(self, soup: BeautifulSoup,
+                           months: Optional[Iterable[Union[str, int]]] = None,
+                           date_from: Optional[Union[str, date]] = None,
+                           date_to: Optional[Union[str, date]] = None,
+                           venue: Optional[str] = None) -> List[Dict]:
+        """
+        提取所有赛马日信息
         
-        return notices
+        Args:
+            soup: 页面文档
+            months: 只解析这些月份的表格，所有指定月份处理完即停止
+            date_from: 只保留该日期（含）之后的赛马日
+            date_to: 只保留该日期（含）之前的赛马日
+            venue: 只保留该场地的赛马日
+        """
+        return self._extract_race_days_from_tables(soup.find_all('table'), months=months, date_from=date_from,
+                                                   date_to=date_to, venue=venue)
     
-    def _extract_race_days(self, soup: BeautifulSoup) -> List[Dict]:
-        """提取所有赛马日信息"""
+    def _extract_race_days_from_tables(self, tables: List,
+                                       months: Optional[Iterable[Union[str, int]]] = None,
+                                       date_from: Optional[Union[str, date]] = None,
+                                       date_to: Optional[Union[str, date]] = None,
+                                       venue: Optional[str] = None) -> List[Dict]:
+        """从日历表格中提取赛马日信息，参数见_extract_race_days"""
         race_days = []
-        
-        # 查找所有表格
-        tables = soup.find_all('table')
+        month_filter = self._normalize_month_filter(months)
+        date_from = parse_race_date(date_from)
+        date_to = parse_race_date(date_to)
+        venue = self._normalize_venue(venue)
+        seen_months: Set[int] = set()
         
         for table in tables:
+            # 指定的月份都已处理，不再查看其余表格
+            if month_filter and month_filter <= seen_months:
+                break
+            
             # 首先从<thead>中提取月份和年份
             current_month = None
             current_year = None
@@ -256,6 +532,20 @@ class RaceScheduleScraper:
                         current_month = month_match.group(1)
                         break
             
+            # 按月份和日期范围筛选整个表格，不符合的表格不处理单元格
+            month_num = self._convert_chinese_month(current_month) if current_month else None
+            if month_filter is not None:
+                if month_num not in month_filter:
+                    continue
+                seen_months.add(month_num)
+            
+            year_num = int(current_year) if current_year and current_year.isdigit() else None
+            if (date_from or date_to) and month_num and year_num:
+                month_start = date(year_num, month_num, 1)
+                month_end = date(year_num, month_num, calendar.monthrange(year_num, month_num)[1])
+                if (date_from and month_end < date_from) or (date_to and month_start > date_to):
+                    continue
+            
             # 处理日期单元格
             for row in data_rows:
                 cells = row.find_all(['td', 'th'])
@@ -306,16 +596,43 @@ class RaceScheduleScraper:
                             day = int(day_match.group(1))
                     
                     if day and 1 <= day <= 31:
+                        # 日期不在范围内的单元格不解析
+                        if (date_from or date_to) and month_num and year_num:
+                            try:
+                                cell_date = date(year_num, month_num, day)
+                            except ValueError:
+                                cell_date = None
+                            if cell_date and ((date_from and cell_date < date_from) or
+                                              (date_to and cell_date > date_to)):
+                                continue
+                        
                         # 是赛马日期，提取该单元格中的所有信息
-                        race_day_info = self._parse_race_day_cell(cell, day, current_month, current_year)
+                        race_day_info = self._parse_race_day_cell(cell, day, current_month, current_year,
+                                                                  venue=venue)
                         
                         if race_day_info:
-                            race_days.append(race_day_info)
+                            if self.intern_strings:
+                                self._intern_race_day(race_day_info)
+                            race_days.append(RaceDay.from_dict(race_day_info) if self.use_records else race_day_info)
         
         return race_days
     
-    def _parse_race_day_cell(self, cell, day: int, month: Optional[str], year: Optional[str]) -> Optional[Dict]:
-        """解析单个日期单元格，提取赛马日信息"""
+    def _intern_race_day(self, race_day: Dict):
+        """驻留赛马日中的月份、年份和图标属性"""
+        intern_fields(race_day, ('month', 'year'))
+        images = list((race_day.get('date_info') or {}).get('images', []))
+        for race in race_day.get('races', []):
+            images.extend(race.get('images', []))
+        for image in images:
+            intern_fields(image, ('src', 'alt', 'title'))
+    
+    def _parse_race_day_cell(self, cell, day: int, month: Optional[str], year: Optional[str],
+                             venue: Optional[str] = None) -> Optional[Dict]:
+        """
+        解析单个日期单元格，提取赛马日信息
+        
+        指定venue时，场地不符合的单元格在解析比赛信息之前返回None
+        """
         race_day = {
             'day': day,
             'month': month,
@@ -342,7 +659,10 @@ class RaceScheduleScraper:
         p_tags = cell.find_all('p')
         if not p_tags:
             # 如果没有<p>标签，使用旧的解析方法作为后备
-            return self._parse_race_day_cell_legacy(cell, day, month, year)
+            race_day = self._parse_race_day_cell_legacy(cell, day, month, year)
+            if race_day and venue and venue not in race_day['venues']:
+                return None
+            return race_day
         
         # 第一个<p>是日期和该日期的相关信息
         if len(p_tags) > 0:
@@ -351,6 +671,9 @@ class RaceScheduleScraper:
             
             # 从第一个<p>中提取场地、赛马类型等信息
             self._extract_day_level_info(first_p, race_day)
+            
+            if venue and venue not in race_day['venues']:
+                return None
         
         # 从第二个<p>开始，每个<p>代表一场比赛
         for i, p_tag in enumerate(p_tags[1:], start=2):
@@ -385,43 +708,19 @@ class RaceScheduleScraper:
     
     def _extract_day_level_info(self, p_tag, race_day: Dict):
         """从第一个<p>标签中提取日期级别的信息（场地、赛马类型、跑道类型等）"""
-        images = p_tag.find_all('img')
-        for img in images:
-            src = img.get('src', '').lower()
-            alt = img.get('alt', '')
-            filename = src.split('/')[-1] if '/' in src else src  # 提取文件名
-            
-            # 解析场地图标
-            # st.gif = 沙田, hv.gif = 跑馬地
-            if filename.endswith('hv.gif') or 'hv.gif' in src or 'hv-ch' in src or '跑馬地' in alt or '跑马地' in alt:
-                if '跑马地' not in race_day['venues']:
-                    race_day['venues'].append('跑马地')
-            elif filename.endswith('st.gif') or 'st.gif' in src or 'st-ch' in src or '沙田' in alt:
-                if '沙田' not in race_day['venues']:
-                    race_day['venues'].append('沙田')
-            
-            # 解析跑道类型图标
-            # mixed.gif = 混合賽路，turf.gif = 草地，awt.gif = 全天候
-            if filename.endswith('mixed.gif') or 'mixed.gif' in src or ('mixed' in src and 'gif' in src) or '混合' in alt or '混合賽路' in alt:
-                if '混合賽路' not in race_day['track_types']:
-                    race_day['track_types'].append('混合賽路')
-            elif filename.endswith('turf.gif') or 'turf.gif' in src or ('turf' in src and 'gif' in src) or '草地' in alt:
-                if '草地' not in race_day['track_types']:
-                    race_day['track_types'].append('草地')
-            elif filename.endswith('awt.gif') or 'awt.gif' in src or ('awt' in src and 'gif' in src) or '全天候' in alt:
-                if '全天候' not in race_day['track_types']:
-                    race_day['track_types'].append('全天候')
-            
-            # 解析赛马类型图标
-            if 'day' in src or '日賽' in alt or '日赛' in alt:
-                if '日赛' not in race_day['race_types']:
-                    race_day['race_types'].append('日赛')
-            elif 'dusk' in src or '黄昏賽' in alt or '黄昏赛' in alt:
-                if '黄昏赛' not in race_day['race_types']:
-                    race_day['race_types'].append('黄昏赛')
-            elif 'night' in src or '夜賽' in alt or '夜赛' in alt:
-                if '夜赛' not in race_day['race_types']:
-                    race_day['race_types'].append('夜赛')
+        for img in p_tag.find_all('img'):
+            icon = classify_icon(img.get('src', ''), img.get('alt', ''), img.get('title', ''), 'day')
+            
+            if icon.venue and icon.venue not in race_day['venues']:
+                race_day['venues'].append(icon.venue)
+            
+            if icon.track:
+                track_type = DAY_TRACK_TYPE_NAMES[icon.track]
+                if track_type not in race_day['track_types']:
+                    race_day['track_types'].append(track_type)
+            
+            if icon.race_type and icon.race_type not in race_day['race_types']:
+                race_day['race_types'].append(icon.race_type)
     
     def _parse_race_p(self, p_tag, race_number: int) -> Optional[Dict]:
         """解析单个比赛<p>标签，提取比赛详细信息"""
@@ -444,56 +743,30 @@ class RaceScheduleScraper:
         # 提取所有图片
         images = p_tag.find_all('img')
         for img in images:
-            src = img.get('src', '').lower()
+            src = img.get('src', '')
             alt = img.get('alt', '')
             title = img.get('title', '')
             
             img_info = {
-                'src': src,
+                'src': src.lower(),
                 'alt': alt,
                 'title': title
             }
             race_info['images'].append(img_info)
             
-            # 解析班次GIF（第一班、第二班等）
-            # 优先从alt/title中提取
-            if '第一班' in alt or '第一班' in title:
-                race_info['class'] = '第一班'
-            elif '第二班' in alt or '第二班' in title:
-                race_info['class'] = '第二班'
-            elif '第三班' in alt or '第三班' in title:
-                race_info['class'] = '第三班'
-            elif '第四班' in alt or '第四班' in title:
-                race_info['class'] = '第四班'
-            elif '第五班' in alt or '第五班' in title:
-                race_info['class'] = '第五班'
-            elif 'class' in src:
-                # 从文件名中提取班次数字（如class1.gif, class_1.gif等）
-                class_match = re.search(r'class[_-]?(\d+)', src)
-                if class_match:
-                    class_num = int(class_match.group(1))
-                    chinese_class = self._number_to_chinese_class(class_num)
-                    race_info['class'] = chinese_class
-            
-            # 解析级别GIF（一级赛、二级赛等）
-            if 'g1' in src or 'class_g1' in src or '一級賽' in alt or '一级赛' in alt:
-                race_info['grade'] = '一级赛'
-            elif 'g2' in src or 'class_g2' in src or '二級賽' in alt or '二级赛' in alt:
-                race_info['grade'] = '二级赛'
-            elif 'g3' in src or 'class_g3' in src or '三級賽' in alt or '三级赛' in alt:
-                race_info['grade'] = '三级赛'
-            elif '4yo' in src or 'class_4yo' in src or '四歲' in alt or '四岁' in alt:
-                race_info['grade'] = '四岁'
-            
-            # 解析全天候跑道GIF（awt.gif）
-            if 'awt' in src or '全天候' in alt:
-                race_info['track_type'] = '全天候跑道'
-            elif 'turf' in src or '草地' in alt:
-                if not race_info['track_type']:  # 如果还没有设置
-                    race_info['track_type'] = '草地'
-            elif 'mixed' in src or '混合' in alt:
-                if not race_info['track_type']:
-                    race_info['track_type'] = '混合赛道'
+            icon = classify_icon(src, alt, title, 'race')
+            
+            # 班次GIF（第一班、第二班等）
+            if icon.race_class:
+                race_info['class'] = icon.race_class
+            
+            # 级别GIF（一级赛、二级赛等）
+            if icon.grade:
+                race_info['grade'] = icon.grade
+            
+            # 跑道GIF：全天候跑道优先，其余只在还没有设置时使用
+            if icon.track == 'awt' or (icon.track and not race_info['track_type']):
+                race_info['track_type'] = RACE_TRACK_TYPE_NAMES[icon.track]
         
         # 提取文本内容
         text = p_tag.get_text(strip=True)
@@ -530,14 +803,7 @@ class RaceScheduleScraper:
     
     def _number_to_chinese_class(self, num: int) -> str:
         """将数字转换为中文班次"""
-        chinese_numbers = {
-            1: '第一班',
-            2: '第二班',
-            3: '第三班',
-            4: '第四班',
-            5: '第五班'
-        }
-        return chinese_numbers.get(num, f'第{num}班')
+        return CHINESE_CLASS_NAMES.get(num, f'第{num}班')
     
     def _parse_race_day_cell_legacy(self, cell, day: int, month: Optional[str], year: Optional[str]) -> Optional[Dict]:
         """旧版解析方法，作为后备方案"""
@@ -569,41 +835,16 @@ class RaceScheduleScraper:
         # 查找图片标签（图标）
         images = cell.find_all('img')
         for img in images:
-            src = img.get('src', '')
-            alt = img.get('alt', '')
-            title = img.get('title', '')
+            icon = classify_icon(img.get('src', ''), img.get('alt', ''), img.get('title', ''), 'legacy')
             
-            # 解析场地图标
-            if 'hv-ch' in src or '跑馬地' in alt or '跑马地' in alt:
-                race_day['venues'].append('跑马地')
-            elif 'st-ch' in src or '沙田' in alt:
-                race_day['venues'].append('沙田')
-            
-            # 解析赛马类型图标
-            if 'day' in src or '日賽' in alt or '日赛' in alt:
-                race_day['race_types'].append('日赛')
-            elif 'dusk' in src or '黄昏賽' in alt or '黄昏赛' in alt:
-                race_day['race_types'].append('黄昏赛')
-            elif 'night' in src or '夜賽' in alt or '夜赛' in alt:
-                race_day['race_types'].append('夜赛')
-            
-            # 解析赛道类型图标
-            if 'turf' in src or '草地' in alt:
-                race_day['track_types'].append('草地')
-            elif 'mixed' in src or '混合' in alt:
-                race_day['track_types'].append('混合赛道')
-            elif 'awt' in src or '全天候' in alt:
-                race_day['track_types'].append('全天候跑道')
-            
-            # 解析赛事级别图标
-            if 'class_g1' in src or '一級賽' in alt or '一级赛' in alt:
-                race_day['race_classes'].append('一级赛')
-            elif 'class_g2' in src or '二級賽' in alt or '二级赛' in alt:
-                race_day['race_classes'].append('二级赛')
-            elif 'class_g3' in src or '三級賽' in alt or '三级赛' in alt:
-                race_day['race_classes'].append('三级赛')
-            elif 'class_4YO' in src or '四歲' in alt or '四岁' in alt:
-                race_day['race_classes'].append('四岁')
+            if icon.venue:
+                race_day['venues'].append(icon.venue)
+            if icon.race_type:
+                race_day['race_types'].append(icon.race_type)
+            if icon.track:
+                race_day['track_types'].append(RACE_TRACK_TYPE_NAMES[icon.track])
+            if icon.grade:
+                race_day['race_classes'].append(icon.grade)
         
         # 提取文本内容
         cell_text = cell.get_text(strip=True)
@@ -652,6 +893,25 @@ class RaceScheduleScraper:
         
         return None
     
+    def _normalize_month_filter(self, months: Optional[Iterable[Union[str, int]]]) -> Optional[Set[int]]:
+        """将月份筛选条件（中文月份或数字）转换为月份数字集合"""
+        if months is None:
+            return None
+        if isinstance(months, (str, int)):
+            months = [months]
+        month_nums = set()
+        for month in months:
+            month_num = month if isinstance(month, int) else self._convert_chinese_month(month)
+            if month_num:
+                month_nums.add(month_num)
+        return month_nums
+    
+    def _normalize_venue(self, venue: Optional[str]) -> Optional[str]:
+        """统一场地名称（繁体"跑馬地"转换为"跑马地"）"""
+        if venue == '跑馬地':
+            return '跑马地'
+        return venue
+    
     def _convert_chinese_month(self, month_str: str) -> Optional[int]:
         """将中文月份转换为数字"""
         month_map = {
@@ -687,89 +947,106 @@ class RaceScheduleScraper:
         
         return None
     
-    def get_race_days_by_month(self, schedule_data: Dict, month: str) -> List[Dict]:
+    def build_index(self, schedule_data: Dict) -> ScheduleIndex:
         """
-        根据月份筛选赛马日
+        为赛程数据建立索引，多次查询时使用
         
         Args:
             schedule_data: scrape_schedule返回的数据
+            
+        Returns:
+            ScheduleIndex，支持按日期范围、下一个赛马日、场地、班次、级别、跑道、途程等查询
+        """
+        return ScheduleIndex(schedule_data)
+    
+    def get_race_days_by_month(self, schedule_data: Union[Dict, ScheduleIndex], month: str) -> List[Dict]:
+        """
+        根据月份筛选赛马日
+        
+        Args:
+            schedule_data: scrape_schedule返回的数据，或build_index建立的索引（不再逐个扫描）
             month: 月份（如"一月"、"二月"等）
             
         Returns:
             该月的所有赛马日列表
         """
+        if isinstance(schedule_data, ScheduleIndex):
+            return schedule_data.by_month(month)
         race_days = schedule_data.get('race_days', [])
         return [day for day in race_days if day.get('month') == month]
     
-    def get_race_days_by_venue(self, schedule_data: Dict, venue: str) -> List[Dict]:
+    def get_race_days_by_venue(self, schedule_data: Union[Dict, ScheduleIndex], venue: str) -> List[Dict]:
         """
         根据场地筛选赛马日
         
         Args:
-            schedule_data: scrape_schedule返回的数据
+            schedule_data: scrape_schedule返回的数据，或build_index建立的索引（不再逐个扫描）
             venue: 场地（"跑马地"或"沙田"）
             
         Returns:
             该场地的所有赛马日列表
         """
+        if isinstance(schedule_data, ScheduleIndex):
+            return schedule_data.by_venue(venue)
         race_days = schedule_data.get('race_days', [])
         return [day for day in race_days if venue in day.get('venues', [])]
     
-    def save_to_json(self, data: Dict, filename: str):
-        """保存数据到JSON文件"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def save_to_json(self, data: Dict, filename: str, codec: str = 'json', pretty: bool = False):
+        """
+        保存数据到JSON文件
+        
+        Args:
+            data: 要保存的数据
+            filename: 文件名
+            codec: 编码方式，'json'（标准库）、'orjson'或'msgspec'，后两者需要安装对应的包
+            pretty: 为True时缩进2格输出，默认紧凑输出
+        """
+        dump_json(data, filename, codec=codec, pretty=pretty)
         print(f"数据已保存到: {filename}")
     
-    def save_to_csv(self, data: Dict, filename: str):
-        """保存赛程数据到CSV文件"""
-        import csv
+    def save_to_sqlite(self, data: Dict, filename: str):
+        """
+        保存赛程数据到SQLite数据库（表结构见sqlite_store），重复保存时更新
+        
+        Args:
+            data: 爬取结果
+            filename: 数据库文件名
+        """
+        if not data.get('race_days'):
+            print("没有赛程数据可保存")
+            return
         
+        with SQLiteStore(filename) as store:
+            store.add_fixture(data)
+        print(f"数据已保存到数据库: {filename}")
+    
+    def save_to_csv(self, data: Dict, filename: str, append: bool = False):
+        """
+        保存赛程数据到CSV文件
+        
+        Args:
+            data: scrape_schedule的返回值
+            filename: 文件名
+            append: 为True时追加到已有文件（多个赛季写入同一文件）
+        """
         race_days = data.get('race_days', [])
         if not race_days:
             print("没有赛程数据可保存")
             return
         
-        # 确定所有可能的字段（支持新的races结构）
-        fieldnames = ['date', 'day', 'month', 'year', 'venues', 'race_types', 'track_types',
-                     'race_number', 'class', 'grade', 'track_type', 
-                     'distance', 'distance_meters', 'distance_race_number', 'has_cup_mark',
-                     'score_range', 'score_min', 'score_max', 'race_text']
+        with CsvAppender(filename, fieldnames=SCHEDULE_CSV_FIELDS, grow=False, append=append) as appender:
+            appender.write_rows(self._iter_csv_rows(race_days))
         
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        print(f"赛程数据已{'追加' if append else '保存'}到: {filename}")
+    
+    def _iter_csv_rows(self, race_days: List[Dict]):
+        """赛程数据的CSV行：有详细比赛信息时每场比赛一行，否则每个赛马日一行"""
+        for day in race_days:
+            races = day.get('races', [])
             
-            for day in race_days:
-                races = day.get('races', [])
-                
-                # 如果有详细的比赛信息，每场比赛一行
-                if races:
-                    for race in races:
-                        row = {
-                            'date': day.get('date', ''),
-                            'day': day.get('day', ''),
-                            'month': day.get('month', ''),
-                            'year': day.get('year', ''),
-                            'venues': ', '.join(day.get('venues', [])),
-                            'race_types': ', '.join(day.get('race_types', [])),
-                            'track_types': ', '.join(day.get('track_types', [])),
-                            'race_number': race.get('race_number', ''),
-                            'class': race.get('class', ''),
-                            'grade': race.get('grade', ''),
-                            'track_type': race.get('track_type', ''),
-                            'distance': race.get('distance', ''),
-                            'distance_meters': race.get('distance_meters', ''),
-                            'distance_race_number': race.get('distance_race_number', ''),
-                            'has_cup_mark': '是' if race.get('has_cup_mark') else '否',
-                            'score_range': race.get('score_range', ''),
-                            'score_min': race.get('score_min', ''),
-                            'score_max': race.get('score_max', ''),
-                            'race_text': race.get('text', '')
-                        }
-                        writer.writerow(row)
-                else:
-                    # 兼容旧格式（没有详细比赛信息）
+            # 如果有详细的比赛信息，每场比赛一行
+            if races:
+                for race in races:
                     row = {
                         'date': day.get('date', ''),
                         'day': day.get('day', ''),
@@ -778,22 +1055,44 @@ class RaceScheduleScraper:
                         'venues': ', '.join(day.get('venues', [])),
                         'race_types': ', '.join(day.get('race_types', [])),
                         'track_types': ', '.join(day.get('track_types', [])),
-                        'race_number': '',
-                        'class': ', '.join(day.get('race_classes', [])),
-                        'grade': '',
-                        'track_type': ', '.join(day.get('track_types', [])),
-                        'distance': '',
-                        'distance_meters': '',
-                        'distance_race_number': '',
-                        'has_cup_mark': '',
-                        'score_range': '',
-                        'score_min': '',
-                        'score_max': '',
-                        'race_text': ''
+                        'race_number': race.get('race_number', ''),
+                        'class': race.get('class', ''),
+                        'grade': race.get('grade', ''),
+                        'track_type': race.get('track_type', ''),
+                        'distance': race.get('distance', ''),
+                        'distance_meters': race.get('distance_meters', ''),
+                        'distance_race_number': race.get('distance_race_number', ''),
+                        'has_cup_mark': '是' if race.get('has_cup_mark') else '否',
+                        'score_range': race.get('score_range', ''),
+                        'score_min': race.get('score_min', ''),
+                        'score_max': race.get('score_max', ''),
+                        'race_text': race.get('text', '')
                     }
-                    writer.writerow(row)
-        
-        print(f"赛程数据已保存到: {filename}")
+                    yield row
+            else:
+                # 兼容旧格式（没有详细比赛信息）
+                row = {
+                    'date': day.get('date', ''),
+                    'day': day.get('day', ''),
+                    'month': day.get('month', ''),
+                    'year': day.get('year', ''),
+                    'venues': ', '.join(day.get('venues', [])),
+                    'race_types': ', '.join(day.get('race_types', [])),
+                    'track_types': ', '.join(day.get('track_types', [])),
+                    'race_number': '',
+                    'class': ', '.join(day.get('race_classes', [])),
+                    'grade': '',
+                    'track_type': ', '.join(day.get('track_types', [])),
+                    'distance': '',
+                    'distance_meters': '',
+                    'distance_race_number': '',
+                    'has_cup_mark': '',
+                    'score_range': '',
+                    'score_min': '',
+                    'score_max': '',
+                    'race_text': ''
+                }
+                yield row
 
 
 def main():
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+紧凑的记录类型
+用__slots__保存已知字段，未映射的表头放在extra字典中；
+记录可以像字典一样读取，并提供to_dict()转换为普通字典
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .lazy import LazyResult
+
+
+class Record(Mapping):
+    """
+    记录基类
+
+    子类在FIELDS中列出已知字段（字典键），并在__slots__中声明对应的属性名。
+    Python关键字（如"class"）和常见中文表头对应的属性名见RENAMED。
+    未设置的字段不占用字典键，读取时与普通字典一样抛出KeyError。
+    """
+
+    __slots__ = ('extra',)
+
+    FIELDS: Tuple[str, ...] = ()
+    RENAMED = {
+        'class': 'race_class',
+        '場次': 'race_index',
+        '馬號': 'horse_no',
+        '實際負磅': 'actual_weight',
+        '頭馬距離': 'margin',
+        '沿途走位': 'running_position',
+        '完成時間': 'finish_time_text',
+    }
+    _attr_map: Dict[str, str] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._attr_map = {key: cls.RENAMED.get(key, key) for key in cls.FIELDS}
+
+    def __init__(self, data: Optional[Dict] = None, **fields):
+        self.extra = None
+        if data:
+            for key, value in data.items():
+                self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Record':
+        """从字典创建记录"""
+        return cls(data)
+
+    def __getitem__(self, key: str) -> Any:
+        attr = self._attr_map.get(key)
+        if attr is not None:
+            try:
+                return getattr(self, attr)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        attr = self._attr_map.get(key)
+        if attr is not None:
+            setattr(self, attr, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __iter__(self) -> Iterator[str]:
+        for key, attr in self._attr_map.items():
+            if hasattr(self, attr):
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        count = sum(1 for attr in self._attr_map.values() if hasattr(self, attr))
+        return count + (len(self.extra) if self.extra else 0)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+    def to_dict(self) -> Dict:
+        """转换为普通字典（嵌套的记录也一并转换）"""
+        data = {}
+        for key in self:
+            value = self[key]
+            if isinstance(value, Record):
+                value = value.to_dict()
+            elif isinstance(value, list) and value and isinstance(value[0], Record):
+                value = [item.to_dict() for item in value]
+            data[key] = value
+        return data
+
+
+class Runner(Record):
+    """比赛结果中的参赛马匹"""
+
+    FIELDS = ('horse_id', 'horse_name', 'horse_url', 'number', 'jockey', 'trainer',
+              'draw', 'weight', 'rating', 'odds', 'position',
+              '馬號', '實際負磅', '頭馬距離', '沿途走位', '完成時間')
+    __slots__ = tuple(Record.RENAMED.get(key, key) for key in FIELDS)
+
+
+class RaceRecord(Record):
+    """马匹的一条赛绩记录"""
+
+    FIELDS = ('date', 'venue', 'distance', 'class', 'position', 'jockey', 'jockey_id',
+              'trainer', 'trainer_id', 'draw', 'weight', 'rating', 'odds', 'finish_time',
+              'track', 'track_condition', 'equipment',
+              'margin', '場次', '實際負磅', '沿途走位')
+    __slots__ = tuple(Record.RENAMED.get(key, key) for key in FIELDS)
+
+
+class ScheduledRace(Record):
+    """赛程表中的一场比赛"""
+
+    FIELDS = ('race_number', 'class', 'grade', 'track_type', 'distance', 'distance_meters',
+              'distance_race_number', 'has_cup_mark', 'score_range', 'score_min', 'score_max',
+              'images', 'text')
+    __slots__ = tuple(Record.RENAMED.get(key, key) for key in FIELDS)
+
+
+class RaceDay(Record):
+    """赛程表中的一个赛马日"""
+
+    FIELDS = ('day', 'month', 'year', 'date', 'date_info', 'venues', 'race_types',
+              'track_types', 'races')
+    __slots__ = FIELDS
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RaceDay':
+        """从字典创建赛马日，其中的比赛也转换为ScheduledRace"""
+        race_day = cls(data)
+        races = data.get('races')
+        if races:
+            race_day['races'] = [race if isinstance(race, Record) else ScheduledRace(race) for race in races]
+        return race_day
+
+
+def record_to_dict(obj: Any) -> Dict:
+    """json.dump的default参数：将记录（或LazyResult）转换为字典"""
+    if isinstance(obj, (Record, LazyResult)):
+        return obj.to_dict()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+赛程表索引
+由scrape_schedule的结果建立一次，之后的查询不再扫描整个race_days列表：
+
+- 赛马日按日期排序，日期范围和"某日之后的下一个赛马日"用二分查找（O(log n)）
+- 月份、场地、赛马类型建立赛马日的哈希索引
+- 班次、级别、跑道类型、途程建立比赛的哈希索引
+
+索引中保存的是排序后的位置，每个索引列表本身也按日期有序，
+因此"某场地的下一个赛马日"等组合查询同样可以二分查找。
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .utils import parse_race_date
+
+
+# 场地名称统一为classify_icon使用的写法
+VENUE_ALIASES = {
+    '跑馬地': '跑马地',
+    'HV': '跑马地',
+    'ST': '沙田',
+}
+
+# 跑道类型统一为比赛（race）中使用的写法
+TRACK_TYPE_ALIASES = {
+    '全天候': '全天候跑道',
+    'AWT': '全天候跑道',
+    '混合賽路': '混合赛道',
+    '混合賽道': '混合赛道',
+    'TURF': '草地',
+}
+
+DateLike = Union[str, date, None]
+
+
+def _date_key(value: DateLike) -> Optional[str]:
+    """日期转换为ISO字符串（可直接比较大小）"""
+    if value is None or value == '':
+        return None
+    parsed = parse_race_date(value)
+    if parsed is None:
+        raise ValueError(f"无法识别的日期: {value}")
+    return parsed.isoformat()
+
+
+def _normalize(value, aliases: Mapping[str, str]):
+    """按别名表统一取值"""
+    if isinstance(value, str):
+        return aliases.get(value, aliases.get(value.upper(), value))
+    return value
+
+
+class ScheduleIndex:
+    """
+    赛程表索引
+
+    用法:
+        index = ScheduleIndex(scraper.scrape_schedule())
+        index.next_race_day('2026-01-05', venue='跑马地')
+        index.races(grade='一级赛', date_from='2025-12-01', date_to='2026-03-31')
+        index.races(distance=1200, track_type='全天候跑道')
+    """
+
+    # 赛马日级别的索引：参数名 -> (字段, 是否为列表, 别名表)
+    DAY_KEYS = {
+        'month': ('month', False, {}),
+        'venue': ('venues', True, VENUE_ALIASES),
+        'race_type': ('race_types', True, {}),
+    }
+
+    # 比赛级别的索引：参数名 -> (字段, 别名表)
+    RACE_KEYS = {
+        'race_class': ('class', {}),
+        'grade': ('grade', {}),
+        'track_type': ('track_type', TRACK_TYPE_ALIASES),
+        'distance': ('distance_meters', {}),
+    }
+
+    def __init__(self, schedule: Union[Mapping, Iterable[Mapping]]):
+        """
+        Args:
+            schedule: scrape_schedule的返回值，或赛马日列表（字典或RaceDay记录）
+        """
+        race_days = schedule.get('race_days', []) if isinstance(schedule, Mapping) else schedule
+
+        # 有日期的赛马日按日期排序在前，没有日期（None或空字符串）的保持原顺序放在最后，
+        # 使self.dates与self.race_days的前len(self.dates)个位置一一对应
+        self.race_days: List[Mapping] = sorted(
+            race_days, key=lambda day: (not day.get('date'), day.get('date') or ''))
+        self.dates: List[str] = [day['date'] for day in self.race_days if day.get('date')]
+
+        # 比赛按所属赛马日的顺序排列：(赛马日位置, 比赛)
+        self.races_list: List[Tuple[int, Mapping]] = [
+            (position, race)
+            for position, day in enumerate(self.race_days)
+            for race in day.get('races') or []
+        ]
+        self._race_day_positions = [position for position, _ in self.races_list]
+        # 每个赛马日的比赛在races_list中的起始位置（最后一项为比赛总数）
+        self._race_starts = [bisect_left(self._race_day_positions, position)
+                             for position in range(len(self.race_days) + 1)]
+
+        self._day_index: Dict[str, Dict] = {name: defaultdict(list) for name in self.DAY_KEYS}
+        for position, day in enumerate(self.race_days):
+            for name, (field, is_list, aliases) in self.DAY_KEYS.items():
+                values = day.get(field)
+                for value in (values or []) if is_list else [values]:
+                    if value is not None:
+                        self._day_index[name][_normalize(value, aliases)].append(position)
+
+        self._race_index: Dict[str, Dict] = {name: defaultdict(list) for name in self.RACE_KEYS}
+        for race_position, (_, race) in enumerate(self.races_list):
+            for name, (field, aliases) in self.RACE_KEYS.items():
+                value = race.get(field)
+                if value is not None:
+                    self._race_index[name][_normalize(value, aliases)].append(race_position)
+
+        # 组合查询时使用的位置集合，按需建立
+        self._set_cache: Dict[Tuple[str, str, object], frozenset] = {}
+
+    def __len__(self) -> int:
+        return len(self.race_days)
+
+    def values(self, key: str) -> List:
+        """
+        某个索引中出现过的所有取值
+
+        Args:
+            key: month、venue、race_type、race_class、grade、track_type或distance
+        """
+        index = self._day_index.get(key)
+        if index is None:
+            index = self._race_index[key]
+        return sorted(index, key=str)
+
+    def _day_positions(self, key: str, value) -> List[int]:
+        """赛马日索引中某个取值对应的位置列表（按日期有序）"""
+        aliases = self.DAY_KEYS[key][2]
+        return self._day_index[key].get(_normalize(value, aliases), [])
+
+    def _date_bounds(self, date_from: DateLike, date_to: DateLike) -> Tuple[int, int]:
+        """日期范围（含两端）对应的赛马日位置区间[start, stop)"""
+        start_key, stop_key = _date_key(date_from), _date_key(date_to)
+        start = bisect_left(self.dates, start_key) if start_key else 0
+        stop = bisect_right(self.dates, stop_key) if stop_key else len(self.dates)
+        if start_key is None and stop_key is None:
+            stop = len(self.race_days)
+        return start, stop
+
+    def race_days_between(self, date_from: DateLike = None, date_to: DateLike = None,
+                          venue: Optional[str] = None, race_type: Optional[str] = None) -> List[Mapping]:
+        """
+        日期范围内（含两端）的赛马日
+
+        Args:
+            date_from: 开始日期，None表示不限
+            date_to: 结束日期，None表示不限
+            venue: 只返回该场地的赛马日
+            race_type: 只返回该类型（日赛、夜赛等）的赛马日
+
+        Returns:
+            按日期排序的赛马日列表
+        """
+        start, stop = self._date_bounds(date_from, date_to)
+        positions = self._filtered_day_positions(start, stop, venue, race_type)
+        if positions is None:
+            return self.race_days[start:stop]
+        return [self.race_days[position] for position in positions]
+
+    def _filtered_day_positions(self, start: int, stop: int, venue: Optional[str],
+                                race_type: Optional[str]) -> Optional[List[int]]:
+        """位置区间[start, stop)内符合场地和类型的赛马日位置；两者都未指定时返回None"""
+        candidates = None
+        for key, value in (('venue', venue), ('race_type', race_type)):
+            if value is None:
+                continue
+            positions = self._day_positions(key, value)
+            positions = positions[bisect_left(positions, start):bisect_left(positions, stop)]
+            candidates = positions if candidates is None else sorted(set(candidates) & set(positions))
+        return candidates
+
+    def next_race_day(self, after: DateLike, venue: Optional[str] = None,
+                      inclusive: bool = False) -> Optional[Mapping]:
+        """
+        某日之后的下一个赛马日
+
+        Args:
+            after: 日期
+            venue: 只查找该场地的赛马日
+            inclusive: 为True时包括当天
+
+        Returns:
+            赛马日，没有时返回None
+        """
+        key = _date_key(after)
+        start = (bisect_left if inclusive else bisect_right)(self.dates, key)
+        if venue is None:
+            return self.race_days[start] if start < len(self.dates) else None
+
+        positions = self._day_positions('venue', venue)
+        found = bisect_left(positions, start)
+        if found < len(positions) and positions[found] < len(self.dates):
+            return self.race_days[positions[found]]
+        return None
+
+    def by_month(self, month: str) -> List[Mapping]:
+        """某月（如"一月"）的所有赛马日"""
+        return [self.race_days[position] for position in self._day_positions('month', month)]
+
+    def by_venue(self, venue: str) -> List[Mapping]:
+        """某场地（"沙田"或"跑马地"）的所有赛马日"""
+        return [self.race_days[position] for position in self._day_positions('venue', venue)]
+
+    def by_race_type(self, race_type: str) -> List[Mapping]:
+        """某类型（日赛、黄昏赛、夜赛）的所有赛马日"""
+        return [self.race_days[position] for position in self._day_positions('race_type', race_type)]
+
+    def races(self, date_from: DateLike = None, date_to: DateLike = None,
+              venue: Optional[str] = None, race_type: Optional[str] = None,
+              race_class: Optional[str] = None, grade: Optional[str] = None,
+              track_type: Optional[str] = None,
+              distance: Optional[int] = None) -> List[Tuple[Mapping, Mapping]]:
+        """
+        按条件查找比赛
+
+        先取命中数最少的比赛索引，再用其他索引的位置集合筛选；日期范围用二分查找截取。
+        只有场地或类型条件时，由赛马日索引取出符合的赛马日，再取这些赛马日的比赛。
+
+        Args:
+            date_from: 开始日期（含）
+            date_to: 结束日期（含）
+            venue: 场地
+            race_type: 赛马日类型（日赛、夜赛等）
+            race_class: 班次（第一班等）
+            grade: 级别（一级赛等）
+            track_type: 跑道类型（草地、全天候跑道、混合赛道）
+            distance: 途程（米）
+
+        Returns:
+            按日期排序的(赛马日, 比赛)列表
+        """
+        start, stop = self._date_bounds(date_from, date_to)
+        first = bisect_left(self._race_day_positions, start)
+        last = bisect_left(self._race_day_positions, stop)
+
+        conditions = []
+        for key, value in (('race_class', race_class), ('grade', grade),
+                           ('track_type', track_type), ('distance', distance)):
+            if value is not None:
+                value = _normalize(value, self.RACE_KEYS[key][1])
+                positions = self._race_index[key].get(value, [])
+                candidates = positions[bisect_left(positions, first):bisect_left(positions, last)]
+                conditions.append((len(candidates), key, value, candidates))
+
+        # 从命中最少的索引出发，用其余索引的位置集合筛选
+        if conditions:
+            conditions.sort(key=lambda condition: condition[0])
+            candidates: Sequence[int] = conditions[0][3]
+            others = [self._position_set('race', key, value) for _, key, value, _ in conditions[1:]]
+            if others:
+                candidates = sorted(others[0].intersection(candidates, *others[1:]))
+        else:
+            day_positions = self._filtered_day_positions(start, stop, venue, race_type)
+            if day_positions is None:
+                candidates = range(first, last)
+            else:
+                starts = self._race_starts
+                return [(self.race_days[day], self.races_list[position][1])
+                        for day in day_positions for position in range(starts[day], starts[day + 1])]
+
+        day_sets = [self._position_set('day', key, _normalize(value, self.DAY_KEYS[key][2]))
+                    for key, value in (('venue', venue), ('race_type', race_type)) if value is not None]
+
+        results = []
+        for position in candidates:
+            day_position, race = self.races_list[position]
+            if not day_sets or all(day_position in allowed for allowed in day_sets):
+                results.append((self.race_days[day_position], race))
+        return results
+
+    def _position_set(self, level: str, key: str, value) -> frozenset:
+        """索引中某个取值的位置集合（第一次使用时建立并缓存）"""
+        cache_key = (level, key, value)
+        positions = self._set_cache.get(cache_key)
+        if positions is None:
+            index = self._day_index if level == 'day' else self._race_index
+            positions = self._set_cache[cache_key] = frozenset(index[key].get(value, ()))
+        return positions
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON序列化
+提供三种编码方式：
+- json: 标准库，紧凑输出
+- orjson: 需要安装orjson
+- msgspec: 需要安装msgspec，解码时可使用类型化的结构（RaceResultStruct等）
+
+所有编码方式都输出UTF-8字节，pretty=True时缩进2格。
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from .records import record_to_dict
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # 可选依赖
+    msgspec = None
+
+
+CODECS = ('json', 'orjson', 'msgspec')
+
+
+if msgspec is not None:
+    # 结构声明爬虫输出的全部字段；未声明的字段在解码时报错（ValidationError），不会被静默丢弃
+    class IncidentReportStruct(msgspec.Struct, omit_defaults=True, forbid_unknown_fields=True):
+        """竞赛事件报告"""
+        position: Optional[str] = None
+        horse_number: Optional[str] = None
+        horse_id: Optional[str] = None
+        horse_name: Optional[str] = None
+        description: str = ''
+
+    class RaceResultStruct(msgspec.Struct, forbid_unknown_fields=True):
+        """比赛结果（RaceResultScraper.scrape_race_result的返回值）"""
+        race_date: str = ''
+        racecourse: str = ''
+        race_no: str = ''
+        race_info: Dict[str, Any] = {}
+        horses: List[Dict[str, Any]] = []
+        race_result: Dict[str, Any] = {}
+        incident_reports: List[IncidentReportStruct] = []
+        pedigree: Dict[str, Any] = {}
+        raw_html: str = ''
+
+    class HorseInfoStruct(msgspec.Struct, forbid_unknown_fields=True):
+        """马匹信息（HorseInfoScraper.scrape_horse_info的返回值）"""
+        horse_id: Optional[str] = None
+        source_url: str = ''
+        scraped_at: str = ''
+        basic_info: Dict[str, Any] = {}
+        race_records: List[Dict[str, Any]] = []
+        equipment_legend: Dict[str, str] = {}
+        raw_html: str = ''
+
+    class FixtureStruct(msgspec.Struct, forbid_unknown_fields=True):
+        """赛程表（RaceScheduleScraper.scrape_schedule的返回值）"""
+        source_url: str = ''
+        scraped_at: str = ''
+        months: List[str] = []
+        race_days: List[Dict[str, Any]] = []
+        legend: Dict[str, Any] = {}
+        notices: List[str] = []
+        raw_html: str = ''
+
+    SCHEMAS = {
+        'race_result': RaceResultStruct,
+        'horse_info': HorseInfoStruct,
+        'fixture': FixtureStruct,
+    }
+
+    _msgspec_encoder = msgspec.json.Encoder(enc_hook=record_to_dict)
+else:
+    SCHEMAS = {}
+
+
+def available_codecs() -> List[str]:
+    """当前环境可用的编码方式"""
+    return [codec for codec in CODECS
+            if codec == 'json' or (codec == 'orjson' and orjson) or (codec == 'msgspec' and msgspec)]
+
+
+def _check_codec(codec: str):
+    """检查编码方式是否可用"""
+    if codec not in CODECS:
+        raise ValueError(f"未知的编码方式: {codec}，可选: {', '.join(CODECS)}")
+    if codec == 'orjson' and orjson is None:
+        raise ImportError("使用orjson编码需要安装orjson: pip install orjson")
+    if codec == 'msgspec' and msgspec is None:
+        raise ImportError("使用msgspec编码需要安装msgspec: pip install msgspec")
+
+
+def encode(data: Any, codec: str = 'json', pretty: bool = False) -> bytes:
+    """
+    编码为JSON字节
+
+    Args:
+        data: 爬虫返回的数据（字典、列表或记录）
+        codec: 编码方式，'json'、'orjson'或'msgspec'
+        pretty: 为True时缩进2格输出
+
+    Returns:
+        UTF-8编码的JSON
+    """
+    _check_codec(codec)
+
+    if codec == 'orjson':
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(data, default=record_to_dict, option=option)
+
+    if codec == 'msgspec':
+        raw = _msgspec_encoder.encode(data)
+        return msgspec.json.format(raw, indent=2) if pretty else raw
+
+    if pretty:
+        text = json.dumps(data, ensure_ascii=False, indent=2, default=record_to_dict)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=record_to_dict)
+    return text.encode('utf-8')
+
+
+def decode(raw: bytes, codec: str = 'json', schema: Optional[str] = None) -> Any:
+    """
+    解码JSON
+
+    Args:
+        raw: JSON字节或字符串
+        codec: 编码方式，'json'、'orjson'或'msgspec'
+        schema: 仅msgspec可用，'race_result'、'horse_info'或'fixture'，
+                指定时解码并校验为对应的结构（包含结构中没有的字段时抛出msgspec.ValidationError）
+
+    Returns:
+        字典/列表；指定schema时返回对应的msgspec结构
+    """
+    _check_codec(codec)
+
+    if schema is not None:
+        if codec != 'msgspec':
+            raise ValueError("schema只能与msgspec编码方式一起使用")
+        if schema not in SCHEMAS:
+            raise ValueError(f"未知的结构: {schema}，可选: {', '.join(SCHEMAS)}")
+        return msgspec.json.decode(raw, type=SCHEMAS[schema])
+
+    if codec == 'orjson':
+        return orjson.loads(raw)
+    if codec == 'msgspec':
+        return msgspec.json.decode(raw)
+    return json.loads(raw)
+
+
+def dump_json(data: Any, filename: str, codec: str = 'json', pretty: bool = False):
+    """
+    保存为JSON文件
+
+    Args:
+        data: 要保存的数据
+        filename: 文件名
+        codec: 编码方式，'json'、'orjson'或'msgspec'
+        pretty: 为True时缩进2格输出
+    """
+    raw = encode(data, codec=codec, pretty=pretty)
+    with open(filename, 'wb') as f:
+        f.write(raw)
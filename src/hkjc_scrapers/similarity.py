@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+马匹近况相似度查询（需要安装numpy）
+每匹马最近N场赛绩的名次、头马距离、评分、途程缩放到0-1后组成定长的float32向量（近况向量），
+全部马匹的向量保存在同一个矩阵中，一次矩阵乘法算出与全部马匹的余弦相似度或欧氏距离，
+再用numpy.argpartition取前k名，不需要对全部马匹排序。
+
+重新抓取马匹资料后再次加入即原地更新该马的一行；删除时由最后一行补位，矩阵始终连续。
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .utils import parse_int, parse_margin, parse_race_date
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+
+# (特征, 赛绩字段, 下限, 上限)：取值按上下限缩放到0-1
+PROFILE_FEATURES: Tuple[Tuple[str, Tuple[str, ...], float, float], ...] = (
+    ('position', ('position',), 1, 14),
+    ('margin', ('margin', '頭馬距離'), 0, 20),
+    ('rating', ('rating', '評分'), 0, 140),
+    ('distance', ('distance', '途程'), 1000, 2400),
+)
+
+DEFAULT_RUNS = 6
+METRICS = ('cosine', 'euclidean')
+
+
+def _require_numpy():
+    """检查numpy是否可用"""
+    if np is None:
+        raise ImportError("近况相似度需要安装numpy: pip install numpy")
+
+
+def _field(record: Mapping, keys: Sequence[str]):
+    """按keys顺序取第一个非空的字段"""
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def form_profile(race_records: Iterable[Mapping], runs: int = DEFAULT_RUNS) -> Optional['np.ndarray']:
+    """
+    由赛绩计算近况向量
+
+    向量按特征分段，每段为最近runs场（由新到旧）的缩放值；
+    缺失的值和不足runs场的位置用该马该特征的平均值补齐。
+
+    Args:
+        race_records: HorseInfoScraper的race_records
+        runs: 使用的场数
+
+    Returns:
+        长度为len(PROFILE_FEATURES) * runs的float32数组；没有可用赛绩时返回None
+    """
+    _require_numpy()
+    dated = []
+    for record in race_records or []:
+        race_date = parse_race_date(record.get('date'))
+        if race_date is not None and parse_int(record.get('position')) is not None:
+            dated.append((race_date, record))
+    if not dated:
+        return None
+    dated.sort(key=lambda item: item[0], reverse=True)
+    recent = [record for _, record in dated[:runs]]
+
+    vector = np.empty(len(PROFILE_FEATURES) * runs, dtype=np.float32)
+    for i, (name, keys, low, high) in enumerate(PROFILE_FEATURES):
+        parse = parse_margin if name == 'margin' else parse_int
+        scaled = []
+        for record in recent:
+            value = parse(_field(record, keys))
+            scaled.append(None if value is None else min(max((value - low) / (high - low), 0.0), 1.0))
+        known = [value for value in scaled if value is not None]
+        fill = sum(known) / len(known) if known else 0.5
+        segment = [fill if value is None else value for value in scaled]
+        segment.extend([fill] * (runs - len(segment)))
+        vector[i * runs:(i + 1) * runs] = segment
+    return vector
+
+
+class FormSimilarity:
+    """
+    马匹近况相似度索引
+
+    用法:
+        index = FormSimilarity()
+        index.add_horses(horses)            # HorseInfoScraper.scrape_horse_info的返回值
+
+        index.similar('HK_2023_J256', k=10)                      # [(horse_id, 余弦相似度), ...]
+        index.similar('HK_2023_J256', k=10, metric='euclidean')  # [(horse_id, 距离), ...]
+        index.similar_many(['HK_2023_J256', 'HK_2024_K123'], k=5)
+    """
+
+    def __init__(self, runs: int = DEFAULT_RUNS, capacity: int = 1024):
+        _require_numpy()
+        self.runs = runs
+        self.dims = len(PROFILE_FEATURES) * runs
+        self._matrix = np.zeros((max(capacity, 1), self.dims), dtype=np.float32)
+        # 每行的平方和（余弦相似度的范数和欧氏距离都由它得到）
+        self._squares = np.zeros(self._matrix.shape[0], dtype=np.float32)
+        self.horse_ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.horse_ids)
+
+    def __contains__(self, horse_id: str) -> bool:
+        return horse_id in self.rows
+
+    @property
+    def matrix(self) -> 'np.ndarray':
+        """全部马匹的近况向量（每行一匹马，顺序同horse_ids）"""
+        return self._matrix[:len(self.horse_ids)]
+
+    def _grow(self):
+        """容量不足时加倍"""
+        capacity = self._matrix.shape[0] * 2
+        matrix = np.zeros((capacity, self.dims), dtype=np.float32)
+        matrix[:len(self.horse_ids)] = self.matrix
+        squares = np.zeros(capacity, dtype=np.float32)
+        squares[:len(self.horse_ids)] = self._squares[:len(self.horse_ids)]
+        self._matrix, self._squares = matrix, squares
+
+    def set_vector(self, horse_id: str, vector: 'np.ndarray'):
+        """加入或更新一匹马的近况向量"""
+        row = self.rows.get(horse_id)
+        if row is None:
+            row = len(self.horse_ids)
+            if row == self._matrix.shape[0]:
+                self._grow()
+            self.horse_ids.append(horse_id)
+            self.rows[horse_id] = row
+        self._matrix[row] = vector
+        self._squares[row] = np.dot(self._matrix[row], self._matrix[row])
+
+    def add_horse(self, horse: Mapping) -> bool:
+        """
+        加入（或更新）一匹马
+
+        Returns:
+            是否有可用的赛绩；没有时原有的向量被删除
+        """
+        horse_id = horse.get('horse_id') if horse else None
+        if not horse_id:
+            return False
+        vector = form_profile(horse.get('race_records'), self.runs)
+        if vector is None:
+            self.remove_horse(horse_id)
+            return False
+        self.set_vector(horse_id, vector)
+        return True
+
+    def add_horses(self, horses: Iterable[Mapping]) -> int:
+        """加入多匹马，返回加入的马匹数量"""
+        return sum(self.add_horse(horse) for horse in horses)
+
+    def remove_horse(self, horse_id: str) -> bool:
+        """删除一匹马（由最后一行补位）"""
+        row = self.rows.pop(horse_id, None)
+        if row is None:
+            return False
+        last = len(self.horse_ids) - 1
+        if row != last:
+            moved = self.horse_ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._squares[row] = self._squares[last]
+            self.horse_ids[row] = moved
+            self.rows[moved] = row
+        self.horse_ids.pop()
+        return True
+
+    def vector(self, horse_id: str) -> Optional['np.ndarray']:
+        """某匹马的近况向量（副本）"""
+        row = self.rows.get(horse_id)
+        return None if row is None else self._matrix[row].copy()
+
+    def _queries(self, queries) -> Tuple['np.ndarray', List[Optional[int]]]:
+        """查询（horse_id或向量）转换为矩阵，并记录各查询自身所在的行"""
+        vectors, own_rows = [], []
+        for query in queries:
+            if isinstance(query, str):
+                row = self.rows.get(query)
+                if row is None:
+                    raise KeyError(f"没有该马匹的近况向量: {query}")
+                vectors.append(self._matrix[row])
+                own_rows.append(row)
+            else:
+                vector = np.asarray(query, dtype=np.float32)
+                if vector.shape != (self.dims,):
+                    raise ValueError(f"向量长度应为{self.dims}，实际为{vector.shape}")
+                vectors.append(vector)
+                own_rows.append(None)
+        return np.vstack(vectors) if vectors else np.empty((0, self.dims), dtype=np.float32), own_rows
+
+    def similar_many(self, queries: Sequence, k: int = 10,
+                     metric: str = 'cosine') -> List[List[Tuple[str, float]]]:
+        """
+        批量查询最相似的k匹马
+
+        Args:
+            queries: horse_id或近况向量的列表；horse_id查询不包含该马本身
+            k: 每个查询返回的马匹数量
+            metric: 'cosine'（余弦相似度，由大到小）或'euclidean'（欧氏距离，由小到大）
+
+        Returns:
+            每个查询的[(horse_id, 相似度或距离), ...]
+        """
+        if metric not in METRICS:
+            raise ValueError(f"未知的相似度: {metric}，可选: {', '.join(METRICS)}")
+        count = len(self.horse_ids)
+        query_matrix, own_rows = self._queries(queries)
+        if count == 0 or not own_rows:
+            return [[] for _ in own_rows]
+
+        products = query_matrix @ self.matrix.T
+        squares = self._squares[:count]
+        query_squares = np.einsum('ij,ij->i', query_matrix, query_matrix)
+        if metric == 'cosine':
+            norms = np.sqrt(squares)
+            query_norms = np.sqrt(query_squares)
+            denominator = query_norms[:, None] * norms[None, :]
+            scores = np.divide(products, denominator, out=np.zeros_like(products), where=denominator > 0)
+            keys = -scores
+        else:
+            scores = np.maximum(query_squares[:, None] + squares[None, :] - 2 * products, 0)
+            keys = scores
+
+        # 查询自身排在最后，多取一名后再去掉
+        has_own = False
+        for i, row in enumerate(own_rows):
+            if row is not None:
+                keys[i, row] = np.inf
+                has_own = True
+        take = min(k + 1 if has_own else k, count)
+        if take <= 0:
+            return [[] for _ in own_rows]
+        top = np.argpartition(keys, take - 1, axis=1)[:, :take]
+        order = np.argsort(np.take_along_axis(keys, top, axis=1), axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        values = np.take_along_axis(scores, top, axis=1)
+        if metric == 'euclidean':
+            values = np.sqrt(values)
+
+        results = []
+        for i, row in enumerate(own_rows):
+            pairs = [(self.horse_ids[r], float(v)) for r, v in zip(top[i].tolist(), values[i].tolist()) if r != row]
+            results.append(pairs[:k])
+        return results
+
+    def similar(self, query, k: int = 10, metric: str = 'cosine') -> List[Tuple[str, float]]:
+        """
+        查询最相似的k匹马
+
+        Args:
+            query: horse_id（结果不包含该马）或近况向量
+            k: 返回的马匹数量
+            metric: 'cosine'或'euclidean'
+
+        Returns:
+            [(horse_id, 相似度或距离), ...]
+        """
+        return self.similar_many([query], k, metric)[0]
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite存储
+把三个爬虫的结果写入规范化的表，按马匹、骑师、练马师、日期和场地查询：
+
+- meetings: 赛马日（日期 + 场地）
+- races: 比赛（比赛信息、结果、血统以JSON保存）
+- runners: 参赛马匹
+- incident_reports: 竞赛事件报告
+- horses: 马匹基本资料
+- race_records: 马匹赛绩
+- fixture_days: 赛程表中的赛马日
+
+日期统一保存为ISO格式（YYYY-MM-DD）。未映射到列的字段以JSON保存在extra列中。
+写入使用WAL模式，每批数据在一个事务中用executemany批量写入（重复写入时更新）。
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .records import record_to_dict
+from .utils import parse_race_date
+
+
+# 字段 -> 列（未列出的字段保存在extra中）
+RUNNER_COLUMNS = (
+    ('horse_id', 'horse_id'), ('horse_name', 'horse_name'), ('horse_url', 'horse_url'),
+    ('number', 'number'), ('馬號', 'horse_no'), ('position', 'position'),
+    ('jockey', 'jockey'), ('trainer', 'trainer'), ('draw', 'draw'), ('weight', 'weight'),
+    ('實際負磅', 'actual_weight'), ('rating', 'rating'), ('odds', 'odds'),
+    ('頭馬距離', 'margin'), ('沿途走位', 'running_position'), ('完成時間', 'finish_time'),
+)
+INCIDENT_COLUMNS = (
+    ('position', 'position'), ('horse_number', 'horse_number'), ('horse_id', 'horse_id'),
+    ('horse_name', 'horse_name'), ('description', 'description'),
+)
+HORSE_COLUMNS = (
+    ('horse_name', 'horse_name'), ('horse_code', 'horse_code'), ('sex', 'sex'), ('age', 'age'),
+    ('colour', 'colour'), ('sire', 'sire'), ('dam', 'dam'), ('maternal_grandsire', 'maternal_grandsire'),
+    ('trainer', 'trainer'), ('owner', 'owner'), ('import_source', 'import_source'),
+    ('birthplace', 'birthplace'), ('current_rating', 'current_rating'),
+    ('season_start_rating', 'season_start_rating'),
+)
+RACE_RECORD_COLUMNS = (
+    ('場次', 'race_index'), ('distance', 'distance'), ('class', 'race_class'), ('position', 'position'),
+    ('jockey', 'jockey'), ('jockey_id', 'jockey_id'), ('trainer', 'trainer'), ('trainer_id', 'trainer_id'),
+    ('draw', 'draw'), ('weight', 'weight'), ('實際負磅', 'actual_weight'), ('rating', 'rating'),
+    ('odds', 'odds'), ('margin', 'margin'), ('沿途走位', 'running_position'),
+    ('finish_time', 'finish_time'), ('track', 'track'), ('track_condition', 'track_condition'),
+    ('equipment', 'equipment'),
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meetings (
+    race_date TEXT NOT NULL,
+    racecourse TEXT NOT NULL,
+    PRIMARY KEY (race_date, racecourse)
+);
+CREATE TABLE IF NOT EXISTS races (
+    race_date TEXT NOT NULL,
+    racecourse TEXT NOT NULL,
+    race_no INTEGER NOT NULL,
+    race_info TEXT,
+    race_result TEXT,
+    pedigree TEXT,
+    PRIMARY KEY (race_date, racecourse, race_no)
+);
+CREATE TABLE IF NOT EXISTS runners (
+    race_date TEXT NOT NULL,
+    racecourse TEXT NOT NULL,
+    race_no INTEGER NOT NULL,
+    runner_index INTEGER NOT NULL,
+    {', '.join(f'{column} TEXT' for _, column in RUNNER_COLUMNS)},
+    extra TEXT,
+    PRIMARY KEY (race_date, racecourse, race_no, runner_index)
+);
+CREATE TABLE IF NOT EXISTS incident_reports (
+    race_date TEXT NOT NULL,
+    racecourse TEXT NOT NULL,
+    race_no INTEGER NOT NULL,
+    report_index INTEGER NOT NULL,
+    {', '.join(f'{column} TEXT' for _, column in INCIDENT_COLUMNS)},
+    PRIMARY KEY (race_date, racecourse, race_no, report_index)
+);
+CREATE TABLE IF NOT EXISTS horses (
+    horse_id TEXT PRIMARY KEY,
+    {', '.join(f'{column} TEXT' for _, column in HORSE_COLUMNS)},
+    source_url TEXT,
+    scraped_at TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS race_records (
+    horse_id TEXT NOT NULL,
+    race_date TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    {', '.join(f'{column} TEXT' for _, column in RACE_RECORD_COLUMNS)},
+    extra TEXT,
+    PRIMARY KEY (horse_id, race_date, venue)
+);
+CREATE TABLE IF NOT EXISTS fixture_days (
+    race_date TEXT PRIMARY KEY,
+    day INTEGER,
+    month TEXT,
+    year TEXT,
+    venues TEXT,
+    race_types TEXT,
+    track_types TEXT,
+    race_count INTEGER,
+    date_info TEXT,
+    races TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_races_date ON races (race_date);
+CREATE INDEX IF NOT EXISTS idx_runners_horse ON runners (horse_id);
+CREATE INDEX IF NOT EXISTS idx_runners_date ON runners (race_date);
+CREATE INDEX IF NOT EXISTS idx_runners_jockey ON runners (jockey, race_date);
+CREATE INDEX IF NOT EXISTS idx_runners_trainer ON runners (trainer, race_date);
+CREATE INDEX IF NOT EXISTS idx_incidents_horse ON incident_reports (horse_id);
+CREATE INDEX IF NOT EXISTS idx_records_date ON race_records (race_date);
+CREATE INDEX IF NOT EXISTS idx_records_jockey ON race_records (jockey, race_date);
+CREATE INDEX IF NOT EXISTS idx_records_trainer ON race_records (trainer, race_date);
+CREATE INDEX IF NOT EXISTS idx_horses_sire ON horses (sire);
+"""
+
+
+def _iso_date(value: Any) -> str:
+    """转换为ISO日期；无法解析时原样返回"""
+    parsed = parse_race_date(value)
+    return parsed.isoformat() if parsed else str(value or '')
+
+
+def _race_no(value: Any) -> int:
+    """场次转换为整数"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _to_json(value: Any) -> Optional[str]:
+    """编码为JSON；空值返回None"""
+    if not value:
+        return None
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=record_to_dict)
+
+
+def _split(row: Mapping, columns: Sequence[Tuple[str, str]], skip: Sequence[str] = ()) -> Tuple[List, Optional[str]]:
+    """按列映射取值，其余字段编码为extra"""
+    values = [row.get(key) for key, _ in columns]
+    mapped = {key for key, _ in columns}
+    extra = {key: value for key, value in row.items() if key not in mapped and key not in skip}
+    return values, _to_json(extra)
+
+
+def _upsert_sql(table: str, key_columns: Sequence[str], columns: Sequence[str]) -> str:
+    """生成INSERT ... ON CONFLICT DO UPDATE语句"""
+    all_columns = list(key_columns) + list(columns)
+    placeholders = ', '.join('?' for _ in all_columns)
+    updates = ', '.join(f'{column} = excluded.{column}' for column in columns)
+    conflict = f'DO UPDATE SET {updates}' if columns else 'DO NOTHING'
+    return (f"INSERT INTO {table} ({', '.join(all_columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT ({', '.join(key_columns)}) {conflict}")
+
+
+RACE_KEY = ('race_date', 'racecourse', 'race_no')
+UPSERT_MEETING = _upsert_sql('meetings', ('race_date', 'racecourse'), ())
+UPSERT_RACE = _upsert_sql('races', RACE_KEY, ('race_info', 'race_result', 'pedigree'))
+INSERT_RUNNER = _upsert_sql('runners', RACE_KEY + ('runner_index',),
+                            [column for _, column in RUNNER_COLUMNS] + ['extra'])
+INSERT_INCIDENT = _upsert_sql('incident_reports', RACE_KEY + ('report_index',),
+                              [column for _, column in INCIDENT_COLUMNS])
+UPSERT_HORSE = _upsert_sql('horses', ('horse_id',),
+                           [column for _, column in HORSE_COLUMNS] + ['source_url', 'scraped_at', 'extra'])
+UPSERT_RACE_RECORD = _upsert_sql('race_records', ('horse_id', 'race_date', 'venue'),
+                                 [column for _, column in RACE_RECORD_COLUMNS] + ['extra'])
+UPSERT_FIXTURE_DAY = _upsert_sql('fixture_days', ('race_date',),
+                                 ('day', 'month', 'year', 'venues', 'race_types', 'track_types',
+                                  'race_count', 'date_info', 'races'))
+
+
+class SQLiteStore:
+    """
+    SQLite存储
+
+    用法:
+        with SQLiteStore('hkjc.db') as store:
+            store.add_race_results(results)
+            store.add_horses(horses)
+            rows = store.runs_by_horse('HK_2020_E436')
+    """
+
+    def __init__(self, filename: str, batch_size: int = 500):
+        """
+        Args:
+            filename: 数据库文件名（':memory:'为内存数据库）
+            batch_size: 每个事务写入的文档数量
+        """
+        self.filename = filename
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(filename)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA synchronous = NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    # ---------- 写入 ----------
+
+    def _write_batches(self, documents: Iterable[Dict], collect) -> int:
+        """按batch_size把文档分批收集为行，每批在一个事务中写入；返回文档数量"""
+        count = 0
+        batch = []
+        for document in documents:
+            if not document:
+                continue
+            batch.append(document)
+            if len(batch) >= self.batch_size:
+                collect(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            collect(batch)
+            count += len(batch)
+        return count
+
+    def add_race_results(self, results: Iterable[Dict]) -> int:
+        """
+        写入比赛结果（RaceResultScraper.scrape_race_result的返回值）
+
+        同一场比赛重复写入时，比赛信息被更新，参赛马匹和事件报告被替换。
+
+        Returns:
+            写入的比赛数量
+        """
+        return self._write_batches(results, self._write_race_results)
+
+    def add_race_result(self, result: Dict) -> int:
+        """写入一场比赛结果"""
+        return self.add_race_results([result])
+
+    def _write_race_results(self, results: List[Dict]):
+        """在一个事务中写入一批比赛结果"""
+        meetings, races, runners, incidents = [], [], [], []
+        for result in results:
+            key = (_iso_date(result.get('race_date')), result.get('racecourse') or '', _race_no(result.get('race_no')))
+            meetings.append(key[:2])
+            races.append(key + (_to_json(result.get('race_info')), _to_json(result.get('race_result')),
+                                _to_json(result.get('pedigree'))))
+            for index, horse in enumerate(result.get('horses') or []):
+                values, extra = _split(horse, RUNNER_COLUMNS)
+                runners.append(key + (index, *values, extra))
+            for index, incident in enumerate(result.get('incident_reports') or []):
+                incidents.append(key + (index, *(incident.get(field) for field, _ in INCIDENT_COLUMNS)))
+
+        keys = [race[:3] for race in races]
+        with self.conn:
+            self.conn.executemany('DELETE FROM runners WHERE race_date = ? AND racecourse = ? AND race_no = ?', keys)
+            self.conn.executemany(
+                'DELETE FROM incident_reports WHERE race_date = ? AND racecourse = ? AND race_no = ?', keys)
+            self.conn.executemany(UPSERT_MEETING, meetings)
+            self.conn.executemany(UPSERT_RACE, races)
+            self.conn.executemany(INSERT_RUNNER, runners)
+            self.conn.executemany(INSERT_INCIDENT, incidents)
+
+    def add_horses(self, horses: Iterable[Dict]) -> int:
+        """
+        写入马匹信息（HorseInfoScraper.scrape_horse_info的返回值）
+
+        赛绩按(马匹, 日期, 场地)更新，已保存但本次没有的赛绩保留（配合增量抓取）。
+
+        Returns:
+            写入的马匹数量
+        """
+        return self._write_batches(horses, self._write_horses)
+
+    def add_horse(self, horse: Dict) -> int:
+        """写入一匹马的信息"""
+        return self.add_horses([horse])
+
+    def _write_horses(self, horses: List[Dict]):
+        """在一个事务中写入一批马匹信息"""
+        horse_rows, record_rows = [], []
+        for horse in horses:
+            horse_id = horse.get('horse_id') or ''
+            values, extra = _split(horse.get('basic_info') or {}, HORSE_COLUMNS)
+            horse_rows.append((horse_id, *values, horse.get('source_url'), horse.get('scraped_at'), extra))
+            for record in horse.get('race_records') or []:
+                values, extra = _split(record, RACE_RECORD_COLUMNS, skip=('date', 'venue'))
+                record_rows.append((horse_id, _iso_date(record.get('date')), record.get('venue') or '',
+                                    *values, extra))
+
+        with self.conn:
+            self.conn.executemany(UPSERT_HORSE, horse_rows)
+            self.conn.executemany(UPSERT_RACE_RECORD, record_rows)
+
+    def add_fixtures(self, fixtures: Iterable[Dict]) -> int:
+        """
+        写入赛程表（RaceScheduleScraper.scrape_schedule的返回值）
+
+        Returns:
+            写入的赛程表数量
+        """
+        return self._write_batches(fixtures, self._write_fixtures)
+
+    def add_fixture(self, fixture: Dict) -> int:
+        """写入一个赛程表"""
+        return self.add_fixtures([fixture])
+
+    def _write_fixtures(self, fixtures: List[Dict]):
+        """在一个事务中写入一批赛程表"""
+        rows = []
+        for fixture in fixtures:
+            for race_day in fixture.get('race_days') or []:
+                if not race_day.get('date'):
+                    continue
+                races = race_day.get('races') or []
+                rows.append((
+                    _iso_date(race_day.get('date')), race_day.get('day'), race_day.get('month'),
+                    race_day.get('year'), ', '.join(race_day.get('venues') or []),
+                    ', '.join(race_day.get('race_types') or []), ', '.join(race_day.get('track_types') or []),
+                    len(races), _to_json(race_day.get('date_info')), _to_json(races),
+                ))
+
+        with self.conn:
+            self.conn.executemany(UPSERT_FIXTURE_DAY, rows)
+
+    # ---------- 查询 ----------
+
+    def query(self, sql: str, params: Sequence = ()) -> List[Dict]:
+        """执行查询，返回字典列表"""
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    @staticmethod
+    def _date_filter(date_from, date_to) -> Tuple[str, List]:
+        """日期范围条件"""
+        clause, params = '', []
+        if date_from is not None:
+            clause += ' AND race_date >= ?'
+            params.append(_iso_date(date_from))
+        if date_to is not None:
+            clause += ' AND race_date <= ?'
+            params.append(_iso_date(date_to))
+        return clause, params
+
+    def runs_by_horse(self, horse_id: str) -> List[Dict]:
+        """马匹的赛绩（由新到旧）"""
+        return self.query('SELECT * FROM race_records WHERE horse_id = ? ORDER BY race_date DESC', (horse_id,))
+
+    def runners_by_horse(self, horse_id: str) -> List[Dict]:
+        """马匹在已保存比赛结果中的出赛（由新到旧）"""
+        return self.query('SELECT * FROM runners WHERE horse_id = ? ORDER BY race_date DESC, race_no', (horse_id,))
+
+    def runners_by_jockey(self, jockey: str, date_from=None, date_to=None) -> List[Dict]:
+        """骑师的出赛（可按日期范围筛选）"""
+        clause, params = self._date_filter(date_from, date_to)
+        return self.query(f'SELECT * FROM runners WHERE jockey = ?{clause} ORDER BY race_date, race_no',
+                          [jockey] + params)
+
+    def runners_by_trainer(self, trainer: str, date_from=None, date_to=None) -> List[Dict]:
+        """练马师的出赛（可按日期范围筛选）"""
+        clause, params = self._date_filter(date_from, date_to)
+        return self.query(f'SELECT * FROM runners WHERE trainer = ?{clause} ORDER BY race_date, race_no',
+                          [trainer] + params)
+
+    def races_on(self, race_date, racecourse: Optional[str] = None) -> List[Dict]:
+        """某日的比赛"""
+        sql = 'SELECT * FROM races WHERE race_date = ?'
+        params = [_iso_date(race_date)]
+        if racecourse:
+            sql += ' AND racecourse = ?'
+            params.append(racecourse)
+        return self.query(sql + ' ORDER BY racecourse, race_no', params)
+
+    def incidents_by_horse(self, horse_id: str) -> List[Dict]:
+        """马匹的竞赛事件报告（由新到旧）"""
+        return self.query('SELECT * FROM incident_reports WHERE horse_id = ? ORDER BY race_date DESC', (horse_id,))
+
+    def fixture_days(self, date_from=None, date_to=None, venue: Optional[str] = None) -> List[Dict]:
+        """赛程表中的赛马日（可按日期范围、场地筛选）"""
+        clause, params = self._date_filter(date_from, date_to)
+        if venue:
+            clause += ' AND venues LIKE ?'
+            params.append(f'%{venue}%')
+        return self.query(f'SELECT * FROM fixture_days WHERE 1 = 1{clause} ORDER BY race_date', params)
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
+
+    def __enter__(self) -> 'SQLiteStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+骑师、练马师统计（增量维护）
+由RaceResultScraper的结果逐场更新出赛、头马、上名（前三名）次数：
+
+- 每个骑师、练马师、骑师与练马师组合的总计
+- 每个(对象, 场地, 途程, 马季)的分项
+
+每场比赛对各项统计的贡献单独保存。同一场比赛再次加入时先减去原来的贡献再加上新的贡献，
+结果与只加入一次相同；每场的更新只涉及该场的参赛马匹，不需要重新统计全部历史赛果。
+统计可以保存为JSON文件，下次运行时载入后继续累加。
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .utils import parse_int, parse_race_date, race_key, season_of, venue_code
+
+
+# 统计对象
+KINDS = ('jockey', 'trainer', 'pair')
+
+# 名次在此范围内算上名
+PLACE_POSITIONS = 3
+
+# 没有数字名次但已出赛的特殊名次（WV、WX等退出的马匹不计出赛）
+STARTED_CODES = frozenset({'PU', 'UR', 'FE', 'DNF', 'TNP', 'DISQ'})
+
+FORMAT_VERSION = 1
+
+
+def _started(position) -> Tuple[bool, Optional[int]]:
+    """是否出赛以及数字名次"""
+    number = parse_int(position)
+    if number is not None:
+        return True, number
+    return (str(position or '').strip().upper() in STARTED_CODES), None
+
+
+def _race_distance(result: Mapping) -> Optional[int]:
+    """比赛途程（米）"""
+    race_info = result.get('race_info') or {}
+    return parse_int(race_info.get('distance_meters') or race_info.get('distance'))
+
+
+def _rates(counts: List[int]) -> Dict:
+    """次数和胜出率、上名率"""
+    starts, wins, places = counts
+    return {
+        'starts': starts,
+        'wins': wins,
+        'places': places,
+        'win_rate': wins / starts if starts else 0.0,
+        'place_rate': places / starts if starts else 0.0,
+    }
+
+
+class RunningStats:
+    """
+    增量维护的骑师、练马师统计
+
+    用法:
+        stats = RunningStats.load('stats.json')   # 文件不存在时为空统计
+        for url in meeting_urls:
+            stats.add_race_result(scraper.scrape_race_result(url))
+        stats.save('stats.json')
+
+        stats.get('jockey', '潘頓')
+        stats.get('pair', ('潘頓', '呂健威'), venue='ST', season='2025-26')
+    """
+
+    def __init__(self):
+        # 统计键 -> [出赛, 头马, 上名]
+        # 总计的键为(对象, 名称)，分项的键为(对象, 名称, 场地, 途程, 马季)；组合的名称为(骑师, 练马师)
+        self.counts: Dict[Tuple, List[int]] = defaultdict(lambda: [0, 0, 0])
+        # (对象, 名称) -> 该对象出现过的分项键
+        self._details: Dict[Tuple, set] = defaultdict(set)
+        # 比赛键 -> 该场比赛的贡献：{'venue', 'distance', 'season', 'runners': [[骑师, 练马师, 头马, 上名], ...]}
+        self.races: Dict[str, Dict] = {}
+
+    def __len__(self) -> int:
+        """已统计的比赛数量"""
+        return len(self.races)
+
+    def __contains__(self, race_key: str) -> bool:
+        return race_key in self.races
+
+    def _contribution(self, result: Mapping) -> Dict:
+        """一场比赛的贡献"""
+        runners = []
+        for horse in result.get('horses') or []:
+            started, position = _started(horse.get('position'))
+            if not started:
+                continue
+            win = int(position == 1)
+            place = int(position is not None and position <= PLACE_POSITIONS)
+            runners.append([horse.get('jockey') or None, horse.get('trainer') or None, win, place])
+        race_date = parse_race_date(result.get('race_date'))
+        return {
+            'venue': venue_code(result.get('racecourse')) or None,
+            'distance': _race_distance(result),
+            'season': season_of(race_date) if race_date else None,
+            'runners': runners,
+        }
+
+    def _apply(self, contribution: Dict, sign: int):
+        """加上（sign=1）或减去（sign=-1）一场比赛的贡献"""
+        dimensions = (contribution['venue'], contribution['distance'], contribution['season'])
+        for jockey, trainer, win, place in contribution['runners']:
+            names = (('jockey', jockey), ('trainer', trainer),
+                     ('pair', (jockey, trainer) if jockey and trainer else None))
+            for kind, name in names:
+                if not name:
+                    continue
+                entity = (kind, name)
+                detail = entity + dimensions
+                for key in (entity, detail):
+                    counts = self.counts[key]
+                    counts[0] += sign
+                    counts[1] += sign * win
+                    counts[2] += sign * place
+                    if not counts[0]:
+                        del self.counts[key]
+                if detail in self.counts:
+                    self._details[entity].add(detail)
+                else:
+                    self._details[entity].discard(detail)
+
+    def add_race_result(self, result: Mapping) -> bool:
+        """
+        加入一场比赛结果（RaceResultScraper.scrape_race_result的返回值）
+
+        同一场比赛再次加入时替换原来的贡献（例如赛果修正后重新抓取）。
+
+        Returns:
+            统计是否有变化
+        """
+        if not result:
+            return False
+        key = race_key(result)
+        if key is None:
+            return False
+        contribution = self._contribution(result)
+        previous = self.races.get(key)
+        if previous == contribution:
+            return False
+        if previous is not None:
+            self._apply(previous, -1)
+        self._apply(contribution, 1)
+        self.races[key] = contribution
+        return True
+
+    def add_race_results(self, results: Iterable[Mapping]) -> int:
+        """加入多场比赛结果，返回有变化的比赛数量"""
+        return sum(self.add_race_result(result) for result in results)
+
+    def remove_race(self, race_key: str) -> bool:
+        """
+        移除一场比赛的贡献
+
+        Args:
+            race_key: 比赛键（"2026-01-18|ST|3"）
+        """
+        contribution = self.races.pop(race_key, None)
+        if contribution is None:
+            return False
+        self._apply(contribution, -1)
+        return True
+
+    def get(self, kind: str, name, venue: Optional[str] = None, distance: Optional[int] = None,
+            season: Optional[str] = None) -> Dict:
+        """
+        查询统计
+
+        Args:
+            kind: 'jockey'、'trainer'或'pair'
+            name: 骑师或练马师名称；组合为(骑师, 练马师)
+            venue: 场地代码（"ST"、"HV"）或中文名称
+            distance: 途程（米）
+            season: 马季（如"2025-26"）
+
+        Returns:
+            {'starts', 'wins', 'places', 'win_rate', 'place_rate'}；只指定部分分项条件时合计符合的分项
+        """
+        if kind not in KINDS:
+            raise ValueError(f"未知的统计对象: {kind}，可选: {', '.join(KINDS)}")
+        entity = (kind, tuple(name) if kind == 'pair' else name)
+        if venue is None and distance is None and season is None:
+            return _rates(self.counts.get(entity, [0, 0, 0]))
+
+        venue = venue_code(venue) if venue else None
+        totals = [0, 0, 0]
+        for detail in self._details.get(entity, ()):
+            _, _, detail_venue, detail_distance, detail_season = detail
+            if (venue is None or detail_venue == venue) and (distance is None or detail_distance == distance) \
+                    and (season is None or detail_season == season):
+                for i, value in enumerate(self.counts[detail]):
+                    totals[i] += value
+        return _rates(totals)
+
+    def jockey(self, name: str, **filters) -> Dict:
+        """骑师统计（filters见get）"""
+        return self.get('jockey', name, **filters)
+
+    def trainer(self, name: str, **filters) -> Dict:
+        """练马师统计（filters见get）"""
+        return self.get('trainer', name, **filters)
+
+    def pair(self, jockey: str, trainer: str, **filters) -> Dict:
+        """骑师与练马师组合统计（filters见get）"""
+        return self.get('pair', (jockey, trainer), **filters)
+
+    def ranking(self, kind: str, by: str = 'wins', n: int = 10, min_starts: int = 1) -> List[Tuple]:
+        """
+        总计排名
+
+        Args:
+            kind: 'jockey'、'trainer'或'pair'
+            by: 排序依据：starts、wins、places、win_rate或place_rate
+            n: 返回前n名
+            min_starts: 最少出赛次数
+
+        Returns:
+            [(名称, 统计), ...]
+        """
+        rows = [(key[1], _rates(counts)) for key, counts in self.counts.items()
+                if len(key) == 2 and key[0] == kind and counts[0] >= min_starts]
+        rows.sort(key=lambda row: row[1][by], reverse=True)
+        return rows[:n]
+
+    def save(self, filename: str):
+        """
+        保存为JSON文件（先写临时文件再替换，中断时不会留下不完整的文件）
+
+        保存各场比赛的贡献和统计结果，载入时不需要重新计算。
+        """
+        data = {
+            'version': FORMAT_VERSION,
+            'races': self.races,
+            'counts': [[list(key), counts] for key, counts in self.counts.items()],
+        }
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, temp_path = tempfile.mkstemp(suffix='.json', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+            if os.path.exists(filename):
+                shutil.copymode(filename, temp_path)
+            os.replace(temp_path, filename)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, filename: str) -> 'RunningStats':
+        """
+        从JSON文件载入，文件不存在时返回空统计
+        """
+        stats = cls()
+        if not os.path.exists(filename):
+            return stats
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"不支持的统计文件版本: {data.get('version')}")
+
+        stats.races = data['races']
+        for key, counts in data['counts']:
+            if key[0] == 'pair':
+                key[1] = tuple(key[1])
+            key = tuple(key)
+            stats.counts[key] = counts
+            if len(key) > 2:
+                stats._details[key[:2]].add(key)
+        return stats
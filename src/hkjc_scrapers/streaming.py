@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式读取HTML
+response.text要等整个响应下载完才能开始解析。这里用requests的stream=True分块读取，
+每一块同时交给lxml的增量解析器（HTMLPullParser），每个元素结束时调用回调；
+回调确认所需的内容都已完整读取后立即停止下载，页面后面的内容（页脚、脚本等）不再读取。
+
+读取的字节数超过上限时抛出ResponseTooLarge，避免异常的响应占用过多内存。
+"""
+
+from typing import Callable, Optional, Tuple
+
+import requests
+from lxml import etree
+
+
+# 每次读取的字节数
+CHUNK_SIZE = 16 * 1024
+
+# 默认的响应大小上限（解压后的字节数）
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+class ResponseTooLarge(requests.RequestException):
+    """响应超过大小上限"""
+
+
+def _check_size(size: int, max_bytes: Optional[int], url: str):
+    """超过上限时抛出ResponseTooLarge"""
+    if max_bytes is not None and size > max_bytes:
+        raise ResponseTooLarge(f"响应超过大小上限 {max_bytes} 字节: {url}")
+
+
+def read_html(response, done: Optional[Callable] = None, max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+              chunk_size: int = CHUNK_SIZE, encoding: str = 'utf-8') -> Tuple[str, bool]:
+    """
+    分块读取HTML响应
+
+    Args:
+        response: requests.get(..., stream=True)的响应
+        done: 每个元素结束时以lxml元素调用，返回True时停止读取；None时读取全部内容
+        max_bytes: 响应大小上限（字节），None为不限
+        chunk_size: 每次读取的字节数
+        encoding: 页面编码
+
+    Returns:
+        (已读取的HTML文本, 是否提前停止)
+
+    Raises:
+        ResponseTooLarge: 声明的长度或已读取的字节数超过上限
+    """
+    url = getattr(response, 'url', '')
+    try:
+        length = (getattr(response, 'headers', None) or {}).get('Content-Length')
+        if length and str(length).isdigit():
+            _check_size(int(length), max_bytes, url)
+
+        parser = etree.HTMLPullParser(events=('end',), encoding=encoding) if done is not None else None
+        chunks = []
+        size = 0
+        stopped = False
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            size += len(chunk)
+            _check_size(size, max_bytes, url)
+            chunks.append(chunk)
+            if parser is None:
+                continue
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                if done(element):
+                    stopped = True
+                    break
+            if stopped:
+                break
+    finally:
+        response.close()
+
+    # 提前停止时最后一个字符可能被截断
+    return b''.join(chunks).decode(encoding, errors='replace'), stopped
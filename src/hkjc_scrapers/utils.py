@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+通用工具函数
+各爬虫及存储、索引模块共用的解析函数
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Mapping, Optional, Union
+
+
+def parse_race_date(value: Union[str, date, None]) -> Optional[date]:
+    """
+    解析比赛日期
+
+    支持的格式：
+    - 马匹赛绩中的 DD/MM/YY 或 DD/MM/YYYY（如"02/06/24"）
+    - 比赛结果URL中的 YYYY/MM/DD（如"2026/01/18"）
+    - 赛程表中的 YYYY-MM-DD（如"2026-01-18"）
+
+    Args:
+        value: 日期字符串或date/datetime对象
+
+    Returns:
+        date对象，无法解析时返回None
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return _parse_date_text(str(value).strip())
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_text(text: str) -> Optional[date]:
+    """解析日期字符串（同一天的日期在不同马匹页面中大量重复，结果缓存）"""
+    match = re.match(r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})', text)
+    if match:
+        year, month, day = (int(g) for g in match.groups())
+    else:
+        match = re.match(r'(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})', text)
+        if not match:
+            return None
+        day, month, year = (int(g) for g in match.groups())
+        if len(match.group(3)) == 2:
+            # 两位年份：70-99 为 1970-1999 年，其余为 2000 年后
+            year += 1900 if year >= 70 else 2000
+
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+# 场地名称 -> 场地代码
+VENUE_CODES = {
+    '沙田': 'ST',
+    '跑馬地': 'HV',
+    '跑马地': 'HV',
+    'ST': 'ST',
+    'HV': 'HV',
+}
+
+INT_PATTERN = re.compile(r'\s*(-?\d+)')
+FLOAT_PATTERN = re.compile(r'\s*(-?\d+(?:\.\d+)?)')
+FINISH_TIME_PATTERN = re.compile(r'\s*(?:(\d+)[:.])?(\d+)\.(\d+)\s*$')
+# 头马距离："2"、"1-1/2"、"3/4"
+MARGIN_PATTERN = re.compile(r'\s*(?:(\d+)(?:-(\d+)/(\d+))?|(\d+)/(\d+))\s*$')
+
+# 不足半个马位的头马距离（马位）
+SHORT_MARGINS = {
+    '鼻位': 0.05, 'N': 0.05, 'NOSE': 0.05,
+    '短馬頭位': 0.1, '短頭位': 0.1, 'SH': 0.1,
+    '頭位': 0.2, 'HD': 0.2,
+    '頸位': 0.3, 'NK': 0.3,
+}
+
+
+def season_of(value: Union[str, date, None]) -> Optional[str]:
+    """
+    比赛日期所属的马季
+
+    香港马季每年9月开始，次年7月结束，例如2025年9月至2026年7月为"2025-26"。
+
+    Args:
+        value: 日期字符串或date对象（格式见parse_race_date）
+
+    Returns:
+        马季字符串，无法解析日期时返回None
+    """
+    race_date = parse_race_date(value)
+    if race_date is None:
+        return None
+    start = race_date.year if race_date.month >= 9 else race_date.year - 1
+    return f'{start}-{(start + 1) % 100:02d}'
+
+
+@lru_cache(maxsize=256)
+def venue_code(value: Optional[str]) -> Optional[str]:
+    """
+    场地名称转换为场地代码（沙田 -> ST，跑馬地 -> HV），其他场地原样返回
+
+    马匹赛绩中的场地带有跑道（如"沙田草地"、"跑馬地草地"），按开头的场地名称识别。
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    code = VENUE_CODES.get(value)
+    if code is not None:
+        return code
+    for name, code in VENUE_CODES.items():
+        if value.startswith(name):
+            return code
+    return value
+
+
+def race_key(result: Mapping) -> Optional[str]:
+    """
+    比赛的唯一键："日期|场地代码|场次"（如"2026-01-18|ST|3"）
+
+    Args:
+        result: 含race_date、racecourse、race_no的比赛结果
+
+    Returns:
+        比赛键，日期或场次无法解析时返回None
+    """
+    race_date = parse_race_date(result.get('race_date'))
+    race_no = parse_int(result.get('race_no'))
+    if race_date is None or race_no is None:
+        return None
+    return f"{race_date.isoformat()}|{venue_code(result.get('racecourse')) or ''}|{race_no}"
+
+
+def parse_int(value) -> Optional[int]:
+    """
+    解析整数（取开头的数字，如"1185"、"3 DH"）
+
+    Returns:
+        整数，没有数字（如"WV"、"--"、空值）时返回None
+    """
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    match = INT_PATTERN.match(str(value).replace(',', ''))
+    return int(match.group(1)) if match else None
+
+
+def parse_float(value) -> Optional[float]:
+    """
+    解析小数（如赔率"4.7"）
+
+    Returns:
+        小数，没有数字时返回None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = FLOAT_PATTERN.match(str(value).replace(',', ''))
+    return float(match.group(1)) if match else None
+
+
+def parse_finish_time(value) -> Optional[float]:
+    """
+    解析完成时间为秒
+
+    支持"1:09.45"（比赛结果）、"1.09.45"（马匹赛绩）和"58.12"。
+
+    Returns:
+        秒数，无法解析时返回None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _parse_finish_time_text(str(value))
+
+
+@lru_cache(maxsize=8192)
+def _parse_finish_time_text(text: str) -> Optional[float]:
+    """解析完成时间字符串（结果缓存）"""
+    match = FINISH_TIME_PATTERN.match(text)
+    if not match:
+        return None
+    minutes, seconds, fraction = match.groups()
+    return int(minutes or 0) * 60 + float(f'{seconds}.{fraction}')
+
+
+def parse_margin(value) -> Optional[float]:
+    """
+    解析头马距离为马位
+
+    支持"2"、"1-1/2"、"3/4"及鼻位、短馬頭位、頭位、頸位（N、SH、HD、NK）；
+    头马的"-"、"---"为0。
+
+    Returns:
+        马位，无法解析时返回None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _parse_margin_text(str(value))
+
+
+@lru_cache(maxsize=1024)
+def _parse_margin_text(text: str) -> Optional[float]:
+    """解析头马距离字符串（结果缓存）"""
+    text = text.strip()
+    if text and set(text) == {'-'}:
+        return 0.0
+    short = SHORT_MARGINS.get(text.upper())
+    if short is not None:
+        return short
+    match = MARGIN_PATTERN.match(text)
+    if not match:
+        return None
+    whole, numerator, denominator, fraction_numerator, fraction_denominator = match.groups()
+    # 分母为0（如"3/0"、"1-1/0"）的格式有误
+    if int(denominator or 1) == 0 or int(fraction_denominator or 1) == 0:
+        return None
+    if whole is None:
+        return int(fraction_numerator) / int(fraction_denominator)
+    lengths = float(whole)
+    if numerator:
+        lengths += int(numerator) / int(denominator)
+    return lengths
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arrow IPC流输出测试
+"""
+
+import pytest
+import io
+import sys
+import os
+import socket
+import threading
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+pa = pytest.importorskip('pyarrow')
+
+from hkjc_scrapers.arrow_stream import ArrowStreamSink, iter_stream_batches
+
+
+RESULT = {
+    'race_date': '2026/01/18', 'racecourse': 'ST', 'race_no': '3',
+    'horses': [
+        {'horse_id': 'HK_2025_L155', 'jockey': '潘頓', 'position': '1', '完成時間': '1:09.45'},
+        {'horse_id': 'HK_2024_K123', 'jockey': '莫雷拉', 'position': '2'},
+        {'horse_id': 'HK_2023_J001', 'jockey': '布文', 'position': 'PU'},
+    ],
+}
+
+
+class TestArrowStream:
+    """Arrow IPC流输出测试类"""
+
+    def test_file_target_batches(self, tmp_path):
+        """测试按batch_size分批写入文件"""
+        filename = str(tmp_path / 'runners.arrows')
+        with ArrowStreamSink(filename, batch_size=2) as sink:
+            sink.add_race_result(RESULT)
+
+        assert sink.batches_written == 2
+        batches = list(iter_stream_batches(filename))
+        assert [batch.num_rows for batch in batches] == [2, 1]
+
+        table = pa.Table.from_batches(batches)
+        assert table.column('jockey').to_pylist() == ['潘頓', '莫雷拉', '布文']
+        assert table.column('position').to_pylist() == [1, 2, None]
+        assert table.column('finish_time').to_pylist()[0] == pytest.approx(69.45)
+        assert pa.types.is_dictionary(table.schema.field('jockey').type)
+
+    def test_stdout_target_with_prints(self, monkeypatch):
+        """测试输出到标准输出时，爬虫的print写到标准错误，不混入二进制流"""
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        stderr = io.StringIO()
+        monkeypatch.setattr(sys, 'stdout', stdout)
+        monkeypatch.setattr(sys, 'stderr', stderr)
+
+        with ArrowStreamSink(batch_size=2) as sink:
+            print("正在爬取: https://racing.hkjc.com/zh-hk/local/information/localresults")
+            sink.add_race_result(RESULT)
+            print("请求错误: timeout")
+        assert sys.stdout is stdout
+
+        stdout.flush()
+        table = pa.ipc.open_stream(stdout.buffer.getvalue()).read_all()
+        assert table.num_rows == 3
+        assert '正在爬取' in stderr.getvalue() and '请求错误' in stderr.getvalue()
+
+    def test_file_descriptor_target(self):
+        """测试写入文件描述符（管道）"""
+        read_fd, write_fd = os.pipe()
+        with ArrowStreamSink(write_fd, batch_size=10) as sink:
+            sink.add_race_result(RESULT)
+        os.close(write_fd)
+
+        with os.fdopen(read_fd, 'rb') as reader:
+            table = pa.ipc.open_stream(reader).read_all()
+        assert table.num_rows == 3
+
+    def test_unix_socket_target(self, tmp_path):
+        """测试写入Unix socket"""
+        path = str(tmp_path / 'hkjc.sock')
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+        received = {}
+
+        def consume():
+            connection, _ = server.accept()
+            with connection, connection.makefile('rb') as reader:
+                received['table'] = pa.ipc.open_stream(reader).read_all()
+
+        thread = threading.Thread(target=consume)
+        thread.start()
+        with ArrowStreamSink(f'unix:{path}', kind='race_records') as sink:
+            sink.add_horse({'horse_id': 'HK_2025_L155',
+                            'race_records': [{'date': '18/01/26', 'venue': '沙田', 'distance': '1200'}]})
+        thread.join(timeout=5)
+        server.close()
+
+        table = received['table']
+        assert table.column('distance').to_pylist() == [1200]
+        assert table.column('venue').to_pylist() == ['ST']
+
+    def test_empty_stream(self, tmp_path):
+        """测试没有数据时仍写出结构"""
+        filename = str(tmp_path / 'empty.arrows')
+        with ArrowStreamSink(filename):
+            pass
+
+        with open(filename, 'rb') as f:
+            reader = pa.ipc.open_stream(f)
+            assert 'horse_id' in reader.schema.names
+            assert reader.read_all().num_rows == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parquet列式导出测试
+"""
+
+import pytest
+import sys
+import os
+from datetime import date
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+pa = pytest.importorskip('pyarrow')
+
+from hkjc_scrapers.columnar import ColumnSink, ParquetExporter, read_dataset, dataset_schema
+
+
+RESULTS = [
+    {
+        'race_date': '2026/01/18', 'racecourse': 'ST', 'race_no': '3',
+        'horses': [
+            {'horse_id': 'HK_2025_L155', 'horse_name': '国千金', 'position': '1', 'jockey': '潘頓',
+             'draw': '4', '實際負磅': '133', 'odds': '4.7', '完成時間': '1:09.45'},
+            {'horse_id': 'HK_2024_K123', 'horse_name': '测试马', 'position': 'WV', 'jockey': '莫雷拉'},
+        ],
+    },
+    {
+        'race_date': '2025/06/04', 'racecourse': 'HV', 'race_no': '1',
+        'horses': [{'horse_id': 'HK_2024_K123', 'horse_name': '测试马', 'position': '2', 'jockey': '潘頓'}],
+    },
+]
+
+HORSE = {
+    'horse_id': 'HK_2025_L155',
+    'race_records': [
+        {'date': '18/01/26', 'venue': '沙田', 'distance': '1200', 'class': '4', 'position': '01',
+         'finish_time': '1.09.45', 'equipment': 'B'},
+        {'date': '02/06/25', 'venue': '跑馬地', 'distance': '1650', 'class': '4', 'position': 'PU'},
+    ],
+}
+
+
+class TestColumnar:
+    """Parquet列式导出测试类"""
+
+    def test_runners_partitioned_by_season_and_venue(self, tmp_path):
+        """测试参赛马匹按马季和场地分区"""
+        root = str(tmp_path / 'runners')
+        with ParquetExporter(root, kind='runners') as exporter:
+            for result in RESULTS:
+                exporter.add_race_result(result)
+
+        assert os.path.isdir(os.path.join(root, 'season=2025-26', 'venue=ST'))
+        assert os.path.isdir(os.path.join(root, 'season=2024-25', 'venue=HV'))
+        assert exporter.rows_written == 3
+
+        table = read_dataset(root, season='2025-26').to_pylist()
+        table.sort(key=lambda row: row['horse_id'])
+        assert table[1]['race_date'] == date(2026, 1, 18)
+        assert table[1]['position'] == 1
+        assert table[1]['actual_weight'] == 133
+        assert table[1]['odds'] == pytest.approx(4.7)
+        assert table[1]['finish_time'] == pytest.approx(69.45)
+        assert table[0]['position'] is None
+        assert table[0]['position_text'] == 'WV'
+
+    def test_typed_and_dictionary_columns(self, tmp_path):
+        """测试字符串列字典编码，数值列类型化"""
+        schema = dataset_schema('runners')
+        assert pa.types.is_dictionary(schema.field('jockey').type)
+        assert schema.field('draw').type == pa.int16()
+        assert schema.field('finish_time').type == pa.float32()
+        assert schema.field('race_date').type == pa.date32()
+
+    def test_incremental_append_and_projection(self, tmp_path):
+        """测试多次写入追加文件，读取时只取需要的列"""
+        root = str(tmp_path / 'runners')
+        for result in RESULTS:
+            with ParquetExporter(root, kind='runners') as exporter:
+                exporter.add_race_result(result)
+        with ParquetExporter(root, kind='runners', rows_per_file=1) as exporter:
+            exporter.add_race_result(RESULTS[0])
+            assert exporter.rows_written == 2
+
+        table = read_dataset(root, columns=['horse_id', 'jockey'], venue='ST')
+        assert table.column_names == ['horse_id', 'jockey']
+        assert table.num_rows == 4
+        assert read_dataset(root).num_rows == 5
+
+    def test_race_records(self, tmp_path):
+        """测试马匹赛绩导出，场地名称转换为代码"""
+        root = str(tmp_path / 'race_records')
+        with ParquetExporter(root, kind='race_records') as exporter:
+            exporter.add_horse(HORSE)
+
+        rows = {row['venue']: row for row in read_dataset(root).to_pylist()}
+        assert rows['ST']['horse_id'] == 'HK_2025_L155'
+        assert rows['ST']['distance'] == 1200
+        assert rows['ST']['position'] == 1
+        assert rows['ST']['finish_time'] == pytest.approx(69.45)
+        assert rows['HV']['season'] == '2024-25'
+        assert rows['HV']['position_text'] == 'PU'
+
+    def test_unknown_kind(self, tmp_path):
+        """测试未知的数据集"""
+        with pytest.raises(ValueError):
+            ParquetExporter(str(tmp_path), kind='horses')
+
+    def test_sink_requires_flush(self):
+        """测试ColumnSink的子类必须实现flush"""
+        with pytest.raises(TypeError):
+            ColumnSink('runners', 100)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSV追加写入器测试
+"""
+
+import pytest
+import sys
+import os
+import csv
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.csv_appender import CsvAppender
+from hkjc_scrapers.records import Runner
+
+
+def read_csv(filename):
+    """读取CSV，返回(表头, 行)"""
+    with open(filename, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+class TestCsvAppender:
+    """CSV追加写入器测试类"""
+
+    def test_declared_schema(self, tmp_path):
+        """测试声明的列在前，新列按出现顺序追加"""
+        filename = str(tmp_path / 'runners.csv')
+        with CsvAppender(filename, fieldnames=['race_no']) as appender:
+            appender.write_rows([{'horse_name': '国千金', 'jockey': '潘頓'}], race_no='3')
+
+        header, rows = read_csv(filename)
+        assert header == ['race_no', 'horse_name', 'jockey']
+        assert rows == [{'race_no': '3', 'horse_name': '国千金', 'jockey': '潘頓'}]
+
+    def test_schema_grows_across_calls(self, tmp_path):
+        """测试后续调用出现新列时只重写表头，旧行保持不变"""
+        filename = str(tmp_path / 'runners.csv')
+        with CsvAppender(filename) as appender:
+            appender.write_rows([{'horse_name': '国千金', 'jockey': '潘頓'}])
+            appender.write_rows([{'horse_name': '测试马', 'jockey': '莫雷拉', '完成時間': '1:09.50'}])
+
+        header, rows = read_csv(filename)
+        assert header == ['horse_name', 'jockey', '完成時間']
+        assert rows[0]['horse_name'] == '国千金'
+        assert rows[0]['完成時間'] is None
+        assert rows[1]['完成時間'] == '1:09.50'
+
+        with open(filename, 'rb') as f:
+            assert f.read().count(b'\xef\xbb\xbf') == 1
+
+    def test_learns_schema_from_existing_file(self, tmp_path):
+        """测试重新打开文件时从表头恢复列登记表"""
+        filename = str(tmp_path / 'runners.csv')
+        with CsvAppender(filename) as appender:
+            appender.write_row({'jockey': '潘頓', 'horse_name': '国千金'})
+        with CsvAppender(filename) as appender:
+            assert appender.fieldnames == ['jockey', 'horse_name']
+            appender.write_row({'horse_name': '测试马', 'jockey': '莫雷拉'})
+
+        header, rows = read_csv(filename)
+        assert header == ['jockey', 'horse_name']
+        assert [row['horse_name'] for row in rows] == ['国千金', '测试马']
+
+    def test_fixed_schema_ignores_unknown_columns(self, tmp_path):
+        """测试grow=False时忽略未声明的列"""
+        filename = str(tmp_path / 'runners.csv')
+        with CsvAppender(filename, fieldnames=['horse_name'], grow=False) as appender:
+            appender.write_row({'horse_name': '国千金', 'jockey': '潘頓'})
+
+        header, rows = read_csv(filename)
+        assert header == ['horse_name']
+        assert rows == [{'horse_name': '国千金'}]
+
+    def test_overwrite(self, tmp_path):
+        """测试append=False时清空已有文件"""
+        filename = str(tmp_path / 'runners.csv')
+        with CsvAppender(filename) as appender:
+            appender.write_row({'jockey': '潘頓'})
+        with CsvAppender(filename, append=False) as appender:
+            appender.write_row(Runner({'horse_name': '国千金', 'class': '第四班'}))
+
+        header, rows = read_csv(filename)
+        assert header == ['horse_name', 'class']
+        assert rows == [{'horse_name': '国千金', 'class': '第四班'}]
+
+    def test_empty_rows(self, tmp_path):
+        """测试没有行时不创建文件"""
+        filename = str(tmp_path / 'runners.csv')
+        with CsvAppender(filename) as appender:
+            assert appender.write_rows([]) == 0
+        assert not os.path.exists(filename)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
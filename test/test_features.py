@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+往绩滚动特征测试
+"""
+
+import pytest
+import sys
+import os
+import random
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+np = pytest.importorskip('numpy')
+
+from hkjc_scrapers.features import rolling_features, race_record_features
+from hkjc_scrapers.utils import parse_int, parse_race_date
+
+
+@pytest.fixture
+def horses():
+    """两匹马的赛绩（由新到旧，与马匹资料页面相同）"""
+    return [
+        {'horse_id': 'A', 'race_records': [
+            {'date': '20/01/26', 'position': '4', 'rating': '62', 'weight': '1100'},
+            {'date': '01/01/26', 'position': 'PU', 'rating': '60', 'weight': '1095'},
+            {'date': '10/12/25', 'position': '2', 'rating': '', 'weight': '1090'},
+            {'date': '20/11/25', 'position': '6', 'rating': '58', 'weight': '1080'},
+        ]},
+        {'horse_id': 'B', 'race_records': [
+            {'date': '18/01/26', 'position': '1', 'rating': '80', 'weight': '1200'},
+        ]},
+    ]
+
+
+def reference(horses, window):
+    """逐匹马的Python循环实现（由新到旧的顺序）"""
+    expected = []
+    for horse in horses:
+        runs = sorted(horse['race_records'], key=lambda r: parse_race_date(r['date']))
+        means = {}
+        for i, run in enumerate(runs):
+            previous = [parse_int(r['position']) for r in runs[max(0, i - window):i]]
+            previous = [p for p in previous if p is not None]
+            means[run['date']] = sum(previous) / len(previous) if previous else None
+        expected.extend(means[record['date']] for record in horse['race_records'])
+    return expected
+
+
+class TestFeatures:
+    """往绩滚动特征测试类"""
+
+    def test_race_record_features(self, horses):
+        """测试各特征只使用之前的赛绩，行顺序与输入相同"""
+        features = race_record_features(horses, windows=(2, 3))
+        assert features['horse_id'].tolist() == ['A', 'A', 'A', 'A', 'B']
+        assert features['runs_before'].tolist() == [3, 2, 1, 0, 0]
+        mean_2 = features['position_mean_2']
+        assert mean_2[0] == pytest.approx(2.0)   # 之前两场：PU（不计）和2
+        assert mean_2[1] == pytest.approx(4.0)   # 之前两场：2和6
+        assert np.isnan(mean_2[3]) and np.isnan(mean_2[4])
+        assert features['position_mean_3'][0] == pytest.approx(4.0)
+
+    def test_days_and_deltas(self, horses):
+        """测试距上一场的日数和评分、体重的差"""
+        features = race_record_features(horses)
+        assert features['days_since_last_run'][:3].tolist() == [19, 22, 20]
+        assert np.isnan(features['days_since_last_run'][3])
+        assert features['weight_delta'][:3].tolist() == [5, 5, 10]
+        rating_delta = features['rating_delta']
+        assert rating_delta[0] == 2
+        assert np.isnan(rating_delta[1]) and np.isnan(rating_delta[2])   # 上一场或本场评分缺失
+        assert np.isnan(rating_delta[4])
+
+    def test_matches_python_loop(self):
+        """测试与逐行计算的结果一致"""
+        rnd = random.Random(0)
+        horses = []
+        for i in range(30):
+            records = [{'date': f'{day:02d}/{month:02d}/25',
+                        'position': rnd.choice(['WV', 'PU'] + [str(p) for p in range(1, 15)])}
+                       for month in range(1, 13) for day in rnd.sample(range(1, 29), 2)]
+            rnd.shuffle(records)
+            horses.append({'horse_id': f'H{i}', 'race_records': records})
+        features = race_record_features(horses, windows=(3, 10))
+        for window in (3, 10):
+            expected = reference(horses, window)
+            actual = features[f'position_mean_{window}']
+            assert [None if np.isnan(value) else pytest.approx(value) for value in actual] == expected
+
+    def test_rolling_features_arrays(self):
+        """测试直接传入数组"""
+        dates = np.array(['2026-01-01', '2025-12-01', '2026-01-05'], dtype='datetime64[D]')
+        positions = np.ma.MaskedArray([3, 1, 2], mask=[False, False, False])
+        features = rolling_features(['X', 'X', 'Y'], dates, positions)
+        assert features['position_mean_3'][0] == 1
+        assert np.isnan(features['position_mean_3'][2])
+        assert 'rating_delta' not in features
+
+    def test_empty(self):
+        """测试没有赛绩"""
+        features = race_record_features([{'horse_id': 'A', 'race_records': []}, {}])
+        assert features['runs_before'].size == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
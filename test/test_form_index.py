@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+马匹往绩索引测试
+"""
+
+import pytest
+import sys
+import os
+from bs4 import BeautifulSoup
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.form_index import FormIndex, MISSING
+from hkjc_scrapers.horse_info_scraper import HorseInfoScraper
+from hkjc_scrapers.records import RaceRecord
+
+
+@pytest.fixture
+def horse():
+    """马匹资料（赛绩由新到旧，与马匹资料页面相同）"""
+    return {
+        'horse_id': 'HK_2023_J256',
+        'race_records': [
+            {'date': '28/12/25', 'venue': '沙田草地', 'distance': '1650', 'track_condition': '好地',
+             'position': '2', 'finish_time': '1.39.80', 'equipment': 'B/TT'},
+            {'date': '10/12/25', 'venue': '跑馬地', 'distance': '1650', 'track_condition': '黏地',
+             'position': 'PU', 'finish_time': '---', 'equipment': 'B/TT'},
+            {'date': '16/11/25', 'venue': '沙田', 'distance': '1650', 'track_condition': '好地',
+             'position': '1', 'finish_time': '1.38.95', 'equipment': 'B'},
+            {'date': '26/10/25', 'venue': '沙田', 'distance': '1400', 'track_condition': '好地',
+             'position': '5', 'finish_time': '1.22.10', 'equipment': 'B'},
+            {'date': '01/10/25', 'venue': '沙田', 'distance': '1650', 'track_condition': '好地至快',
+             'position': '3 DH', 'finish_time': '1.39.20', 'equipment': '--'},
+        ],
+    }
+
+
+@pytest.fixture
+def index(horse):
+    """往绩索引"""
+    index = FormIndex()
+    index.add_horse(horse)
+    return index
+
+
+# 马匹资料页面的赛绩表格（表头与页面相同："場地狀況"包含"場地"，"頭馬距離"包含"距離"）
+RACE_RECORDS_HTML = """
+<table>
+    <tr><td>場次</td><td>名次</td><td>日期</td><td>場地</td><td>途程</td><td>場地狀況</td>
+        <td>班次</td><td>檔位</td><td>評分</td><td>頭馬距離</td><td>完成時間</td><td>裝備</td></tr>
+    <tr><td>601</td><td>2</td><td>28/12/25</td><td>沙田</td><td>1650</td><td>好地</td>
+        <td>第三班</td><td>4</td><td>62</td><td>1-1/4</td><td>1.39.80</td><td>B</td></tr>
+    <tr><td>512</td><td>1</td><td>10/12/25</td><td>跑馬地</td><td>1650</td><td>黏地</td>
+        <td>第四班</td><td>7</td><td>55</td><td>---</td><td>1.40.15</td><td>B</td></tr>
+    <tr><td>388</td><td>5</td><td>16/11/25</td><td>沙田</td><td>1400</td><td>好地</td>
+        <td>第四班</td><td>2</td><td>55</td><td>3-1/2</td><td>1.22.10</td><td>--</td></tr>
+</table>
+"""
+
+
+class TestFormIndex:
+    """马匹往绩索引测试类"""
+
+    def test_columns_sorted_by_date(self, index):
+        """测试赛绩按日期由旧到新转换为类型化的列"""
+        form = index.horse('HK_2023_J256')
+        assert len(form) == 5
+        assert list(form.dates) == sorted(form.dates)
+        assert list(form.distances) == [1650, 1400, 1650, 1650, 1650]
+        assert list(form.positions) == [3, 5, 1, MISSING, 2]
+        assert form.finish_times[0] == pytest.approx(99.2)
+        assert form.finish_times[3] != form.finish_times[3]  # nan
+        assert [index.categories[code] for code in form.venues] == ['ST', 'ST', 'ST', 'HV', 'ST']
+
+    def test_last_n(self, index):
+        """测试最近N次赛绩（由新到旧）"""
+        assert [r['date'] for r in index.last_n('HK_2023_J256', 2)] == ['28/12/25', '10/12/25']
+        assert [r['date'] for r in index.last_n('HK_2023_J256', 10, distance=1650, venue='沙田')] == \
+            ['28/12/25', '16/11/25', '01/10/25']
+        assert [r['date'] for r in index.last_n('HK_2023_J256', 2, venue='ST', distance=1650,
+                                                track_condition='好地')] == ['28/12/25', '16/11/25']
+        assert [r['date'] for r in index.last_n('HK_2023_J256', 5, venue='跑马地')] == ['10/12/25']
+
+    def test_last_n_no_match(self, index):
+        """测试没有符合条件的赛绩"""
+        assert index.last_n('HK_2023_J256', 3, distance=2400) == []
+        assert index.last_n('HK_2023_J256', 3, track_condition='濕慢') == []
+        assert index.last_n('HK_2023_J256', 0) == []
+        assert index.last_n('unknown', 3) == []
+
+    def test_best_time(self, index):
+        """测试最佳完成时间，忽略没有完成时间的赛绩"""
+        seconds, record = index.best_time('HK_2023_J256', 1650)
+        assert seconds == pytest.approx(98.95)
+        assert record['date'] == '16/11/25'
+        assert index.best_time('HK_2023_J256', 1650, venue='HV') is None
+        assert index.best_time('HK_2023_J256', 1200) is None
+        assert index.best_time('unknown', 1650) is None
+
+    def test_runs_since_equipment_change(self, index):
+        """测试上次更换配备后出赛的次数"""
+        assert index.runs_since_equipment_change('HK_2023_J256') == 2
+        assert index.runs_since_equipment_change('HK_2023_J256', equipment='B/TT') == 2
+        assert index.runs_since_equipment_change('HK_2023_J256', equipment='B/TT/V') == 0
+        assert index.runs_since_equipment_change('unknown') is None
+
+    def test_replace_horse(self, index, horse):
+        """测试重新加入同一匹马时替换原有赛绩"""
+        horse = dict(horse, race_records=horse['race_records'][:2])
+        assert index.add_horse(horse) == 2
+        assert len(index) == 1
+        assert len(index.horse('HK_2023_J256')) == 2
+        assert index.best_time('HK_2023_J256', 1400) is None
+
+    def test_out_of_range_values(self, horse):
+        """测试超出array('h')范围的值记为缺失，各列行数保持一致"""
+        records = [dict(horse['race_records'][0], weight='1,105,000', rating='-40000')] + horse['race_records'][1:]
+        index = FormIndex()
+        assert index.add_horse(dict(horse, race_records=records)) == 5
+        form = index.horse('HK_2023_J256')
+        assert form.weights[-1] == MISSING
+        assert form.ratings[-1] == MISSING
+        assert all(len(column) == 5 for column in (form.dates, form.distances, form.positions,
+                                                   form.weights, form.ratings, form.venues))
+        assert index.last_n('HK_2023_J256', 1)[0]['date'] == '28/12/25'
+
+    def test_records_and_missing_horse_id(self, horse):
+        """测试RaceRecord记录和没有马匹ID的数据"""
+        index = FormIndex()
+        records = [RaceRecord(record) for record in horse['race_records']]
+        assert index.add_horses([{'horse_id': 'HK_2023_J256', 'race_records': records}, {}, None]) == 5
+        assert 'HK_2023_J256' in index
+        assert index.last_n('HK_2023_J256', 1)[0]['position'] == '2'
+
+    def test_scraped_race_records(self):
+        """测试由马匹资料页面提取的赛绩建立索引"""
+        records = HorseInfoScraper()._extract_race_records(BeautifulSoup(RACE_RECORDS_HTML, 'html.parser'))
+        assert [(r['venue'], r['distance'], r['track_condition']) for r in records] == [
+            ('沙田', '1650', '好地'), ('跑馬地', '1650', '黏地'), ('沙田', '1400', '好地')]
+
+        index = FormIndex()
+        assert index.add_horse({'horse_id': 'HK_2023_J256', 'race_records': records}) == 3
+        form = index.horse('HK_2023_J256')
+        assert list(form.distances) == [1400, 1650, 1650]
+        assert [index.categories[code] for code in form.track_conditions] == ['好地', '黏地', '好地']
+        assert sorted(set(index.categories)) == sorted(['ST', 'HV', '好地', '黏地', 'B', '--'])
+        found = index.last_n('HK_2023_J256', venue='ST', distance=1650, track_condition='好地')
+        assert [record['date'] for record in found] == ['28/12/25']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
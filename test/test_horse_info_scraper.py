@@ -22,7 +22,8 @@ class TestHorseInfoScraper:
     
     @pytest.fixture
     def scraper(self):
-        """创建爬虫实例"""
+        """创建爬虫实例（清除进程内的装备图例缓存）"""
+        HorseInfoScraper.clear_equipment_legend_cache()
         return HorseInfoScraper()
     
     @pytest.fixture
@@ -161,6 +162,39 @@ class TestHorseInfoScraper:
             assert first_record.get('jockey_id') == 'PZ'
             assert first_record.get('trainer_id') == 'YPF'
     
+    def test_extract_race_records_since(self, scraper, sample_html):
+        """测试增量解析：遇到已知日期的赛绩即停止"""
+        soup = BeautifulSoup(sample_html, 'html.parser')
+        
+        race_records = scraper._extract_race_records(soup, since='30/03/24')
+        assert [record['date'] for record in race_records] == ['02/06/24']
+        
+        assert scraper._extract_race_records(soup, since='02/06/24') == []
+        assert len(scraper._extract_race_records(soup, since='2024-01-01')) == 2
+    
+    def test_scrape_horse_info_merges_known_records(self, scraper, sample_html):
+        """测试增量爬取时与已保存的赛绩合并"""
+        url = "https://racing.hkjc.com/zh-hk/local/information/horse?horseid=HK_2020_E436&Option=1"
+        known_records = [
+            {'date': '30/03/24', 'venue': '美丹/草地', 'position': '10-1/2'},
+            {'date': '01/01/24', 'venue': '沙田', 'position': '3'},
+        ]
+        
+        with patch('hkjc_scrapers.horse_info_scraper.requests.Session.get') as mock_get:
+            mock_response = Mock()
+            mock_response.text = sample_html
+            mock_response.encoding = 'utf-8'
+            mock_response.raise_for_status = Mock()
+            mock_get.return_value = mock_response
+            
+            with patch.object(scraper, '_extract_race_records', wraps=scraper._extract_race_records) as mock_extract:
+                result = scraper.scrape_horse_info(url, known_records=known_records)
+                assert str(mock_extract.call_args.kwargs['since']) == '2024-03-30'
+        
+        dates = [record['date'] for record in result['race_records']]
+        assert dates == ['02/06/24', '30/03/24', '01/01/24']
+        assert result['race_records'][1] is known_records[0]
+    
     def test_extract_equipment_legend(self, scraper, sample_html):
         """测试装备图例提取"""
         soup = BeautifulSoup(sample_html, 'html.parser')
@@ -174,6 +208,36 @@ class TestHorseInfoScraper:
         assert 'CP' in equipment_legend
         assert equipment_legend.get('CP') == '羊毛面箍'
     
+    def test_equipment_legend_cached_across_pages(self, scraper, sample_html):
+        """测试装备图例只解析一次，之后的结果共享同一个字典"""
+        first = scraper._get_equipment_legend(BeautifulSoup(sample_html, 'html.parser'))
+        assert first.get('B') == '戴眼罩'
+        
+        with patch.object(scraper, '_find_equipment_legend_tables') as mock_find:
+            second = scraper._get_equipment_legend(BeautifulSoup(sample_html, 'html.parser'))
+            mock_find.assert_not_called()
+        assert second is first
+        
+        # 新的爬虫实例也共享进程内缓存
+        assert HorseInfoScraper()._get_equipment_legend(BeautifulSoup('<html></html>', 'html.parser')) is first
+    
+    def test_equipment_legend_detect_change(self, sample_html):
+        """测试开启变化检测时，图例表格变化才重新解析"""
+        HorseInfoScraper.clear_equipment_legend_cache()
+        scraper = HorseInfoScraper(detect_legend_change=True)
+        first = scraper._get_equipment_legend(BeautifulSoup(sample_html, 'html.parser'))
+        
+        with patch.object(scraper, '_parse_equipment_legend_table') as mock_parse:
+            same = scraper._get_equipment_legend(BeautifulSoup(sample_html, 'html.parser'))
+            mock_parse.assert_not_called()
+        assert same is first
+        
+        changed_html = sample_html.replace('CP :  羊毛面箍', 'CP :  羊毛面箍</td>\n<td>TT :  綁繫舌帶')
+        changed = scraper._get_equipment_legend(BeautifulSoup(changed_html, 'html.parser'))
+        assert changed is not first
+        assert changed.get('TT') == '綁繫舌帶'
+        HorseInfoScraper.clear_equipment_legend_cache()
+    
     def test_scrape_horse_info_integration(self, scraper, sample_html):
         """测试完整爬取流程"""
         url = "https://racing.hkjc.com/zh-hk/local/information/horse?horseid=HK_2020_E436&Option=1"
@@ -195,6 +259,47 @@ class TestHorseInfoScraper:
             assert 'scraped_at' in result
             assert 'source_url' in result
     
+    def test_horses_share_equipment_legend(self, scraper, sample_html):
+        """测试两匹马的结果引用同一个装备图例字典"""
+        with patch('hkjc_scrapers.horse_info_scraper.requests.Session.get') as mock_get:
+            mock_response = Mock()
+            mock_response.text = sample_html
+            mock_response.encoding = 'utf-8'
+            mock_response.raise_for_status = Mock()
+            mock_get.return_value = mock_response
+            
+            first = scraper.scrape_horse_info(
+                "https://racing.hkjc.com/zh-hk/local/information/horse?horseid=HK_2020_E436&Option=1")
+            second = scraper.scrape_horse_info(
+                "https://racing.hkjc.com/zh-hk/local/information/horse?horseid=HK_2023_J256&Option=1")
+        
+        assert first['equipment_legend'].get('B') == '戴眼罩'
+        assert second['equipment_legend'] is first['equipment_legend']
+    
+    def test_scrape_horse_info_lazy_and_sections(self, scraper, sample_html):
+        """测试按需解析和只提取指定的部分"""
+        url = "https://racing.hkjc.com/zh-hk/local/information/horse?horseid=HK_2020_E436&Option=1"
+        
+        with patch('hkjc_scrapers.horse_info_scraper.requests.Session.get') as mock_get:
+            mock_response = Mock()
+            mock_response.text = sample_html
+            mock_response.encoding = 'utf-8'
+            mock_response.raise_for_status = Mock()
+            mock_get.return_value = mock_response
+            
+            eager = scraper.scrape_horse_info(url)
+            with patch.object(scraper, '_extract_race_records') as mock_records:
+                result = scraper.scrape_horse_info(url, lazy=True)
+                assert result['basic_info'] == eager['basic_info']
+                mock_records.assert_not_called()
+            assert result['race_records'] == eager['race_records']
+            
+            selected = scraper.scrape_horse_info(url, sections=['basic_info'])
+        
+        assert 'equipment_legend' not in result.loaded
+        assert list(result) == list(eager)
+        assert list(selected) == ['horse_id', 'source_url', 'scraped_at', 'basic_info', 'raw_html']
+    
     def test_empty_result_on_error(self, scraper):
         """测试错误时返回空字典"""
         url = "https://racing.hkjc.com/zh-hk/local/information/horse?horseid=INVALID"
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+竞赛事件报告全文索引测试
+"""
+
+import pytest
+import random
+import sys
+import os
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.incident_index import IncidentIndex, _intersect
+
+
+def result(race_date, race_no, reports):
+    """一场比赛的事件报告"""
+    return {'race_date': race_date, 'racecourse': 'ST', 'race_no': race_no, 'incident_reports': [
+        {'position': str(i + 1), 'horse_id': horse_id, 'description': description}
+        for i, (horse_id, description) in enumerate(reports)]}
+
+
+@pytest.fixture
+def index():
+    """两场比赛的事件"""
+    index = IncidentIndex()
+    index.add_race_result(result('2026/01/18', '1', [
+        ('HK_2023_A001', '出閘時受阻；沿途走外疊。'),
+        ('HK_2024_B002', '賽後獸醫檢驗，發現流鼻血。'),
+        ('HK_2025_C003', '受驚，走勢阻礙。'),
+    ]))
+    index.add_race_result(result('2026/01/21', '2', [
+        ('HK_2023_A001', '轉彎時走勢受阻。'),
+        ('HK_2025_C003', 'Bled from both nostrils'),
+    ]))
+    return index
+
+
+class TestIncidentIndex:
+    """IncidentIndex测试类"""
+
+    def test_search_phrase(self, index):
+        """短语查询，由新到旧"""
+        found = index.search('受阻')
+        assert [(i['race_date'], i['horse_id']) for i in found] == [
+            ('2026/01/21', 'HK_2023_A001'), ('2026/01/18', 'HK_2023_A001')]
+        assert [i['horse_id'] for i in index.search('流鼻血')] == ['HK_2024_B002']
+        assert index.search('跛行') == []
+
+    def test_phrase_must_be_contiguous(self, index):
+        """二元组都出现但不连续时不算命中"""
+        assert [i['horse_id'] for i in index.search('走勢受阻')] == ['HK_2023_A001']
+        # 描述中有"走勢"和"勢走"，但没有连续的"走勢走"
+        index.add_race_result(result('2026/01/25', '3', [('HK_2024_B002', '走勢一般，勢走不前')]))
+        assert index.search('走勢走') == []
+        assert [i['horse_id'] for i in index.search('勢走不前')] == ['HK_2024_B002']
+
+    def test_single_character_and_punctuation(self, index):
+        """单字查询，短语中的标点被忽略"""
+        assert len(index.search('阻')) == 3
+        assert [i['horse_id'] for i in index.search('檢驗，發現')] == ['HK_2024_B002']
+
+    def test_case_insensitive_latin_text(self, index):
+        """英文描述不分大小写"""
+        assert [i['horse_id'] for i in index.search('bled')] == ['HK_2025_C003']
+
+    def test_horse_filter(self, index):
+        """按horse_id筛选"""
+        assert len(index.search(horse_id='HK_2023_A001')) == 2
+        assert [i['race_no'] for i in index.search('受阻', horse_id='HK_2023_A001', limit=1)] == ['2']
+        assert index.search('流鼻血', horse_id='HK_2023_A001') == []
+        assert index.search(horse_id='HK_9999_X000') == []
+
+    def test_readding_race_replaces_incidents(self, index):
+        """同一场比赛再次加入时替换原来的事件"""
+        assert len(index) == 5
+        index.add_race_result(result('2026/01/18', '1', [('HK_2024_B002', '賽後發現流鼻血。')]))
+        assert len(index) == 3
+        assert [i['description'] for i in index.search('流鼻血')] == ['賽後發現流鼻血。']
+        assert [i['race_date'] for i in index.search('受阻')] == ['2026/01/21']
+        assert index.remove_race('2026-01-21|ST|2')
+        assert not index.remove_race('2026-01-21|ST|2')
+        assert index.search('受阻') == []
+
+    def test_postings_are_delta_encoded(self, index):
+        """倒排表保存相邻编号的差"""
+        postings = index._postings['受阻']
+        assert postings.deltas.typecode == 'I'
+        assert list(postings.deltas) == [0, 3]
+        assert postings.decode() == [0, 3]
+
+    def test_intersect_sorted_lists(self):
+        """递增列表的交集与集合交集一致"""
+        rnd = random.Random(0)
+        for _ in range(500):
+            first = sorted(rnd.sample(range(200), rnd.randint(0, 120)))
+            second = sorted(rnd.sample(range(200), rnd.randint(0, 120)))
+            assert _intersect(first, second) == sorted(set(first) & set(second))
+        shared = list(range(0, 3000, 3))
+        assert _intersect(shared, shared) == shared
+        assert _intersect(shared, [0, 1, 2997, 5000]) == [0, 2997]
+
+    def test_empty_result(self):
+        """没有事件报告或没有比赛键"""
+        index = IncidentIndex()
+        assert index.add_race_result({}) == 0
+        assert index.add_race_result({'incident_reports': [{'description': '起步慢'}]}) == 1
+        assert len(index.search('起步')) == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
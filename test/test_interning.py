@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字符串驻留测试
+"""
+
+import pytest
+import sys
+import os
+from bs4 import BeautifulSoup
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers import interning
+from hkjc_scrapers.horse_info_scraper import HorseInfoScraper
+from hkjc_scrapers.race_result_scraper import RaceResultScraper
+
+
+class TestInterning:
+    """字符串驻留测试类"""
+
+    @pytest.fixture(autouse=True)
+    def clear_pool(self):
+        """每个测试使用空的驻留池"""
+        interning.clear_pool()
+        yield
+        interning.clear_pool()
+
+    def test_intern_text_returns_shared_instance(self):
+        """测试相等的字符串返回同一实例"""
+        first = ''.join(['潘', '頓'])
+        second = ''.join(['潘', '頓'])
+        assert first is not second
+        assert interning.intern_text(first) is interning.intern_text(second)
+        assert interning.pool_size() == 1
+
+    def test_intern_text_non_string(self):
+        """测试非字符串原样返回"""
+        assert interning.intern_text(None) is None
+        assert interning.intern_text(3) == 3
+        assert interning.pool_size() == 0
+
+    def test_intern_fields(self):
+        """测试只驻留指定的字符串字段"""
+        record = {'jockey': ''.join(['莫', '雷拉']), 'odds': 3.5, 'comment': ''.join(['好', '表現'])}
+        other = {'jockey': ''.join(['莫', '雷拉'])}
+        interning.intern_fields(record, ('jockey', 'odds', 'missing'))
+        interning.intern_fields(other, ('jockey',))
+
+        assert record['jockey'] is other['jockey']
+        assert record['odds'] == 3.5
+        assert interning.pool_size() == 1
+
+    def test_pool_is_bounded(self, monkeypatch):
+        """测试驻留池达到上限后不再加入新的字符串"""
+        monkeypatch.setattr(interning, 'MAX_POOL_SIZE', 2)
+        first = interning.intern_text(''.join(['沙', '田']))
+        interning.intern_text('跑馬地')
+        extra = ''.join(['好', '地'])
+        assert interning.intern_text(extra) is extra
+        assert interning.intern_fields({'going': extra}, ('going',))['going'] is extra
+        assert interning.pool_size() == 2
+        # 已在池中的取值仍返回共享实例
+        assert interning.intern_text(''.join(['沙', '田'])) is first
+
+    def test_horse_race_records_interned(self):
+        """测试马匹赛绩的表头和重复取值被驻留"""
+        html = """
+        <table>
+            <tr><th>場次</th><th>名次</th><th>日期</th><th>場地</th><th>騎師</th><th>練馬師</th></tr>
+            <tr><td>123</td><td>1</td><td>02/06/24</td><td>沙田</td><td>潘頓</td><td>蔡約翰</td></tr>
+        </table>
+        """
+        scraper = HorseInfoScraper(intern_strings=True)
+        first = scraper._extract_race_records(BeautifulSoup(html, 'html.parser'))
+        second = scraper._extract_race_records(BeautifulSoup(html, 'html.parser'))
+
+        assert first == second
+        assert first[0]['venue'] is second[0]['venue']
+        assert first[0]['jockey'] is second[0]['jockey']
+        assert first[0]['trainer'] is second[0]['trainer']
+        # 日期的取值不断增加，不驻留
+        assert first[0]['date'] is not second[0]['date']
+
+    def test_disabled_by_default(self):
+        """测试默认不驻留"""
+        html = """
+        <table>
+            <tr><th>名次</th><th>馬號</th><th>馬名</th><th>騎師</th><th>練馬師</th><th>檔位</th></tr>
+            <tr><td>1</td><td>3</td><td><a href="/horse?horseid=HK_2025_L155">国千金</a></td><td>潘頓</td><td>蔡約翰</td><td>1</td></tr>
+        </table>
+        """
+        RaceResultScraper()._extract_horse_info(BeautifulSoup(html, 'html.parser'))
+        assert interning.pool_size() == 0
+
+        horses = RaceResultScraper(intern_strings=True)._extract_horse_info(BeautifulSoup(html, 'html.parser'))
+        assert horses[0]['jockey'] == '潘頓'
+        assert interning.pool_size() > 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
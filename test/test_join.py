@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+比赛结果与马匹资料关联测试
+"""
+
+import pytest
+import sys
+import os
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.join import HorseLookup, join_runners
+from hkjc_scrapers.records import RaceRecord, Runner
+
+
+@pytest.fixture
+def results():
+    """两场比赛结果"""
+    return [
+        {'race_date': '2026/01/18', 'racecourse': 'ST', 'race_no': '3', 'horses': [
+            {'horse_id': 'HK_2025_L155', 'horse_name': '馬一', 'position': '1'},
+            {'horse_id': 'HK_2024_K123', 'horse_name': '馬二', 'position': '2'},
+            {'horse_id': 'HK_2023_J001', 'horse_name': '馬三', 'position': '3'},
+            {'horse_name': '沒有編號', 'position': '4'},
+        ]},
+        {'race_date': '2026/01/21', 'racecourse': 'HV', 'race_no': '1', 'horses': [
+            {'horse_id': 'HK_2025_L155', 'horse_name': '馬一', 'position': '5'},
+        ]},
+    ]
+
+
+@pytest.fixture
+def horses():
+    """马匹资料（赛绩日期和场地使用马匹资料页面的写法）"""
+    return [
+        {'horse_id': 'HK_2025_L155', 'basic_info': {'country_of_origin': '澳洲'}, 'race_records': [
+            {'date': '21/01/26', 'venue': '跑馬地草地', 'position': '5'},
+            {'date': '18/01/26', 'venue': '沙田草地', 'position': '1'},
+        ]},
+        {'horse_id': 'HK_2024_K123', 'basic_info': {'country_of_origin': '紐西蘭'}, 'race_records': [
+            {'date': '01/01/26', 'venue': '沙田', 'position': '7'},
+        ]},
+        {'horse_id': 'HK_2020_X999', 'basic_info': {}, 'race_records': []},
+    ]
+
+
+class TestJoin:
+    """比赛结果与马匹资料关联测试类"""
+
+    def test_join_runners(self, results, horses):
+        """测试附上马匹资料和同日同场地的赛绩"""
+        rows, report = join_runners(results, horses)
+        assert len(rows) == 5
+        first = rows[0]
+        assert first['horse_name'] == '馬一'
+        assert (first['race_date'], first['racecourse'], first['race_no']) == ('2026/01/18', 'ST', '3')
+        assert first['basic_info'] == {'country_of_origin': '澳洲'}
+        assert first['race_record']['venue'] == '沙田草地'
+        assert rows[4]['race_record']['venue'] == '跑馬地草地'
+        assert rows[1]['basic_info']['country_of_origin'] == '紐西蘭'
+        assert rows[1]['race_record'] is None
+        assert rows[2]['basic_info'] is None
+
+    def test_report(self, results, horses):
+        """测试报告关联不上的键"""
+        _, report = join_runners(results, horses)
+        assert report['runners'] == 5
+        assert report['matched_horses'] == 3
+        assert report['matched_records'] == 2
+        assert report['missing_horse_id'] == 1
+        assert report['unmatched_horse_ids'] == ['HK_2023_J001']
+        assert report['unmatched_records'] == [('HK_2024_K123', '2026-01-18', 'ST')]
+        assert report['unused_horse_ids'] == ['HK_2020_X999']
+
+    def test_lookup(self, horses):
+        """测试按日期和场地查找赛绩，场地缺失时只按日期查找"""
+        lookup = HorseLookup(horses)
+        assert len(lookup) == 3
+        assert lookup.race_record('HK_2025_L155', '2026-01-18', '沙田')['position'] == '1'
+        assert lookup.race_record('HK_2025_L155', '18/01/26')['position'] == '1'
+        assert lookup.race_record('HK_2025_L155', '2026/01/18', 'HV') is None
+        assert lookup.horse('unknown') is None
+
+    def test_readd_horse_replaces_records(self, results, horses):
+        """测试重新抓取后再次加入时替换基本资料和赛绩"""
+        lookup = HorseLookup(horses)
+        lookup.add_horse({'horse_id': 'HK_2025_L155', 'basic_info': {'country_of_origin': '英國'}, 'race_records': [
+            {'date': '18/01/26', 'venue': '沙田', 'position': '2'},
+        ]})
+        assert len(lookup) == 3
+        assert lookup.race_record('HK_2025_L155', '2026/01/21', 'HV') is None
+        assert lookup.race_record('HK_2025_L155', '2026/01/21') is None
+        rows, report = join_runners(results, lookup)
+        assert rows[0]['basic_info'] == {'country_of_origin': '英國'}
+        assert rows[0]['race_record']['position'] == '2'
+        assert rows[4]['race_record'] is None
+        assert report['unmatched_records'] == [('HK_2024_K123', '2026-01-18', 'ST'),
+                                               ('HK_2025_L155', '2026-01-21', 'HV')]
+
+    def test_reuse_lookup_and_records(self, results, horses):
+        """测试传入已建立的HorseLookup和紧凑记录"""
+        for horse in horses:
+            horse['race_records'] = [RaceRecord(record) for record in horse['race_records']]
+        for result in results:
+            result['horses'] = [Runner(runner) for runner in result['horses']]
+        rows, report = join_runners(results, HorseLookup(horses), include_horse=False)
+        assert rows[0]['basic_info'] is None
+        assert rows[0]['race_record']['position'] == '1'
+        assert report['matched_records'] == 2
+
+    def test_empty_results(self, horses):
+        """测试没有比赛结果"""
+        rows, report = join_runners([{}, None], horses)
+        assert rows == []
+        assert report['unused_horse_ids'] == ['HK_2020_X999', 'HK_2024_K123', 'HK_2025_L155']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON Lines读写测试
+"""
+
+import pytest
+import sys
+import os
+import gzip
+import zlib
+from unittest.mock import patch
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.jsonl import JsonLinesWriter, iter_json_lines, detect_compression
+from hkjc_scrapers.records import Runner
+
+
+RECORDS = [
+    {'race_no': str(i), 'horses': [{'horse_name': '国千金', 'comment': '第一行\n第二行'}]}
+    for i in range(1, 6)
+]
+
+
+class TestJsonLines:
+    """JSON Lines读写测试类"""
+
+    @pytest.fixture(params=[None, 'gzip', 'zstd'])
+    def compression(self, request):
+        """各压缩方式（未安装zstandard时跳过）"""
+        if request.param == 'zstd':
+            pytest.importorskip('zstandard')
+        return request.param
+
+    def test_round_trip(self, tmp_path, compression):
+        """测试写入后逐行读取"""
+        filename = str(tmp_path / 'results.jsonl')
+        with JsonLinesWriter(filename, compression=compression) as writer:
+            writer.write_many(RECORDS)
+
+        assert writer.count == len(RECORDS)
+        assert list(iter_json_lines(filename, compression=compression)) == RECORDS
+
+    def test_append(self, tmp_path, compression):
+        """测试多次打开追加，已有记录保留"""
+        filename = str(tmp_path / 'results.jsonl')
+        with JsonLinesWriter(filename, compression=compression) as writer:
+            writer.write_many(RECORDS[:2])
+        with JsonLinesWriter(filename, compression=compression) as writer:
+            writer.write_many(RECORDS[2:])
+
+        assert list(iter_json_lines(filename, compression=compression)) == RECORDS
+
+    def test_flush_makes_records_readable(self, tmp_path, compression):
+        """测试刷新后未关闭的文件中的记录可读"""
+        filename = str(tmp_path / 'results.jsonl')
+        writer = JsonLinesWriter(filename, compression=compression, flush_every=2)
+        writer.write_many(RECORDS[:2])
+
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        if compression == 'gzip':
+            # 未结束的gzip成员只能增量解压
+            assert zlib.decompressobj(31).decompress(raw).count(b'\n') == 2
+        elif compression == 'zstd':
+            import zstandard
+            assert zstandard.ZstdDecompressor().decompressobj().decompress(raw).count(b'\n') == 2
+        else:
+            assert list(iter_json_lines(filename)) == RECORDS[:2]
+        writer.close()
+
+    def test_auto_compression(self, tmp_path):
+        """测试根据扩展名选择压缩方式"""
+        filename = str(tmp_path / 'results.jsonl.gz')
+        with JsonLinesWriter(filename) as writer:
+            writer.write(RECORDS[0])
+
+        with gzip.open(filename, 'rt', encoding='utf-8') as f:
+            assert f.read().count('\n') == 1
+        assert list(iter_json_lines(filename)) == RECORDS[:1]
+        assert detect_compression('a.jsonl.zst') == 'zstd'
+        assert detect_compression('a.jsonl') is None
+
+    def test_fsync(self, tmp_path):
+        """测试fsync=True时刷新后同步到磁盘"""
+        filename = str(tmp_path / 'results.jsonl')
+        with patch('hkjc_scrapers.jsonl.os.fsync') as mock_fsync:
+            with JsonLinesWriter(filename, flush_every=2, fsync=True) as writer:
+                writer.write_many(RECORDS[:4])
+            assert mock_fsync.call_count == 3
+
+    def test_records_and_blank_lines(self, tmp_path):
+        """测试紧凑记录可写入，读取时跳过空行"""
+        filename = str(tmp_path / 'results.jsonl')
+        with JsonLinesWriter(filename) as writer:
+            writer.write(Runner({'horse_id': 'HK_2025_L155', 'class': '第四班'}))
+        with open(filename, 'ab') as f:
+            f.write(b'\n')
+
+        assert list(iter_json_lines(filename)) == [{'horse_id': 'HK_2025_L155', 'class': '第四班'}]
+
+    def test_reader_is_lazy(self, tmp_path):
+        """测试读取器逐条返回记录"""
+        filename = str(tmp_path / 'results.jsonl')
+        with JsonLinesWriter(filename) as writer:
+            writer.write_many(RECORDS)
+
+        reader = iter_json_lines(filename)
+        assert next(reader) == RECORDS[0]
+        reader.close()
+
+    def test_unknown_compression(self, tmp_path):
+        """测试未知压缩方式"""
+        with pytest.raises(ValueError):
+            JsonLinesWriter(str(tmp_path / 'results.jsonl'), compression='bz2')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按需解析的爬取结果测试
+"""
+
+import json
+import pytest
+import sys
+import os
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.lazy import Deferred, LazyResult, select_sections
+from hkjc_scrapers.records import Runner
+from hkjc_scrapers.serialization import available_codecs, decode, encode
+
+
+@pytest.fixture
+def calls():
+    """记录提取函数的调用"""
+    return []
+
+
+@pytest.fixture
+def result(calls):
+    """两个已知字段和两个待提取的部分"""
+    def extract(name, value):
+        calls.append(name)
+        return value
+
+    return LazyResult({
+        'race_date': '2026/01/18',
+        'horses': Deferred(extract, 'horses', [Runner({'horse_name': '馬一', 'position': '1'})]),
+        'pedigree': Deferred(extract, 'pedigree', {'sire': 'Sire One'}),
+        'raw_html': '<html></html>',
+    })
+
+
+class TestLazyResult:
+    """LazyResult测试类"""
+
+    def test_extracts_on_first_access_only(self, result, calls):
+        """第一次读取时提取，之后使用缓存"""
+        assert calls == []
+        assert result.loaded == ['race_date', 'raw_html']
+        assert result['horses'][0]['horse_name'] == '馬一'
+        assert result['horses'] is result['horses']
+        assert calls == ['horses']
+        assert result.is_loaded('horses') and not result.is_loaded('pedigree')
+
+    def test_dict_compatible(self, result, calls):
+        """键、长度、get、in、修改都与字典相同，不触发提取"""
+        assert list(result) == ['race_date', 'horses', 'pedigree', 'raw_html']
+        assert len(result) == 4
+        assert 'pedigree' in result and 'race_info' not in result
+        assert result.get('race_info', {}) == {}
+        result['race_no'] = '3'
+        del result['raw_html']
+        assert list(result) == ['race_date', 'horses', 'pedigree', 'race_no']
+        assert calls == []
+        assert result.get('pedigree') == {'sire': 'Sire One'}
+
+    def test_to_dict(self, result, calls):
+        """to_dict和dict()提取全部部分"""
+        plain = result.to_dict()
+        assert type(plain) is dict
+        assert plain['pedigree'] == {'sire': 'Sire One'}
+        assert calls == ['horses', 'pedigree']
+        assert dict(result) == plain
+        assert calls == ['horses', 'pedigree']
+        assert 'pending=[]' in repr(result)
+
+    @pytest.mark.parametrize('codec', available_codecs())
+    def test_json_encoding(self, result, codec):
+        """各编码方式都可以直接编码LazyResult"""
+        data = decode(encode({'results': [result]}, codec=codec))
+        assert data['results'][0]['horses'][0]['horse_name'] == '馬一'
+        assert data['results'][0]['pedigree'] == {'sire': 'Sire One'}
+        assert json.loads(encode(result))['race_date'] == '2026/01/18'
+
+
+class TestSelectSections:
+    """select_sections测试类"""
+
+    def test_order_and_validation(self):
+        """按页面顺序排列，未知的部分抛出异常"""
+        available = ('race_info', 'horses', 'pedigree')
+        assert select_sections(available, None) == ['race_info', 'horses', 'pedigree']
+        assert select_sections(available, ['pedigree', 'horses']) == ['horses', 'pedigree']
+        assert select_sections(available, 'horses') == ['horses']
+        assert select_sections(available, []) == []
+        with pytest.raises(ValueError):
+            select_sections(available, ['horses', 'odds'])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
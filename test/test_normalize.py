@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+向量化类型转换测试
+"""
+
+import pytest
+import sys
+import os
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+np = pytest.importorskip('numpy')
+
+from hkjc_scrapers.normalize import (PLACING_CODES, int_column, float_column, finish_time_column,
+                                     position_column, date_column, normalize_runners,
+                                     normalize_race_records)
+from hkjc_scrapers.utils import parse_finish_time, parse_int
+
+
+class TestNormalize:
+    """向量化类型转换测试类"""
+
+    def test_int_column(self):
+        """测试整数列和遮罩"""
+        column = int_column(['1185', ' 1,092 ', '', None, '-', '-3', 'abc'])
+        assert column.dtype == np.int32
+        assert column.mask.tolist() == [False, False, True, True, True, False, True]
+        assert column.compressed().tolist() == [1185, 1092, -3]
+
+    def test_int_column_out_of_range(self):
+        """测试超出结果类型范围或不是ASCII整数的值被遮罩而不是回绕或抛出异常"""
+        column = int_column(['1185', '3000000000', '-3000000000', '2147483647', '99999999999999999999'])
+        assert column.dtype == np.int32
+        assert column.mask.tolist() == [False, True, True, False, True]
+        assert column.compressed().tolist() == [1185, 2147483647]
+
+        column = int_column(['40000', '-129', '127'], dtype=np.int8)
+        assert column.mask.tolist() == [True, True, False]
+        assert int_column(['3000000000'], dtype=np.int64).compressed().tolist() == [3000000000]
+
+        column = int_column(['1', '--5', '²', '3', '1-2'])
+        assert column.mask.tolist() == [False, True, True, False, True]
+        assert column.compressed().tolist() == [1, 3]
+        assert float_column(['²', '1.²', '.5', '2.']).mask.tolist() == [True, True, False, False]
+        assert finish_time_column(['1.²', '1:0².5', '1:09.45']).mask.tolist() == [True, True, False]
+
+        columns = position_column(['1', '70000', '70000 DH'])
+        assert columns['position'].mask.tolist() == [False, True, True]
+        assert columns['position_code'].tolist() == [0, 0, 0]
+
+    def test_float_column(self):
+        """测试小数列"""
+        column = float_column(['4.7', '12', '---', '1.2.3', None])
+        assert column.mask.tolist() == [False, False, True, True, True]
+        assert column.compressed().tolist() == [4.7, 12.0]
+
+    def test_finish_time_column(self):
+        """测试完成时间转换为秒"""
+        column = finish_time_column(['1:09.45', '1.09.45', '58.12', '', '---', '1:xx.45'])
+        assert column.mask.tolist() == [False, False, False, True, True, True]
+        assert column.compressed() == pytest.approx([69.45, 69.45, 58.12])
+
+    def test_finish_time_matches_per_row(self):
+        """测试与逐行解析结果一致"""
+        values = ['1:09.45', '2:01.30', '1.23.04', '57.98', '']
+        column = finish_time_column(values)
+        expected = [parse_finish_time(value) for value in values]
+        assert column.mask.tolist() == [value is None for value in expected]
+        assert column.compressed() == pytest.approx(expected[:4])
+
+    def test_position_column(self):
+        """测试名次拆分为数字名次、特殊名次代码和平头标记"""
+        columns = position_column(['1', '2 DH', 'PU', 'wv', '', 'XYZ'])
+        assert columns['position'].mask.tolist() == [False, False, True, True, True, True]
+        assert columns['position'].compressed().tolist() == [1, 2]
+        assert columns['dead_heat'].tolist() == [False, True, False, False, False, False]
+        codes = columns['position_code'].tolist()
+        assert codes[:2] == [0, 0]
+        assert PLACING_CODES[codes[2]] == 'PU'
+        assert PLACING_CODES[codes[3]] == 'WV'
+        assert codes[4:] == [-1, -1]
+
+    def test_date_column(self):
+        """测试日期列"""
+        column = date_column(['18/01/26', '2026/01/18', '18/01/26', 'bad'])
+        assert column.mask.tolist() == [False, False, False, True]
+        assert str(column[0]) == '2026-01-18'
+        assert column.dtype == np.dtype('datetime64[D]')
+
+    def test_empty_columns(self):
+        """测试空列"""
+        assert int_column([]).size == 0
+        assert finish_time_column([]).size == 0
+        assert date_column([]).size == 0
+        assert position_column([])['position_code'].size == 0
+
+    def test_normalize_runners(self):
+        """测试转换参赛马匹，来源字段按顺序取第一个非空值"""
+        rows = [
+            {'position': '1', 'number': '5', 'draw': '3', 'weight': '1102', '實際負磅': '133',
+             'odds': '4.7', '完成時間': '1:09.45'},
+            {'position': 'WV', '馬號': '7', '檔位': '9', '排位體重': '1,050', 'odds': '',
+             '獨贏賠率': '12'},
+        ]
+        columns = normalize_runners(rows)
+        assert set(columns) >= {'position', 'position_code', 'dead_heat', 'number', 'draw',
+                                'weight', 'actual_weight', 'rating', 'odds', 'finish_time'}
+        assert columns['number'].tolist() == [5, 7]
+        assert columns['weight'].tolist() == [1102, 1050]
+        assert columns['odds'].tolist() == [4.7, 12.0]
+        assert columns['finish_time'].tolist() == [pytest.approx(69.45), None]
+        assert columns['rating'].mask.all()
+        assert columns['number'].tolist() == [parse_int(row.get('number') or row.get('馬號'))
+                                              for row in rows]
+
+    def test_normalize_race_records(self):
+        """测试转换马匹赛绩"""
+        rows = [
+            {'date': '02/06/24', 'position': '3', 'distance': '1200', 'finish_time': '1.09.45'},
+            {'date': '15/05/24', 'position': '10', '途程': '1650', 'finish_time': ''},
+        ]
+        columns = normalize_race_records(rows)
+        assert columns['race_date'].astype(str).tolist() == ['2024-06-02', '2024-05-15']
+        assert columns['distance'].tolist() == [1200, 1650]
+        assert columns['position'].tolist() == [3, 10]
+        assert columns['finish_time'].tolist() == [pytest.approx(69.45), None]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
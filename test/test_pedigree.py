@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+血统关系图测试
+"""
+
+import pytest
+import sys
+import os
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.form_index import FormIndex
+from hkjc_scrapers.pedigree import PedigreeGraph
+
+
+def horse(horse_id, name, sire, dam, grandsire, records=()):
+    """马匹资料"""
+    return {'horse_id': horse_id, 'race_records': list(records), 'basic_info': {
+        'horse_name': name, 'sire': sire, 'dam': dam, 'maternal_grandsire': grandsire}}
+
+
+@pytest.fixture
+def horses():
+    """五匹马：A、B全同胞，C与A同母，D与A同父，E的母系是A的母系的姊妹"""
+    return [
+        horse('HK_2023_A001', '馬甲', 'Sire One', 'Dam One', 'Grandsire', [
+            {'date': '18/01/26', 'venue': '沙田草地', 'distance': '1800', 'position': '2'},
+            {'date': '01/01/26', 'venue': '沙田草地', 'distance': '1200', 'position': '5'},
+        ]),
+        horse('HK_2024_B002', '馬乙', 'Sire One', 'Dam One', 'Grandsire', [
+            {'date': '11/01/26', 'venue': '跑馬地草地', 'distance': '2200', 'position': '1'},
+        ]),
+        horse('HK_2024_C003', '馬丙', 'Sire Two', 'Dam One', 'Grandsire'),
+        horse('HK_2025_D004', '馬丁', ' Sire One ', 'Dam Two', 'Other Grandsire', [
+            {'date': '04/01/26', 'venue': '沙田草地', 'distance': '1650', 'position': '3'},
+        ]),
+        horse('HK_2025_E005', '馬戊', 'Sire Two', 'Dam Three', 'Grandsire'),
+    ]
+
+
+@pytest.fixture
+def graph(horses):
+    """已加入全部马匹的关系图"""
+    graph = PedigreeGraph()
+    graph.add_horses(horses)
+    return graph
+
+
+class TestPedigreeGraph:
+    """PedigreeGraph测试类"""
+
+    def test_offspring(self, graph):
+        """父系、母系、外祖父的后代"""
+        assert len(graph) == 5
+        assert graph.offspring('Sire One') == ['HK_2023_A001', 'HK_2024_B002', 'HK_2025_D004']
+        assert graph.offspring('Dam One', role='dam') == ['HK_2023_A001', 'HK_2024_B002', 'HK_2024_C003']
+        assert graph.offspring('Grandsire', role='maternal_grandsire') == [
+            'HK_2023_A001', 'HK_2024_B002', 'HK_2024_C003', 'HK_2025_E005']
+        assert graph.offspring('Unknown') == []
+
+    def test_siblings(self, graph):
+        """全同胞、同母、同父"""
+        assert graph.siblings('HK_2023_A001', 'full') == ['HK_2024_B002']
+        assert graph.siblings('HK_2023_A001') == ['HK_2024_B002', 'HK_2024_C003']
+        assert graph.siblings('HK_2023_A001', 'sire') == ['HK_2024_B002', 'HK_2025_D004']
+        assert graph.siblings('HK_9999_X000') == []
+        with pytest.raises(ValueError):
+            graph.siblings('HK_2023_A001', 'cousin')
+
+    def test_ancestors(self, graph):
+        """祖先：外祖父是母系的父系"""
+        assert graph.ancestors('HK_2023_A001', generations=1) == [(1, 'sire', 'Sire One'), (1, 'dam', 'Dam One')]
+        assert (2, 'dam.sire', 'Grandsire') in graph.ancestors('HK_2023_A001')
+        assert graph.ancestors('馬甲') == graph.ancestors('HK_2023_A001')
+
+    def test_descendants(self, graph):
+        """后代：外祖父的第二代是母系的子女"""
+        assert graph.descendants('Dam One', generations=1) == [(1, '馬甲'), (1, '馬乙'), (1, '馬丙')]
+        second = [name for generation, name in graph.descendants('Grandsire') if generation == 2]
+        assert second == ['馬甲', '馬乙', '馬丙', '馬戊']
+
+    def test_names_are_interned(self, graph):
+        """名称去除空白并驻留"""
+        sires = {id(graph.horses[horse_id]['sire']) for horse_id in graph.offspring('Sire One')}
+        assert len(sires) == 1
+        assert graph.horse_ids('馬丁') == ['HK_2025_D004']
+
+    def test_update_replaces_edges(self, graph):
+        """重新加入时替换原来的边"""
+        graph.add('HK_2024_C003', '馬丙', 'Sire One', 'Dam One')
+        assert graph.offspring('Sire Two') == ['HK_2025_E005']
+        assert graph.siblings('HK_2023_A001', 'full') == ['HK_2024_B002', 'HK_2024_C003']
+        # 没有给出的外祖父保留原值
+        assert graph.horses['HK_2024_C003']['maternal_grandsire'] == 'Grandsire'
+
+    def test_update_keeps_grandsire_edge_from_foals(self):
+        """更新母马时保留其子女的外祖父给出的父系"""
+        graph = PedigreeGraph()
+        graph.add('HK_2025_F001', 'Foal', 'Sire One', 'Mare', 'S0')
+        graph.add('HK_2020_M001', 'Mare', dam='Old Dam')
+        graph.add('HK_2020_M001', 'Mare', dam='New Dam')
+        assert (2, 'dam.sire', 'S0') in graph.ancestors('HK_2025_F001', 2)
+        assert (2, 'dam.dam', 'New Dam') in graph.ancestors('HK_2025_F001', 2)
+        assert 'Old Dam' not in graph.children
+        assert graph.descendants('S0') == [(1, 'Mare'), (2, 'Foal')]
+
+        # 母马自己给出不同的父系时取代外祖父的边
+        graph.add('HK_2020_M001', 'Mare', sire='S1')
+        assert graph.parents['Mare'] == {'sire': 'S1', 'dam': 'New Dam'}
+        assert 'S0' not in graph.children
+        assert graph.descendants('S1') == [(1, 'Mare'), (2, 'Foal')]
+
+    def test_add_race_result(self):
+        """比赛结果中头马的血统"""
+        graph = PedigreeGraph()
+        graph.add_race_result({'pedigree': {'horse_id': 'HK_2024_K123', 'horse_name': '勝利',
+                                            'sire': 'Sire One', 'dam': 'Dam Four'}})
+        graph.add_race_result({'pedigree': {}})
+        graph.add_race_result(None)
+        assert graph.offspring('Sire One') == ['HK_2024_K123']
+        assert graph.ancestors('勝利') == [(1, 'sire', 'Sire One'), (1, 'dam', 'Dam Four')]
+
+    def test_runs_by_sire(self, graph, horses):
+        """父系后代在途程范围内的赛绩"""
+        index = FormIndex()
+        index.add_horses(horses)
+        runs = graph.runs_by_sire('Sire One', index, min_distance=1650)
+        assert [(horse_id, run['distance']) for horse_id, run in runs] == [
+            ('HK_2023_A001', '1800'), ('HK_2024_B002', '2200'), ('HK_2025_D004', '1650')]
+        runs = graph.runs_by_sire('Sire One', index, min_distance=1600, max_distance=2000)
+        assert [horse_id for horse_id, _ in runs] == ['HK_2023_A001', 'HK_2025_D004']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
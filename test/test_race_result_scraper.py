@@ -136,7 +136,86 @@ class TestRaceResultScraper:
         incidents = scraper._extract_incident_reports(soup)
         
         assert isinstance(incidents, list)
-    
+        assert len(incidents) == 1
+        assert incidents[0]['horse_id'] == 'HK_2025_L155'
+        assert incidents[0]['description'] == '出閘迅速，全程領先'
+
+    def test_extract_incident_reports_inside_layout_table(self, scraper):
+        """测试事件报告提取：页面被布局表格包裹时只解析事件报告区块"""
+        html = """
+        <html><body>
+        <table class="layout">
+            <tr><td><a href="/report">賽事報告</a></td><td>導航</td><td>連結</td></tr>
+            <tr><td>
+                <table>
+                    <tr><th>名次</th><th>馬號</th><th>馬名</th><th>騎師</th><th>練馬師</th><th>檔位</th></tr>
+                    <tr><td>1</td><td>3</td><td><a href="/horse?horseid=HK_2025_L155">国千金</a></td><td>潘頓</td><td>蔡約翰</td><td>1</td></tr>
+                </table>
+                <div>競賽事件報告</div>
+                <table>
+                    <tr><th>名次</th><th>馬號</th><th>馬名</th><th>競賽事件</th></tr>
+                    <tr><td>1</td><td>3</td><td><a href="/horse?horseid=HK_2025_L155">国千金</a></td><td>出閘時受阻。</td></tr>
+                    <tr><td>2</td><td>5</td><td><a href="/horse?horseid=HK_2024_K123">测试马</a></td><td>沿途走外疊。</td></tr>
+                </table>
+            </td><td>頁尾</td><td>報告</td></tr>
+        </table>
+        </body></html>
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        incidents = scraper._extract_incident_reports(soup)
+
+        assert len(incidents) == 2
+        assert incidents[0] == {
+            'position': '1',
+            'horse_number': '3',
+            'horse_id': 'HK_2025_L155',
+            'horse_name': '国千金',
+            'description': '出閘時受阻。'
+        }
+        assert incidents[1]['horse_id'] == 'HK_2024_K123'
+
+        # 旧版方法会把布局表格和成绩表的行也当作事件报告
+        assert len(scraper._extract_incident_reports_legacy(soup)) > len(incidents)
+
+    def test_extract_incident_reports_validates_header(self, scraper):
+        """测试导航中的标题之后的名次表不会被当作事件报告，<td>表头行被跳过"""
+        html = """
+        <html><body>
+        <div class="nav"><a href="/incident">競賽事件報告</a></div>
+        <table>
+            <tr><th>名次</th><th>馬號</th><th>馬名</th><th>騎師</th><th>練馬師</th><th>檔位</th></tr>
+            <tr><td>1</td><td>3</td><td><a href="/horse?horseid=HK_2025_L155">国千金</a></td><td>潘頓</td><td>蔡約翰</td><td>1</td></tr>
+        </table>
+        <div>競賽事件報告</div>
+        <table>
+            <tr><td>名次</td><td>馬號</td><td>馬名</td><td>競賽事件</td></tr>
+            <tr><td>2</td><td>5</td><td><a href="/horse?horseid=HK_2024_K123">测试马</a></td><td>沿途走外疊。</td></tr>
+        </table>
+        </body></html>
+        """
+        incidents = scraper._extract_incident_reports(BeautifulSoup(html, 'html.parser'))
+        assert [(i['horse_id'], i['description']) for i in incidents] == [('HK_2024_K123', '沿途走外疊。')]
+
+    def test_extract_incident_reports_without_header(self, scraper):
+        """测试没有表头的事件报告表格不丢失第一条事件"""
+        html = """
+        <html><body>
+        <div>競賽事件報告</div>
+        <table>
+            <tr><td>1</td><td>3</td><td><a href="/horse?horseid=HK_2025_L155">国千金</a></td><td>出閘時受阻。</td></tr>
+            <tr><td>2</td><td>5</td><td><a href="/horse?horseid=HK_2024_K123">测试马</a></td><td>沿途走外疊。</td></tr>
+        </table>
+        </body></html>
+        """
+        incidents = scraper._extract_incident_reports(BeautifulSoup(html, 'html.parser'))
+        assert [i['horse_id'] for i in incidents] == ['HK_2025_L155', 'HK_2024_K123']
+        assert incidents[0]['position'] == '1'
+
+    def test_extract_incident_reports_not_found(self, scraper):
+        """测试没有事件报告区块时返回空列表"""
+        soup = BeautifulSoup("<html><body><table><tr><td>1</td><td>2</td><td>3</td></tr></table></body></html>", 'html.parser')
+        assert scraper._extract_incident_reports(soup) == []
+
     def test_extract_pedigree(self, scraper, sample_html):
         """测试血统信息提取"""
         soup = BeautifulSoup(sample_html, 'html.parser')
@@ -186,6 +265,29 @@ class TestRaceResultScraper:
             assert len(rows) == 2
             assert rows[0]['horse_name'] == '测试马1'
     
+    def test_save_to_csv_append(self, scraper, tmp_path):
+        """测试多场比赛追加到同一CSV，列随新表头增加"""
+        first = {
+            'race_date': '2026/01/18', 'racecourse': 'ST', 'race_no': '1',
+            'horses': [{'horse_name': '测试马1', 'jockey': '骑师1'}]
+        }
+        second = {
+            'race_date': '2026/01/18', 'racecourse': 'ST', 'race_no': '2',
+            'horses': [{'horse_name': '测试马2', 'jockey': '骑师2', '完成時間': '1:09.50'}]
+        }
+
+        csv_file = tmp_path / 'runners.csv'
+        scraper.save_to_csv(first, str(csv_file), append=True)
+        scraper.save_to_csv(second, str(csv_file), append=True)
+
+        import csv
+        with open(csv_file, 'r', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        assert reader.fieldnames == ['race_date', 'racecourse', 'race_no', 'horse_name', 'jockey', '完成時間']
+        assert [row['race_no'] for row in rows] == ['1', '2']
+        assert rows[1]['完成時間'] == '1:09.50'
+
     def test_save_to_csv_empty_data(self, scraper, tmp_path):
         """测试CSV保存空数据"""
         test_data = {'horses': []}
@@ -196,6 +298,104 @@ class TestRaceResultScraper:
         # 空数据不应该创建文件或应该创建空文件
         # 根据实现，这里可能不创建文件
     
+    def test_scrape_race_result_lazy(self, scraper, sample_html):
+        """测试按需解析：只提取读取的部分"""
+        url = "https://racing.hkjc.com/zh-hk/local/information/localresults?racedate=2026/01/18&Racecourse=ST&RaceNo=3"
+        
+        with patch('hkjc_scrapers.race_result_scraper.requests.Session.get') as mock_get:
+            mock_response = Mock()
+            mock_response.text = sample_html
+            mock_response.encoding = 'utf-8'
+            mock_response.raise_for_status = Mock()
+            mock_get.return_value = mock_response
+            
+            eager = scraper.scrape_race_result(url)
+            with patch.object(scraper, '_extract_incident_reports') as mock_incidents, \
+                    patch.object(scraper, '_extract_pedigree') as mock_pedigree:
+                result = scraper.scrape_race_result(url, lazy=True)
+                assert result['horses'] == eager['horses']
+                mock_incidents.assert_not_called()
+                mock_pedigree.assert_not_called()
+        
+        assert list(result) == list(eager)
+        assert result.loaded == ['race_date', 'racecourse', 'race_no', 'horses', 'raw_html']
+    
+    def test_scrape_race_result_sections(self, scraper, sample_html):
+        """测试只提取指定的部分"""
+        url = "https://racing.hkjc.com/zh-hk/local/information/localresults?racedate=2026/01/18&Racecourse=ST&RaceNo=3"
+        
+        with patch('hkjc_scrapers.race_result_scraper.requests.Session.get') as mock_get:
+            mock_response = Mock()
+            mock_response.text = sample_html
+            mock_response.encoding = 'utf-8'
+            mock_response.raise_for_status = Mock()
+            mock_get.return_value = mock_response
+            
+            result = scraper.scrape_race_result(url, sections=['pedigree', 'horses'])
+        
+        assert isinstance(result, dict)
+        assert list(result) == ['race_date', 'racecourse', 'race_no', 'horses', 'pedigree', 'raw_html']
+        with pytest.raises(ValueError):
+            scraper.scrape_race_result(url, sections=['odds'])
+    
+    def test_scrape_race_result_stream(self, scraper, sample_html):
+        """测试流式下载：所选部分读取后停止，结果与完整下载相同"""
+        url = "https://racing.hkjc.com/zh-hk/local/information/localresults?racedate=2026/01/18&Racecourse=ST&RaceNo=3"
+        data = sample_html.encode('utf-8')
+        
+        def streamed(*args, **kwargs):
+            assert kwargs.get('stream') is True
+            response = Mock()
+            response.headers = {}
+            response.iter_content = lambda chunk_size: (data[i:i + 64] for i in range(0, len(data), 64))
+            return response
+        
+        with patch('hkjc_scrapers.race_result_scraper.requests.Session.get') as mock_get:
+            mock_response = Mock()
+            mock_response.text = sample_html
+            mock_response.encoding = 'utf-8'
+            mock_response.raise_for_status = Mock()
+            mock_get.return_value = mock_response
+            eager = scraper.scrape_race_result(url)
+            
+            mock_get.side_effect = streamed
+            horses_only = scraper.scrape_race_result(url, sections=['horses'], stream=True)
+            # 没有事件报告标题时读取到页面结束
+            full = scraper.scrape_race_result(url, stream=True)
+            too_large = scraper.scrape_race_result(url, stream=True, max_bytes=256)
+        
+        assert horses_only['horses'] == eager['horses']
+        assert '勝出馬匹血統' not in horses_only['raw_html']
+        for name in ('race_info', 'horses', 'race_result', 'incident_reports', 'pedigree'):
+            assert full[name] == eager[name]
+        assert too_large == {}
+    
+    def test_scrape_race_result_stream_incident_heading(self, scraper):
+        """测试流式下载：事件报告标题之后的表格读取后停止"""
+        url = "https://racing.hkjc.com/zh-hk/local/information/localresults?racedate=2026/01/18&Racecourse=ST&RaceNo=3"
+        html = (
+            '<html><body><table class="layout"><tr><td>'
+            '<table><tr><td><a href="/menu">賽事報告</a></td><td>a</td><td>b</td></tr></table>'
+            '<div class="title">競賽事件報告</div>'
+            '<table><tr><th>名次</th><th>馬號</th><th>馬名</th><th>競賽事件</th></tr>'
+            '<tr><td>1</td><td>3</td><td><a href="/horse?horseid=HK_2025_L155">国千金</a></td>'
+            '<td>出閘時受阻。</td></tr></table>'
+            + '<p>頁尾連結</p>' * 300 +
+            '</td></tr></table></body></html>'
+        )
+        data = html.encode('utf-8')
+        
+        with patch('hkjc_scrapers.race_result_scraper.requests.Session.get') as mock_get:
+            response = Mock()
+            response.headers = {}
+            response.iter_content = lambda chunk_size: (data[i:i + 128] for i in range(0, len(data), 128))
+            mock_get.return_value = response
+            result = scraper.scrape_race_result(url, sections=['incident_reports'], stream=True)
+        
+        assert result['incident_reports'] == [{'position': '1', 'horse_number': '3', 'horse_id': 'HK_2025_L155',
+                                               'horse_name': '国千金', 'description': '出閘時受阻。'}]
+        assert len(result['raw_html']) < len(html) // 2
+    
     def test_error_handling_invalid_url(self, scraper):
         """测试无效URL的错误处理"""
         with patch('hkjc_scrapers.race_result_scraper.requests.Session.get') as mock_get:
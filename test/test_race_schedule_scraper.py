@@ -15,9 +15,129 @@ from bs4 import BeautifulSoup
 # 添加src目录到路径
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
 
-from hkjc_scrapers.race_schedule_scraper import RaceScheduleScraper
+from hkjc_scrapers.race_schedule_scraper import (RaceScheduleScraper, IconInfo, classify_icon,
+                                                 DAY_TRACK_TYPE_NAMES, RACE_TRACK_TYPE_NAMES)
 
 
+# 图标识别在合并为classify_icon之前，三个解析位置各自的判断（用于比对输出）
+def baseline_day_icon(src, alt, title):
+    """原_extract_day_level_info的判断：(场地, 跑道类型, 赛马类型)"""
+    src = src.lower()
+    filename = src.split('/')[-1] if '/' in src else src
+    venue = track = race_type = None
+    if filename.endswith('hv.gif') or 'hv.gif' in src or 'hv-ch' in src or '跑馬地' in alt or '跑马地' in alt:
+        venue = '跑马地'
+    elif filename.endswith('st.gif') or 'st.gif' in src or 'st-ch' in src or '沙田' in alt:
+        venue = '沙田'
+    if filename.endswith('mixed.gif') or 'mixed.gif' in src or ('mixed' in src and 'gif' in src) or '混合' in alt:
+        track = '混合賽路'
+    elif filename.endswith('turf.gif') or 'turf.gif' in src or ('turf' in src and 'gif' in src) or '草地' in alt:
+        track = '草地'
+    elif filename.endswith('awt.gif') or 'awt.gif' in src or ('awt' in src and 'gif' in src) or '全天候' in alt:
+        track = '全天候'
+    if 'day' in src or '日賽' in alt or '日赛' in alt:
+        race_type = '日赛'
+    elif 'dusk' in src or '黄昏賽' in alt or '黄昏赛' in alt:
+        race_type = '黄昏赛'
+    elif 'night' in src or '夜賽' in alt or '夜赛' in alt:
+        race_type = '夜赛'
+    return venue, track, race_type
+
+
+def baseline_race_icon(src, alt, title):
+    """原_parse_race_p的判断：(班次, 级别, 跑道类型)"""
+    src = src.lower()
+    race_class = grade = track = None
+    for name in ('第一班', '第二班', '第三班', '第四班', '第五班'):
+        if name in alt or name in title:
+            race_class = name
+            break
+    else:
+        if 'class' in src:
+            match = re.search(r'class[_-]?(\d+)', src)
+            if match:
+                race_class = RaceScheduleScraper()._number_to_chinese_class(int(match.group(1)))
+    if 'g1' in src or 'class_g1' in src or '一級賽' in alt or '一级赛' in alt:
+        grade = '一级赛'
+    elif 'g2' in src or 'class_g2' in src or '二級賽' in alt or '二级赛' in alt:
+        grade = '二级赛'
+    elif 'g3' in src or 'class_g3' in src or '三級賽' in alt or '三级赛' in alt:
+        grade = '三级赛'
+    elif '4yo' in src or 'class_4yo' in src or '四歲' in alt or '四岁' in alt:
+        grade = '四岁'
+    if 'awt' in src or '全天候' in alt:
+        track = '全天候跑道'
+    elif 'turf' in src or '草地' in alt:
+        track = '草地'
+    elif 'mixed' in src or '混合' in alt:
+        track = '混合赛道'
+    return race_class, grade, track
+
+
+def baseline_legacy_icon(src, alt, title):
+    """原_parse_race_day_cell_legacy的判断：(场地, 赛马类型, 跑道类型, 级别)"""
+    venue = race_type = track = grade = None
+    if 'hv-ch' in src or '跑馬地' in alt or '跑马地' in alt:
+        venue = '跑马地'
+    elif 'st-ch' in src or '沙田' in alt:
+        venue = '沙田'
+    if 'day' in src or '日賽' in alt or '日赛' in alt:
+        race_type = '日赛'
+    elif 'dusk' in src or '黄昏賽' in alt or '黄昏赛' in alt:
+        race_type = '黄昏赛'
+    elif 'night' in src or '夜賽' in alt or '夜赛' in alt:
+        race_type = '夜赛'
+    if 'turf' in src or '草地' in alt:
+        track = '草地'
+    elif 'mixed' in src or '混合' in alt:
+        track = '混合赛道'
+    elif 'awt' in src or '全天候' in alt:
+        track = '全天候跑道'
+    if 'class_g1' in src or '一級賽' in alt or '一级赛' in alt:
+        grade = '一级赛'
+    elif 'class_g2' in src or '二級賽' in alt or '二级赛' in alt:
+        grade = '二级赛'
+    elif 'class_g3' in src or '三級賽' in alt or '三级赛' in alt:
+        grade = '三级赛'
+    elif 'class_4YO' in src or '四歲' in alt or '四岁' in alt:
+        grade = '四岁'
+    return venue, race_type, track, grade
+
+
+# 各解析位置之间判断不同的图标
+EDGE_ICONS = [
+    ('/images/ST.gif', '', ''), ('/images/st-ch.gif', '', ''), ('/images/HV-CH.gif', '', ''),
+    ('/images/hv.gif', '', ''), ('/class_4YO.gif', '', ''), ('/class_g2.gif', '', ''), ('/G1.gif', '', ''),
+    ('/images/awt_turf.gif', '', ''), ('/images/turf-mixed.gif', '', ''), ('/mixed.png', '', ''),
+    ('/mixed.png', '混合賽道', ''), ('/x.gif', '全天候 草地', ''), ('/awt.gif', '混合', ''),
+    ('/Day.gif', '', ''), ('/dusk.gif', '', ''), ('/class_5.gif', '', '第三班'), ('/classic.gif', '', ''),
+    ('/blank.gif', '', ''),
+]
+
+
+
+def baseline_notices(page_text):
+    """原_extract_notices：逐个正则findall，按正则次序收集通知"""
+    notices = []
+    for pattern in [r'原定於.*?取消', r'原定于.*?取消', r'延期', r'改期', r'注意.*?事項', r'注意.*?事项']:
+        for match in re.findall(pattern, page_text, re.IGNORECASE):
+            if match and match not in notices:
+                notices.append(match.strip())
+    return notices
+
+
+def baseline_legend_order(page_text):
+    """原_extract_legend：按图例正则的次序收集的(分类, 键)列表"""
+    patterns = [
+        ('venues', {'跑马地': r'跑馬地|跑马地', '沙田': r'沙田'}),
+        ('race_types', {'日赛': r'日賽|日赛', '黄昏赛': r'黄昏賽|黄昏赛', '夜赛': r'夜賽|夜赛'}),
+        ('track_types', {'草地': r'草地', '混合赛道': r'混合賽道|混合赛道'}),
+        ('race_classes', {'一级赛': r'一級賽|一级赛', '二级赛': r'二級賽|二级赛',
+                          '三级赛': r'三級賽|三级赛', '四岁': r'四歲|四岁'}),
+    ]
+    return [(category, key) for category, keys in patterns
+            for key, pattern in keys.items() if re.search(pattern, page_text)]
+
 class TestRaceScheduleScraper:
     """HKJC赛程表爬虫测试类"""
     
@@ -148,6 +268,49 @@ class TestRaceScheduleScraper:
         # 示例HTML中包含取消通知
         assert len(notices) > 0
     
+    def test_extract_fixture_single_pass(self, scraper, sample_html):
+        """测试一次遍历的提取结果与分别提取一致"""
+        soup = BeautifulSoup(sample_html, 'html.parser')
+        fixture = scraper._extract_fixture(soup)
+        
+        assert fixture['months'] == scraper._extract_months(soup)
+        assert fixture['race_days'] == scraper._extract_race_days(soup)
+        assert fixture['legend'] == scraper._extract_legend(soup)
+        assert fixture['notices'] == scraper._extract_notices(soup)
+        
+        with patch.object(scraper, '_match_fixture_text', wraps=scraper._match_fixture_text) as mock_match:
+            scraper._extract_fixture(soup)
+            assert mock_match.call_count == 1
+        
+        # 页面文本在遍历时收集，不再单独调用get_text
+        page_text = soup.get_text()
+        with patch.object(scraper, '_match_fixture_text', wraps=scraper._match_fixture_text) as mock_match, \
+                patch.object(BeautifulSoup, 'get_text', side_effect=AssertionError('get_text')):
+            scraper._extract_fixture(soup)
+        assert mock_match.call_args[0][0] == page_text
+    
+    def test_match_fixture_text(self, scraper):
+        """测试组合正则同时匹配图例和通知，通知中的关键词也计入图例"""
+        legend, notices = scraper._match_fixture_text('原定於9月24日在跑馬地舉行的夜賽將予取消。沙田日賽延期')
+        
+        assert notices == ['原定於9月24日在跑馬地舉行的夜賽將予取消', '延期']
+        assert legend['venues'] == {'跑马地': True, '沙田': True}
+        assert legend['race_types'] == {'夜赛': True, '日赛': True}
+    
+    @pytest.mark.parametrize('page_text', [
+        '原定於9月24日原定於10月1日在沙田舉行的日賽將予取消。',
+        '注意事項：跑馬地夜賽改期。原定於3月5日的賽事取消，另一場延期，再延期；注意以下事項',
+        '四歲系列 三級賽 二級賽 一級賽 混合賽道 草地 夜賽 黄昏賽 日賽 沙田 跑馬地 改期 延期',
+        '原定於A取消原定於B取消 原定于C取消 注意甲事項注意乙事项',
+    ])
+    def test_match_fixture_text_matches_baseline(self, scraper, page_text):
+        """测试通知不重叠、通知和图例的次序与合并正则之前的输出一致"""
+        legend, notices = scraper._match_fixture_text(page_text)
+        
+        assert notices == baseline_notices(page_text)
+        assert [(category, key) for category in ('venues', 'race_types', 'track_types', 'race_classes')
+                for key in legend[category]] == baseline_legend_order(page_text)
+    
     def test_extract_race_days(self, scraper, sample_html):
         """测试赛马日提取"""
         soup = BeautifulSoup(sample_html, 'html.parser')
@@ -168,6 +331,51 @@ class TestRaceScheduleScraper:
             assert race_day.get('month') == '一月'
             assert race_day.get('year') == '2026'
     
+    def test_extract_race_days_month_filter(self, scraper, sample_html):
+        """测试按月份筛选时跳过其他月份的表格"""
+        soup = BeautifulSoup(sample_html, 'html.parser')
+        
+        assert len(scraper._extract_race_days(soup, months=['一月'])) == 2
+        assert len(scraper._extract_race_days(soup, months=[1])) == 2
+        
+        with patch.object(scraper, '_parse_race_day_cell') as mock_parse:
+            assert scraper._extract_race_days(soup, months=['二月']) == []
+            mock_parse.assert_not_called()
+    
+    def test_extract_race_days_date_range(self, scraper, sample_html):
+        """测试按日期范围筛选时只解析范围内的日期单元格"""
+        soup = BeautifulSoup(sample_html, 'html.parser')
+        
+        with patch.object(scraper, '_parse_race_day_cell', wraps=scraper._parse_race_day_cell) as mock_parse:
+            race_days = scraper._extract_race_days(soup, date_from='2026-01-05', date_to='2026-01-31')
+            assert mock_parse.call_count == 1
+        assert [day['date'] for day in race_days] == ['2026-01-11']
+        
+        assert scraper._extract_race_days(soup, date_from='2026-02-01') == []
+    
+    def test_extract_race_days_venue_filter(self, scraper, sample_html):
+        """测试按场地筛选赛马日"""
+        soup = BeautifulSoup(sample_html, 'html.parser')
+        
+        hv_days = scraper._extract_race_days(soup, venue='跑馬地')
+        assert [day['day'] for day in hv_days] == [11]
+        st_days = scraper._extract_race_days(soup, venue='沙田')
+        assert [day['day'] for day in st_days] == [3]
+    
+    def test_scrape_schedule_with_filters(self, scraper, sample_html):
+        """测试爬取时传入筛选条件"""
+        with patch('hkjc_scrapers.race_schedule_scraper.requests.Session.get') as mock_get:
+            mock_response = Mock()
+            mock_response.text = sample_html
+            mock_response.encoding = 'utf-8'
+            mock_response.raise_for_status = Mock()
+            mock_get.return_value = mock_response
+            
+            result = scraper.scrape_schedule(months=['一月'], venue='沙田')
+        
+        assert [day['date'] for day in result['race_days']] == ['2026-01-03']
+        assert all(scraper._convert_chinese_month(month) == 1 for month in result['months'])
+    
     def test_parse_race_day_cell(self, scraper, sample_html):
         """测试日期单元格解析"""
         soup = BeautifulSoup(sample_html, 'html.parser')
@@ -184,6 +392,47 @@ class TestRaceScheduleScraper:
                 assert isinstance(race_day['races'], list)
                 assert 'track_types' in race_day
     
+    def test_classify_icon(self):
+        """测试图标识别"""
+        assert classify_icon('/images/ST-CH.gif', '', '') == IconInfo(venue='沙田')
+        assert classify_icon('/hv.gif', '跑馬地', '').venue == '跑马地'
+        assert classify_icon('/night.gif', '夜賽', '').race_type == '夜赛'
+        assert classify_icon('/awt.gif', '', '').track == 'awt'
+        assert classify_icon('/turf.gif', '草地', '').track == 'turf'
+        assert classify_icon('/class2.gif', '', '').race_class == '第二班'
+        assert classify_icon('/x.gif', '', '第四班').race_class == '第四班'
+        assert classify_icon('/class_g1.gif', '一級賽', '').grade == '一级赛'
+        assert classify_icon('/blank.gif', '', '') == IconInfo()
+    
+    def test_classify_icon_matches_baseline(self, sample_html):
+        """测试各解析位置的图标识别与合并之前各自的判断相同"""
+        soup = BeautifulSoup(sample_html, 'html.parser')
+        icons = [(img.get('src', ''), img.get('alt', ''), img.get('title', '')) for img in soup.find_all('img')]
+        for src, alt, title in icons + EDGE_ICONS:
+            day = classify_icon(src, alt, title, 'day')
+            track = DAY_TRACK_TYPE_NAMES[day.track] if day.track else None
+            assert (day.venue, track, day.race_type) == baseline_day_icon(src, alt, title), src
+
+            race = classify_icon(src, alt, title, 'race')
+            track = RACE_TRACK_TYPE_NAMES[race.track] if race.track else None
+            assert (race.race_class, race.grade, track) == baseline_race_icon(src, alt, title), src
+
+            legacy = classify_icon(src, alt, title, 'legacy')
+            track = RACE_TRACK_TYPE_NAMES[legacy.track] if legacy.track else None
+            assert (legacy.venue, legacy.race_type, track, legacy.grade) == \
+                baseline_legacy_icon(src, alt, title), src
+    
+    def test_classify_icon_cached(self, scraper, sample_html):
+        """测试同样的图标只识别一次"""
+        classify_icon.cache_clear()
+        soup = BeautifulSoup(sample_html + sample_html, 'html.parser')
+        scraper._extract_race_days(soup)
+        
+        cache_info = classify_icon.cache_info()
+        # 示例页面中共有7个不同的图标，重复的页面全部命中缓存
+        assert cache_info.currsize == 7
+        assert cache_info.hits >= 7
+    
     def test_convert_chinese_month(self, scraper):
         """测试中文月份转换"""
         assert scraper._convert_chinese_month('一月') == 1
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+紧凑记录类型测试
+"""
+
+import pytest
+import sys
+import os
+import json
+from bs4 import BeautifulSoup
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.records import Runner, RaceRecord, RaceDay, ScheduledRace, record_to_dict
+from hkjc_scrapers.horse_info_scraper import HorseInfoScraper
+from hkjc_scrapers.race_schedule_scraper import RaceScheduleScraper
+
+
+class TestRecords:
+    """紧凑记录类型测试类"""
+    
+    def test_record_reads_like_dict(self):
+        """测试记录可以像字典一样读取"""
+        record = RaceRecord({'date': '02/06/24', 'class': 'G1', 'margin': '1-1/4'})
+        
+        assert record['date'] == '02/06/24'
+        assert record['class'] == 'G1'
+        assert record.race_class == 'G1'
+        assert record.margin == '1-1/4'
+        assert record.get('margin') == '1-1/4'
+        assert record.get('jockey') is None
+        assert 'jockey' not in record
+        assert 'date' in record
+        assert len(record) == 3
+        with pytest.raises(KeyError):
+            record['jockey']
+    
+    def test_record_overflow_only_for_unmapped_headers(self):
+        """测试只有未映射的表头才放入extra"""
+        assert Runner({'horse_id': 'HK_2025_L155', 'jockey': '潘頓'}).extra is None
+        
+        runner = Runner({'horse_id': 'HK_2025_L155', '完成時間': '1:09.45', '備註': '退出'})
+        assert runner.finish_time_text == '1:09.45'
+        assert runner.extra == {'備註': '退出'}
+    
+    def test_record_has_no_instance_dict(self):
+        """测试记录不带实例字典"""
+        record = RaceRecord({'date': '02/06/24'})
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(AttributeError):
+            record.unknown_field = 1
+    
+    def test_to_dict_and_equality(self):
+        """测试转换为字典"""
+        data = {'date': '02/06/24', 'venue': '沙田', 'class': '第四班', '場次': '123'}
+        record = RaceRecord(data)
+        
+        assert record.to_dict() == data
+        assert record == data
+        assert json.loads(json.dumps(record, default=record_to_dict, ensure_ascii=False)) == data
+    
+    def test_race_day_converts_races(self):
+        """测试赛马日中的比赛也转换为记录"""
+        race_day = RaceDay.from_dict({
+            'day': 3, 'month': '一月', 'year': '2026', 'date': '2026-01-03',
+            'venues': ['沙田'], 'races': [{'race_number': 1, 'class': '第二班'}]
+        })
+        
+        assert isinstance(race_day['races'][0], ScheduledRace)
+        assert race_day.to_dict()['races'] == [{'race_number': 1, 'class': '第二班'}]
+    
+    def test_scrapers_use_records(self):
+        """测试爬虫开启use_records后返回记录"""
+        html = """
+        <table>
+            <tr><th>日期</th><th>場地</th><th>距離</th><th>班次</th><th>名次</th><th>騎師</th></tr>
+            <tr><td>02/06/24</td><td>沙田</td><td>1600</td><td>第三班</td><td>1</td><td>潘頓</td></tr>
+        </table>
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        records = HorseInfoScraper(use_records=True)._extract_race_records(soup)
+        assert isinstance(records[0], RaceRecord)
+        assert records[0] == HorseInfoScraper()._extract_race_records(soup)[0]
+        
+        fixture = """
+        <table>
+            <thead><tr><th colspan="7">2026年一月</th></tr></thead>
+            <tr><th>日</th><th>一</th><th>二</th><th>三</th><th>四</th><th>五</th><th>六</th></tr>
+            <tr><td class="calendar"><p><span>3</span><img src="/st.gif" alt="沙田"></p><p>1200(1) 85-60</p></td>
+                <td>4</td><td>5</td><td>6</td><td>7</td><td>8</td><td>9</td></tr>
+        </table>
+        """
+        race_days = RaceScheduleScraper(use_records=True)._extract_race_days(BeautifulSoup(fixture, 'html.parser'))
+        assert isinstance(race_days[0], RaceDay)
+        assert isinstance(race_days[0]['races'][0], ScheduledRace)
+    
+    def test_save_to_json_with_records(self, tmp_path):
+        """测试保存包含记录的结果为JSON"""
+        data = {'horse_id': 'HK_2020_E436', 'race_records': [RaceRecord({'date': '02/06/24', 'class': 'G1'})]}
+        json_file = tmp_path / 'records.json'
+        HorseInfoScraper().save_to_json(data, str(json_file))
+        
+        with open(json_file, 'r', encoding='utf-8') as f:
+            assert json.load(f)['race_records'] == [{'date': '02/06/24', 'class': 'G1'}]
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+赛程表索引测试
+"""
+
+import pytest
+import sys
+import os
+from datetime import date
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.records import RaceDay
+from hkjc_scrapers.race_schedule_scraper import RaceScheduleScraper
+from hkjc_scrapers.schedule_index import ScheduleIndex
+
+
+def make_race(number, race_class=None, grade=None, track_type='草地', distance=1200):
+    """生成一场比赛"""
+    return {'race_number': number, 'class': race_class, 'grade': grade,
+            'track_type': track_type, 'distance_meters': distance}
+
+
+@pytest.fixture
+def schedule():
+    """一个月的赛程（故意打乱顺序，并包含没有日期的赛马日）"""
+    return {
+        'race_days': [
+            {'date': '2026-01-14', 'day': 14, 'month': '一月', 'venues': ['跑马地'], 'race_types': ['夜赛'],
+             'races': [make_race(1, '第四班', distance=1650), make_race(2, '第三班', distance=1200)]},
+            {'date': '2026-01-04', 'day': 4, 'month': '一月', 'venues': ['沙田'], 'race_types': ['日赛'],
+             'races': [make_race(1, '第五班', track_type='全天候跑道'),
+                       make_race(2, grade='一级赛', distance=1600)]},
+            {'date': None, 'day': 30, 'month': '一月', 'venues': ['沙田'], 'race_types': [], 'races': []},
+            {'date': '2026-01-18', 'day': 18, 'month': '一月', 'venues': ['沙田'], 'race_types': ['日赛'],
+             'races': [make_race(1, '第四班', track_type='全天候跑道'),
+                       make_race(2, grade='一级赛', distance=2000)]},
+            {'date': '2026-02-01', 'day': 1, 'month': '二月', 'venues': ['沙田'], 'race_types': ['日赛'],
+             'races': [make_race(1, '第三班', track_type='全天候跑道', distance=1650)]},
+        ]
+    }
+
+
+@pytest.fixture
+def index(schedule):
+    """赛程索引"""
+    return ScheduleIndex(schedule)
+
+
+class TestScheduleIndex:
+    """赛程表索引测试类"""
+
+    def test_sorted_by_date(self, index):
+        """测试按日期排序，没有日期的放在最后"""
+        assert len(index) == 5
+        assert index.dates == ['2026-01-04', '2026-01-14', '2026-01-18', '2026-02-01']
+        assert index.race_days[-1]['day'] == 30
+
+    def test_race_days_between(self, index):
+        """测试日期范围查询（含两端）"""
+        days = index.race_days_between('2026-01-04', '2026-01-18')
+        assert [day['day'] for day in days] == [4, 14, 18]
+        assert [day['day'] for day in index.race_days_between(date_from=date(2026, 1, 15))] == [18, 1]
+        assert [day['day'] for day in index.race_days_between('2026-01-05', '2026-01-18', venue='沙田')] == [18]
+        assert len(index.race_days_between()) == 5
+
+    def test_next_race_day(self, index):
+        """测试下一个赛马日"""
+        assert index.next_race_day('2026-01-04')['day'] == 14
+        assert index.next_race_day('2026-01-04', inclusive=True)['day'] == 4
+        assert index.next_race_day('2026-01-01', venue='跑馬地')['day'] == 14
+        assert index.next_race_day('2026-01-14', venue='跑马地') is None
+        assert index.next_race_day('2026-01-18', venue='ST')['day'] == 1
+        assert index.next_race_day('2026-02-01') is None
+
+    def test_invalid_date(self, index):
+        """测试无法识别的日期"""
+        with pytest.raises(ValueError):
+            index.next_race_day('not a date')
+
+    def test_hash_indexes(self, index):
+        """测试月份、场地、赛马类型索引"""
+        assert [day['day'] for day in index.by_month('一月')] == [4, 14, 18, 30]
+        assert [day['day'] for day in index.by_venue('跑马地')] == [14]
+        assert [day['day'] for day in index.by_race_type('日赛')] == [4, 18, 1]
+        assert index.by_venue('不存在') == []
+        assert index.values('venue') == ['沙田', '跑马地']
+
+    def test_races_by_grade_in_range(self, index):
+        """测试日期范围内的一级赛"""
+        races = index.races(grade='一级赛', date_from='2026-01-10', date_to='2026-01-31')
+        assert [(day['day'], race['distance_meters']) for day, race in races] == [(18, 2000)]
+        assert len(index.races(grade='一级赛')) == 2
+
+    def test_races_combined_conditions(self, index):
+        """测试途程和跑道类型的组合查询"""
+        races = index.races(distance=1200, track_type='全天候')
+        assert [(day['day'], race['race_number']) for day, race in races] == [(4, 1), (18, 1)]
+        races = index.races(distance=1650, venue='沙田')
+        assert [day['day'] for day, _ in races] == [1]
+        races = index.races(race_class='第四班', race_type='夜赛')
+        assert [day['day'] for day, _ in races] == [14]
+        assert len(index.races()) == 7
+
+    def test_races_by_day_conditions_only(self, index):
+        """测试只有场地或类型条件时由赛马日索引取比赛"""
+        races = index.races(venue='沙田', date_from='2026-01-05')
+        assert [(day['day'], race['race_number']) for day, race in races] == [(18, 1), (18, 2), (1, 1)]
+        races = index.races(race_type='日赛', venue='ST', date_to='2026-01-18')
+        assert [(day['day'], race['race_number']) for day, race in races] == [(4, 1), (4, 2), (18, 1), (18, 2)]
+        assert index.races(venue='跑马地', date_from='2026-01-15') == []
+
+    def test_empty_date_sorted_last(self, schedule):
+        """测试日期为空字符串的赛马日与None一样放在最后"""
+        schedule['race_days'][2]['date'] = ''
+        index = ScheduleIndex(schedule)
+        assert index.race_days[-1]['day'] == 30
+        assert index.next_race_day('2026-01-05')['day'] == 14
+        assert [day['day'] for day in index.race_days_between('2026-01-01', '2026-01-31')] == [4, 14, 18]
+
+    def test_accepts_records(self, schedule):
+        """测试使用RaceDay记录建立索引"""
+        index = ScheduleIndex([RaceDay.from_dict(day) for day in schedule['race_days']])
+        assert index.next_race_day('2026-01-05', venue='沙田')['day'] == 18
+        assert len(index.races(track_type='全天候跑道')) == 3
+
+    def test_scraper_methods_accept_index(self, schedule):
+        """测试get_race_days_by_month和get_race_days_by_venue接受索引"""
+        scraper = RaceScheduleScraper()
+        index = scraper.build_index(schedule)
+        assert scraper.get_race_days_by_month(index, '一月') == \
+            sorted(scraper.get_race_days_by_month(schedule, '一月'), key=lambda day: day['date'] or '9')
+        assert scraper.get_race_days_by_venue(index, '跑马地') == \
+            scraper.get_race_days_by_venue(schedule, '跑马地')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
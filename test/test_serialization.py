@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON序列化测试
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers import serialization
+from hkjc_scrapers.records import Runner
+from hkjc_scrapers.serialization import encode, decode, dump_json
+
+
+RACE_RESULT = {
+    'race_date': '2026/01/18',
+    'racecourse': 'ST',
+    'race_no': '3',
+    'race_info': {'venue': '沙田'},
+    'horses': [{'horse_id': 'HK_2025_L155', 'horse_name': '国千金', '馬號': '3'}],
+    'race_result': {},
+    'incident_reports': [{'position': '1', 'horse_id': 'HK_2025_L155', 'description': '出閘時受阻。'}],
+    'pedigree': {},
+    'raw_html': '<html></html>',
+}
+
+HORSE_INFO = {
+    'horse_id': 'HK_2023_J256',
+    'source_url': 'https://racing.hkjc.com/zh-hk/local/information/horse?horseid=HK_2023_J256',
+    'scraped_at': '2026-01-19T10:00:00',
+    'basic_info': {'horse_name': '馬甲', 'sire': 'Sire One'},
+    'race_records': [{'date': '18/01/26', 'venue': '沙田', 'margin': '1-1/4'}],
+    'equipment_legend': {'B': '戴眼罩'},
+    'raw_html': '<html></html>',
+}
+
+FIXTURE = {
+    'source_url': 'https://racing.hkjc.com/zh-hk/local/information/fixture',
+    'scraped_at': '2026-01-19T10:00:00',
+    'months': ['一月'],
+    'race_days': [{'date': '2026-01-18', 'venues': ['沙田'], 'races': []}],
+    'legend': {'venues': ['沙田']},
+    'notices': ['原定於9月24日舉行的賽事將予取消'],
+    'raw_html': '<html></html>',
+}
+
+SCHEMA_SAMPLES = {'race_result': RACE_RESULT, 'horse_info': HORSE_INFO, 'fixture': FIXTURE}
+
+
+class TestSerialization:
+    """JSON序列化测试类"""
+
+    @pytest.fixture(params=['json', 'orjson', 'msgspec'])
+    def codec(self, request):
+        """各编码方式（未安装的可选依赖跳过）"""
+        if request.param != 'json':
+            pytest.importorskip(request.param)
+        return request.param
+
+    def test_round_trip(self, codec):
+        """测试编码后解码得到相同数据"""
+        raw = encode(RACE_RESULT, codec=codec)
+        assert isinstance(raw, bytes)
+        assert decode(raw, codec=codec) == RACE_RESULT
+        assert json.loads(raw) == RACE_RESULT
+
+    def test_compact_by_default(self, codec):
+        """测试默认紧凑输出，pretty=True时缩进"""
+        assert b'\n' not in encode(RACE_RESULT, codec=codec)
+        pretty = encode(RACE_RESULT, codec=codec, pretty=True)
+        assert b'\n  "race_date"' in pretty
+        assert json.loads(pretty) == RACE_RESULT
+
+    def test_non_ascii_kept(self, codec):
+        """测试中文不转义"""
+        assert '国千金'.encode('utf-8') in encode(RACE_RESULT, codec=codec)
+
+    def test_records(self, codec):
+        """测试紧凑记录编码为对象"""
+        data = {'horses': [Runner({'horse_id': 'HK_2025_L155', 'class': '第四班'})]}
+        assert json.loads(encode(data, codec=codec)) == {
+            'horses': [{'horse_id': 'HK_2025_L155', 'class': '第四班'}]
+        }
+
+    def test_dump_json(self, codec, tmp_path):
+        """测试保存文件"""
+        filename = tmp_path / 'result.json'
+        dump_json(RACE_RESULT, str(filename), codec=codec)
+        with open(filename, 'r', encoding='utf-8') as f:
+            assert json.load(f) == RACE_RESULT
+
+    def test_unknown_codec(self):
+        """测试未知编码方式"""
+        with pytest.raises(ValueError):
+            encode(RACE_RESULT, codec='yaml')
+
+    def test_msgspec_schema(self):
+        """测试msgspec按结构解码"""
+        msgspec = pytest.importorskip('msgspec')
+        result = decode(encode(RACE_RESULT), codec='msgspec', schema='race_result')
+
+        assert isinstance(result, serialization.RaceResultStruct)
+        assert result.race_no == '3'
+        assert result.incident_reports[0].horse_id == 'HK_2025_L155'
+        assert result.incident_reports[0].horse_number is None
+        assert msgspec.to_builtins(result) == RACE_RESULT
+
+        with pytest.raises(msgspec.ValidationError):
+            decode(b'{"race_no": 3}', codec='msgspec', schema='race_result')
+
+    @pytest.mark.parametrize('schema', sorted(SCHEMA_SAMPLES))
+    def test_schema_round_trip_all_codecs(self, codec, schema):
+        """测试爬虫输出经各编码方式编码后，按结构解码不丢失字段"""
+        msgspec = pytest.importorskip('msgspec')
+        data = SCHEMA_SAMPLES[schema]
+        raw = encode(data, codec=codec)
+        assert decode(raw, codec=codec) == data
+        assert msgspec.to_builtins(decode(raw, codec='msgspec', schema=schema)) == data
+
+    @pytest.mark.parametrize('schema', sorted(SCHEMA_SAMPLES))
+    def test_schema_rejects_unknown_fields(self, schema):
+        """测试结构中没有的字段解码时报错，不被静默丢弃"""
+        msgspec = pytest.importorskip('msgspec')
+        data = dict(SCHEMA_SAMPLES[schema], extra_field='x')
+        with pytest.raises(msgspec.ValidationError):
+            decode(encode(data), codec='msgspec', schema=schema)
+
+    def test_schema_requires_msgspec(self):
+        """测试schema只能用于msgspec"""
+        with pytest.raises(ValueError):
+            decode(encode(RACE_RESULT), codec='json', schema='race_result')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
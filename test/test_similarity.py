@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+马匹近况相似度测试
+"""
+
+import pytest
+import sys
+import os
+from bs4 import BeautifulSoup
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+np = pytest.importorskip('numpy')
+
+from hkjc_scrapers.horse_info_scraper import HorseInfoScraper
+from hkjc_scrapers.similarity import FormSimilarity, form_profile
+
+
+def horse(horse_id, positions, rating='60', distance='1200'):
+    """赛绩由新到旧，每场相隔14日"""
+    records = [{'date': f'{28 - i * 2:02d}/12/25', 'position': str(position), '頭馬距離': '1-1/2',
+                'rating': rating, 'distance': distance} for i, position in enumerate(positions)]
+    return {'horse_id': horse_id, 'race_records': records}
+
+
+@pytest.fixture
+def horses():
+    """前两匹马近况接近，第三匹相反"""
+    return [
+        horse('HK_2023_A001', [1, 2, 1, 3]),
+        horse('HK_2023_A002', [2, 1, 2, 3]),
+        horse('HK_2023_A003', [14, 12, 13, 14], rating='30', distance='2000'),
+        horse('HK_2023_A004', [7, 7, 7, 7]),
+    ]
+
+
+class TestFormProfile:
+    """form_profile测试类"""
+
+    def test_layout(self):
+        """按特征分段，由新到旧，缩放到0-1"""
+        vector = form_profile(horse('X', [1, 14])['race_records'], runs=3)
+        assert vector.dtype == np.float32
+        assert vector.shape == (12,)
+        # 名次：1→0，14→1，不足的场数以平均值补齐
+        assert vector[:3].tolist() == pytest.approx([0.0, 1.0, 0.5])
+        # 头马距离1.5马位
+        assert vector[3] == pytest.approx(1.5 / 20)
+
+    def test_sorted_by_date_and_skips_unplaced(self):
+        """赛绩按日期排序，没有数字名次的赛绩不计"""
+        records = [
+            {'date': '01/01/25', 'position': '14'},
+            {'date': '01/06/25', 'position': 'WV'},
+            {'date': '01/03/25', 'position': '1'},
+        ]
+        vector = form_profile(records, runs=2)
+        assert vector[:2].tolist() == pytest.approx([0.0, 1.0])
+
+    def test_scraped_race_records(self):
+        """由马匹资料页面提取的赛绩（头马距离和途程都有值）"""
+        html = (
+            '<table><tr><td>場次</td><td>名次</td><td>日期</td><td>場地</td><td>距離</td><td>場地狀況</td>'
+            '<td>評分</td><td>頭馬距離</td></tr>'
+            '<tr><td>601</td><td>3</td><td>28/12/25</td><td>沙田</td><td>1800</td><td>好地</td>'
+            '<td>70</td><td>2-1/2</td></tr>'
+            '<tr><td>512</td><td>1</td><td>10/12/25</td><td>跑馬地</td><td>1200</td><td>黏地</td>'
+            '<td>64</td><td>---</td></tr></table>'
+        )
+        records = HorseInfoScraper()._extract_race_records(BeautifulSoup(html, 'html.parser'))
+        assert [(r['distance'], r['margin']) for r in records] == [('1800', '2-1/2'), ('1200', '---')]
+        vector = form_profile(records, runs=2)
+        assert vector[2:4].tolist() == pytest.approx([2.5 / 20, 0.0])
+        assert vector[6:8].tolist() == pytest.approx([800 / 1400, 200 / 1400])
+
+    def test_no_runs(self):
+        """没有可用赛绩"""
+        assert form_profile([]) is None
+        assert form_profile([{'date': '01/06/25', 'position': 'WV'}]) is None
+
+
+class TestFormSimilarity:
+    """FormSimilarity测试类"""
+
+    def test_cosine_and_euclidean(self, horses):
+        """余弦相似度由大到小，欧氏距离由小到大，不含查询的马匹本身"""
+        index = FormSimilarity(runs=4)
+        assert index.add_horses(horses) == 4
+        cosine = index.similar('HK_2023_A001', k=3)
+        assert [horse_id for horse_id, _ in cosine][0] == 'HK_2023_A002'
+        assert 'HK_2023_A001' not in [horse_id for horse_id, _ in cosine]
+        assert cosine[0][1] >= cosine[1][1] >= cosine[2][1]
+
+        euclidean = index.similar('HK_2023_A001', k=3, metric='euclidean')
+        assert [horse_id for horse_id, _ in euclidean] == ['HK_2023_A002', 'HK_2023_A004', 'HK_2023_A003']
+        expected = np.linalg.norm(index.vector('HK_2023_A001') - index.vector('HK_2023_A002'))
+        assert euclidean[0][1] == pytest.approx(expected, abs=1e-5)
+
+    def test_query_by_vector_and_batch(self, horses):
+        """以向量查询时包含完全相同的马匹；批量查询与逐个查询相同"""
+        index = FormSimilarity(runs=4)
+        index.add_horses(horses)
+        found = index.similar(index.vector('HK_2023_A003'), k=1, metric='euclidean')
+        assert found[0][0] == 'HK_2023_A003'
+        assert found[0][1] == pytest.approx(0.0, abs=1e-3)
+
+        batch = index.similar_many(['HK_2023_A001', 'HK_2023_A003'], k=2)
+        single = [index.similar('HK_2023_A001', k=2), index.similar('HK_2023_A003', k=2)]
+        for batch_found, single_found in zip(batch, single):
+            assert [horse_id for horse_id, _ in batch_found] == [horse_id for horse_id, _ in single_found]
+            assert [score for _, score in batch_found] == pytest.approx([score for _, score in single_found])
+        assert len(index.similar('HK_2023_A001', k=10)) == 3
+
+    def test_incremental_update_and_growth(self, horses):
+        """重新加入时原地更新，超出容量时扩容，删除时由最后一行补位"""
+        index = FormSimilarity(runs=4, capacity=2)
+        index.add_horses(horses)
+        assert index.matrix.shape == (4, 16)
+        row = index.rows['HK_2023_A004']
+        index.add_horse(horse('HK_2023_A004', [1, 2, 1, 3]))
+        assert index.rows['HK_2023_A004'] == row
+        assert len(index) == 4
+        assert index.similar('HK_2023_A001', k=1, metric='euclidean')[0][0] == 'HK_2023_A004'
+
+        assert index.remove_horse('HK_2023_A001')
+        assert not index.remove_horse('HK_2023_A001')
+        assert index.horse_ids[index.rows['HK_2023_A004']] == 'HK_2023_A004'
+        assert 'HK_2023_A001' not in index
+        # 重新抓取后没有可用赛绩时删除
+        assert not index.add_horse({'horse_id': 'HK_2023_A002', 'race_records': []})
+        assert sorted(index.horse_ids) == ['HK_2023_A003', 'HK_2023_A004']
+
+    def test_errors(self, horses):
+        """未知的马匹、相似度或向量长度"""
+        index = FormSimilarity(runs=4)
+        assert index.similar(np.zeros(16), k=3) == []
+        index.add_horses(horses)
+        with pytest.raises(KeyError):
+            index.similar('HK_9999_X000')
+        with pytest.raises(ValueError):
+            index.similar('HK_2023_A001', metric='manhattan')
+        with pytest.raises(ValueError):
+            index.similar(np.zeros(3))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
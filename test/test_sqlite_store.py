@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite存储测试
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.sqlite_store import SQLiteStore
+from hkjc_scrapers.race_result_scraper import RaceResultScraper
+from hkjc_scrapers.records import RaceRecord
+
+
+def race_result(race_no='3', horses=None):
+    """构造比赛结果"""
+    return {
+        'race_date': '2026/01/18',
+        'racecourse': 'ST',
+        'race_no': race_no,
+        'race_info': {'venue': '沙田'},
+        'horses': horses if horses is not None else [
+            {'horse_id': 'HK_2025_L155', 'horse_name': '国千金', 'position': '1',
+             'jockey': '潘頓', 'trainer': '蔡約翰', '完成時間': '1:09.50', '備註': '好'},
+            {'horse_id': 'HK_2024_K123', 'horse_name': '测试马', 'position': '2',
+             'jockey': '莫雷拉', 'trainer': '方嘉柏'},
+        ],
+        'race_result': {},
+        'incident_reports': [{'position': '1', 'horse_id': 'HK_2025_L155', 'description': '出閘時受阻。'}],
+        'pedigree': {},
+        'raw_html': '<html></html>',
+    }
+
+
+HORSE = {
+    'horse_id': 'HK_2025_L155',
+    'source_url': 'https://racing.hkjc.com/horse?horseid=HK_2025_L155',
+    'scraped_at': '2026-01-19T10:00:00',
+    'basic_info': {'horse_name': '国千金', 'sire': 'Starspangledbanner', 'trainer': '蔡約翰'},
+    'race_records': [
+        {'date': '18/01/26', 'venue': '沙田', 'class': '第四班', 'jockey': '潘頓', '場次': '123'},
+        RaceRecord({'date': '02/06/25', 'venue': '跑馬地', 'class': '第五班', 'jockey': '布文'}),
+    ],
+}
+
+FIXTURE = {
+    'race_days': [
+        {'date': '2026-01-03', 'day': 3, 'month': '一月', 'year': '2026', 'venues': ['沙田'],
+         'race_types': ['日赛'], 'track_types': ['草地'], 'races': [{'race_number': 1, 'class': '第二班'}]},
+        {'date': '2026-01-07', 'day': 7, 'month': '一月', 'year': '2026', 'venues': ['跑马地'],
+         'race_types': ['夜赛'], 'track_types': ['草地'], 'races': []},
+    ]
+}
+
+
+class TestSQLiteStore:
+    """SQLite存储测试类"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """创建数据库"""
+        store = SQLiteStore(str(tmp_path / 'hkjc.db'))
+        yield store
+        store.close()
+
+    def test_wal_mode_and_indexes(self, store):
+        """测试WAL模式和查询索引"""
+        assert store.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        indexes = {row['name'] for row in store.query("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {'idx_runners_horse', 'idx_runners_jockey', 'idx_runners_trainer', 'idx_runners_date'} <= indexes
+
+    def test_race_results(self, store):
+        """测试写入比赛结果并按马匹、骑师、练马师、日期查询"""
+        assert store.add_race_results([race_result('3'), race_result('4')]) == 2
+
+        races = store.races_on('2026-01-18', 'ST')
+        assert [race['race_no'] for race in races] == [3, 4]
+        assert json.loads(races[0]['race_info']) == {'venue': '沙田'}
+        assert store.query('SELECT * FROM meetings') == [{'race_date': '2026-01-18', 'racecourse': 'ST'}]
+
+        runs = store.runners_by_horse('HK_2025_L155')
+        assert len(runs) == 2
+        assert runs[0]['finish_time'] == '1:09.50'
+        assert json.loads(runs[0]['extra']) == {'備註': '好'}
+
+        assert len(store.runners_by_jockey('潘頓', date_from='2026-01-01', date_to='2026/01/31')) == 2
+        assert store.runners_by_jockey('潘頓', date_from='2026-02-01') == []
+        assert len(store.runners_by_trainer('方嘉柏')) == 2
+        assert store.incidents_by_horse('HK_2025_L155')[0]['description'] == '出閘時受阻。'
+
+    def test_race_result_upsert_replaces_runners(self, store):
+        """测试重复写入同一场比赛时替换参赛马匹"""
+        store.add_race_result(race_result('3'))
+        store.add_race_result(race_result('3', horses=[{'horse_id': 'HK_2025_L155', 'jockey': '布文'}]))
+
+        assert store.query('SELECT COUNT(*) AS n FROM races')[0]['n'] == 1
+        runners = store.query('SELECT horse_id, jockey FROM runners')
+        assert runners == [{'horse_id': 'HK_2025_L155', 'jockey': '布文'}]
+
+    def test_horses(self, store):
+        """测试写入马匹信息，赛绩按日期和场地更新"""
+        store.add_horse(HORSE)
+        updated = dict(HORSE, race_records=[{'date': '18/01/26', 'venue': '沙田', 'class': '第三班'}])
+        store.add_horse(updated)
+
+        runs = store.runs_by_horse('HK_2025_L155')
+        assert [run['race_date'] for run in runs] == ['2026-01-18', '2025-06-02']
+        assert runs[0]['race_class'] == '第三班'
+        assert runs[1]['jockey'] == '布文'
+
+        horse = store.query('SELECT * FROM horses')[0]
+        assert horse['sire'] == 'Starspangledbanner'
+
+    def test_fixtures(self, store):
+        """测试写入赛程表并按场地、日期查询"""
+        store.add_fixture(FIXTURE)
+
+        assert [day['race_date'] for day in store.fixture_days()] == ['2026-01-03', '2026-01-07']
+        assert [day['race_date'] for day in store.fixture_days(venue='跑马地')] == ['2026-01-07']
+        assert store.fixture_days(date_from='2026-01-04')[0]['race_count'] == 0
+
+    def test_batches(self, tmp_path):
+        """测试分批写入"""
+        with SQLiteStore(str(tmp_path / 'hkjc.db'), batch_size=2) as store:
+            assert store.add_race_results(race_result(str(n)) for n in range(1, 6)) == 5
+            assert store.query('SELECT COUNT(*) AS n FROM runners')[0]['n'] == 10
+
+    def test_scraper_save_to_sqlite(self, tmp_path):
+        """测试爬虫保存到数据库"""
+        filename = str(tmp_path / 'hkjc.db')
+        RaceResultScraper().save_to_sqlite(race_result('3'), filename)
+
+        with SQLiteStore(filename) as store:
+            assert len(store.runners_by_horse('HK_2024_K123')) == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+骑师、练马师统计测试
+"""
+
+import pytest
+import sys
+import os
+import copy
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.stats import RunningStats
+
+
+def make_result(race_date='2026/01/18', racecourse='ST', race_no='1', distance='1200', horses=None):
+    """生成一场比赛结果"""
+    return {
+        'race_date': race_date, 'racecourse': racecourse, 'race_no': race_no,
+        'race_info': {'distance_meters': distance},
+        'horses': horses if horses is not None else [
+            {'position': '1', 'jockey': '潘頓', 'trainer': '呂健威'},
+            {'position': '2', 'jockey': '莫雷拉', 'trainer': '呂健威'},
+            {'position': '3 DH', 'jockey': '布文', 'trainer': '方嘉柏'},
+            {'position': '4', 'jockey': '田泰安', 'trainer': '方嘉柏'},
+            {'position': 'PU', 'jockey': '何澤堯', 'trainer': '沈集成'},
+            {'position': 'WV', 'jockey': '周俊樂', 'trainer': '沈集成'},
+        ],
+    }
+
+
+@pytest.fixture
+def stats():
+    """两场比赛的统计"""
+    stats = RunningStats()
+    stats.add_race_result(make_result())
+    stats.add_race_result(make_result(race_date='2026/01/21', racecourse='HV', race_no='2', distance='1650',
+                                      horses=[{'position': '1', 'jockey': '莫雷拉', 'trainer': '呂健威'},
+                                              {'position': '2', 'jockey': '潘頓', 'trainer': '方嘉柏'}]))
+    return stats
+
+
+class TestRunningStats:
+    """骑师、练马师统计测试类"""
+
+    def test_totals(self, stats):
+        """测试总计和比率"""
+        assert len(stats) == 2
+        jockey = stats.jockey('潘頓')
+        assert (jockey['starts'], jockey['wins'], jockey['places']) == (2, 1, 2)
+        assert jockey['win_rate'] == pytest.approx(0.5)
+        trainer = stats.trainer('呂健威')
+        assert (trainer['starts'], trainer['wins'], trainer['places']) == (3, 2, 3)
+        assert stats.trainer('方嘉柏')['places'] == 2   # 平头第三也算上名
+
+    def test_withdrawn_not_counted(self, stats):
+        """测试退出的马匹不计出赛，未完成的计出赛"""
+        assert stats.jockey('周俊樂')['starts'] == 0
+        assert stats.jockey('何澤堯')['starts'] == 1
+
+    def test_pairs_and_details(self, stats):
+        """测试组合统计和分项统计"""
+        pair = stats.pair('莫雷拉', '呂健威')
+        assert (pair['starts'], pair['wins']) == (2, 1)
+        assert stats.pair('莫雷拉', '呂健威', venue='跑馬地')['wins'] == 1
+        assert stats.pair('莫雷拉', '呂健威', venue='ST', distance=1200, season='2025-26')['starts'] == 1
+        assert stats.jockey('潘頓', distance=1650)['places'] == 1
+        assert stats.jockey('潘頓', season='2024-25')['starts'] == 0
+
+    def test_reingest_is_idempotent(self, stats):
+        """测试重复加入同一场比赛不改变统计"""
+        before = copy.deepcopy(dict(stats.counts))
+        assert stats.add_race_result(make_result()) is False
+        assert dict(stats.counts) == before
+        assert len(stats) == 2
+
+    def test_corrected_result_replaces_contribution(self, stats):
+        """测试赛果修正后重新加入时替换原来的贡献"""
+        corrected = make_result()
+        corrected['horses'][0]['position'], corrected['horses'][1]['position'] = '2', '1'
+        assert stats.add_race_result(corrected) is True
+        assert stats.jockey('潘頓')['wins'] == 0
+        assert stats.jockey('莫雷拉')['wins'] == 2
+        assert stats.trainer('呂健威')['wins'] == 2
+
+    def test_remove_race(self, stats):
+        """测试移除比赛后统计归零的键被删除"""
+        assert stats.remove_race('2026-01-21|HV|2') is True
+        assert stats.remove_race('2026-01-21|HV|2') is False
+        assert stats.jockey('潘頓')['starts'] == 1
+        assert stats.jockey('潘頓', venue='HV')['starts'] == 0
+        assert ('pair', ('潘頓', '方嘉柏')) not in stats.counts
+
+    def test_ranking(self, stats):
+        """测试排名"""
+        ranking = stats.ranking('trainer', by='wins', n=2)
+        assert [name for name, _ in ranking] == ['呂健威', '方嘉柏']
+        assert stats.ranking('jockey', by='win_rate', min_starts=2)[0][0] in ('潘頓', '莫雷拉')
+
+    def test_invalid_kind(self, stats):
+        """测试未知的统计对象"""
+        with pytest.raises(ValueError):
+            stats.get('horse', 'X')
+
+    def test_save_and_load(self, stats, tmp_path):
+        """测试保存后载入继续累加，重复加入仍然不改变统计"""
+        filename = str(tmp_path / 'stats.json')
+        stats.save(filename)
+        loaded = RunningStats.load(filename)
+        assert dict(loaded.counts) == dict(stats.counts)
+        assert loaded.pair('莫雷拉', '呂健威', venue='HV') == stats.pair('莫雷拉', '呂健威', venue='HV')
+
+        assert loaded.add_race_result(make_result()) is False
+        assert loaded.add_race_result(make_result(race_no='3')) is True
+        assert loaded.jockey('潘頓')['starts'] == 3
+        assert os.listdir(tmp_path) == ['stats.json']
+
+    def test_load_missing_file(self, tmp_path):
+        """测试文件不存在时为空统计"""
+        assert len(RunningStats.load(str(tmp_path / 'missing.json'))) == 0
+
+    def test_invalid_results(self):
+        """测试空结果和缺少日期的结果"""
+        stats = RunningStats()
+        assert stats.add_race_results([{}, None, {'race_no': '1', 'horses': []}]) == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式读取HTML测试
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.streaming import ResponseTooLarge, read_html
+
+
+PAGE = ('<html><body><table id="first"><tr><td>一</td></tr></table>'
+        + '<p>頁尾</p>' * 200 + '</body></html>')
+
+
+def streamed_response(html: str, chunk: int = 64, headers=None):
+    """分块返回html的响应"""
+    data = html.encode('utf-8')
+    response = Mock()
+    response.headers = headers or {}
+    response.iter_content = Mock(side_effect=lambda chunk_size: (data[i:i + chunk] for i in range(0, len(data), chunk)))
+    return response
+
+
+class TestReadHtml:
+    """read_html测试类"""
+
+    def test_reads_everything_without_callback(self):
+        """没有回调时读取全部内容"""
+        response = streamed_response(PAGE)
+        html, stopped = read_html(response)
+        assert html == PAGE
+        assert not stopped
+        response.close.assert_called_once()
+
+    def test_stops_when_done(self):
+        """回调返回True后停止读取"""
+        seen = []
+
+        def done(element):
+            seen.append(element.tag)
+            return element.tag == 'table'
+
+        response = streamed_response(PAGE)
+        html, stopped = read_html(response, done)
+        assert stopped
+        assert '<table id="first">' in html and '</table>' in html
+        assert len(html) < len(PAGE) // 4
+        assert seen[-1] == 'table'
+        response.close.assert_called_once()
+
+    def test_multibyte_characters_across_chunks(self):
+        """多字节字符跨越分块时仍正确解码"""
+        html, _ = read_html(streamed_response(PAGE, chunk=5))
+        assert html == PAGE
+
+    def test_max_bytes(self):
+        """超过大小上限时抛出异常，异常属于请求错误"""
+        response = streamed_response(PAGE)
+        with pytest.raises(ResponseTooLarge):
+            read_html(response, max_bytes=100)
+        response.close.assert_called_once()
+        assert issubclass(ResponseTooLarge, __import__('requests').RequestException)
+        html, _ = read_html(streamed_response(PAGE), max_bytes=None)
+        assert html == PAGE
+
+    def test_declared_length(self):
+        """声明的长度超过上限时不读取内容"""
+        response = streamed_response(PAGE, headers={'Content-Length': '999999'})
+        with pytest.raises(ResponseTooLarge):
+            read_html(response, max_bytes=1000)
+        response.iter_content.assert_not_called()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+通用工具函数测试
+"""
+
+import pytest
+import sys
+import os
+from datetime import date, datetime
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from hkjc_scrapers.utils import (parse_race_date, season_of, venue_code, parse_int, parse_float,
+                                 parse_finish_time, parse_margin, race_key)
+
+
+class TestUtils:
+    """通用工具函数测试类"""
+    
+    def test_parse_race_date_formats(self):
+        """测试解析各页面中的日期格式"""
+        assert parse_race_date('02/06/24') == date(2024, 6, 2)
+        assert parse_race_date('02/06/2024') == date(2024, 6, 2)
+        assert parse_race_date('2026/01/18') == date(2026, 1, 18)
+        assert parse_race_date('2026-01-18') == date(2026, 1, 18)
+        assert parse_race_date('15/09/98') == date(1998, 9, 15)
+    
+    def test_parse_race_date_objects(self):
+        """测试直接传入日期对象"""
+        assert parse_race_date(date(2026, 1, 18)) == date(2026, 1, 18)
+        assert parse_race_date(datetime(2026, 1, 18, 12, 30)) == date(2026, 1, 18)
+    
+    def test_parse_race_date_invalid(self):
+        """测试无法解析的日期返回None"""
+        assert parse_race_date(None) is None
+        assert parse_race_date('') is None
+        assert parse_race_date('日期') is None
+    
+    def test_season_of(self):
+        """测试马季以9月为界"""
+        assert season_of('2025-09-07') == '2025-26'
+        assert season_of('18/01/26') == '2025-26'
+        assert season_of('2026/07/15') == '2025-26'
+        assert season_of(date(1999, 12, 1)) == '1999-00'
+        assert season_of('') is None
+    
+    def test_venue_code(self):
+        """测试场地名称转换为代码"""
+        assert venue_code('沙田') == 'ST'
+        assert venue_code('跑馬地') == 'HV'
+        assert venue_code('跑马地 ') == 'HV'
+        assert venue_code('從化') == '從化'
+        assert venue_code('沙田草地') == 'ST'
+        assert venue_code('跑馬地草地') == 'HV'
+        assert venue_code(None) is None
+    
+    def test_parse_numbers(self):
+        """测试解析整数和小数，无数字时返回None"""
+        assert parse_int('1185') == 1185
+        assert parse_int('1,185') == 1185
+        assert parse_int('3 DH') == 3
+        assert parse_int('WV') is None
+        assert parse_int('') is None
+        assert parse_float('4.7') == 4.7
+        assert parse_float('99') == 99.0
+        assert parse_float('---') is None
+    
+    def test_parse_finish_time(self):
+        """测试完成时间转换为秒"""
+        assert parse_finish_time('1:09.45') == pytest.approx(69.45)
+        assert parse_finish_time('1.09.45') == pytest.approx(69.45)
+        assert parse_finish_time('58.12') == pytest.approx(58.12)
+        assert parse_finish_time('---') is None
+        assert parse_finish_time(None) is None
+        assert parse_race_date('31/02/24') is None
+    
+    def test_parse_margin(self):
+        """测试头马距离转换为马位"""
+        assert parse_margin('2') == 2.0
+        assert parse_margin('1-1/2') == 1.5
+        assert parse_margin('3/4') == 0.75
+        assert parse_margin('頸位') == 0.3
+        assert parse_margin('SH') == 0.1
+        assert parse_margin('---') == 0.0
+        assert parse_margin('') is None
+        assert parse_margin(None) is None
+        assert parse_margin('3/0') is None
+        assert parse_margin('1-1/0') is None
+        assert parse_margin('1-1/00') is None
+    
+    def test_race_key(self):
+        """测试比赛键"""
+        assert race_key({'race_date': '2026/01/18', 'racecourse': '沙田', 'race_no': '3'}) == '2026-01-18|ST|3'
+        assert race_key({'race_date': '18/01/26', 'racecourse': 'HV', 'race_no': 3}) == '2026-01-18|HV|3'
+        assert race_key({'race_date': '2026/01/18', 'race_no': 3}) == '2026-01-18||3'
+        assert race_key({'race_date': '2026/01/18'}) is None
+        assert race_key({'race_no': 3}) is None